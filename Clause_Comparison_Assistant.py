@@ -45,20 +45,47 @@ Clause Comparison Assistant V18.8 (Precise Recognition Edition)
 - [V18.5] 代码质量优化（预编译正则、常量定义、类型注解、辅助方法）
 - [V18.8] 精准识别模式：勾选后仅提取蓝色字体的条款，适用于干扰项多的文档
 - [V18.9] 加粗格式保留：条款库中的加粗文本在比对报告、Word输出、录单版全流程保留
+- [V19.1] 单遍行分类器：标题/条款行判定编译为特征位掩码 + 决策表（--bench-classifier 校验一致性与性能）
+- [V19.1] 大库两阶段检索：2万条以上条款库使用 n-gram 倒排索引召回候选 + 精确重打分（--bench-retrieval 评估召回率与延迟）
+- [V19.1] 增量比对：修订版文档按标题+内容哈希与上一版报告对齐，仅重新匹配新增/修改条款并标注变更状态
+- [V19.1] 监控目录模式（--watch）：无界面自动比对新增/变更的 docx/pdf，常驻条款库索引，状态库断点续跑，状态文件输出吞吐与队列
+- [V19.1] 启动优化：pandas/sklearn/jieba/PDF/保险计算器延迟导入，窗口显示后后台预热；支持预编译jieba词典缓存（--build-jieba-cache，build_exe.bat 打包时生成并随程序分发），--import-report 输出启动耗时；打包改用本模块，并入 Windows 版的控制台编码/日志目录适配
+- [V19.1] 条款库索引服务：条款库/Sheet变化后后台加载并建索引，查询对话框、映射对话框、比对线程共享，不再卡界面；映射下拉提示不再限制500条
+- [V19.1] 条款提取多进程并行：文件分发到工作进程解析，按完成顺序显示结果，单文件出错/超时不影响其他文件，进程数可配置
+- [V19.1] PDF文本提取：大文件分页多进程并行、按内容哈希缓存每页文本，同一PDF不重复解析；pypdfium2 快速路径需设置环境变量 CLAUSE_PDF_FAST=1 开启（分行可能与 pdfplumber 不同）
+- [V19.1] 增量提取：文件夹模式记录提取清单（大小、修改时间、内容哈希、提取结果），再次提取只解析新增/修改的文件并报告增删改数量
+- [V19.1] .doc转换：后台线程执行，常驻一个 headless LibreOffice 实例整批提交，单文件超时/崩溃自动重启，不再逐个启动 soffice
+- [V19.1] Word输出：条款文档流式写入（段落XML直接写入docx、run属性XML预生成、<b>标记一次切分），数千条合并导出内存恒定
+- [V19.1] Word输出：按条款/按分类输出改为后台多进程生成，先写入临时目录再移动到位，可直接打包为ZIP；重名文件自动加序号
+- [V19.1] 分类ZIP：后台打包，.docx/.xlsx/.pdf 等已压缩格式直接存储，其余文件多线程压缩，内存占用有上限
+- [V19.1] 条款列表改为数据模型+视图：按列存储条款，只绘制可见行，分批追加；条款输出页支持表头排序和筛选，提取页文件列表标记提取结果
+- [V19.1] 条款输出Excel快速导入：直接解析工作表XML，只读取识别出的列，条款内容的加粗标记在显示/生成文档时才生成，边读取边追加到列表
 
 Author: Dachi Yijin
 Date: 2025-12-23
 Updated: 2026-01-27 (V18.9 Bold Format Preservation)
 """
 
+import time
+_MODULE_START = time.perf_counter()  # v19.1: 启动耗时统计（--import-report）
+
 import sys
 import os
+
+# Windows UTF-8 编码适配（解决 cp936 无法编码 emoji/Unicode 的问题）
+if sys.platform == 'win32':
+    os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    if hasattr(sys.stderr, 'reconfigure'):
+        sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
 import re
 import difflib
 import traceback
 import logging
 import subprocess
-from typing import List, Dict, Tuple, Optional, Set, Any
+from typing import List, Dict, Tuple, Optional, Set, Any, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import defaultdict
@@ -66,8 +93,9 @@ from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 import json
-import pandas as pd
-from docx import Document
+import importlib
+import importlib.util
+import threading
 
 # ASCII Art Logo
 APP_LOGO = """
@@ -83,42 +111,105 @@ APP_LOGO = """
 ╚═══════════════════════════════════════════════════════════════════╝
 """
 # 打印Logo
-print(APP_LOGO)
+if __name__ != '__mp_main__':  # v19.1: 并行提取的工作进程不重复打印
+    print(APP_LOGO)
+
+# ==========================================
+# v19.1: 重型依赖延迟导入（启动优化）
+# pandas / numpy / python-docx / sklearn / jieba / PDF / 翻译 / 保险计算器
+# 在首次使用时才导入，窗口显示后由 warmup_heavy_modules() 在后台预热
+# ==========================================
+_IMPORT_TIMINGS: Dict[str, float] = {}  # 模块名 -> 首次导入耗时（秒）
+JIEBA_CACHE_NAME = "jieba.cache"        # 随程序分发的 jieba 前缀词典缓存
+
+
+def _has_module(name: str) -> bool:
+    """仅检查模块是否已安装，不执行导入"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _timed_import(name: str):
+    """导入模块并记录首次导入耗时"""
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _IMPORT_TIMINGS.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+class _LazyModule:
+    """模块代理：首次访问属性时才导入（线程安全，可在后台线程预热）"""
+
+    def __init__(self, name: str, on_load=None):
+        self._name = name
+        self._on_load = on_load
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    module = _timed_import(self._name)
+                    if self._on_load:
+                        self._on_load(module)
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+def _configure_jieba(module):
+    """减少jieba日志输出；优先使用随程序分发的预编译词典缓存，避免冷启动重建前缀词典"""
+    module.setLogLevel(logging.WARNING)
+    candidates = [getattr(sys, '_MEIPASS', None), Path(__file__).parent]
+    if getattr(sys, 'frozen', False):
+        candidates.insert(1, Path(sys.executable).parent)
+    for base in candidates:
+        if base and (Path(base) / JIEBA_CACHE_NAME).is_file():
+            module.dt.tmp_dir = str(base)
+            module.dt.cache_file = JIEBA_CACHE_NAME
+            break
+
+
+def Document(*args, **kwargs):
+    """python-docx Document（延迟导入）"""
+    return _timed_import('docx').Document(*args, **kwargs)
+
+
+pd = _LazyModule('pandas')
+np = _LazyModule('numpy')
 
 # ==========================================
 # 中文分词支持
 # ==========================================
-try:
-    import jieba
-    jieba.setLogLevel(logging.WARNING)  # 减少jieba日志输出
-    HAS_JIEBA = True
-except ImportError:
-    HAS_JIEBA = False
+HAS_JIEBA = _has_module('jieba')
+jieba = _LazyModule('jieba', on_load=_configure_jieba)
 
 # ==========================================
 # TF-IDF向量匹配支持
 # ==========================================
-try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-    import numpy as np
-    HAS_SKLEARN = True
-except ImportError:
-    HAS_SKLEARN = False
+HAS_SKLEARN = _has_module('sklearn')
+
+# ==========================================
+# 大库检索支持（n-gram 倒排索引）
+# ==========================================
+HAS_RETRIEVAL = _has_module('clause_retrieval')
 
 # ==========================================
 # PDF解析支持
 # ==========================================
-try:
-    import pdfplumber
-    HAS_PDFPLUMBER = True
-except ImportError:
-    HAS_PDFPLUMBER = False
-    try:
-        import PyPDF2
-        HAS_PYPDF2 = True
-    except ImportError:
-        HAS_PYPDF2 = False
+HAS_PDFPLUMBER = _has_module('pdfplumber')
+HAS_PYPDF2 = not HAS_PDFPLUMBER and _has_module('PyPDF2')
+pdfplumber = _LazyModule('pdfplumber')
+PyPDF2 = _LazyModule('PyPDF2')
+# v19.1: 分页并行 + 内容哈希缓存的PDF文本提取
+HAS_PDF_INGEST = _has_module('clause_pdf')
 
 # ==========================================
 # ZIP打包支持
@@ -129,7 +220,11 @@ import shutil
 # ==========================================
 # 日志配置
 # ==========================================
-LOG_DIR = Path(__file__).parent / "logs"
+# PyInstaller 打包时日志放在 exe 同级目录，而非临时解压目录
+if getattr(sys, 'frozen', False):
+    LOG_DIR = Path(sys.executable).parent / "logs"
+else:
+    LOG_DIR = Path(__file__).parent / "logs"
 LOG_DIR.mkdir(exist_ok=True)
 
 logging.basicConfig(
@@ -152,6 +247,61 @@ except ImportError:
     HAS_CONFIG_MANAGER = False
     logger.warning("未找到 clause_config_manager，使用内置配置")
 
+# v19.1: 导入增量比对支持
+try:
+    from clause_rematch import (
+        STATUS_ADDED, STATUS_CHANGED, STATUS_UNCHANGED, STATUS_REMOVED,
+        align_revision, content_hash, library_fingerprint, load_state, normalize_title,
+        save_state, state_path_for
+    )
+    HAS_REMATCH = True
+except ImportError:
+    HAS_REMATCH = False
+
+# v19.1: 导入并行提取支持
+try:
+    from clause_extraction import ParallelExtractor, ExtractionManifest, available_cpus, default_workers
+    HAS_PARALLEL_EXTRACT = True
+except ImportError:
+    HAS_PARALLEL_EXTRACT = False
+
+# v19.1: 导入监控目录模式支持
+try:
+    from clause_watch import FolderWatcher, RetryableError
+    HAS_WATCH = True
+except ImportError:
+    HAS_WATCH = False
+
+# v19.1: 导入条款Word流式生成
+try:
+    from clause_docx_writer import (
+        write_combined_doc, export_documents, safe_filename, unique_filenames
+    )
+    HAS_DOCX_STREAM = True
+except ImportError:
+    HAS_DOCX_STREAM = False
+
+# v19.1: 导入多线程ZIP打包
+try:
+    from clause_zip import write_zip
+    HAS_ZIP_PACK = True
+except ImportError:
+    HAS_ZIP_PACK = False
+
+# v19.1: 导入条款Excel快速读取
+try:
+    from clause_excel_import import XlsxClauseReader, XlsxReadError
+    HAS_FAST_XLSX = True
+except ImportError:
+    HAS_FAST_XLSX = False
+
+# v19.1: 导入常驻 LibreOffice 转换服务
+try:
+    from office_convert import shared_converter
+    HAS_OFFICE_CONVERT = True
+except ImportError:
+    HAS_OFFICE_CONVERT = False
+
 # 导入映射管理器
 try:
     from clause_mapping_manager import ClauseMappingManager, get_mapping_manager
@@ -162,26 +312,26 @@ except ImportError:
     logger.warning("未找到 clause_mapping_manager，映射管理功能不可用")
 
 # ==========================================
-# macOS PyQt5 Plugin Fix
+# PyQt5 Plugin Fix & Windows Console Encoding
 # ==========================================
+if sys.platform == 'win32':
+    try:
+        import ctypes
+        ctypes.windll.kernel32.SetConsoleOutputCP(65001)
+    except Exception:
+        pass
 try:
     import PyQt5
     plugin_path = os.path.join(os.path.dirname(PyQt5.__file__), 'Qt5', 'plugins')
+    if not os.path.exists(plugin_path):
+        plugin_path = os.path.join(os.path.dirname(PyQt5.__file__), 'Qt', 'plugins')
     os.environ['QT_QPA_PLATFORM_PLUGIN_PATH'] = plugin_path
 except ImportError:
     pass
 
-try:
-    from deep_translator import GoogleTranslator
-    HAS_TRANSLATOR = True
-except ImportError:
-    HAS_TRANSLATOR = False
-
-try:
-    from insurance_calculator import MainInsuranceTab, AddonInsuranceTab
-    HAS_INSURANCE_CALC = True
-except ImportError:
-    HAS_INSURANCE_CALC = False
+# v19.1: 翻译与保险计算器均在首次使用时导入
+HAS_TRANSLATOR = _has_module('deep_translator')
+HAS_INSURANCE_CALC = _has_module('insurance_calculator')
 
 import openpyxl
 from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
@@ -192,21 +342,26 @@ from PyQt5.QtWidgets import (
     QFileDialog, QMessageBox, QFrame, QGraphicsDropShadowEffect,
     QDialog, QFormLayout, QListWidget, QListWidgetItem, QCheckBox,
     QTabWidget, QSpinBox, QDoubleSpinBox, QGroupBox, QComboBox,
-    QScrollArea
+    QScrollArea, QListView, QTableView, QHeaderView, QAbstractItemView
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QUrl, QTimer, QPropertyAnimation, QEasingCurve
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal, QUrl, QTimer, QPropertyAnimation, QEasingCurve
 from PyQt5.QtGui import QFont, QColor, QDesktopServices, QTextCursor
 
+# v19.1: 条款列表/文件列表数据模型（Model/View）
+from clause_models import ClauseTableModel, FileListModel
+
 # ==========================================
-# macOS 打包防闪退
+# 打包防闪退 (PyInstaller --windowed 时无控制台)
 # ==========================================
 class NullWriter:
     def write(self, text): pass
     def flush(self): pass
 
 if getattr(sys, 'frozen', False):
-    sys.stdout = NullWriter()
-    sys.stderr = NullWriter()
+    if sys.stdout is None:
+        sys.stdout = NullWriter()
+    if sys.stderr is None:
+        sys.stderr = NullWriter()
 
 def global_exception_handler(exctype, value, tb):
     error_msg = "".join(traceback.format_exception(exctype, value, tb))
@@ -392,7 +547,7 @@ class AnthropicFonts:
     CODE = ("JetBrains Mono", 12)
 
     # 中文回退（Anthropic 字体不含中文）
-    CN_FALLBACK = "PingFang SC"
+    CN_FALLBACK = "Microsoft YaHei" if sys.platform == 'win32' else "PingFang SC"
 
 
 # ==========================================
@@ -405,6 +560,7 @@ class ExcelColumns:
     CLIENT_TRANS = '客户条款(译)'
     CLIENT_CONTENT = '客户原始内容'
     LIMIT_INFO = '约定的限额'  # v18.15: 提取的限额/约定信息
+    CHANGE_STATUS = '变更状态'  # v19.1: 增量比对时标注（新增/修改/未变更/已删除），位于最后一列
 
     # 多结果匹配列 (v17.1)
     # 匹配1
@@ -488,6 +644,7 @@ class LibraryIndex:
     by_keyword: Dict[str, List[int]] = field(default_factory=lambda: defaultdict(list))
     cleaned_cache: Dict[int, Dict[str, str]] = field(default_factory=dict)
     data: List[Dict] = field(default_factory=list)
+    retrieval: Optional[Any] = None  # v19.1: 大库 n-gram 倒排索引（NgramRetrievalIndex）
 
 
 # ==========================================
@@ -1365,6 +1522,9 @@ class ClauseMatcherLogic:
     # 条款标题最大长度
     MAX_TITLE_LENGTH_DEFAULT = 150   # 中文条款标题通常较短
     MAX_TITLE_LENGTH_ENGLISH = 250   # 英文条款标题可能较长，包含完整描述
+    # v19.1: 大库两阶段检索
+    LARGE_LIBRARY_THRESHOLD = 20000  # 条款数达到该值时使用 n-gram 倒排索引代替 TF-IDF
+    RETRIEVAL_TOP_K = 50             # 第一阶段召回的候选数（第二阶段精确重打分）
 
     # ===== v18.5: 预编译正则表达式（性能优化）=====
     _RE_CLAUSE_KEYWORDS = re.compile(r'\b(Clause|Extension|Coverage|Endorsement)\b', re.IGNORECASE)
@@ -1429,9 +1589,74 @@ class ClauseMatcherLogic:
     _RE_PAREN_CONTENT = re.compile(r'[\(（].*?[\)）]')
     _RE_DIGITS_SPACES = re.compile(r'[0-9\s]+')
 
+    # ===== v19.1: 标题/条款行判定使用的关键词表（供参考实现与单遍分类器共用）=====
+    # is_likely_title: 特殊长条款（在长度检查之前识别为标题）
+    _TITLE_SPECIAL_LONG_PATTERNS = (
+        '兹经双方同意，责任免除第七条',  # 除外责任明晰条款
+        '责任免除第七条（七）修改',
+        '责任免除第七条(七)修改',
+        '由于供应水、电、气',  # "三停"损失保险
+        '供应水、电、气及其他能源',
+    )
+    # is_likely_title: 不含"条款"但确实是条款名称的短标题关键词
+    _TITLE_SPECIAL_KEYWORDS = (
+        '合同争议解决', '争议解决', '合同争议',
+        '自动恢复保险金额', '恢复保险金额',
+        '通译和标题', '错误和遗漏', '错误与遗漏',
+        '权益保障', '损失通知', '不受控制',
+        '品牌和商标', '合同价格',
+    )
+    # is_likely_title: 英文特殊条款关键词（无Clause/Extension但确实是条款，不区分大小写）
+    _TITLE_EN_SPECIAL_KEYWORDS = (
+        'Burglary', 'Theft', 'Robbery',  # 盗窃抢劫
+        'Strike', 'Riot', 'Civil Commotion',  # 罢工暴动
+        'Works of Arts', 'Work of Art',  # 艺术品
+        'Cancellation by Insurer', 'Cancellation by Insured',  # 注销条款
+        'Notice of Cancellation',  # 注销通知
+        'Property in the Open',  # 露天财产
+        'Unnamed location', 'Unnamed Location',  # 未指定地点
+        'Miscellaneous',  # 杂项（但不在excluded中时）
+    )
+    # is_likely_title: 英文特殊关键词行的正文开头（小写比较）
+    _TITLE_EN_SPECIAL_CONTENT_STARTS = (
+        'the ', 'this ', 'if ', 'when ', 'where ', 'by ', 'and ', 'or ',
+        'provided ', 'subject ', 'in ', 'for ', 'any ', 'all ', 'such ',
+    )
+    # is_likely_title: 描述性文字（赔偿限额、保险金额等）
+    _TITLE_DESCRIPTIVE_KEYWORDS = (
+        '赔偿限额', '保险金额', '责任限额', '每次事故', '累计赔偿',
+        '免赔额', '自负额', '保险费', '费率', '保险期间',
+    )
+    # is_likely_title: 完整匹配即排除的内容句
+    _TITLE_EXCLUDED_EXACT = (
+        '本扩展条款受下列条件限制',
+        '特约扩展责任',
+    )
+    # is_likely_title: 英文条款关键词行的正文开头词
+    _TITLE_EN_CONTENT_STARTERS = (
+        'Provided ', 'If ', 'Where ', 'When ', 'Unless ', 'Subject to ',
+        'In the event ', 'In respect ', 'For the purpose ', 'Notwithstanding ',
+        'by ', 'and ', 'or ', 'but ', 'that ', 'which ', 'who ', 'whose ',
+    )
+    # _is_valid_clause_line: 明显的正文开头
+    _LINE_CONTENT_STARTS = (
+        '本条款', '本保险', '本附加', '保险人', '被保险人', '投保人',
+        '如果', '若', '当', '在', '对于', '经双方', '兹经', '因履行',
+        '但', '无论', '特别条件', '重置价值是指', '交付日期', '每次事故免赔额',
+        '被保险财产若', '中华人民共和国法律',
+        'The insurer', 'The insured', 'If ', 'When ', 'Where ',
+        'Subject to', 'Provided that', 'It is agreed', 'It is further',
+        'It is hereby', 'It is understood', 'The limit', 'The deductible',
+        'The amount', 'All the terms', 'Any breach', 'Any disputes',
+        'Limit of indemnity', 'Headings have', 'Sedgwick', 'McLarens', 'Charles Taylor',
+    )
+
     # v18.4: 排除词汇缓存（完全匹配时排除，忽略编号和大小写）
     _excluded_titles: Optional[set] = None
 
+    # v19.1: 单遍行分类器（首次使用时构建）
+    _line_classifier: Optional['ClauseLineClassifier'] = None
+
     @classmethod
     def _load_excluded_titles(cls) -> set:
         """加载排除词汇列表"""
@@ -1454,6 +1679,13 @@ class ClauseMatcherLogic:
 
         return cls._excluded_titles
 
+    @classmethod
+    def get_line_classifier(cls) -> 'ClauseLineClassifier':
+        """v19.1: 获取单遍行分类器（与排除词汇列表绑定，首次调用时构建）"""
+        if cls._line_classifier is None:
+            cls._line_classifier = ClauseLineClassifier(cls._load_excluded_titles())
+        return cls._line_classifier
+
     @staticmethod
     def _is_blue_text(run) -> bool:
         """
@@ -1540,6 +1772,15 @@ class ClauseMatcherLogic:
         """
         v18.6: 宽松的条款行验证（用于从表格条款区域提取）
         已经确定在"附加条款/Extension"区域，只需排除明显不是条款的内容
+        v19.1: 由单遍行分类器判定，规则见 _is_valid_clause_line_reference
+        """
+        return ClauseMatcherLogic.get_line_classifier().is_valid_clause_line(text)
+
+    @staticmethod
+    def _is_valid_clause_line_reference(text: str) -> bool:
+        """
+        _is_valid_clause_line 的逐条规则参考实现
+        ClauseLineClassifier 的决策表由此编译而来，一致性校验（--bench-classifier）以此为准
         """
         if not text or len(text) < 3:
             return False
@@ -1560,18 +1801,7 @@ class ClauseMatcherLogic:
             return False
 
         # 排除明显的正文开头
-        content_starts = (
-            '本条款', '本保险', '本附加', '保险人', '被保险人', '投保人',
-            '如果', '若', '当', '在', '对于', '经双方', '兹经', '因履行',
-            '但', '无论', '特别条件', '重置价值是指', '交付日期', '每次事故免赔额',
-            '被保险财产若', '中华人民共和国法律',
-            'The insurer', 'The insured', 'If ', 'When ', 'Where ',
-            'Subject to', 'Provided that', 'It is agreed', 'It is further',
-            'It is hereby', 'It is understood', 'The limit', 'The deductible',
-            'The amount', 'All the terms', 'Any breach', 'Any disputes',
-            'Limit of indemnity', 'Headings have', 'Sedgwick', 'McLarens', 'Charles Taylor',
-        )
-        if text.startswith(content_starts):
+        if text.startswith(ClauseMatcherLogic._LINE_CONTENT_STARTS):
             return False
 
         # v18.7.2: 排除以中文分号结尾的内容（正文句子）
@@ -2085,6 +2315,8 @@ class ClauseMatcherLogic:
             return
 
         try:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+
             # 使用字符n-gram，适合中文
             self._tfidf_vectorizer = TfidfVectorizer(
                 analyzer='char',
@@ -2116,6 +2348,8 @@ class ClauseMatcherLogic:
             else:
                 query_text = query
 
+            from sklearn.metrics.pairwise import cosine_similarity
+
             query_vec = self._tfidf_vectorizer.transform([query_text])
             similarities = cosine_similarity(query_vec, self._tfidf_vectors).flatten()
 
@@ -2214,11 +2448,29 @@ class ClauseMatcherLogic:
         logger.info(f"索引构建完成: {len(index.by_name_norm)} 名称, {len(index.by_keyword)} 关键词")
         self._index = index
 
-        # v17.0: 构建TF-IDF索引
-        self.build_tfidf_index(lib_data)
+        # v19.1: 大库使用 n-gram 倒排索引（TF-IDF 全量余弦在 10 万条以上时过慢）
+        if HAS_RETRIEVAL and len(index.cleaned_cache) >= self.LARGE_LIBRARY_THRESHOLD:
+            from clause_retrieval import NgramRetrievalIndex
+            ids = list(index.cleaned_cache.keys())
+            index.retrieval = NgramRetrievalIndex().build(
+                [index.cleaned_cache[i]['original'] for i in ids], ids=ids)
+            self._tfidf_vectorizer = None
+            self._tfidf_vectors = None
+            self._tfidf_names = []
+        else:
+            # v17.0: 构建TF-IDF索引
+            self.build_tfidf_index(lib_data)
 
         return index
 
+    def adopt_index(self, source: 'ClauseMatcherLogic') -> LibraryIndex:
+        """v19.1: 复用另一实例已构建的索引（含TF-IDF向量），索引只读共享"""
+        self._index = source._index
+        self._tfidf_vectorizer = source._tfidf_vectorizer
+        self._tfidf_vectors = source._tfidf_vectors
+        self._tfidf_names = getattr(source, '_tfidf_names', [])
+        return self._index
+
     @staticmethod
     def _fullwidth_to_halfwidth(text: str) -> str:
         """全角字符转半角"""
@@ -2396,14 +2648,19 @@ class ClauseMatcherLogic:
         # 预计算客户条款内容的清洗结果（避免循环内重复计算）
         c_content_clean = self.clean_content(content) if not is_title_only and content.strip() else ""
 
-        # v17.0: 使用TF-IDF快速筛选候选（如果可用）
         candidate_indices = set()
-        tfidf_candidates = self.find_tfidf_candidates(original_title or title_clean, top_k=30)
-        if tfidf_candidates:
-            candidate_indices = {idx for idx, _ in tfidf_candidates}
+        if index.retrieval is not None:
+            # v19.1: 大库两阶段检索 - 倒排索引召回候选，下方循环即第二阶段精确重打分
+            candidate_indices = {idx for idx, _ in index.retrieval.search(
+                original_title or title_clean, top_k=self.RETRIEVAL_TOP_K)}
         else:
-            # TF-IDF不可用时才回退到全量扫描
-            candidate_indices = set(index.cleaned_cache.keys())
+            # v17.0: 使用TF-IDF快速筛选候选（如果可用）
+            tfidf_candidates = self.find_tfidf_candidates(original_title or title_clean, top_k=30)
+            if tfidf_candidates:
+                candidate_indices = {idx for idx, _ in tfidf_candidates}
+            else:
+                # TF-IDF不可用时才回退到全量扫描
+                candidate_indices = set(index.cleaned_cache.keys())
 
         for i in candidate_indices:
             if i not in index.cleaned_cache:
@@ -2870,6 +3127,78 @@ class ClauseMatcherLogic:
                 content_score=0.0,
             )
 
+    def build_report_row(self, clause: ClauseItem, index: LibraryIndex, idx: int,
+                         is_title_only: bool, mapping_mgr=None) -> Tuple[Dict, MatchResult, Optional[str]]:
+        """
+        v19.1: 匹配单条客户条款并构建报告行（MatchWorker / 监控目录模式共用）
+        返回: (报告行, 主匹配结果, 命中的用户映射名称)
+        """
+        # 翻译
+        original_title = clause.title
+        translated_title, was_translated = self.translate_title(clause.title)
+        if was_translated:
+            clause.title = translated_title
+            clause.original_title = original_title
+
+        # 检查用户自定义映射
+        user_library_name = None
+        if mapping_mgr:
+            # 按原标题或翻译后标题查找
+            user_library_name = mapping_mgr.get_library_name(original_title)
+            if not user_library_name and was_translated:
+                user_library_name = mapping_mgr.get_library_name(translated_title)
+
+        # v17.1: 根据是否有用户映射决定匹配策略
+        # v18.5: 使用 create_user_mapping_result 方法减少重复代码
+        match_results = []
+        if user_library_name:
+            # 有用户映射，只返回映射的那一条
+            lib_entry = self.find_library_entry_by_name(user_library_name, index)
+            mapped_result = self.create_user_mapping_result(lib_entry, user_library_name)
+            match_results = [mapped_result]
+        else:
+            # 无用户映射，使用多结果匹配（最多3条）
+            match_results = self.match_clause_multiple(clause, index, is_title_only, max_results=3)
+
+        primary_match = match_results[0] if match_results else MatchResult()
+
+        # v18.15: 提取限额信息
+        limit_info = ''
+        # 优先从客户条款原名提取
+        _, limit_info = self.extract_limit_info(original_title)
+        # 如果客户条款没有，再从匹配结果提取
+        if not limit_info and match_results and match_results[0].matched_name:
+            _, limit_info = self.extract_limit_info(match_results[0].matched_name)
+
+        # v17.1: 构建多结果行
+        row = {
+            ExcelColumns.SEQ: idx,
+            ExcelColumns.CLIENT_ORIG: original_title,
+            ExcelColumns.CLIENT_TRANS: translated_title if was_translated else "",
+            ExcelColumns.CLIENT_CONTENT: clause.content[:500] if clause.content else "",
+            ExcelColumns.LIMIT_INFO: limit_info,  # v18.15: 约定的限额
+        }
+
+        # 填充最多3条匹配结果
+        for match_num in range(1, 4):
+            if match_num <= len(match_results):
+                mr = match_results[match_num - 1]
+                # v18.15: 显示时去掉限额后缀
+                display_name, _ = self.extract_limit_info(mr.matched_name or "")
+                row[f'匹配{match_num}_条款名称'] = display_name
+                row[f'匹配{match_num}_注册号'] = self.clean_reg_number(mr.matched_reg)
+                row[f'匹配{match_num}_条款内容'] = mr.matched_content[:500] if mr.matched_content else ""
+                row[f'匹配{match_num}_匹配度'] = round(mr.score, 3)
+                row[f'匹配{match_num}_匹配级别'] = mr.match_level.value
+            else:
+                row[f'匹配{match_num}_条款名称'] = ""
+                row[f'匹配{match_num}_注册号'] = ""
+                row[f'匹配{match_num}_条款内容'] = ""
+                row[f'匹配{match_num}_匹配度'] = ""
+                row[f'匹配{match_num}_匹配级别'] = ""
+
+        return row, primary_match, user_library_name
+
     # ========================================
     # 翻译和差异分析
     # ========================================
@@ -2904,6 +3233,7 @@ class ClauseMatcherLogic:
                 return self._translation_cache[title_norm], True
             try:
                 if self._translator_instance is None:
+                    from deep_translator import GoogleTranslator
                     self._translator_instance = GoogleTranslator(source='auto', target='zh-CN')
                 translated = self._translator_instance.translate(title)
                 logger.debug(f"在线翻译: {title} -> {translated}")
@@ -2955,6 +3285,15 @@ class ClauseMatcherLogic:
         判断是否像标题（严格模式）
         只有明确符合标题特征的才返回True
         v17.1: 增强过滤规则
+        v19.1: 由单遍行分类器判定，规则见 _is_likely_title_reference
+        """
+        return cls.get_line_classifier().is_likely_title(text)
+
+    @classmethod
+    def _is_likely_title_reference(cls, text: str) -> bool:
+        """
+        is_likely_title 的逐条规则参考实现
+        ClauseLineClassifier 的决策表由此编译而来，一致性校验（--bench-classifier）以此为准
         """
         if not text or len(text) < 3:
             return False
@@ -2969,14 +3308,7 @@ class ClauseMatcherLogic:
 
         # ===== v18.2: 特殊长条款识别（在长度检查之前）=====
         # 这些是特殊的长文本条款，需要被识别为条款标题
-        special_long_clause_patterns = [
-            '兹经双方同意，责任免除第七条',  # 除外责任明晰条款
-            '责任免除第七条（七）修改',
-            '责任免除第七条(七)修改',
-            '由于供应水、电、气',  # "三停"损失保险
-            '供应水、电、气及其他能源',
-        ]
-        for pattern in special_long_clause_patterns:
+        for pattern in cls._TITLE_SPECIAL_LONG_PATTERNS:
             if pattern in text:
                 return True
 
@@ -2996,35 +3328,16 @@ class ClauseMatcherLogic:
 
         # ===== v18.2: 特殊标题关键词（优先检查）=====
         # 这些短标题虽然不含"条款"但确实是条款名称
-        special_title_keywords = [
-            '合同争议解决', '争议解决', '合同争议',
-            '自动恢复保险金额', '恢复保险金额',
-            '通译和标题', '错误和遗漏', '错误与遗漏',
-            '权益保障', '损失通知', '不受控制',
-            '品牌和商标', '合同价格',
-        ]
-        for kw in special_title_keywords:
+        for kw in cls._TITLE_SPECIAL_KEYWORDS:
             if kw in text:
                 return True
 
         # ===== v18.4: 英文特殊条款关键词（无Clause/Extension但确实是条款）=====
-        english_special_keywords = [
-            'Burglary', 'Theft', 'Robbery',  # 盗窃抢劫
-            'Strike', 'Riot', 'Civil Commotion',  # 罢工暴动
-            'Works of Arts', 'Work of Art',  # 艺术品
-            'Cancellation by Insurer', 'Cancellation by Insured',  # 注销条款
-            'Notice of Cancellation',  # 注销通知
-            'Property in the Open',  # 露天财产
-            'Unnamed location', 'Unnamed Location',  # 未指定地点
-            'Miscellaneous',  # 杂项（但不在excluded中时）
-        ]
         # 检查是否包含英文特殊关键词（需要至少匹配一个）
-        for kw in english_special_keywords:
+        for kw in cls._TITLE_EN_SPECIAL_KEYWORDS:
             if kw.lower() in text.lower():
                 # 额外检查：排除明显是正文的情况
-                content_starts = ('the ', 'this ', 'if ', 'when ', 'where ', 'by ', 'and ', 'or ',
-                                  'provided ', 'subject ', 'in ', 'for ', 'any ', 'all ', 'such ')
-                if text.lower().startswith(content_starts):
+                if text.lower().startswith(cls._TITLE_EN_SPECIAL_CONTENT_STARTS):
                     continue  # 跳过这个关键词，继续检查其他
                 # 额外检查：以小写字母开头的通常是正文
                 if text and text[0].islower():
@@ -3054,17 +3367,11 @@ class ClauseMatcherLogic:
 
         # 2. 排除包含"赔偿限额"、"保险金额"等描述性文字的内容
         # 注意：如果包含"条款"关键词，上面已经返回True，不会到达这里
-        descriptive_keywords = ['赔偿限额', '保险金额', '责任限额', '每次事故', '累计赔偿',
-                                '免赔额', '自负额', '保险费', '费率', '保险期间']
-        if any(kw in text for kw in descriptive_keywords):
+        if any(kw in text for kw in cls._TITLE_DESCRIPTIVE_KEYWORDS):
             return False
 
         # 3. 排除特定的内容句（完整匹配或开头匹配）
-        excluded_exact = [
-            '本扩展条款受下列条件限制',
-            '特约扩展责任',
-        ]
-        if text in excluded_exact:
+        if text in cls._TITLE_EXCLUDED_EXACT:
             return False
 
         # ===== 其他标题模式检查 =====
@@ -3116,12 +3423,7 @@ class ClauseMatcherLogic:
 
             # v18.4 修复6: 排除以正文开头词开始的内容
             # 如 "Provided that...", "If the sum...", "by fire caused..."
-            content_starters = (
-                'Provided ', 'If ', 'Where ', 'When ', 'Unless ', 'Subject to ',
-                'In the event ', 'In respect ', 'For the purpose ', 'Notwithstanding ',
-                'by ', 'and ', 'or ', 'but ', 'that ', 'which ', 'who ', 'whose ',
-            )
-            if text.startswith(content_starters):
+            if text.startswith(cls._TITLE_EN_CONTENT_STARTERS):
                 return False
 
             # v18.4 修复7: 以小写字母开头的通常是正文内容
@@ -3407,6 +3709,18 @@ class ClauseMatcherLogic:
         heading_count = sum(1 for _, is_h in non_empty_lines_with_info if is_h)
         logger.info(f"非空行数: {len(non_empty_lines_with_info)}, Heading行数: {heading_count}")
 
+        return self._split_into_clauses(non_empty_lines_with_info)
+
+    def _split_into_clauses(self, non_empty_lines_with_info: List[Tuple[str, bool]]) -> Tuple[List[ClauseItem], bool]:
+        """
+        v19.1: 按标题识别把行序列分割为条款（parse_docx / parse_pdf 共用）
+
+        Args:
+            non_empty_lines_with_info: [(行文本, 是否Heading样式), ...]
+
+        Returns:
+            (条款列表, 是否为纯标题模式)
+        """
         # 3. 基于标题识别进行分割（不再依赖空行）
         # v18.4: 使用 Heading 样式作为条款标题的强识别信号
         # v18.5: 已映射的条款名称优先识别为标题
@@ -3432,6 +3746,7 @@ class ClauseMatcherLogic:
         clauses = []
         current_title = None
         current_content = []
+        line_classifier = self.get_line_classifier()
 
         for line, is_heading in non_empty_lines_with_info:
             # 判断是否是条款标题：
@@ -3441,14 +3756,11 @@ class ClauseMatcherLogic:
             is_title = self.is_likely_title(line)
 
             # v18.5: 检查是否在排除列表中（用于后续的 Heading/映射识别）
+            # v19.1: 复用 is_likely_title 已提取的行特征
             is_excluded = False
-            if HAS_MAPPING_MANAGER:
-                excluded_titles = ClauseMatcherLogic._load_excluded_titles()
-                if excluded_titles:
-                    line_cleaned_for_exclude = ClauseMatcherLogic._remove_leading_number(line)
-                    if line_cleaned_for_exclude.upper() in excluded_titles:
-                        is_excluded = True
-                        logger.debug(f"排除列表跳过: {line[:50]}")
+            if HAS_MAPPING_MANAGER and line_classifier.is_excluded(line):
+                is_excluded = True
+                logger.debug(f"排除列表跳过: {line[:50]}")
 
             # v18.5: 已映射的条款名称优先识别为标题（但排除列表优先）
             if not is_title and not is_excluded and mapped_client_names:
@@ -3503,6 +3815,43 @@ class ClauseMatcherLogic:
 
         return clauses, is_title_only
 
+    def parse_pdf(self, pdf_path: str) -> Tuple[List[ClauseItem], bool]:
+        """
+        v19.1: 解析PDF文档（按行识别标题，PDF无样式信息）
+
+        Returns:
+            (条款列表, 是否为纯标题模式)
+        """
+        logger.info(f"解析PDF: {pdf_path}")
+        lines = []
+        try:
+            if HAS_PDF_INGEST:
+                from clause_pdf import extract_pdf_lines
+                lines = extract_pdf_lines(pdf_path)
+            elif HAS_PDFPLUMBER:
+                with pdfplumber.open(pdf_path) as pdf:
+                    for page in pdf.pages:
+                        lines.extend((page.extract_text() or '').split('\n'))
+            elif HAS_PYPDF2:
+                with open(pdf_path, 'rb') as f:
+                    for page in PyPDF2.PdfReader(f).pages:
+                        lines.extend((page.extract_text() or '').split('\n'))
+            else:
+                raise ImportError("未安装PDF解析库 (pdfplumber 或 PyPDF2)")
+        except ImportError:
+            raise
+        except Exception as e:
+            logger.error(f"PDF打开失败: {e}")
+            raise ValueError(f"无法打开PDF: {e}")
+
+        return self._split_into_clauses([(line.strip(), False) for line in lines if line.strip()])
+
+    def parse_document(self, doc_path: str, precise_mode: bool = False) -> Tuple[List[ClauseItem], bool]:
+        """v19.1: 按扩展名解析 .docx / .pdf 客户文档"""
+        if Path(doc_path).suffix.lower() == '.pdf':
+            return self.parse_pdf(doc_path)
+        return self.parse_docx(doc_path, precise_mode=precise_mode)
+
     def _parse_docx_precise_mode(self, doc) -> Tuple[List[ClauseItem], bool]:
         """
         v18.9: 精准识别模式 - 只提取蓝色字体的文字作为条款
@@ -3561,6 +3910,355 @@ class ClauseMatcherLogic:
         return clauses, True
 
 
+# ==========================================
+# 单遍条款行分类器 (v19.1)
+# ==========================================
+class ClauseLineClassifier:
+    """
+    v19.1: 单遍条款行分类器
+    将 is_likely_title / _is_valid_clause_line 的规则级联编译为：
+    1. 特征提取：一次遍历取出该规则集用到的全部特征，得到一个整数位掩码
+       - 行首特征由一个锚定正则的多个可选前瞻分组一次匹配得出
+       - 关键词表用子串查找，行内正则先用必要子串预判，仅在可能命中时执行
+    2. 决策表：按原规则顺序排列的 (必须具备, 必须不具备, 结果) 行，首个命中行给出结论
+    同一位掩码的结论只计算一次，同一文本的特征按 LRU 缓存
+    规则与关键词表来自 ClauseMatcherLogic，一致性由 --bench-classifier 对照参考实现校验
+    """
+
+    # ===== 特征位 =====
+    # 长度
+    F_SHORT = 1 << 0                  # 空或长度 < 3
+    F_LEN_GT_5 = 1 << 1
+    F_LEN_GT_30 = 1 << 2
+    F_LEN_GT_50 = 1 << 3
+    F_LEN_GT_80 = 1 << 4
+    F_LEN_GT_150 = 1 << 5             # > MAX_TITLE_LENGTH_DEFAULT
+    F_LEN_GT_200 = 1 << 6
+    F_LEN_GT_250 = 1 << 7             # > MAX_TITLE_LENGTH_ENGLISH
+    F_LEN_GT_300 = 1 << 8
+    # 结尾
+    F_END_TITLE_PUNCT = 1 << 9        # 。；.;，,
+    F_END_CN_STOP = 1 << 10           # 。；
+    F_END_CN_SEMI = 1 << 11           # ；
+    F_END_DOT = 1 << 12               # .
+    F_END_COLON = 1 << 13             # ：:
+    F_RSTRIP_COLON = 1 << 14          # 去尾部空白后以 : 结尾
+    # 大小写
+    F_FIRST_LOWER = 1 << 15           # 首字符为小写字母
+    F_IS_UPPER = 1 << 16              # str.isupper()
+    F_UPPER3 = 1 << 17                # isupper 且含连续3个以上大写字母
+    # 行首
+    F_BEN_TIAOKUAN = 1 << 18          # 本条款/本扩展条款/本附加条款
+    F_BEN_FUJIA = 1 << 19             # 本附加/在附加
+    F_EN_SPECIAL_CONTENT = 1 << 20    # 英文特殊关键词行的正文开头（小写比较）
+    F_EN_CONTENT = 1 << 21            # 英文条款行的正文开头词
+    F_ALL_THE_TERMS = 1 << 22
+    F_LINE_CONTENT = 1 << 23          # 条款区域行的正文开头
+    F_NUMBERED_TITLE = 1 << 24        # 带编号且编号后为条款名称
+    F_EN_SUBITEM = 1 << 25            # (1) (a) a) i. 1.REINSTATEMENT 1. The ...
+    F_CONTENT_START = 1 << 26         # _RE_CONTENT_START
+    F_PURE_NUMBER = 1 << 27
+    F_CURRENCY_NUM = 1 << 28
+    F_CN_SUBITEM = 1 << 29            # （一） ① 1、
+    F_LINE_SUBITEM = 1 << 30          # 1. a / (a) x / 1) a / 1.1 / (a) The said
+    # 行内关键词
+    F_SPECIAL_LONG = 1 << 31
+    F_SPECIAL_TITLE = 1 << 32
+    F_EN_SPECIAL = 1 << 33
+    F_DESCRIPTIVE = 1 << 34
+    F_TIAOKUAN = 1 << 35              # 条款
+    F_FUJIA = 1 << 36                 # 附加
+    F_BAOXIAN = 1 << 37               # 保险
+    F_COMPANY = 1 << 38               # Ltd / Co. / 有限公司
+    F_CLAUSE_CI = 1 << 39             # clause（不区分大小写）
+    F_EXTENSION_CI = 1 << 40          # extension（不区分大小写）
+    F_EXCLUDED_EXACT = 1 << 41
+    F_EXCLUDED = 1 << 42              # 去编号后命中排除词汇列表
+    # 行内正则
+    F_CLAUSE_KW = 1 << 43             # _RE_CLAUSE_KEYWORDS
+    F_CLAUSE_KW_LINE = 1 << 44        # _RE_CLAUSE_KW_LINE
+    F_EN_CLAUSE_KW = 1 << 45          # _RE_EN_CLAUSE_KW
+    F_INSURANCE_CO = 1 << 46
+    F_THIS_CLAUSE = 1 << 47
+    F_MONEY = 1 << 48
+    F_YEAR_VERSION = 1 << 49
+
+    # ===== 决策表：(必须具备, 必须不具备, 结果)，顺序即 is_likely_title 的规则顺序，未命中为 False =====
+    TITLE_RULES = (
+        (F_SHORT, 0, False),
+        (F_EXCLUDED, 0, False),                                     # v18.4 排除词汇
+        (F_SPECIAL_LONG, 0, True),                                  # v18.2 特殊长条款
+        (F_LEN_GT_250, 0, False),                                   # 太长的不是标题
+        (F_LEN_GT_150, F_CLAUSE_KW, False),
+        (F_END_TITLE_PUNCT, F_CLAUSE_KW, False),                    # 句号等结尾
+        (F_SPECIAL_TITLE, 0, True),                                 # v18.2 特殊标题关键词
+        (F_EN_SPECIAL, F_EN_SPECIAL_CONTENT | F_FIRST_LOWER, True),  # v18.4 英文特殊条款
+        (F_TIAOKUAN | F_BEN_TIAOKUAN, 0, False),                    # "本条款..."内容句
+        (F_TIAOKUAN, 0, True),                                      # 含"条款"
+        (F_FUJIA | F_BAOXIAN, F_BEN_FUJIA, True),                   # 附加...保险
+        (F_MONEY, 0, False),
+        (F_DESCRIPTIVE, 0, False),
+        (F_EXCLUDED_EXACT, 0, False),
+        (F_NUMBERED_TITLE, 0, True),
+        (F_FUJIA | F_BAOXIAN | F_YEAR_VERSION, 0, True),            # (XXXX版) 结尾
+        (F_EN_CLAUSE_KW | F_INSURANCE_CO, 0, False),                # v18.3/18.4 英文条款关键词
+        (F_EN_CLAUSE_KW | F_THIS_CLAUSE, 0, False),
+        (F_EN_CLAUSE_KW | F_EN_SUBITEM, 0, False),
+        (F_EN_CLAUSE_KW | F_EN_CONTENT, 0, False),
+        (F_EN_CLAUSE_KW | F_FIRST_LOWER, 0, False),
+        (F_EN_CLAUSE_KW | F_IS_UPPER | F_RSTRIP_COLON, 0, False),
+        (F_EN_CLAUSE_KW, F_ALL_THE_TERMS, True),
+        (F_CONTENT_START, 0, False),                                # 明确是内容
+        (F_UPPER3 | F_LEN_GT_5, F_RSTRIP_COLON, True),              # 全大写英文
+    )
+
+    # ===== 决策表：顺序即 _is_valid_clause_line 的规则顺序，未命中为 True =====
+    LINE_RULES = (
+        (F_SHORT, 0, False),
+        (F_LEN_GT_300, 0, False),
+        (F_LEN_GT_200, F_CLAUSE_KW_LINE, False),
+        (F_END_CN_STOP | F_LEN_GT_50, 0, False),
+        (F_FIRST_LOWER | F_LEN_GT_30, 0, False),
+        (F_LINE_CONTENT, 0, False),
+        (F_END_CN_SEMI, 0, False),
+        (F_END_DOT | F_LEN_GT_80, 0, False),
+        (F_END_COLON, 0, False),
+        (F_PURE_NUMBER, 0, False),
+        (F_CURRENCY_NUM, 0, False),
+        (F_CN_SUBITEM, F_TIAOKUAN | F_CLAUSE_CI | F_EXTENSION_CI, False),
+        (F_LINE_SUBITEM, 0, False),
+        (F_COMPANY, F_TIAOKUAN | F_CLAUSE_CI, False),
+    )
+
+    _TITLE_NUMBER_KEYWORDS = ('险', '条款', '责任', '扩展', '附加')
+    FEATURE_CACHE_SIZE = 20000
+
+    def __init__(self, excluded_titles: Optional[Set[str]] = None):
+        rules = ClauseMatcherLogic
+        self._excluded_titles = excluded_titles or set()
+
+        def src(rx) -> str:
+            return f'(?i:{rx.pattern})' if rx.flags & re.IGNORECASE else rx.pattern
+
+        def any_of(*rxs) -> str:
+            return '|'.join(src(rx) for rx in rxs)
+
+        def prefix_matcher(groups):
+            """行首特征：每个特征一个可选前瞻分组，一次 match 取出全部"""
+            rx = re.compile(''.join(f'(?:(?=(?P<{name}>{pattern}))|)' for name, pattern, _ in groups))
+            return rx, tuple((rx.groupindex[name], bit) for name, _, bit in groups if bit)
+
+        self._re_title_prefix, self._title_prefix_bits = prefix_matcher((
+            ('numbered', src(rules._RE_NUMBERED_TITLE), 0),
+            ('en_subitem', any_of(rules._RE_PARENTHESIS_NUMBER, rules._RE_PARENTHESIS_LETTER,
+                                  rules._RE_LETTER_PAREN, rules._RE_ROMAN_NUMBER,
+                                  rules._RE_SUB_NUMBER, rules._RE_CONTENT_STARTER), self.F_EN_SUBITEM),
+            ('content_start', src(rules._RE_CONTENT_START), self.F_CONTENT_START),
+        ))
+        self._numbered_group = self._re_title_prefix.groupindex['numbered']
+        self._re_line_prefix, self._line_prefix_bits = prefix_matcher((
+            ('pure_number', src(rules._RE_PURE_NUMBER), self.F_PURE_NUMBER),
+            ('currency_num', src(rules._RE_CURRENCY_NUM), self.F_CURRENCY_NUM),
+            ('cn_subitem', any_of(rules._RE_CN_SUBITEM, rules._RE_CIRCLE_NUM,
+                                  rules._RE_NUM_COMMA), self.F_CN_SUBITEM),
+            ('line_subitem', any_of(rules._RE_NUM_DOT_LC, rules._RE_PAREN_LC, rules._RE_NUM_PAREN_LC,
+                                    rules._RE_NUM_DOT_NUM, rules._RE_PAREN_SAID), self.F_LINE_SUBITEM),
+        ))
+
+        # 去编号（与 _remove_leading_number 的四次替换等价的单次匹配）
+        self._re_leading_number = re.compile('^' + ''.join(
+            f'(?:{rx.pattern.lstrip("^")})?' for rx in (
+                rules._RE_LEADING_CN_NUM, rules._RE_LEADING_CN_SEQ,
+                rules._RE_LEADING_DIGIT_SEQ, rules._RE_LEADING_LETTER)
+        ))
+
+        # 行内关键词：(关键词, 特征位)，_lower 表在小写文本中查找
+        title_keywords = [(kw, self.F_SPECIAL_LONG) for kw in rules._TITLE_SPECIAL_LONG_PATTERNS]
+        title_keywords += [(kw, self.F_SPECIAL_TITLE) for kw in rules._TITLE_SPECIAL_KEYWORDS]
+        title_keywords += [(kw, self.F_DESCRIPTIVE) for kw in rules._TITLE_DESCRIPTIVE_KEYWORDS]
+        title_keywords += [('条款', self.F_TIAOKUAN), ('附加', self.F_FUJIA), ('保险', self.F_BAOXIAN)]
+        self._title_keywords = tuple(title_keywords)
+        self._title_keywords_lower = tuple(dict.fromkeys(
+            (kw.lower(), self.F_EN_SPECIAL) for kw in rules._TITLE_EN_SPECIAL_KEYWORDS))
+        self._line_keywords = (('条款', self.F_TIAOKUAN), ('Ltd', self.F_COMPANY),
+                               ('Co.', self.F_COMPANY), ('有限公司', self.F_COMPANY))
+        self._line_keywords_lower = (('clause', self.F_CLAUSE_CI), ('extension', self.F_EXTENSION_CI))
+
+        # 行内正则：(必要子串, 正则, 特征位)，任一必要子串出现在小写文本中才执行正则
+        # 忽略大小写匹配时只有 i/s/k 存在非ASCII折叠（İ ı ſ K），必要子串均避开这三个字母
+        self._title_searches = (
+            (('clau', 'xten', 'overag', 'ndor'), rules._RE_CLAUSE_KEYWORDS, self.F_CLAUSE_KW),
+            (('clau', 'xten', 'cover', 'ndor', 'urance'), rules._RE_EN_CLAUSE_KW, self.F_EN_CLAUSE_KW),
+            (('urance',), rules._RE_INSURANCE_CO, self.F_INSURANCE_CO),
+            (('clau', 'xten', 'pol', 'urance', 'cover', 'ndor'), rules._RE_THIS_CLAUSE, self.F_THIS_CLAUSE),
+            (('元', '万', '亿'), rules._RE_MONEY_PATTERN, self.F_MONEY),
+            (('(', '（'), rules._RE_YEAR_VERSION, self.F_YEAR_VERSION),
+        )
+        self._line_searches = (
+            (('clau', 'xten', 'cover', 'ndor', 'urance', '条款'), rules._RE_CLAUSE_KW_LINE,
+             self.F_CLAUSE_KW_LINE),
+        )
+        self._re_upper3 = rules._RE_UPPER_3PLUS
+
+        self._title_starts_ben = ('本条款', '本扩展条款', '本附加条款')
+        self._title_starts_fujia = ('本附加', '在附加')
+        self._en_special_content = rules._TITLE_EN_SPECIAL_CONTENT_STARTS
+        self._en_content = rules._TITLE_EN_CONTENT_STARTERS
+        self._line_content = rules._LINE_CONTENT_STARTS
+        self._excluded_exact = frozenset(rules._TITLE_EXCLUDED_EXACT)
+
+        self._title_decisions: Dict[int, bool] = {}
+        self._line_decisions: Dict[int, bool] = {}
+        self.title_features = lru_cache(maxsize=self.FEATURE_CACHE_SIZE)(self._extract_title_features)
+        self.line_features = lru_cache(maxsize=self.FEATURE_CACHE_SIZE)(self._extract_line_features)
+
+    @staticmethod
+    def _scan(text: str, lower: str, keywords: tuple, keywords_lower: tuple, searches: tuple) -> int:
+        """行内关键词与带预判的行内正则"""
+        f = 0
+        for kw, bit in keywords:
+            if kw in text:
+                f |= bit
+        for kw, bit in keywords_lower:
+            if kw in lower:
+                f |= bit
+        for guards, rx, bit in searches:
+            for guard in guards:
+                if guard in lower:
+                    if rx.search(text):
+                        f |= bit
+                    break
+        return f
+
+    def _extract_title_features(self, text: str) -> int:
+        """提取 TITLE_RULES 用到的全部特征"""
+        f = 0
+        # 排除词汇（短行也需要给出，供 parse_docx 的映射/Heading 识别使用）
+        if self._excluded_titles:
+            cleaned = self._re_leading_number.sub('', text.strip(), count=1).strip()
+            if cleaned.upper() in self._excluded_titles:
+                f |= self.F_EXCLUDED
+
+        n = len(text)
+        if n < 3:
+            return f | self.F_SHORT
+        if n > 5:
+            f |= self.F_LEN_GT_5
+            if n > 150:
+                f |= self.F_LEN_GT_150
+                if n > 250:
+                    f |= self.F_LEN_GT_250
+
+        if text[-1] in '。；.;，,':
+            f |= self.F_END_TITLE_PUNCT
+        if text[0].islower():
+            f |= self.F_FIRST_LOWER
+        if text.isupper():
+            f |= self.F_IS_UPPER
+            if text.rstrip().endswith(':'):
+                f |= self.F_RSTRIP_COLON
+            if self._re_upper3.search(text):
+                f |= self.F_UPPER3
+
+        lower = text.lower()
+        if text.startswith(self._title_starts_ben):
+            f |= self.F_BEN_TIAOKUAN
+        if text.startswith(self._title_starts_fujia):
+            f |= self.F_BEN_FUJIA
+        if lower.startswith(self._en_special_content):
+            f |= self.F_EN_SPECIAL_CONTENT
+        if text.startswith(self._en_content):
+            f |= self.F_EN_CONTENT
+        if text.startswith('All the terms'):
+            f |= self.F_ALL_THE_TERMS
+        if text in self._excluded_exact:
+            f |= self.F_EXCLUDED_EXACT
+
+        m = self._re_title_prefix.match(text)
+        for group, bit in self._title_prefix_bits:
+            if m.start(group) >= 0:
+                f |= bit
+        numbered_end = m.end(self._numbered_group)
+        if numbered_end >= 0:
+            title_part = text[numbered_end:].strip()
+            if (len(title_part) > 3 and not title_part.endswith(('。', '；', '，'))
+                    and any(kw in title_part for kw in self._TITLE_NUMBER_KEYWORDS)):
+                f |= self.F_NUMBERED_TITLE
+
+        return f | self._scan(text, lower, self._title_keywords, self._title_keywords_lower,
+                              self._title_searches)
+
+    def _extract_line_features(self, text: str) -> int:
+        """提取 LINE_RULES 用到的全部特征"""
+        n = len(text)
+        if n < 3:
+            return self.F_SHORT
+        f = 0
+        if n > 30:
+            f |= self.F_LEN_GT_30
+            if n > 50:
+                f |= self.F_LEN_GT_50
+                if n > 80:
+                    f |= self.F_LEN_GT_80
+                    if n > 200:
+                        f |= self.F_LEN_GT_200
+                        if n > 300:
+                            f |= self.F_LEN_GT_300
+
+        last = text[-1]
+        if last in '。；':
+            f |= self.F_END_CN_STOP
+            if last == '；':
+                f |= self.F_END_CN_SEMI
+        elif last == '.':
+            f |= self.F_END_DOT
+        elif last in '：:':
+            f |= self.F_END_COLON
+        if text[0].islower():
+            f |= self.F_FIRST_LOWER
+        if text.startswith(self._line_content):
+            f |= self.F_LINE_CONTENT
+
+        m = self._re_line_prefix.match(text)
+        for group, bit in self._line_prefix_bits:
+            if m.start(group) >= 0:
+                f |= bit
+
+        return f | self._scan(text, text.lower(), self._line_keywords, self._line_keywords_lower,
+                              self._line_searches)
+
+    @staticmethod
+    def _decide(rules: tuple, features: int, default: bool) -> bool:
+        for required, forbidden, result in rules:
+            if features & required == required and not features & forbidden:
+                return result
+        return default
+
+    def is_likely_title(self, text: str) -> bool:
+        if not text:
+            return False
+        features = self.title_features(text)
+        decision = self._title_decisions.get(features)
+        if decision is None:
+            decision = self._decide(self.TITLE_RULES, features, False)
+            self._title_decisions[features] = decision
+        return decision
+
+    def is_valid_clause_line(self, text: str) -> bool:
+        if not text:
+            return False
+        features = self.line_features(text)
+        decision = self._line_decisions.get(features)
+        if decision is None:
+            decision = self._decide(self.LINE_RULES, features, True)
+            self._line_decisions[features] = decision
+        return decision
+
+    def is_excluded(self, text: str) -> bool:
+        """去编号后是否命中排除词汇列表（与 is_likely_title 共用同一次特征提取）"""
+        return bool(text) and bool(self.title_features(text) & self.F_EXCLUDED)
+
+
 # ==========================================
 # 条款库加载器
 # ==========================================
@@ -3703,6 +4401,199 @@ class LibraryLoader:
         logger.info(f"加载完成: {len(lib_data)} 条有效记录")
         return lib_data
 
+    @staticmethod
+    def get_clause_names(excel_path: str) -> List[str]:
+        """
+        v19.1: 读取所有Sheet首列的条款名称（映射对话框下拉提示用）
+        保持首次出现顺序去重，不限制数量
+        """
+        names: Dict[str, None] = {}
+        wb = openpyxl.load_workbook(excel_path, read_only=True)
+        try:
+            for sheet in wb.sheetnames:
+                for row in wb[sheet].iter_rows(max_col=1, values_only=True):
+                    if row and row[0] and isinstance(row[0], str):
+                        name = row[0].strip()
+                        if len(name) > 3:
+                            names.setdefault(name, None)
+        finally:
+            wb.close()
+        return list(names)
+
+
+# ==========================================
+# v19.1: 条款库索引服务（会话内共享）
+# ==========================================
+@dataclass
+class LibrarySnapshot:
+    """已加载并建好索引的条款库（只读，供查询对话框/映射对话框/匹配线程共享）"""
+    key: Tuple[str, str, int, int]  # (路径, Sheet, 文件大小, 修改时间)
+    excel_path: str
+    sheet_name: Optional[str]
+    index: LibraryIndex
+    logic: 'ClauseMatcherLogic'     # 构建索引的实例，持有对应的TF-IDF向量
+    clause_names: List[str]         # 所有Sheet的条款名称（去重）
+    load_seconds: float = 0.0
+
+
+class LibraryIndexService(QObject):
+    """
+    条款库索引服务
+
+    - 条款库路径或Sheet变化时由界面调用 request() 在后台线程加载并建索引
+    - 查询对话框、映射对话框通过 ready 信号拿到结果，界面不再卡顿
+    - 匹配线程调用 get()：已就绪直接复用；正在加载则等待同一次加载完成
+    - 按 (路径, Sheet, 大小, 修改时间) 缓存最近几个条款库，文件更新后自动失效
+    """
+    progress = pyqtSignal(str, int)    # 阶段说明, 百分比
+    ready = pyqtSignal(object)         # LibrarySnapshot
+    failed = pyqtSignal(str, str)      # 条款库路径, 错误信息
+
+    MAX_CACHED = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cond = threading.Condition()
+        self._snapshots: Dict[Tuple, LibrarySnapshot] = {}  # 按最近使用排序
+        self._loading: set = set()
+
+    @staticmethod
+    def library_key(excel_path: str, sheet_name: Optional[str]) -> Tuple[str, str, int, int]:
+        stat = os.stat(excel_path)
+        return (os.path.abspath(excel_path), sheet_name or '', stat.st_size, stat.st_mtime_ns)
+
+    def snapshot_for(self, excel_path: str, sheet_name: Optional[str]) -> Optional[LibrarySnapshot]:
+        """已就绪的条款库，未加载或文件已更新时返回 None"""
+        try:
+            key = self.library_key(excel_path, sheet_name)
+        except OSError:
+            return None
+        with self._cond:
+            return self._snapshots.get(key)
+
+    def request(self, excel_path: str, sheet_name: Optional[str]) -> Optional[LibrarySnapshot]:
+        """
+        请求条款库：已就绪时直接返回；否则在后台线程加载，完成后发出 ready 信号
+        """
+        try:
+            key = self.library_key(excel_path, sheet_name)
+        except OSError:
+            return None
+        with self._cond:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None or key in self._loading:
+                return snapshot
+        threading.Thread(target=self._load_quietly, args=(excel_path, sheet_name),
+                         name='library-index', daemon=True).start()
+        return None
+
+    def _load_quietly(self, excel_path: str, sheet_name: Optional[str]):
+        try:
+            self.get(excel_path, sheet_name)
+        except Exception as e:
+            logger.warning(f"后台加载条款库失败: {e}")
+
+    def get(self, excel_path: str, sheet_name: Optional[str],
+            log_fn: Callable[[str, str], None] = None) -> LibrarySnapshot:
+        """
+        获取条款库（阻塞，供工作线程调用）
+
+        Raises:
+            ValueError: 条款库读取失败
+        """
+        try:
+            key = self.library_key(excel_path, sheet_name)
+        except OSError:
+            raise ValueError(f"文件不存在: {excel_path}")
+
+        with self._cond:
+            while key in self._loading:
+                self._cond.wait()
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None:
+                # 移到最近使用
+                self._snapshots[key] = self._snapshots.pop(key)
+                if log_fn:
+                    log_fn(f"♻️ 复用已加载的条款库 {len(snapshot.index.data)} 条", "success")
+                return snapshot
+            self._loading.add(key)
+
+        try:
+            snapshot = self._build(key, excel_path, sheet_name, log_fn)
+        except Exception as e:
+            with self._cond:
+                self._loading.discard(key)
+                self._cond.notify_all()
+            self.failed.emit(excel_path, str(e))
+            raise
+
+        with self._cond:
+            self._loading.discard(key)
+            # 同一文件的旧版本不再需要
+            for old in [k for k in self._snapshots if k[:2] == key[:2]]:
+                del self._snapshots[old]
+            self._snapshots[key] = snapshot
+            while len(self._snapshots) > self.MAX_CACHED:
+                del self._snapshots[next(iter(self._snapshots))]
+            self._cond.notify_all()
+        self.ready.emit(snapshot)
+        return snapshot
+
+    def _build(self, key, excel_path: str, sheet_name: Optional[str],
+               log_fn: Callable[[str, str], None] = None) -> LibrarySnapshot:
+        start = time.perf_counter()
+        sheet_info = f" [{sheet_name}]" if sheet_name else ""
+
+        self.progress.emit(f"读取条款库{sheet_info}", 10)
+        if log_fn:
+            log_fn(f"📚 加载条款库{sheet_info}...", "info")
+        lib_data = LibraryLoader.load_excel(excel_path, sheet_name=sheet_name)
+        if log_fn:
+            log_fn(f"✓ 条款库 {len(lib_data)} 条", "success")
+
+        self.progress.emit(f"构建索引（{len(lib_data)} 条）", 50)
+        if log_fn:
+            log_fn("🔧 构建索引...", "info")
+        logic = ClauseMatcherLogic()
+        index = logic.build_index(lib_data)
+
+        self.progress.emit("整理条款名称", 90)
+        try:
+            clause_names = LibraryLoader.get_clause_names(excel_path)
+        except Exception as e:
+            logger.warning(f"读取条款名称失败: {e}")
+            clause_names = list(dict.fromkeys(
+                str(lib.get('条款名称', '')).strip() for lib in lib_data if str(lib.get('条款名称', '')).strip()))
+
+        elapsed = time.perf_counter() - start
+        self.progress.emit(f"条款库已就绪（{len(lib_data)} 条）", 100)
+        logger.info(f"条款库索引服务: {excel_path}{sheet_info} 加载完成 {len(lib_data)} 条, {elapsed:.2f}s")
+        return LibrarySnapshot(key=key, excel_path=excel_path, sheet_name=sheet_name, index=index,
+                               logic=logic, clause_names=clause_names, load_seconds=elapsed)
+
+
+def load_library_index(logic: 'ClauseMatcherLogic', excel_path: str, sheet_name: Optional[str],
+                       log_fn: Callable[[str, str], None],
+                       library_service: LibraryIndexService = None) -> LibraryIndex:
+    """v19.1: 匹配线程加载条款库索引 - 有会话服务时复用/等待共享索引，否则现场加载"""
+    if library_service is not None:
+        snapshot = library_service.get(excel_path, sheet_name, log_fn=log_fn)
+        index = logic.adopt_index(snapshot.logic)
+    else:
+        sheet_info = f" [{sheet_name}]" if sheet_name else ""
+        log_fn(f"📚 加载条款库{sheet_info}...", "info")
+        lib_data = LibraryLoader.load_excel(excel_path, sheet_name=sheet_name)
+        log_fn(f"✓ 条款库 {len(lib_data)} 条", "success")
+
+        log_fn("🔧 构建索引...", "info")
+        index = logic.build_index(lib_data)
+
+    # v19.0: 设置险种上下文
+    logic._current_category = logic.detect_category_from_sheet(sheet_name)
+    if logic._current_category:
+        log_fn(f"🏷️ 检测到险种类别: {logic._current_category}", "info")
+    return index
+
 
 # ==========================================
 # Excel样式器
@@ -3736,8 +4627,13 @@ class ExcelStyler:
         'K': 40, 'L': 25, 'M': 50, 'N': 10, 'O': 12,
         # 匹配3
         'P': 40, 'Q': 25, 'R': 50, 'S': 10, 'T': 12,
+        # v19.1: 变更状态（仅增量比对报告）
+        'U': 10,
     }
 
+    # v19.1: 变更状态着色
+    CHANGE_FILLS = {'新增': 'green', '修改': 'yellow', '已删除': 'red'}
+
     # v18.15: 内容列索引（需要处理富文本的列）
     # D=4=客户原始内容, H=8=匹配1内容, M=13=匹配2内容, R=18=匹配3内容
     CONTENT_COLS = {4, 8, 13, 18}
@@ -3826,6 +4722,8 @@ class ExcelStyler:
         # 匹配3: S(19)=匹配度, T(20)=级别
         score_cols = {9, 14, 19}  # 匹配度列索引
         level_cols = {10, 15, 20}  # 匹配级别列索引
+        # v19.1: 变更状态列（增量比对报告才有）
+        change_col = next((c.col_idx for c in ws[1] if c.value == ExcelColumns.CHANGE_STATUS), None)
 
         for row in ws.iter_rows(min_row=2):
             for cell in row:
@@ -3855,6 +4753,9 @@ class ExcelStyler:
                     elif "关键词" in val:
                         cell.fill = cls.FILLS['yellow']
 
+                if cell.col_idx == change_col and cell.value in cls.CHANGE_FILLS:
+                    cell.fill = cls.FILLS[cls.CHANGE_FILLS[cell.value]]
+
                 # v18.15: 内容列转换为富文本（保留加粗格式）
                 if cell.col_idx in cls.CONTENT_COLS and cell.value:
                     rich_value = cls._convert_to_rich_text(cell.value)
@@ -3868,6 +4769,14 @@ class ExcelStyler:
             wb.save(output_path)
         logger.info(f"Excel样式已应用: {output_path}")
 
+    @classmethod
+    def save_report(cls, results: List[Dict], output_path: str):
+        """v19.1: 写出比对报告（单次写入：pandas写数据 + openpyxl样式 → 一次save）"""
+        df_res = pd.DataFrame(results)
+        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+            df_res.to_excel(writer, index=False)
+            cls.apply_styles(output_path, wb=writer.book)
+
 
 # ==========================================
 # 工作线程
@@ -3879,68 +4788,295 @@ class ExtractionWorker(QThread):
     result_signal = pyqtSignal(dict)
     finished_signal = pyqtSignal(int, int)  # (success_count, category_count)
 
-    def __init__(self, files: list, extract_fn):
+    def __init__(self, files: list, extract_fn, max_workers: int = 1, manifest=None):
+        """
+        extract_fn: 文件路径 -> 结果列表；多进程时必须是模块级函数（见 extract_clause_file）
+        max_workers: v19.1 并行提取进程数，1 为顺序提取
+        manifest: v19.1 文件夹提取清单（ExtractionManifest），未变更的文件直接复用上次结果
+        """
         super().__init__()
         self.files = files
         self.extract_fn = extract_fn
+        self.max_workers = max_workers
+        self.manifest = manifest
 
     def run(self):
         categories = set()
         success_count = 0
-        self.log_signal.emit(f"🚀 开始处理 {len(self.files)} 个文件...", "info")
+        completed = 0
+        total = len(self.files)
+        parallel = HAS_PARALLEL_EXTRACT and self.max_workers > 1
+
+        # v19.1: 增量提取 - 未变更的文件直接复用清单中的结果
+        files = self.files
+        reuse = {}
+        if self.manifest is not None:
+            reuse, files, delta = self.manifest.plan(self.files)
+            self.log_signal.emit(
+                f"🔁 增量提取: 新增 {delta['added']}, 修改 {delta['changed']}, "
+                f"未变更 {delta['unchanged']}（复用上次结果）, 已删除 {delta['removed']}", "info")
+
+        worker_info = f"（{self.max_workers} 个进程并行）" if parallel and files else ""
+        self.log_signal.emit(f"🚀 开始处理 {len(files)} 个文件{worker_info}...", "info")
+
+        # v19.1: 结果按完成顺序返回
+        def on_result(fp, results, error, cached=False):
+            nonlocal success_count, completed
+            completed += 1
+            self.progress_signal.emit(int(completed / total * 100))
+            if error is not None:
+                fname = os.path.basename(fp)
+                self.log_signal.emit(f"✗ {fname}: {sanitize_error_message(error)}", "error")
+                return
+            if self.manifest is not None and not cached:
+                self.manifest.record(fp, results)
+            for result in results:
+                self.result_signal.emit(result)
+                categories.add(result['Category'])
+                if result.get('Error'):
+                    self.log_signal.emit(f"✗ {result['ClauseName']}: {result['Error']}", "error")
+                else:
+                    if not cached:
+                        self.log_signal.emit(f"✓ {result['ClauseName']} → {result['Category']}", "success")
+                    success_count += 1
 
-        for i, fp in enumerate(self.files):
-            progress = int((i + 1) / len(self.files) * 100)
-            self.progress_signal.emit(progress)
+        for fp, results in reuse.items():
+            on_result(fp, results, None, cached=True)
 
-            try:
-                results = self.extract_fn(fp)
-                for result in results:
-                    self.result_signal.emit(result)
-                    categories.add(result['Category'])
-                    if result.get('Error'):
-                        self.log_signal.emit(f"✗ {result['ClauseName']}: {result['Error']}", "error")
-                    else:
-                        self.log_signal.emit(f"✓ {result['ClauseName']} → {result['Category']}", "success")
-                        success_count += 1
-            except Exception as e:
-                fname = os.path.basename(fp)
-                self.log_signal.emit(f"✗ {fname}: {sanitize_error_message(e)}", "error")
+        if parallel:
+            start = time.perf_counter()
+            stats = ParallelExtractor(self.extract_fn, self.max_workers).run(files, on_result)
+            if stats['timeout']:
+                self.log_signal.emit(f"⚠️ {stats['timeout']} 个文件解析超时已跳过", "warning")
+            self.log_signal.emit(f"⏱️ 并行提取耗时 {time.perf_counter() - start:.1f}s", "info")
+        else:
+            for fp in files:
+                try:
+                    results = self.extract_fn(fp)
+                except Exception as e:
+                    on_result(fp, None, e)
+                else:
+                    on_result(fp, results, None)
+
+        if self.manifest is not None:
+            self.manifest.save()
 
         self.finished_signal.emit(success_count, len(categories))
 
 
-class MatchWorker(QThread):
-    """单文件匹配工作线程"""
+class DocConvertWorker(QThread):
+    """v19.1: .doc → .docx 批量转换工作线程（常驻 soffice 实例，整批提交）"""
     log_signal = pyqtSignal(str, str)
-    progress_signal = pyqtSignal(int, int)
-    finished_signal = pyqtSignal(bool, str)
+    progress_signal = pyqtSignal(int)
+    converted_signal = pyqtSignal(str, str)  # (doc_path, docx_path)
+    finished_signal = pyqtSignal(int, int)  # (converted, failed)
 
-    def __init__(self, doc_path: str, excel_path: str, output_path: str, sheet_name: str = None,
-                 match_mode: str = "auto", precise_mode: bool = False):
+    def __init__(self, doc_paths: list):
         super().__init__()
-        self.doc_path = doc_path
-        self.excel_path = excel_path
-        self.output_path = output_path
-        self.sheet_name = sheet_name  # 指定的Sheet名称
-        self.match_mode = match_mode  # v18.3: 匹配模式 (auto/title/content)
-        self.precise_mode = precise_mode  # v18.9: 精准识别模式（仅蓝色文字）
-        self._cancelled = False  # v18.4: 取消标志
-
-    def cancel(self):
-        """v18.4: 取消比对"""
-        self._cancelled = True
-
-    def is_cancelled(self) -> bool:
-        """v18.4: 检查是否已取消"""
-        return self._cancelled
+        self.doc_paths = doc_paths
 
-    def run(self):
+    @staticmethod
+    def _textutil_convert(doc_path: str, docx_path: str) -> bool:
+        """macOS textutil 转换（LibreOffice 不可用或失败时使用）"""
+        import subprocess
         try:
-            logic = ClauseMatcherLogic()
+            result = subprocess.run(
+                ['textutil', '-convert', 'docx', doc_path, '-output', docx_path],
+                capture_output=True, text=True, timeout=60
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return result.returncode == 0 and os.path.exists(docx_path)
 
-            # 状态信息
-            self.log_signal.emit(f"📊 配置: 外部={logic._use_external_config}, 翻译={HAS_TRANSLATOR}", "info")
+    def run(self):
+        import platform
+        is_mac = platform.system() == 'Darwin'
+        total = len(self.doc_paths)
+        converted = failed = 0
+        reported = set()
+        fallback = []
+
+        def on_result(doc_path, docx_path, error):
+            nonlocal converted, failed
+            reported.add(doc_path)
+            self.progress_signal.emit(int(len(reported) / total * 100))
+            if docx_path:
+                converted += 1
+                self.log_signal.emit(f"  ✓ {os.path.basename(doc_path)} → .docx", "success")
+                self.converted_signal.emit(doc_path, docx_path)
+            elif is_mac:
+                fallback.append(doc_path)
+            else:
+                failed += 1
+                self.log_signal.emit(f"  ✗ 转换失败: {os.path.basename(doc_path)} - {error}", "error")
+
+        converter = shared_converter() if HAS_OFFICE_CONVERT else None
+        if converter is not None and converter.available:
+            try:
+                converter.convert(self.doc_paths, 'docx', on_result=on_result)
+            except Exception as e:
+                self.log_signal.emit(f"  ✗ LibreOffice 转换出错: {sanitize_error_message(e)}", "error")
+                for doc_path in self.doc_paths:
+                    if doc_path not in reported:
+                        on_result(doc_path, None, e)
+        else:
+            self.log_signal.emit("⚠️ 未找到 LibreOffice (soffice)", "warning")
+            for doc_path in self.doc_paths:
+                on_result(doc_path, None, "未安装 LibreOffice")
+
+        # LibreOffice 不可用或失败时，使用 textutil（注意：可能包含页眉页脚内容）
+        for doc_path in fallback:
+            docx_path = doc_path.rsplit('.', 1)[0] + '.docx'
+            name = os.path.basename(doc_path)
+            if self._textutil_convert(doc_path, docx_path):
+                converted += 1
+                self.log_signal.emit(f"  ⚠️ {name} 使用textutil转换（页眉页脚可能变为正文）", "warning")
+                self.converted_signal.emit(doc_path, docx_path)
+            else:
+                failed += 1
+                self.log_signal.emit(f"  ✗ 转换失败: {name}", "error")
+
+        self.finished_signal.emit(converted, failed)
+
+
+class WordExportWorker(QThread):
+    """v19.1: Word批量导出工作线程（逐条款/按分类，多进程生成）"""
+    log_signal = pyqtSignal(str, str)
+    progress_signal = pyqtSignal(int)
+    finished_signal = pyqtSignal(bool, str, str)  # (success, message, output_path)
+
+    def __init__(self, jobs: list, output_dir: str, zip_path: str = None, max_workers: int = 1,
+                 log_success: bool = False):
+        """
+        jobs: [(文件名, 'clause' | 'category', 参数), ...]，见 clause_docx_writer.export_documents
+        log_success: 是否逐个记录成功的文档（按分类导出时文档少，逐个记录）
+        """
+        super().__init__()
+        self.jobs = jobs
+        self.output_dir = output_dir
+        self.zip_path = zip_path
+        self.max_workers = max_workers
+        self.log_success = log_success
+
+    def run(self):
+        def on_result(filename, error):
+            if error is not None:
+                self.log_signal.emit(f"  ✗ {filename}: {error}", "error")
+            elif self.log_success:
+                self.log_signal.emit(f"  ✓ {filename}", "success")
+
+        def on_progress(done, total):
+            self.progress_signal.emit(int(done / total * 100))
+
+        start = time.perf_counter()
+        try:
+            summary = export_documents(self.jobs, self.output_dir, self.max_workers, self.zip_path,
+                                       on_result=on_result, on_progress=on_progress,
+                                       should_stop=self.isInterruptionRequested)
+        except Exception as e:
+            logger.exception("Word批量导出失败")
+            self.finished_signal.emit(False, f"导出失败: {sanitize_error_message(e)}", self.output_dir)
+            return
+
+        if summary['cancelled']:
+            self.finished_signal.emit(False, "导出已取消，未写入任何文件", self.output_dir)
+            return
+        elapsed = time.perf_counter() - start
+        message = f"成功生成 {summary['written']}/{len(self.jobs)} 个文档（{elapsed:.1f}s）"
+        target = self.zip_path if self.zip_path and summary['written'] else self.output_dir
+        self.finished_signal.emit(summary['written'] > 0, message, target)
+
+
+class ZipPackWorker(QThread):
+    """v19.1: ZIP打包工作线程（按文件类型存储/压缩，多线程压缩）"""
+    progress_signal = pyqtSignal(int)
+    finished_signal = pyqtSignal(bool, object)  # (success, summary 或错误信息)
+
+    def __init__(self, files: list, zip_path: str):
+        """files: [(源文件路径, ZIP内路径), ...]"""
+        super().__init__()
+        self.files = files
+        self.zip_path = zip_path
+
+    def run(self):
+        total = len(self.files)
+        try:
+            summary = write_zip(self.files, self.zip_path,
+                                on_progress=lambda done, _: self.progress_signal.emit(int(done / total * 100)),
+                                should_stop=self.isInterruptionRequested)
+        except Exception as e:
+            logger.exception("ZIP打包失败")
+            self.finished_signal.emit(False, sanitize_error_message(e))
+            return
+        self.finished_signal.emit(not summary['cancelled'], summary)
+
+
+class MatchWorker(QThread):
+    """单文件匹配工作线程"""
+    log_signal = pyqtSignal(str, str)
+    progress_signal = pyqtSignal(int, int)
+    finished_signal = pyqtSignal(bool, str)
+
+    # v19.1: 匹配级别 -> 统计键
+    _STAT_KEYS = {
+        MatchLevel.EXACT.value: 'exact',
+        MatchLevel.SEMANTIC.value: 'semantic',
+        MatchLevel.KEYWORD.value: 'keyword',
+        MatchLevel.FUZZY.value: 'fuzzy',
+    }
+
+    def __init__(self, doc_path: str, excel_path: str, output_path: str, sheet_name: str = None,
+                 match_mode: str = "auto", precise_mode: bool = False, previous_report: str = None,
+                 library_service: LibraryIndexService = None):
+        super().__init__()
+        self.doc_path = doc_path
+        self.excel_path = excel_path
+        self.output_path = output_path
+        self.sheet_name = sheet_name  # 指定的Sheet名称
+        self.match_mode = match_mode  # v18.3: 匹配模式 (auto/title/content)
+        self.precise_mode = precise_mode  # v18.9: 精准识别模式（仅蓝色文字）
+        self.previous_report = previous_report  # v19.1: 上一版比对报告（增量比对）
+        self.library_service = library_service  # v19.1: 会话共享的条款库索引
+        self._cancelled = False  # v18.4: 取消标志
+
+    def cancel(self):
+        """v18.4: 取消比对"""
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        """v18.4: 检查是否已取消"""
+        return self._cancelled
+
+    def _load_revision_plan(self, clauses: List[ClauseItem], fingerprint: Dict):
+        """
+        v19.1: 读取上一版比对状态并与当前文档对齐
+        返回: (plan, removed, reusable)，无可用状态时 plan 为 None
+        """
+        if not self.previous_report:
+            return None, [], False
+        if not HAS_REMATCH:
+            self.log_signal.emit("⚠️ 未找到 clause_rematch，执行完整比对", "warning")
+            return None, [], False
+
+        state = load_state(self.previous_report)
+        if state is None:
+            self.log_signal.emit("⚠️ 上一版报告没有比对状态文件，执行完整比对", "warning")
+            return None, [], False
+
+        plan, removed = align_revision(
+            state.get('clauses', []),
+            [(normalize_title(c.title), content_hash(c.content)) for c in clauses])
+        reusable = state.get('fingerprint') == fingerprint
+        if not reusable:
+            self.log_signal.emit("⚠️ 条款库或匹配模式已变化，全部条款重新匹配", "warning")
+        return plan, removed, reusable
+
+    def run(self):
+        try:
+            logic = ClauseMatcherLogic()
+
+            # 状态信息
+            self.log_signal.emit(f"📊 配置: 外部={logic._use_external_config}, 翻译={HAS_TRANSLATOR}", "info")
 
             # v18.9: 精准识别模式提示
             if self.precise_mode:
@@ -3963,25 +5099,45 @@ class MatchWorker(QThread):
 
             self.log_signal.emit(f"📖 [{mode_str}] 提取到 {len(clauses)} 条", "success")
 
-            # 加载条款库
-            sheet_info = f" [{self.sheet_name}]" if self.sheet_name else ""
-            self.log_signal.emit(f"📚 加载条款库{sheet_info}...", "info")
-            lib_data = LibraryLoader.load_excel(self.excel_path, sheet_name=self.sheet_name)
-            self.log_signal.emit(f"✓ 条款库 {len(lib_data)} 条", "success")
-
-            # v19.0: 设置险种上下文
-            logic._current_category = logic.detect_category_from_sheet(self.sheet_name)
-            if logic._current_category:
-                self.log_signal.emit(f"🏷️ 检测到险种类别: {logic._current_category}", "info")
+            # v19.1: 增量比对 - 与上一版对齐，未变更条款直接复用上一版结果
+            fingerprint = library_fingerprint(self.excel_path, self.sheet_name, is_title_only) \
+                if HAS_REMATCH else {}
+            plan, removed, reusable = self._load_revision_plan(clauses, fingerprint)
+            mapping_mgr = get_mapping_manager() if HAS_MAPPING_MANAGER else None
 
-            # 构建索引
-            self.log_signal.emit("🔧 构建索引...", "info")
-            index = logic.build_index(lib_data)
-            self.log_signal.emit(f"✓ 索引完成", "success")
+            reuse = [None] * len(clauses)
+            if plan is not None and reusable:
+                for i, (status, prev) in enumerate(plan):
+                    if status != STATUS_UNCHANGED:
+                        continue
+                    # 用户映射在两版之间有变化时也需重新匹配
+                    prev_row = prev['row']
+                    current_mapping = None
+                    if mapping_mgr:
+                        current_mapping = mapping_mgr.get_library_name(prev_row.get(ExcelColumns.CLIENT_ORIG, ''))
+                        if not current_mapping and prev_row.get(ExcelColumns.CLIENT_TRANS):
+                            current_mapping = mapping_mgr.get_library_name(prev_row[ExcelColumns.CLIENT_TRANS])
+                    if current_mapping == prev.get('mapped'):
+                        reuse[i] = prev
+            if plan is not None:
+                counts = {s: sum(1 for status, _ in plan if status == s)
+                          for s in (STATUS_ADDED, STATUS_CHANGED, STATUS_UNCHANGED)}
+                self.log_signal.emit(
+                    f"🔁 增量比对: 新增 {counts[STATUS_ADDED]}, 修改 {counts[STATUS_CHANGED]}, "
+                    f"未变更 {counts[STATUS_UNCHANGED]}, 已删除 {len(removed)}，"
+                    f"需重新匹配 {sum(1 for r in reuse if r is None)} 条", "info")
+
+            index = None
+            if any(r is None for r in reuse):
+                # 加载条款库并构建索引（v19.1: 优先复用会话共享索引）
+                index = load_library_index(logic, self.excel_path, self.sheet_name,
+                                           self.log_signal.emit, self.library_service)
+                self.log_signal.emit(f"✓ 索引完成", "success")
 
             # 开始匹配 (v17.1 多结果匹配)
             self.log_signal.emit("🧠 开始智能匹配（v18.8 多结果模式）...", "info")
             results = []
+            state_entries = []
             stats = {'exact': 0, 'semantic': 0, 'keyword': 0, 'fuzzy': 0, 'none': 0}
 
             for idx, clause in enumerate(clauses, 1):
@@ -3993,89 +5149,50 @@ class MatchWorker(QThread):
 
                 self.progress_signal.emit(idx, len(clauses))
 
-                # 翻译
-                original_title = clause.title
-                translated_title, was_translated = logic.translate_title(clause.title)
-                if was_translated:
-                    clause.title = translated_title
-                    clause.original_title = original_title
-
-                # 检查用户自定义映射
-                user_library_name = None
-                if HAS_MAPPING_MANAGER:
-                    mapping_mgr = get_mapping_manager()
-                    # 按原标题或翻译后标题查找
-                    user_library_name = mapping_mgr.get_library_name(original_title)
-                    if not user_library_name and was_translated:
-                        user_library_name = mapping_mgr.get_library_name(translated_title)
-
-                # v17.1: 根据是否有用户映射决定匹配策略
-                # v18.5: 使用 create_user_mapping_result 方法减少重复代码
-                match_results = []
-                if user_library_name:
-                    # 有用户映射，只返回映射的那一条
-                    lib_entry = logic.find_library_entry_by_name(user_library_name, index)
-                    mapped_result = logic.create_user_mapping_result(lib_entry, user_library_name)
-                    match_results = [mapped_result]
+                prev = reuse[idx - 1]
+                if prev is not None:
+                    row = dict(prev['row'])
+                    # 标题键相同，但编号/标点可能变化，显示当前版本的原文
+                    row[ExcelColumns.SEQ] = idx
+                    row[ExcelColumns.CLIENT_ORIG] = clause.title
+                    row[ExcelColumns.CLIENT_CONTENT] = clause.content[:500] if clause.content else ""
+                    level = row.get(ExcelColumns.MATCH1_LEVEL, '')
+                    user_library_name = prev.get('mapped')
                 else:
-                    # 无用户映射，使用多结果匹配（最多3条）
-                    match_results = logic.match_clause_multiple(clause, index, is_title_only, max_results=3)
+                    row, primary_match, user_library_name = logic.build_report_row(
+                        clause, index, idx, is_title_only, mapping_mgr)
+                    level = primary_match.match_level.value
 
                 # 统计使用第一个匹配结果
-                primary_match = match_results[0] if match_results else MatchResult()
-                if primary_match.match_level == MatchLevel.EXACT:
-                    stats['exact'] += 1
-                elif primary_match.match_level == MatchLevel.SEMANTIC:
-                    stats['semantic'] += 1
-                elif primary_match.match_level == MatchLevel.KEYWORD:
-                    stats['keyword'] += 1
-                elif primary_match.match_level == MatchLevel.FUZZY:
-                    stats['fuzzy'] += 1
-                else:
-                    stats['none'] += 1
-
-                # v18.15: 提取限额信息
-                limit_info = ''
-                # 优先从客户条款原名提取
-                _, limit_info = logic.extract_limit_info(original_title)
-                # 如果客户条款没有，再从匹配结果提取
-                if not limit_info and match_results and match_results[0].matched_name:
-                    _, limit_info = logic.extract_limit_info(match_results[0].matched_name)
-
-                # v17.1: 构建多结果行
-                row = {
-                    ExcelColumns.SEQ: idx,
-                    ExcelColumns.CLIENT_ORIG: original_title,
-                    ExcelColumns.CLIENT_TRANS: translated_title if was_translated else "",
-                    ExcelColumns.CLIENT_CONTENT: clause.content[:500] if clause.content else "",
-                    ExcelColumns.LIMIT_INFO: limit_info,  # v18.15: 约定的限额
-                }
-
-                # 填充最多3条匹配结果
-                for match_num in range(1, 4):
-                    if match_num <= len(match_results):
-                        mr = match_results[match_num - 1]
-                        # v18.15: 显示时去掉限额后缀
-                        display_name, _ = logic.extract_limit_info(mr.matched_name or "")
-                        row[f'匹配{match_num}_条款名称'] = display_name
-                        row[f'匹配{match_num}_注册号'] = logic.clean_reg_number(mr.matched_reg)
-                        row[f'匹配{match_num}_条款内容'] = mr.matched_content[:500] if mr.matched_content else ""
-                        row[f'匹配{match_num}_匹配度'] = round(mr.score, 3)
-                        row[f'匹配{match_num}_匹配级别'] = mr.match_level.value
-                    else:
-                        row[f'匹配{match_num}_条款名称'] = ""
-                        row[f'匹配{match_num}_注册号'] = ""
-                        row[f'匹配{match_num}_条款内容'] = ""
-                        row[f'匹配{match_num}_匹配度'] = ""
-                        row[f'匹配{match_num}_匹配级别'] = ""
+                stats[self._STAT_KEYS.get(level, 'none')] += 1
+
+                if HAS_REMATCH:
+                    state_entries.append({
+                        'key': normalize_title(row[ExcelColumns.CLIENT_ORIG]),
+                        'hash': content_hash(clause.content),
+                        'mapped': user_library_name,
+                        'row': dict(row),
+                    })
+                if plan is not None:
+                    row[ExcelColumns.CHANGE_STATUS] = plan[idx - 1][0]
+                results.append(row)
 
+            # v19.1: 上一版中已删除的条款保留在报告末尾
+            for prev in removed:
+                row = dict(prev['row'])
+                row[ExcelColumns.SEQ] = ""
+                row[ExcelColumns.CHANGE_STATUS] = STATUS_REMOVED
                 results.append(row)
 
-            # 保存结果（单次写入：pandas写数据 + openpyxl样式 → 一次save）
-            df_res = pd.DataFrame(results)
-            with pd.ExcelWriter(self.output_path, engine='openpyxl') as writer:
-                df_res.to_excel(writer, index=False)
-                ExcelStyler.apply_styles(self.output_path, wb=writer.book)
+            # 保存结果
+            ExcelStyler.save_report(results, self.output_path)
+
+            # v19.1: 写入比对状态，供下一版文档增量比对
+            if HAS_REMATCH:
+                try:
+                    save_state(self.output_path, self.doc_path, fingerprint, state_entries)
+                except OSError as e:
+                    self.log_signal.emit(f"⚠️ 比对状态保存失败: {e}", "warning")
 
             # 输出统计
             self.log_signal.emit(f"📊 匹配统计:", "info")
@@ -4103,7 +5220,8 @@ class BatchMatchWorker(QThread):
     finished_signal = pyqtSignal(bool, str, int, int)  # 成功, 消息, 成功数, 总数
 
     def __init__(self, doc_paths: List[str], excel_path: str, output_dir: str, sheet_name: str = None,
-                 match_mode: str = "auto", precise_mode: bool = False):
+                 match_mode: str = "auto", precise_mode: bool = False,
+                 library_service: LibraryIndexService = None):
         super().__init__()
         self.doc_paths = doc_paths
         self.excel_path = excel_path
@@ -4111,6 +5229,7 @@ class BatchMatchWorker(QThread):
         self.sheet_name = sheet_name  # 指定的Sheet名称
         self.match_mode = match_mode  # v18.3: 匹配模式 (auto/title/content)
         self.precise_mode = precise_mode  # v18.9: 精准识别模式（仅蓝色文字）
+        self.library_service = library_service  # v19.1: 会话共享的条款库索引
         self._cancelled = False  # v18.4: 取消标志
 
     def cancel(self):
@@ -4121,20 +5240,9 @@ class BatchMatchWorker(QThread):
         try:
             logic = ClauseMatcherLogic()
 
-            # 加载条款库（只需一次）
-            sheet_info = f" [{self.sheet_name}]" if self.sheet_name else ""
-            self.log_signal.emit(f"📚 加载条款库{sheet_info}...", "info")
-            lib_data = LibraryLoader.load_excel(self.excel_path, sheet_name=self.sheet_name)
-            self.log_signal.emit(f"✓ 条款库 {len(lib_data)} 条", "success")
-
-            # v19.0: 设置险种上下文
-            logic._current_category = logic.detect_category_from_sheet(self.sheet_name)
-            if logic._current_category:
-                self.log_signal.emit(f"🏷️ 检测到险种类别: {logic._current_category}", "info")
-
-            # 构建索引（只需一次）
-            self.log_signal.emit("🔧 构建索引...", "info")
-            index = logic.build_index(lib_data)
+            # 加载条款库并构建索引（只需一次；v19.1: 优先复用会话共享索引）
+            index = load_library_index(logic, self.excel_path, self.sheet_name,
+                                       self.log_signal.emit, self.library_service)
 
             success_count = 0
             total = len(self.doc_paths)
@@ -4591,15 +5699,30 @@ class BatchSelectDialog(QDialog):
 
 class ClauseQueryDialog(QDialog):
     """v17.1: 条款查询对话框 - 仅查询条款标题"""
-    def __init__(self, parent=None, library_index=None, logic=None, mapping_mgr=None):
+    def __init__(self, parent=None, library_index=None, logic=None, mapping_mgr=None,
+                 library_service: LibraryIndexService = None, library_key: Tuple[str, str] = None):
         super().__init__(parent)
         self.setWindowTitle("🔍 条款智能查询")
         self.setMinimumSize(600, 500)
         self.library_index = library_index
         self.logic = logic or ClauseMatcherLogic()
         self.mapping_mgr = mapping_mgr
+        self._library_key = library_key  # (绝对路径, Sheet)，用于识别后台加载结果
+        self._loading = False
         self._setup_ui()
 
+        # v19.1: 条款库仍在后台加载时先打开对话框，显示进度，就绪后自动启用查询
+        if library_index is None and library_service is not None:
+            library_service.progress.connect(self._on_library_progress)
+            library_service.ready.connect(self._on_library_ready)
+            library_service.failed.connect(self._on_library_failed)
+            self._set_loading(True)
+            # 打开对话框前已加载完成（ready 信号在连接前发出）时直接启用；加载失败过则重新发起
+            if library_key is not None:
+                snapshot = library_service.request(library_key[0], library_key[1] or None)
+                if snapshot is not None:
+                    self._on_library_ready(snapshot)
+
     def _setup_ui(self):
         self.setStyleSheet(f"""
             QDialog {{ background: {AnthropicColors.BG_PRIMARY}; }}
@@ -4636,6 +5759,13 @@ class ClauseQueryDialog(QDialog):
         hint.setWordWrap(True)
         layout.addWidget(hint)
 
+        # v19.1: 条款库加载进度
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 100)
+        self.load_progress.setFormat("正在加载条款库... %p%")
+        self.load_progress.setVisible(False)
+        layout.addWidget(self.load_progress)
+
         # 输入行
         input_row = QHBoxLayout()
         self.query_input = QLineEdit()
@@ -4669,6 +5799,32 @@ class ClauseQueryDialog(QDialog):
         # 存储结果数据
         self._search_results = []
 
+    def _set_loading(self, loading: bool):
+        """v19.1: 加载中禁用查询按钮（仍可先输入关键词）"""
+        self._loading = loading
+        self.load_progress.setVisible(loading)
+        self.search_btn.setEnabled(not loading)
+
+    def _on_library_progress(self, stage: str, percent: int):
+        self.load_progress.setValue(percent)
+        self.load_progress.setFormat(f"{stage}... %p%")
+
+    def _on_library_ready(self, snapshot):
+        if self._library_key and snapshot.key[:2] != self._library_key:
+            return
+        self.library_index = snapshot.index
+        self.logic = snapshot.logic
+        self._set_loading(False)
+        if self.query_input.text().strip():
+            self._do_search()
+
+    def _on_library_failed(self, excel_path: str, error: str):
+        if self._library_key and os.path.abspath(excel_path) != self._library_key[0]:
+            return
+        self._set_loading(False)
+        self.result_list.clear()
+        self.result_list.addItem(f"⚠️ 加载条款库失败: {sanitize_error_message(error)}")
+
     def _do_search(self):
         """执行查询"""
         query = self.query_input.text().strip()
@@ -4679,6 +5835,9 @@ class ClauseQueryDialog(QDialog):
         self.detail_text.clear()
         self._search_results = []
 
+        if self._loading:
+            self.result_list.addItem("⏳ 条款库加载中，完成后自动查询")
+            return
         if not self.library_index or not self.library_index.data:
             self.result_list.addItem("⚠️ 请先选择条款库文件")
             return
@@ -4764,6 +5923,7 @@ class ClauseExtractorTab(QWidget):
         self.doc_files = []  # .doc文件列表（需要转换）
         self.extracted_data = []
         self.categories = set()
+        self._source_folder = None  # v19.1: 文件夹模式下的源文件夹（增量提取）
         self._setup_ui()
 
     def _setup_ui(self):
@@ -4913,11 +6073,15 @@ class ClauseExtractorTab(QWidget):
         self.file_select_btn.clicked.connect(self._select_files)
         file_card_layout.addWidget(self.file_select_btn)
 
-        # 文件列表
-        self.file_list = QListWidget()
+        # 文件列表（v19.1: 数据模型 + 视图，提取结果返回时标记状态）
+        self.file_model = FileListModel(self)
+        self.file_list = QListView()
+        self.file_list.setModel(self.file_model)
+        self.file_list.setUniformItemSizes(True)
+        self.file_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.file_list.setMaximumHeight(140)
         self.file_list.setStyleSheet(f"""
-            QListWidget {{
+            QListView {{
                 background: {AnthropicColors.BG_CARD};
                 border: 1px solid {AnthropicColors.BORDER};
                 border-radius: 8px;
@@ -4926,16 +6090,16 @@ class ClauseExtractorTab(QWidget):
                 font-size: 13px;
                 color: {AnthropicColors.TEXT_PRIMARY};
             }}
-            QListWidget::item {{
+            QListView::item {{
                 padding: 8px 12px;
                 border-radius: 6px;
                 color: {AnthropicColors.TEXT_PRIMARY};
                 margin-bottom: 2px;
             }}
-            QListWidget::item:hover {{
+            QListView::item:hover {{
                 background: rgba(217, 119, 87, 0.1);
             }}
-            QListWidget::item:selected {{
+            QListView::item:selected {{
                 background: {AnthropicColors.BG_DARK};
                 color: {AnthropicColors.TEXT_LIGHT};
             }}
@@ -5044,6 +6208,26 @@ class ClauseExtractorTab(QWidget):
         """)
         self.clear_btn.clicked.connect(self._clear_all)
 
+        # v19.1: 并行提取进程数
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, max(2, available_cpus()) if HAS_PARALLEL_EXTRACT else 1)
+        self.workers_spin.setValue(default_workers() if HAS_PARALLEL_EXTRACT else 1)
+        self.workers_spin.setPrefix("进程 ")
+        self.workers_spin.setMinimumHeight(40)
+        self.workers_spin.setToolTip("并行提取的工作进程数（1 为顺序提取）")
+        self.workers_spin.setEnabled(HAS_PARALLEL_EXTRACT)
+        self.workers_spin.setStyleSheet(f"""
+            QSpinBox {{
+                background: {AnthropicColors.BG_PRIMARY};
+                border: 1px solid {AnthropicColors.BORDER};
+                border-radius: 8px;
+                padding: 0 8px;
+                color: {AnthropicColors.TEXT_PRIMARY};
+                font-size: 14px;
+            }}
+        """)
+
+        btn_layout.addWidget(self.workers_spin)
         btn_layout.addWidget(self.extract_btn, 3)
         btn_layout.addWidget(self.download_zip_btn, 1)
         btn_layout.addWidget(self.download_excel_btn, 1)
@@ -5168,8 +6352,8 @@ class ClauseExtractorTab(QWidget):
 
     def _handle_files(self, file_paths: list):
         """处理选择的文件"""
+        self._source_folder = None
         self.selected_files = []
-        self.file_list.clear()
 
         for fp in file_paths:
             fname = os.path.basename(fp)
@@ -5191,8 +6375,8 @@ class ClauseExtractorTab(QWidget):
                 continue
 
             self.selected_files.append(fp)
-            self.file_list.addItem(f"📄 {fname}")
 
+        self.file_model.set_files([(fp, '📄') for fp in self.selected_files])
         if self.selected_files:
             self.file_list.setVisible(True)
             self.extract_btn.setEnabled(True)
@@ -5201,10 +6385,10 @@ class ClauseExtractorTab(QWidget):
 
     def _handle_folder(self, folder_path: str):
         """处理文件夹 - 自动分类（支持多层子目录穿透）"""
+        self._source_folder = folder_path  # v19.1: 增量提取清单按文件夹保存
         self.classified_files = {'fujia': [], 'feilv': [], 'zhu': []}
         self.selected_files = []
         self.doc_files = []  # 需要转换的.doc文件
-        self.file_list.clear()
 
         # 使用os.walk递归遍历所有子目录
         for root, dirs, files in os.walk(folder_path):
@@ -5238,15 +6422,7 @@ class ClauseExtractorTab(QWidget):
         self.preview_zhu.findChild(QLabel, "count").setText(str(len(self.classified_files['zhu'])))
 
         # 显示文件列表
-        self.file_list.clear()
-        category_icons = {'fujia': '📗', 'feilv': '📘', 'zhu': '📙'}
-        for cat in ['fujia', 'feilv', 'zhu']:
-            for fp in self.classified_files[cat]:
-                fname = os.path.basename(fp)
-                ext = fname.split('.')[-1].lower()
-                # 标记.doc文件
-                suffix = " ⚠️" if ext == 'doc' else ""
-                self.file_list.addItem(f"{category_icons[cat]} {fname}{suffix}")
+        self._refresh_file_list()
         self.file_list.setVisible(True)
 
         total = sum(len(v) for v in self.classified_files.values())
@@ -5395,101 +6571,51 @@ class ClauseExtractorTab(QWidget):
             self._convert_doc_files()
 
     def _convert_doc_files(self):
-        """批量转换.doc文件为.docx格式"""
-        import subprocess
-        import platform
-
+        """批量转换.doc文件为.docx格式（v19.1: 后台线程 + 常驻 LibreOffice 实例）"""
         self._log(f"🔄 开始转换 {len(self.doc_files)} 个 .doc 文件...", "info")
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
 
-        converted = 0
-        failed = 0
-        converted_paths = []
-
-        for i, doc_name in enumerate(self.doc_files):
-            progress = int((i + 1) / len(self.doc_files) * 100)
-            self.progress_bar.setValue(progress)
-            QApplication.processEvents()
-
-            # 查找完整路径
-            doc_path = None
-            for cat in ['fujia', 'feilv', 'zhu']:
-                for fp in self.classified_files[cat]:
-                    if os.path.basename(fp) == doc_name:
-                        doc_path = fp
-                        break
-                if doc_path:
-                    break
-
-            if not doc_path:
+        # 查找完整路径
+        path_by_name = {}
+        for cat in ['fujia', 'feilv', 'zhu']:
+            for fp in self.classified_files[cat]:
+                path_by_name.setdefault(os.path.basename(fp), fp)
+        doc_paths = []
+        missing = 0
+        for doc_name in self.doc_files:
+            doc_path = path_by_name.get(doc_name)
+            if doc_path:
+                doc_paths.append(doc_path)
+            else:
                 self._log(f"  ✗ 未找到文件路径: {doc_name}", "error")
-                failed += 1
-                continue
+                missing += 1
 
-            docx_path = doc_path.rsplit('.', 1)[0] + '.docx'
-
-            try:
-                if platform.system() == 'Darwin':
-                    # macOS: 优先使用 LibreOffice（能正确处理页眉页脚），再用 textutil
-                    converted_ok = False
-                    soffice_paths = [
-                        '/Applications/LibreOffice.app/Contents/MacOS/soffice',
-                        '/usr/local/bin/soffice'
-                    ]
-                    for soffice in soffice_paths:
-                        if os.path.exists(soffice):
-                            output_dir = os.path.dirname(doc_path)
-                            result = subprocess.run(
-                                [soffice, '--headless', '--convert-to', 'docx', '--outdir', output_dir, doc_path],
-                                capture_output=True, text=True, timeout=120
-                            )
-                            if result.returncode == 0 and os.path.exists(docx_path):
-                                converted_ok = True
-                                break
-
-                    # LibreOffice不可用或失败时，使用 textutil（注意：可能包含页眉页脚内容）
-                    if not converted_ok:
-                        result = subprocess.run(
-                            ['textutil', '-convert', 'docx', doc_path, '-output', docx_path],
-                            capture_output=True, text=True, timeout=60
-                        )
-                        if result.returncode == 0:
-                            self._log(f"  ⚠️ {doc_name} 使用textutil转换（页眉页脚可能变为正文）", "warning")
-                else:
-                    # Windows/Linux: 使用 LibreOffice
-                    soffice = 'soffice' if platform.system() == 'Linux' else 'soffice.exe'
-                    output_dir = os.path.dirname(doc_path)
-                    result = subprocess.run(
-                        [soffice, '--headless', '--convert-to', 'docx', '--outdir', output_dir, doc_path],
-                        capture_output=True, text=True, timeout=120
-                    )
-
-                if os.path.exists(docx_path):
-                    converted += 1
-                    converted_paths.append(docx_path)
-                    self._log(f"  ✓ {doc_name} → .docx", "success")
-
-                    # 更新分类列表
-                    for cat in ['fujia', 'feilv', 'zhu']:
-                        if doc_path in self.classified_files[cat]:
-                            self.classified_files[cat].remove(doc_path)
-                            self.classified_files[cat].append(docx_path)
-                            # 如果是附加条款，添加到待提取列表
-                            if cat == 'fujia':
-                                self.selected_files.append(docx_path)
-                            break
-                else:
-                    self._log(f"  ✗ 转换失败: {doc_name}", "error")
-                    failed += 1
+        if not doc_paths:
+            self._on_doc_convert_finished(0, missing)
+            return
 
-            except subprocess.TimeoutExpired:
-                self._log(f"  ✗ 转换超时: {doc_name}", "error")
-                failed += 1
-            except Exception as e:
-                self._log(f"  ✗ 转换错误: {doc_name} - {str(e)}", "error")
-                failed += 1
+        self.extract_btn.setEnabled(False)
+        self._convert_worker = DocConvertWorker(doc_paths)
+        self._convert_worker.log_signal.connect(self._log)
+        self._convert_worker.progress_signal.connect(self.progress_bar.setValue)
+        self._convert_worker.converted_signal.connect(self._on_doc_converted)
+        self._convert_worker.finished_signal.connect(
+            lambda converted, failed: self._on_doc_convert_finished(converted, failed + missing))
+        self._convert_worker.start()
+
+    def _on_doc_converted(self, doc_path: str, docx_path: str):
+        """单个.doc转换完成：更新分类列表"""
+        for cat in ['fujia', 'feilv', 'zhu']:
+            if doc_path in self.classified_files[cat]:
+                self.classified_files[cat].remove(doc_path)
+                self.classified_files[cat].append(docx_path)
+                # 如果是附加条款，添加到待提取列表
+                if cat == 'fujia':
+                    self.selected_files.append(docx_path)
+                break
 
+    def _on_doc_convert_finished(self, converted: int, failed: int):
         self.progress_bar.setValue(100)
         self._log(f"🎉 转换完成! 成功: {converted}, 失败: {failed}", "success" if failed == 0 else "warning")
 
@@ -5497,20 +6623,19 @@ class ClauseExtractorTab(QWidget):
         if converted > 0:
             self._refresh_file_list()
             self._update_stats()
-            if self.selected_files:
-                self.extract_btn.setEnabled(True)
+        if self.selected_files:
+            self.extract_btn.setEnabled(True)
+            if converted > 0:
                 self._log(f"✓ 现在可以提取 {len(self.selected_files)} 个附加条款", "success")
 
     def _refresh_file_list(self):
         """刷新文件列表显示"""
-        self.file_list.clear()
         category_icons = {'fujia': '📗', 'feilv': '📘', 'zhu': '📙'}
-        for cat in ['fujia', 'feilv', 'zhu']:
-            for fp in self.classified_files[cat]:
-                fname = os.path.basename(fp)
-                ext = fname.split('.')[-1].lower()
-                suffix = " ⚠️" if ext == 'doc' else ""
-                self.file_list.addItem(f"{category_icons[cat]} {fname}{suffix}")
+        self.file_model.set_files([
+            (fp, category_icons[cat])
+            for cat in ['fujia', 'feilv', 'zhu']
+            for fp in self.classified_files[cat]
+        ])
 
         # 更新分类预览
         self.preview_fujia.findChild(QLabel, "count").setText(str(len(self.classified_files['fujia'])))
@@ -5524,12 +6649,19 @@ class ClauseExtractorTab(QWidget):
             return
 
         self.extracted_data = []
+        self.file_model.reset_status()
         self.categories = set()
         self.extract_btn.setEnabled(False)
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
 
-        self._extraction_worker = ExtractionWorker(self.selected_files, self._extract_clause)
+        # v19.1: 多进程并行提取（extract_clause_file 为模块级函数，可分发到工作进程）
+        max_workers = self.workers_spin.value() if HAS_PARALLEL_EXTRACT else 1
+        # v19.1: 文件夹模式按清单增量提取，只解析新增/修改的文件
+        manifest = None
+        if self._source_folder and HAS_PARALLEL_EXTRACT:
+            manifest = ExtractionManifest(self._source_folder)
+        self._extraction_worker = ExtractionWorker(self.selected_files, extract_clause_file, max_workers, manifest)
         self._extraction_worker.log_signal.connect(self._log)
         self._extraction_worker.progress_signal.connect(self.progress_bar.setValue)
         self._extraction_worker.result_signal.connect(self._on_extraction_result)
@@ -5540,6 +6672,8 @@ class ClauseExtractorTab(QWidget):
         """处理单条提取结果"""
         self.extracted_data.append(result)
         self.categories.add(result['Category'])
+        # v19.1: 文件列表中标记提取状态
+        self.file_model.set_status(result['FileName'], " ✗" if result.get('Error') else " ✓")
 
     def _on_extraction_finished(self, success_count: int, category_count: int):
         """提取完成回调"""
@@ -5550,8 +6684,9 @@ class ClauseExtractorTab(QWidget):
         if self.extracted_data:
             self.download_excel_btn.setVisible(True)
 
-    def _extract_clause(self, file_path: str) -> list:
-        """提取单个文件的条款"""
+    @classmethod
+    def _extract_clause(cls, file_path: str) -> list:
+        """提取单个文件的条款（v19.1: 不依赖界面状态，可在工作进程中执行）"""
         fname = os.path.basename(file_path)
         clause_name = os.path.splitext(fname)[0]
         today = datetime.now().strftime('%Y-%m-%d')
@@ -5562,16 +6697,16 @@ class ClauseExtractorTab(QWidget):
             'ClauseName': clause_name,
             'RegistrationNo': '',
             'Content': '',
-            'Category': self._get_category(fname, clause_name),
+            'Category': cls._get_category(fname, clause_name),
             'AddDate': today,
             'Error': ''
         }
 
         try:
             if ext == 'pdf':
-                paragraphs = self._parse_pdf(file_path)
+                paragraphs = cls._parse_pdf(file_path)
             else:
-                paragraphs = self._parse_docx(file_path)
+                paragraphs = cls._parse_docx(file_path)
 
             if not paragraphs:
                 result['Error'] = '文档内容为空'
@@ -5607,7 +6742,7 @@ class ClauseExtractorTab(QWidget):
 
             for para in paragraphs[start_idx:]:
                 clean = para.strip()
-                if clean and clean != clause_name and not self._is_noise_line(clean):
+                if clean and clean != clause_name and not cls._is_noise_line(clean):
                     content_lines.append(clean)
 
             result['Content'] = '\n'.join(content_lines)
@@ -5617,7 +6752,8 @@ class ClauseExtractorTab(QWidget):
             result['Error'] = f'解析出错: {str(e)}'
             return [result]
 
-    def _parse_docx(self, file_path: str) -> list:
+    @classmethod
+    def _parse_docx(cls, file_path: str) -> list:
         """解析Word文档 - v18.17: 支持表格提取
 
         使用 <b>...</b> 标记加粗文本，便于后续导出时保留格式
@@ -5677,13 +6813,14 @@ class ClauseExtractorTab(QWidget):
                     table_idx += 1
 
                     # 将表格转换为文本格式
-                    table_text = self._table_to_text(table)
+                    table_text = cls._table_to_text(table)
                     if table_text:
                         paragraphs.append(table_text)
 
         return paragraphs
 
-    def _table_to_text(self, table) -> str:
+    @staticmethod
+    def _table_to_text(table) -> str:
         """将Word表格转换为可读的文本格式 - v18.17
 
         使用管道符和横线创建类似Markdown的表格格式
@@ -5736,11 +6873,16 @@ class ClauseExtractorTab(QWidget):
         lines.append('</table>')  # 表格结束标记
         return '\n'.join(lines)
 
-    def _parse_pdf(self, file_path: str) -> list:
+    @staticmethod
+    def _parse_pdf(file_path: str) -> list:
         """解析PDF文档"""
         paragraphs = []
 
-        if HAS_PDFPLUMBER:
+        if HAS_PDF_INGEST:
+            # v19.1: 大文件分页并行，按内容哈希缓存
+            from clause_pdf import extract_pdf_lines
+            paragraphs = extract_pdf_lines(file_path)
+        elif HAS_PDFPLUMBER:
             with pdfplumber.open(file_path) as pdf:
                 for page in pdf.pages:
                     text = page.extract_text()
@@ -5775,14 +6917,16 @@ class ClauseExtractorTab(QWidget):
         re.IGNORECASE
     )
 
-    def _is_noise_line(self, text: str) -> bool:
+    @classmethod
+    def _is_noise_line(cls, text: str) -> bool:
         """判断是否为噪声行（页码、网址等明显非内容行）"""
-        clean_text = self._RE_BOLD_TAG.sub('', text).strip()
+        clean_text = cls._RE_BOLD_TAG.sub('', text).strip()
         if not clean_text:
             return True
-        return bool(self._RE_NOISE.search(clean_text))
+        return bool(cls._RE_NOISE.search(clean_text))
 
-    def _get_category(self, filename: str, title: str) -> str:
+    @staticmethod
+    def _get_category(filename: str, title: str) -> str:
         """获取条款分类"""
         text = title or filename
         if '附加' in text:
@@ -5808,9 +6952,23 @@ class ClauseExtractorTab(QWidget):
 
         self._log("📦 正在生成分类ZIP文件...", "info")
 
+        folder_names = {'fujia': '附加条款', 'feilv': '费率表', 'zhu': '主条款'}
+        if HAS_ZIP_PACK:
+            # v19.1: 后台打包，.docx/.pdf 等已压缩格式直接存储
+            files = [(fp, f"{folder_names[cat]}/{os.path.basename(fp)}")
+                     for cat, cat_files in self.classified_files.items() for fp in cat_files]
+            self.progress_bar.setVisible(True)
+            self.progress_bar.setValue(0)
+            self.download_zip_btn.setEnabled(False)
+            self._zip_worker = ZipPackWorker(files, save_path)
+            self._zip_worker.progress_signal.connect(self.progress_bar.setValue)
+            self._zip_worker.finished_signal.connect(
+                lambda ok, result: self._on_classified_zip_finished(ok, result, save_path))
+            self._zip_worker.start()
+            return
+
         try:
             with zipfile.ZipFile(save_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                folder_names = {'fujia': '附加条款', 'feilv': '费率表', 'zhu': '主条款'}
                 for cat, files in self.classified_files.items():
                     folder_name = folder_names[cat]
                     for fp in files:
@@ -5823,6 +6981,19 @@ class ClauseExtractorTab(QWidget):
         except Exception as e:
             self._log(f"❌ ZIP生成失败: {sanitize_error_message(e)}", "error")
 
+    def _on_classified_zip_finished(self, ok: bool, result, save_path: str):
+        self.progress_bar.setVisible(False)
+        self.download_zip_btn.setEnabled(True)
+        if not ok:
+            self._log(f"❌ ZIP生成失败: {result if isinstance(result, str) else '已取消'}", "error")
+            return
+        for src, error in result['failed']:
+            self._log(f"  ✗ {os.path.basename(src)}: {error}", "error")
+        self._log(f"✅ 分类ZIP已保存: {os.path.basename(save_path)}", "success")
+        self._log(f"   包含 {len(self.classified_files['fujia'])} 附加条款 + {len(self.classified_files['feilv'])} 费率表 + {len(self.classified_files['zhu'])} 主条款", "info")
+        self._log(f"   {result['deflated']} 个压缩 + {result['stored']} 个直接存储，"
+                  f"{result['bytes_in'] / 1048576:.1f} MB → {result['bytes_out'] / 1048576:.1f} MB", "info")
+
     def _parse_rich_text(self, text: str):
         """v18.9: 解析带 <b> 标记的文本，返回富文本对象
 
@@ -5989,13 +7160,14 @@ class ClauseExtractorTab(QWidget):
 
     def _clear_all(self):
         """清空所有"""
+        self._source_folder = None
         self.selected_files = []
         self.classified_files = {'fujia': [], 'feilv': [], 'zhu': []}
         self.doc_files = []
         self.extracted_data = []
         self.categories = set()
 
-        self.file_list.clear()
+        self.file_model.clear()
         self.file_list.setVisible(False)
         self.classify_preview.setVisible(False)
         self.download_zip_btn.setVisible(False)
@@ -6035,6 +7207,11 @@ class ClauseExtractorTab(QWidget):
         self.log_text.append(f'<span style="color: {color}">{message}</span>')
 
 
+def extract_clause_file(file_path: str) -> list:
+    """v19.1: 单文件条款提取（模块级函数，供并行提取进程池调用）"""
+    return ClauseExtractorTab._extract_clause(file_path)
+
+
 # ==========================================
 # 条款输出Tab - V18.0 完整功能
 # ==========================================
@@ -6044,7 +7221,6 @@ class ClauseOutputTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent_window = parent
-        self.report_data = []  # 存储读取的条款数据
         self.selected_clauses = []  # 用户选中的条款
         self.source_excel_path = None  # v18.15: 源Excel路径，用于录单增强模式
         self._setup_ui()
@@ -6178,6 +7354,25 @@ class ClauseOutputTab(QWidget):
         preview_header.addWidget(self.clause_count_label)
         preview_header.addStretch()
 
+        # v19.1: 筛选（在数据模型中过滤，不重建列表）
+        self.clause_filter_edit = QLineEdit()
+        self.clause_filter_edit.setPlaceholderText("筛选名称/分类/注册号...")
+        self.clause_filter_edit.setClearButtonEnabled(True)
+        self.clause_filter_edit.setMaximumWidth(240)
+        self.clause_filter_edit.setStyleSheet(f"""
+            QLineEdit {{
+                background: {AnthropicColors.BG_PRIMARY};
+                border: 1px solid {AnthropicColors.BORDER};
+                border-radius: 6px;
+                padding: 4px 10px;
+                color: {AnthropicColors.TEXT_PRIMARY};
+                font-size: 14px;
+            }}
+            QLineEdit:focus {{ border-color: {AnthropicColors.ACCENT}; }}
+        """)
+        self.clause_filter_edit.textChanged.connect(self._on_clause_filter_changed)
+        preview_header.addWidget(self.clause_filter_edit)
+
         # 全选/取消按钮
         self.select_all_btn = QPushButton("全选")
         self.select_all_btn.setStyleSheet(f"""
@@ -6195,11 +7390,28 @@ class ClauseOutputTab(QWidget):
 
         preview_layout.addLayout(preview_header)
 
-        # 条款列表
-        self.clause_list = QListWidget()
+        # 条款列表（v19.1: 表格模型 + 视图，只绘制可见行；点击表头排序）
+        self.clause_model = ClauseTableModel(self)
+        self.clause_list = QTableView()
+        self.clause_list.setModel(self.clause_model)
         self.clause_list.setMinimumHeight(150)
+        self.clause_list.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.clause_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.clause_list.setShowGrid(False)
+        self.clause_list.setWordWrap(False)
+        self.clause_list.verticalHeader().setVisible(False)
+        self.clause_list.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.clause_list.verticalHeader().setDefaultSectionSize(36)
+        header = self.clause_list.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.Interactive)
+        header.setSectionResizeMode(2, QHeaderView.Interactive)
+        header.resizeSection(1, 140)
+        header.resizeSection(2, 220)
+        header.setSortIndicator(-1, Qt.AscendingOrder)  # 默认保持加载顺序
+        self.clause_list.setSortingEnabled(True)
         self.clause_list.setStyleSheet(f"""
-            QListWidget {{
+            QTableView {{
                 background: {AnthropicColors.BG_PRIMARY};
                 border: 1px solid {AnthropicColors.BORDER};
                 border-radius: 8px;
@@ -6207,18 +7419,24 @@ class ClauseOutputTab(QWidget):
                 font-size: 15px;
                 color: {AnthropicColors.TEXT_PRIMARY};
             }}
-            QListWidget::item {{
-                padding: 10px 12px;
-                border-radius: 6px;
-                margin-bottom: 2px;
+            QTableView::item {{
+                padding: 4px 8px;
             }}
-            QListWidget::item:hover {{
+            QTableView::item:hover {{
                 background: rgba(217, 119, 87, 0.08);
             }}
-            QListWidget::item:selected {{
+            QTableView::item:selected {{
                 background: {AnthropicColors.BG_DARK};
                 color: {AnthropicColors.TEXT_LIGHT};
             }}
+            QHeaderView::section {{
+                background: {AnthropicColors.BG_PRIMARY};
+                color: {AnthropicColors.TEXT_MUTED};
+                border: none;
+                border-bottom: 1px solid {AnthropicColors.BORDER};
+                padding: 6px 8px;
+                font-size: 13px;
+            }}
         """)
         preview_layout.addWidget(self.clause_list)
 
@@ -6308,6 +7526,17 @@ class ClauseOutputTab(QWidget):
         include_reg_layout.addWidget(self.include_reg_check)
         style_grid.addLayout(include_reg_layout)
 
+        # v19.1: 逐条款/按分类输出时直接打包为ZIP
+        zip_layout = QVBoxLayout()
+        zip_label = QLabel("打包")
+        zip_label.setStyleSheet(label_style)
+        zip_layout.addWidget(zip_label)
+        self.zip_export_check = QCheckBox("ZIP")
+        self.zip_export_check.setToolTip("按条款/按分类输出时，将生成的文档打包为一个ZIP文件")
+        self.zip_export_check.setStyleSheet(f"color: {AnthropicColors.TEXT_PRIMARY}; font-size: 15px;")
+        zip_layout.addWidget(self.zip_export_check)
+        style_grid.addLayout(zip_layout)
+
         style_layout.addLayout(style_grid)
         style_layout.addStretch()
         settings_main_layout.addWidget(style_section)
@@ -6466,10 +7695,10 @@ class ClauseOutputTab(QWidget):
                 self._log("   请先在「条款提取」页面提取条款", "info")
                 return
 
-            self.report_data = []
+            records = []
             for item in extractor_tab.extracted_data:
                 if not item.get('Error'):
-                    self.report_data.append({
+                    records.append({
                         'name': item.get('ClauseName', ''),
                         'regNo': item.get('RegistrationNo', ''),
                         'content': item.get('Content', ''),
@@ -6477,10 +7706,10 @@ class ClauseOutputTab(QWidget):
                         'filename': item.get('FileName', '')
                     })
 
-            if self.report_data:
-                self._update_clause_list()
-                self.source_label.setText(f"✓ 已从条款提取加载 {len(self.report_data)} 条数据")
-                self._log(f"✓ 从条款提取Tab加载了 {len(self.report_data)} 条条款", "success")
+            if records:
+                self._update_clause_list(records)
+                self.source_label.setText(f"✓ 已从条款提取加载 {len(records)} 条数据")
+                self._log(f"✓ 从条款提取Tab加载了 {len(records)} 条条款", "success")
                 self.generate_btn.setEnabled(True)
             else:
                 self._log("⚠️ 没有成功提取的条款数据", "warning")
@@ -6504,58 +7733,26 @@ class ClauseOutputTab(QWidget):
         try:
             self._log(f"📖 读取文件: {os.path.basename(file_path)}", "info")
 
-            # v18.9: 使用 rich_text=True 以保留加粗格式
-            wb = openpyxl.load_workbook(file_path, rich_text=True)
-            self.report_data = []
-
-            for sheet_name in wb.sheetnames:
-                ws = wb[sheet_name]
-                rows = list(ws.iter_rows())
-                if not rows:
-                    continue
-
-                headers = [str(cell.value) if cell.value else '' for cell in rows[0]]
-
-                # 智能识别列
-                col_map = self._detect_columns(headers)
-
-                if not col_map.get('name'):
-                    continue
-
-                self.progress_bar.setValue(30)
-
-                for row in rows[1:]:
-                    if not row or not any(cell.value for cell in row):
-                        continue
-
-                    name = self._extract_cell_text(row, col_map.get('name'))
-                    if not name:
-                        continue
-
-                    self.report_data.append({
-                        'name': name,
-                        'regNo': self._extract_cell_text(row, col_map.get('regNo')),
-                        'content': self._extract_cell_text(row, col_map.get('content')),
-                        'category': sheet_name if sheet_name != 'Sheet' else '条款',
-                        'filename': self._extract_cell_text(row, col_map.get('filename'))
-                    })
-
-            wb.close()
+            # v19.1: 按Sheet分批追加到列表（同名条款只保留第一条）
+            self._update_clause_list([])
+            seen = set()
+            loaded = False
+            if HAS_FAST_XLSX:
+                try:
+                    self._load_excel_fast(file_path, seen)
+                    loaded = True
+                except XlsxReadError as e:
+                    self._log(f"⚠️ 快速读取失败，改用完整读取: {e}", "warning")
+                    self._update_clause_list([])
+                    seen.clear()
+            if not loaded:
+                self._load_excel_full(file_path, seen)
             self.progress_bar.setValue(80)
 
-            # 去重
-            seen = set()
-            unique_data = []
-            for item in self.report_data:
-                if item['name'] not in seen:
-                    seen.add(item['name'])
-                    unique_data.append(item)
-            self.report_data = unique_data
-
-            if self.report_data:
-                self._update_clause_list()
-                self.source_label.setText(f"✓ {os.path.basename(file_path)} ({len(self.report_data)} 条)")
-                self._log(f"✓ 加载了 {len(self.report_data)} 条不重复条款", "success")
+            total = self.clause_model.total_count()
+            if total:
+                self.source_label.setText(f"✓ {os.path.basename(file_path)} ({total} 条)")
+                self._log(f"✓ 加载了 {total} 条不重复条款", "success")
                 self.generate_btn.setEnabled(True)
             else:
                 self._log("⚠️ 文件中未找到有效条款数据", "warning")
@@ -6565,6 +7762,66 @@ class ClauseOutputTab(QWidget):
         finally:
             self.progress_bar.setVisible(False)
 
+    def _append_excel_records(self, records: list, sheet_name: str, seen: set):
+        """追加一批Excel条款到列表（同名条款只保留第一条）"""
+        category = sheet_name if sheet_name != 'Sheet' else '条款'
+        batch = []
+        for record in records:
+            name = record.get('name')
+            if not name or name in seen:
+                continue
+            seen.add(name)
+            record['category'] = category
+            batch.append(record)
+        self.clause_model.append_records(batch)
+        self._update_clause_count()
+        QApplication.processEvents()
+
+    def _load_excel_fast(self, file_path: str, seen: set):
+        """v19.1: 只读、按列投影读取（只解析识别出的列，条款内容的加粗标记在使用时生成）"""
+        with XlsxClauseReader(file_path) as reader:
+            sheets = reader.sheet_names()
+            for i, sheet_name in enumerate(sheets):
+                for records in reader.iter_records(sheet_name, self._detect_columns):
+                    self._append_excel_records(records, sheet_name, seen)
+                self.progress_bar.setValue(10 + 70 * (i + 1) // len(sheets))
+
+    def _load_excel_full(self, file_path: str, seen: set):
+        """openpyxl 完整读取"""
+        # v18.9: 使用 rich_text=True 以保留加粗格式
+        wb = openpyxl.load_workbook(file_path, rich_text=True)
+
+        for sheet_name in wb.sheetnames:
+            ws = wb[sheet_name]
+            rows = list(ws.iter_rows())
+            if not rows:
+                continue
+
+            headers = [str(cell.value) if cell.value else '' for cell in rows[0]]
+
+            # 智能识别列
+            col_map = self._detect_columns(headers)
+
+            if not col_map.get('name'):
+                continue
+
+            self.progress_bar.setValue(30)
+
+            records = []
+            for row in rows[1:]:
+                if not row or not any(cell.value for cell in row):
+                    continue
+
+                records.append({
+                    'name': self._extract_cell_text(row, col_map.get('name')),
+                    'regNo': self._extract_cell_text(row, col_map.get('regNo')),
+                    'content': self._extract_cell_text(row, col_map.get('content')),
+                    'filename': self._extract_cell_text(row, col_map.get('filename'))
+                })
+            self._append_excel_records(records, sheet_name, seen)
+
+        wb.close()
+
     def _detect_columns(self, headers: list) -> dict:
         """智能识别Excel列 - 优先匹配「匹配1_」前缀的列（E/F/G）"""
         col_map = {}
@@ -6628,49 +7885,34 @@ class ClauseOutputTab(QWidget):
 
         return str(cell.value).strip() if cell.value else ''
 
-    def _update_clause_list(self):
-        """更新条款列表显示"""
-        self.clause_list.clear()
-
-        for item in self.report_data:
-            list_item = QListWidgetItem()
-            list_item.setCheckState(Qt.Checked)
+    def _update_clause_list(self, records: list):
+        """更新条款列表显示（v19.1: 替换模型数据，默认全部勾选）"""
+        self.clause_model.set_records(records)
+        self._update_clause_count()
 
-            # 显示格式：条款名称 (分类)
-            display_text = item['name']
-            if item.get('category'):
-                display_text += f"  [{item['category']}]"
-            if item.get('regNo'):
-                display_text += f"  ({item['regNo'][:20]}...)" if len(item.get('regNo', '')) > 20 else f"  ({item['regNo']})"
-
-            list_item.setText(display_text)
-            list_item.setData(Qt.UserRole, item)
-            self.clause_list.addItem(list_item)
+    def _update_clause_count(self):
+        total = self.clause_model.total_count()
+        shown = self.clause_model.rowCount()
+        if shown == total:
+            self.clause_count_label.setText(f"共 {total} 条")
+        else:
+            self.clause_count_label.setText(f"显示 {shown} / 共 {total} 条")
 
-        self.clause_count_label.setText(f"共 {len(self.report_data)} 条")
+    def _on_clause_filter_changed(self, text: str):
+        """v19.1: 筛选条款列表"""
+        self.clause_model.set_filter(text)
+        self._update_clause_count()
+        self.select_all_btn.setText("取消全选" if self.clause_model.rowCount() and self.clause_model.all_checked() else "全选")
 
     def _toggle_select_all(self):
-        """切换全选/取消"""
-        # 检查当前状态
-        all_checked = all(
-            self.clause_list.item(i).checkState() == Qt.Checked
-            for i in range(self.clause_list.count())
-        )
-
-        new_state = Qt.Unchecked if all_checked else Qt.Checked
-        for i in range(self.clause_list.count()):
-            self.clause_list.item(i).setCheckState(new_state)
-
+        """切换全选/取消（v19.1: 作用于当前筛选显示的条款）"""
+        all_checked = self.clause_model.all_checked()
+        self.clause_model.set_all_checked(not all_checked)
         self.select_all_btn.setText("取消全选" if not all_checked else "全选")
 
     def _get_selected_clauses(self) -> list:
-        """获取选中的条款"""
-        selected = []
-        for i in range(self.clause_list.count()):
-            item = self.clause_list.item(i)
-            if item.checkState() == Qt.Checked:
-                selected.append(item.data(Qt.UserRole))
-        return selected
+        """获取选中的条款（包括被筛选隐藏的已勾选条款）"""
+        return self.clause_model.checked_records()
 
     def _preview_output(self):
         """预览输出"""
@@ -6865,6 +8107,14 @@ class ClauseOutputTab(QWidget):
 
     def _generate_individual_docs(self, clauses: list, output_dir: str):
         """按条款逐个生成Word文档"""
+        if HAS_DOCX_STREAM:
+            # v19.1: 后台多进程生成
+            include_reg = self.include_reg_check.isChecked()
+            names = unique_filenames([safe_filename(c['name'], 50) for c in clauses])
+            jobs = [(name, 'clause', (clause, include_reg)) for name, clause in zip(names, clauses)]
+            self._start_word_export(jobs, output_dir, f"📄 开始生成 {len(clauses)} 个独立文档...")
+            return
+
         self.progress_bar.setVisible(True)
         self._log(f"📄 开始生成 {len(clauses)} 个独立文档...", "info")
 
@@ -6905,6 +8155,16 @@ class ClauseOutputTab(QWidget):
             cat = clause.get('category', '其他') or '其他'
             categorized[cat].append(clause)
 
+        if HAS_DOCX_STREAM:
+            # v19.1: 后台多进程生成
+            include_reg = self.include_reg_check.isChecked()
+            names = unique_filenames([f"{safe_filename(cat, 30)}_条款汇总" for cat in categorized])
+            jobs = [(name, 'category', (category, cat_clauses, include_reg))
+                    for name, (category, cat_clauses) in zip(names, categorized.items())]
+            self._start_word_export(jobs, output_dir, f"📄 按 {len(categorized)} 个分类生成文档...",
+                                    log_success=True)
+            return
+
         self._log(f"📄 按 {len(categorized)} 个分类生成文档...", "info")
 
         total = len(categorized)
@@ -6932,6 +8192,41 @@ class ClauseOutputTab(QWidget):
         if sys.platform == 'darwin':
             subprocess.run(['open', output_dir], check=False)
 
+    def _start_word_export(self, jobs: list, output_dir: str, start_message: str, log_success: bool = False):
+        """v19.1: 启动后台导出（先写入临时目录，完成后移动到位或打包为ZIP）"""
+        zip_path = None
+        if self.zip_export_check.isChecked():
+            zip_path = os.path.join(output_dir, f"条款导出_{datetime.now():%Y%m%d_%H%M}.zip")
+
+        self._log(start_message, "info")
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.generate_btn.setEnabled(False)
+
+        max_workers = default_workers() if HAS_PARALLEL_EXTRACT else 1
+        self._export_worker = WordExportWorker(jobs, output_dir, zip_path, max_workers, log_success)
+        self._export_worker.log_signal.connect(self._log)
+        self._export_worker.progress_signal.connect(self.progress_bar.setValue)
+        self._export_worker.finished_signal.connect(self._on_word_export_finished)
+        self._export_worker.start()
+
+    def _on_word_export_finished(self, success: bool, message: str, output_path: str):
+        self.progress_bar.setVisible(False)
+        self.generate_btn.setEnabled(True)
+        if not success:
+            self._log(f"❌ {message}", "error")
+            return
+        self._log(f"✅ 完成! {message}", "success")
+        if output_path.lower().endswith('.zip'):
+            self._log(f"   已打包: {output_path}", "info")
+            output_path = os.path.dirname(output_path)
+        else:
+            self._log(f"   输出目录: {output_path}", "info")
+
+        # 打开输出目录（使用subprocess防止命令注入）
+        if sys.platform == 'darwin':
+            subprocess.run(['open', output_path], check=False)
+
     def _set_run_font(self, run, size_pt: float, bold: bool = False, color_rgb=None):
         """设置run的字体：宋体(中文) + Times New Roman(英文)
 
@@ -7030,95 +8325,21 @@ class ClauseOutputTab(QWidget):
         try:
             self._log(f"📄 生成合并文档，共 {len(clauses)} 条条款...", "info")
 
-            doc = Document()
-
-            from docx.shared import Pt, RGBColor, Twips
-            from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING
-            from docx.oxml.ns import qn
-
-            # v18.15: 固定格式参数 - 5号字=10.5pt, 两端对齐, 单倍行距, 段后0.5行≈120twips
-            BODY_SIZE = 10.5  # 5号字
-            TITLE_SIZE = 10.5  # 标题也用5号字
-            SPACE_AFTER_HALF_LINE = 120  # 0.5行 (twips)
-
-            # 文档标题
-            title_para = doc.add_paragraph()
-            title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            title_run = title_para.add_run('条款汇总清单')
-            self._set_run_font(title_run, 16, bold=True)  # 三号字
-            title_para.paragraph_format.space_after = Twips(400)
-
-            # 生成日期
-            date_para = doc.add_paragraph()
-            date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            date_run = date_para.add_run(f"生成日期: {datetime.now():%Y年%m月%d日}")
-            self._set_run_font(date_run, 10, color_rgb=RGBColor(128, 128, 128))
-            date_para.paragraph_format.space_after = Twips(200)
-
-            self.progress_bar.setValue(40)
-
-            # 按分类组织
-            categorized = defaultdict(list)
-            for clause in clauses:
-                cat = clause.get('category', '其他') or '其他'
-                categorized[cat].append(clause)
-
-            clause_num = 1
-            for category, cat_clauses in categorized.items():
-                # 分类标题
-                cat_para = doc.add_paragraph()
-                cat_para.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-                cat_run = cat_para.add_run(f"【{category}】")
-                self._set_run_font(cat_run, TITLE_SIZE, bold=True, color_rgb=RGBColor(217, 119, 87))
-                cat_para.paragraph_format.space_after = Twips(SPACE_AFTER_HALF_LINE)
-
-                for clause in cat_clauses:
-                    # 条款前空行（除第一条外）
-                    if clause_num > 1:
-                        blank_para = doc.add_paragraph()
-                        blank_para.paragraph_format.space_after = Twips(SPACE_AFTER_HALF_LINE)
-
-                    # 条款名称（加粗，无下划线）
-                    name_para = doc.add_paragraph()
-                    name_para.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-                    name_run = name_para.add_run(f"{clause_num}. {clause['name']}")
-                    self._set_run_font(name_run, TITLE_SIZE, bold=True)
-                    name_para.paragraph_format.space_after = Twips(60)
-                    name_para.paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
-
-                    # 注册号 - v18.15: 直接输出，不添加额外前缀（数据已包含"注册号"或"产品注册号"）
-                    if self.include_reg_check.isChecked() and clause.get('regNo'):
-                        reg_para = doc.add_paragraph()
-                        reg_para.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-                        reg_run = reg_para.add_run(clause['regNo'])  # 直接输出，不加前缀
-                        self._set_run_font(reg_run, BODY_SIZE)
-                        reg_para.paragraph_format.space_after = Twips(60)
-                        reg_para.paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
-
-                    # 条款内容 - v18.15: 支持<b>标记保留加粗格式
-                    if clause.get('content'):
-                        content_lines = clause['content'].split('\n')
-                        for i, para_text in enumerate(content_lines):
-                            para_text = para_text.strip()
-                            if para_text:
-                                content_para = doc.add_paragraph()
-                                content_para.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-                                # 使用格式化方法处理可能包含<b>标记的文本
-                                self._add_formatted_text_to_paragraph(content_para, para_text, BODY_SIZE)
-                                # 最后一行段后0.5行，其他行无段后
-                                is_last_line = (i == len(content_lines) - 1)
-                                content_para.paragraph_format.space_after = Twips(SPACE_AFTER_HALF_LINE if is_last_line else 0)
-                                content_para.paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
-
-                    clause_num += 1
-
-            self.progress_bar.setValue(80)
-
-            doc.save(save_path)
+            if HAS_DOCX_STREAM:
+                # v19.1: 段落XML直接流式写入docx，内存占用与条款数量无关
+                def on_progress(done, total):
+                    self.progress_bar.setValue(20 + int(done / total * 70))
+                    QApplication.processEvents()
+                category_count = write_combined_doc(save_path, clauses, self.include_reg_check.isChecked(),
+                                                    on_progress)
+            else:
+                doc, category_count = self._create_combined_document(clauses)
+                self.progress_bar.setValue(80)
+                doc.save(save_path)
 
             self.progress_bar.setValue(100)
             self._log(f"✅ Word文档已生成: {os.path.basename(save_path)}", "success")
-            self._log(f"   共导出 {len(clauses)} 条条款，{len(categorized)} 个分类", "info")
+            self._log(f"   共导出 {len(clauses)} 条条款，{category_count} 个分类", "info")
 
             # 打开生成的文档（使用subprocess防止命令注入）
             if sys.platform == 'darwin':
@@ -7130,7 +8351,91 @@ class ClauseOutputTab(QWidget):
         finally:
             self.progress_bar.setVisible(False)
 
-    def _create_clause_document(self, clause: dict) -> Document:
+    def _create_combined_document(self, clauses: list):
+        """创建合并文档（python-docx），返回 (文档, 分类数)"""
+        doc = Document()
+
+        from docx.shared import Pt, RGBColor, Twips
+        from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING
+        from docx.oxml.ns import qn
+
+        # v18.15: 固定格式参数 - 5号字=10.5pt, 两端对齐, 单倍行距, 段后0.5行≈120twips
+        BODY_SIZE = 10.5  # 5号字
+        TITLE_SIZE = 10.5  # 标题也用5号字
+        SPACE_AFTER_HALF_LINE = 120  # 0.5行 (twips)
+
+        # 文档标题
+        title_para = doc.add_paragraph()
+        title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        title_run = title_para.add_run('条款汇总清单')
+        self._set_run_font(title_run, 16, bold=True)  # 三号字
+        title_para.paragraph_format.space_after = Twips(400)
+
+        # 生成日期
+        date_para = doc.add_paragraph()
+        date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        date_run = date_para.add_run(f"生成日期: {datetime.now():%Y年%m月%d日}")
+        self._set_run_font(date_run, 10, color_rgb=RGBColor(128, 128, 128))
+        date_para.paragraph_format.space_after = Twips(200)
+
+        # 按分类组织
+        categorized = defaultdict(list)
+        for clause in clauses:
+            cat = clause.get('category', '其他') or '其他'
+            categorized[cat].append(clause)
+
+        clause_num = 1
+        for category, cat_clauses in categorized.items():
+            # 分类标题
+            cat_para = doc.add_paragraph()
+            cat_para.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+            cat_run = cat_para.add_run(f"【{category}】")
+            self._set_run_font(cat_run, TITLE_SIZE, bold=True, color_rgb=RGBColor(217, 119, 87))
+            cat_para.paragraph_format.space_after = Twips(SPACE_AFTER_HALF_LINE)
+
+            for clause in cat_clauses:
+                # 条款前空行（除第一条外）
+                if clause_num > 1:
+                    blank_para = doc.add_paragraph()
+                    blank_para.paragraph_format.space_after = Twips(SPACE_AFTER_HALF_LINE)
+
+                # 条款名称（加粗，无下划线）
+                name_para = doc.add_paragraph()
+                name_para.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+                name_run = name_para.add_run(f"{clause_num}. {clause['name']}")
+                self._set_run_font(name_run, TITLE_SIZE, bold=True)
+                name_para.paragraph_format.space_after = Twips(60)
+                name_para.paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
+
+                # 注册号 - v18.15: 直接输出，不添加额外前缀（数据已包含"注册号"或"产品注册号"）
+                if self.include_reg_check.isChecked() and clause.get('regNo'):
+                    reg_para = doc.add_paragraph()
+                    reg_para.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+                    reg_run = reg_para.add_run(clause['regNo'])  # 直接输出，不加前缀
+                    self._set_run_font(reg_run, BODY_SIZE)
+                    reg_para.paragraph_format.space_after = Twips(60)
+                    reg_para.paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
+
+                # 条款内容 - v18.15: 支持<b>标记保留加粗格式
+                if clause.get('content'):
+                    content_lines = clause['content'].split('\n')
+                    for i, para_text in enumerate(content_lines):
+                        para_text = para_text.strip()
+                        if para_text:
+                            content_para = doc.add_paragraph()
+                            content_para.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+                            # 使用格式化方法处理可能包含<b>标记的文本
+                            self._add_formatted_text_to_paragraph(content_para, para_text, BODY_SIZE)
+                            # 最后一行段后0.5行，其他行无段后
+                            is_last_line = (i == len(content_lines) - 1)
+                            content_para.paragraph_format.space_after = Twips(SPACE_AFTER_HALF_LINE if is_last_line else 0)
+                            content_para.paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
+
+                clause_num += 1
+
+        return doc, len(categorized)
+
+    def _create_clause_document(self, clause: dict) -> 'docx.document.Document':
         """创建单个条款的Word文档 - v18.15格式：宋体+Times New Roman, 5号字, 两端对齐, 单倍行距"""
         from docx.shared import RGBColor, Twips
         from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING
@@ -7175,7 +8480,7 @@ class ClauseOutputTab(QWidget):
 
         return doc
 
-    def _create_category_document(self, category: str, clauses: list) -> Document:
+    def _create_category_document(self, category: str, clauses: list) -> 'docx.document.Document':
         """创建分类条款文档 - v18.15格式：宋体+Times New Roman, 5号字, 两端对齐, 单倍行距"""
         from docx.shared import RGBColor, Twips
         from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING
@@ -7279,6 +8584,16 @@ class ClauseComparisonAssistant(QMainWindow):
         else:
             self._mapping_manager = None
 
+        # v19.1: 会话共享的条款库索引（后台加载，查询/映射对话框与匹配线程共用）
+        self.library_service = LibraryIndexService(self)
+        self.library_service.progress.connect(self._on_library_progress)
+        self.library_service.ready.connect(self._on_library_ready)
+        self.library_service.failed.connect(self._on_library_failed)
+        self._library_prefetch_timer = QTimer(self)
+        self._library_prefetch_timer.setSingleShot(True)
+        self._library_prefetch_timer.setInterval(400)
+        self._library_prefetch_timer.timeout.connect(self._prefetch_library)
+
         self._setup_ui()
 
     def _setup_ui(self):
@@ -7381,20 +8696,15 @@ class ClauseComparisonAssistant(QMainWindow):
         self.main_tabs.addTab(self.output_tab, "📝 条款输出")
 
         # Tab 4 & 5: 保险计算器（如已安装）
+        # v19.1: 先放占位页，首次切换到任一计算器页时再导入并创建
+        self.main_insurance_tab = None
+        self.addon_insurance_tab = None
         if HAS_INSURANCE_CALC:
-            self.main_insurance_tab = MainInsuranceTab(self)
-            self.main_tabs.addTab(self.main_insurance_tab, "🧮 主险计算")
-
-            self.addon_insurance_tab = AddonInsuranceTab(self)
-            self.main_tabs.addTab(self.addon_insurance_tab, "📋 附加险计算")
-
-            # 连接信号：主险计算结果 → 附加险
-            self.main_insurance_tab.premium_calculated.connect(
-                self.addon_insurance_tab.receive_main_premium
-            )
-            self.main_insurance_tab.full_result_calculated.connect(
-                self.addon_insurance_tab.receive_full_data
+            self._insurance_tab_indexes = (
+                self.main_tabs.addTab(QWidget(), "🧮 主险计算"),
+                self.main_tabs.addTab(QWidget(), "📋 附加险计算"),
             )
+            self.main_tabs.currentChanged.connect(self._ensure_insurance_tabs)
 
         layout.addWidget(self.main_tabs, 1)
 
@@ -7404,6 +8714,41 @@ class ClauseComparisonAssistant(QMainWindow):
         version.setStyleSheet(f"color: {AnthropicColors.TEXT_SECONDARY}; font-size: 11px;")
         layout.addWidget(version)
 
+    def _ensure_insurance_tabs(self, index: int):
+        """切换到保险计算器页时创建主险/附加险Tab（仅首次）"""
+        if self.main_insurance_tab is not None or index not in self._insurance_tab_indexes:
+            return
+        try:
+            from insurance_calculator import MainInsuranceTab, AddonInsuranceTab
+        except ImportError as e:
+            logger.warning(f"保险计算器加载失败: {e}")
+            self.main_tabs.currentChanged.disconnect(self._ensure_insurance_tabs)
+            return
+
+        self.main_tabs.blockSignals(True)
+        try:
+            main_index, addon_index = self._insurance_tab_indexes
+            self.main_insurance_tab = MainInsuranceTab(self)
+            self.addon_insurance_tab = AddonInsuranceTab(self)
+            for tab_index, widget in ((main_index, self.main_insurance_tab), (addon_index, self.addon_insurance_tab)):
+                label = self.main_tabs.tabText(tab_index)
+                placeholder = self.main_tabs.widget(tab_index)
+                self.main_tabs.removeTab(tab_index)
+                self.main_tabs.insertTab(tab_index, widget, label)
+                placeholder.deleteLater()
+            self.main_tabs.setCurrentIndex(index)
+        finally:
+            self.main_tabs.blockSignals(False)
+        self.main_tabs.currentChanged.disconnect(self._ensure_insurance_tabs)
+
+        # 连接信号：主险计算结果 → 附加险
+        self.main_insurance_tab.premium_calculated.connect(
+            self.addon_insurance_tab.receive_main_premium
+        )
+        self.main_insurance_tab.full_result_calculated.connect(
+            self.addon_insurance_tab.receive_full_data
+        )
+
     def _create_comparison_tab(self) -> QWidget:
         """创建条款比对Tab"""
         tab = QWidget()
@@ -7504,10 +8849,17 @@ class ClauseComparisonAssistant(QMainWindow):
         self.sheet_combo.setToolTip("选择条款库中的险种Sheet（如财产险、责任险等）")
         # 当条款库文件改变时更新Sheet列表
         self.lib_input.textChanged.connect(self._update_sheet_list)
+        # v19.1: 条款库或Sheet变化后在后台预加载并建索引
+        self.sheet_combo.currentIndexChanged.connect(lambda _: self._library_prefetch_timer.start())
         sheet_row.addWidget(sheet_label)
         sheet_row.addWidget(self.sheet_combo, 1)
         card_layout.addLayout(sheet_row)
 
+        self.library_status_label = QLabel("")
+        self.library_status_label.setStyleSheet(f"color: {AnthropicColors.TEXT_MUTED}; font-size: 12px;")
+        self.library_status_label.setVisible(False)
+        card_layout.addWidget(self.library_status_label)
+
         line = QFrame()
         line.setFixedHeight(2)
         line.setStyleSheet(f"background: {AnthropicColors.BORDER};")
@@ -7612,6 +8964,15 @@ class ClauseComparisonAssistant(QMainWindow):
         mode_layout.addWidget(self.mode_hint_label)
         mode_layout.addSpacing(20)
         mode_layout.addWidget(self.precise_mode_checkbox)
+
+        # v19.1: 增量比对勾选框（修订版文档只重新匹配变化的条款）
+        if HAS_REMATCH:
+            self.incremental_checkbox = QCheckBox("🔁 增量比对")
+            self.incremental_checkbox.setToolTip("基于上一版比对报告，仅重新匹配新增/修改的条款\n报告末列标注变更状态")
+            self.incremental_checkbox.setCursor(Qt.PointingHandCursor)
+            self.incremental_checkbox.setStyleSheet(self.precise_mode_checkbox.styleSheet())
+            mode_layout.addSpacing(12)
+            mode_layout.addWidget(self.incremental_checkbox)
         mode_layout.addStretch()
         scroll_layout.addLayout(mode_layout)
 
@@ -7796,11 +9157,25 @@ class ClauseComparisonAssistant(QMainWindow):
         """打开条款映射管理对话框"""
         if HAS_MAPPING_MANAGER:
             # 获取当前条款库中的条款名称列表（用于下拉提示）
+            # v19.1: 条款库尚未加载完成时先打开对话框，加载完成后再补上下拉提示
             library_clauses = self._get_library_clauses()
+            library_key = self._current_library_key()
 
             dialog = ClauseMappingDialog(self, library_clauses=library_clauses)
             dialog.mappings_changed.connect(self._on_mappings_changed)
-            dialog.exec_()
+
+            def on_ready(snapshot):
+                if snapshot.key[:2] == library_key:
+                    dialog.set_library_clauses(snapshot.clause_names)
+
+            if not library_clauses and library_key:
+                self.library_service.ready.connect(on_ready)
+            try:
+                dialog.exec_()
+            finally:
+                if not library_clauses and library_key:
+                    self.library_service.ready.disconnect(on_ready)
+                dialog.deleteLater()
         elif self._config:
             # 兼容旧版：使用简单的添加对话框
             dialog = AddMappingDialog(self)
@@ -7820,48 +9195,65 @@ class ClauseComparisonAssistant(QMainWindow):
             QMessageBox.warning(self, "提示", "请先选择条款库文件！")
             return
 
-        try:
-            # 加载条款库并构建索引
-            logic = ClauseMatcherLogic()
-            sheet_name = self._get_selected_sheet()
-            lib_data = LibraryLoader.load_excel(library_path, sheet_name=sheet_name)
-            library_index = logic.build_index(lib_data)
+        # v19.1: 使用会话共享索引；尚未就绪时后台加载，对话框内显示进度
+        sheet_name = self._get_selected_sheet()
+        snapshot = self.library_service.request(library_path, sheet_name)
+
+        # 获取映射管理器
+        mapping_mgr = get_mapping_manager() if HAS_MAPPING_MANAGER else None
+
+        # 打开查询对话框
+        dialog = ClauseQueryDialog(
+            parent=self,
+            library_index=snapshot.index if snapshot else None,
+            logic=snapshot.logic if snapshot else None,
+            mapping_mgr=mapping_mgr,
+            library_service=self.library_service,
+            library_key=self._current_library_key()
+        )
+        dialog.exec_()
+        dialog.deleteLater()
 
-            # 获取映射管理器
-            mapping_mgr = get_mapping_manager() if HAS_MAPPING_MANAGER else None
+    def _current_library_key(self) -> Optional[Tuple[str, str]]:
+        """v19.1: 当前选择的 (条款库绝对路径, Sheet)"""
+        library_path = self.lib_input.text().strip()
+        if not library_path or not os.path.exists(library_path):
+            return None
+        return os.path.abspath(library_path), self._get_selected_sheet() or ''
 
-            # 打开查询对话框
-            dialog = ClauseQueryDialog(
-                parent=self,
-                library_index=library_index,
-                logic=logic,
-                mapping_mgr=mapping_mgr
-            )
-            dialog.exec_()
-        except Exception as e:
-            QMessageBox.warning(self, "错误", f"加载条款库失败: {sanitize_error_message(e)}")
+    def _prefetch_library(self):
+        """v19.1: 后台预加载当前条款库/Sheet"""
+        library_key = self._current_library_key()
+        if library_key is None:
+            self.library_status_label.setVisible(False)
+            return
+        snapshot = self.library_service.request(self.lib_input.text().strip(), self._get_selected_sheet())
+        if snapshot is not None:
+            self._on_library_ready(snapshot)
+
+    def _on_library_progress(self, stage: str, percent: int):
+        self.library_status_label.setText(f"⏳ {stage}... {percent}%")
+        self.library_status_label.setVisible(True)
+
+    def _on_library_ready(self, snapshot):
+        if snapshot.key[:2] != self._current_library_key():
+            return
+        self.library_status_label.setText(
+            f"✓ 条款库已就绪: {len(snapshot.index.data)} 条（{snapshot.load_seconds:.1f}s）")
+        self.library_status_label.setVisible(True)
+
+    def _on_library_failed(self, excel_path: str, error: str):
+        self.library_status_label.setText(f"⚠️ 条款库加载失败: {sanitize_error_message(error)}")
+        self.library_status_label.setVisible(True)
 
     def _get_library_clauses(self) -> List[str]:
-        """从当前条款库获取条款名称列表"""
+        """从当前条款库获取条款名称列表（v19.1: 取自会话共享索引，未就绪时触发后台加载并返回空列表）"""
         library_path = self.lib_input.text().strip()
         if not library_path or not os.path.exists(library_path):
             return []
 
-        try:
-            clauses = []
-            wb = openpyxl.load_workbook(library_path, read_only=True)
-            for sheet in wb.sheetnames:
-                ws = wb[sheet]
-                for row in ws.iter_rows(max_col=1, values_only=True):
-                    if row[0] and isinstance(row[0], str):
-                        name = row[0].strip()
-                        if name and len(name) > 3 and name not in clauses:
-                            clauses.append(name)
-            wb.close()
-            return clauses[:500]  # 限制数量防止内存问题
-        except Exception as e:
-            logger.warning(f"读取条款库失败: {e}")
-            return []
+        snapshot = self.library_service.request(library_path, self._get_selected_sheet())
+        return snapshot.clause_names if snapshot else []
 
     def _on_mappings_changed(self):
         """映射变更回调：更新配置"""
@@ -7914,6 +9306,17 @@ class ClauseComparisonAssistant(QMainWindow):
             QMessageBox.warning(self, "提示", "请完善所有文件路径！")
             return
 
+        # v19.1: 增量比对 - 输出路径已有比对状态时直接沿用，否则选择上一版报告
+        previous_report = None
+        if HAS_REMATCH and self.incremental_checkbox.isChecked():
+            if state_path_for(out).exists():
+                previous_report = out
+            else:
+                previous_report, _ = QFileDialog.getOpenFileName(
+                    self, "选择上一版比对报告", os.path.dirname(out), "Excel Files (*.xlsx)")
+                if not previous_report:
+                    return
+
         self._set_ui_state(False)
         self.log_text.clear()
 
@@ -7926,7 +9329,8 @@ class ClauseComparisonAssistant(QMainWindow):
         # v18.9: 获取精准识别模式
         precise_mode = self.precise_mode_checkbox.isChecked()
 
-        self.worker = MatchWorker(doc, excel, out, sheet_name, match_mode, precise_mode)
+        self.worker = MatchWorker(doc, excel, out, sheet_name, match_mode, precise_mode, previous_report,
+                                  library_service=self.library_service)
         self.worker.log_signal.connect(self._append_log)
         self.worker.progress_signal.connect(lambda c, t: self.progress_bar.setValue(int(c/t*100)))
         self.worker.finished_signal.connect(self._on_finished)
@@ -7945,7 +9349,8 @@ class ClauseComparisonAssistant(QMainWindow):
         # v18.9: 获取精准识别模式
         precise_mode = self.precise_mode_checkbox.isChecked()
 
-        self.batch_worker = BatchMatchWorker(files, self.lib_input.text(), output_dir, sheet_name, match_mode, precise_mode)
+        self.batch_worker = BatchMatchWorker(files, self.lib_input.text(), output_dir, sheet_name, match_mode,
+                                             precise_mode, library_service=self.library_service)
         self.batch_worker.log_signal.connect(self._append_log)
         self.batch_worker.batch_progress_signal.connect(
             lambda c, t, n: self.progress_bar.setValue(int(c/t*100))
@@ -8088,6 +9493,350 @@ def run_clause_test(doc_paths: List[Tuple[str, Optional[int], str]]):
     print('=' * 60)
 
 
+def _collect_docx_lines(doc_path: str) -> List[str]:
+    """收集文档中会被行分类器判定的全部文本行（段落 + 表格单元格按行拆分）"""
+    doc = Document(doc_path)
+    lines = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                lines.extend(l.strip() for l in cell.text.split('\n') if l.strip())
+    return lines
+
+
+def run_classifier_benchmark(doc_paths: List[str], repeat: int = 1):
+    """
+    v19.1: 行分类器一致性校验 + 性能基准
+    对每个文档的全部文本行，比较 ClauseLineClassifier 与逐条规则参考实现的判定结果，
+    并分别统计两者的耗时（分类器每轮前清空缓存，即冷启动耗时）
+    repeat: 行列表重复次数，用于把小文档放大到真实长清单的规模
+    """
+    import time
+
+    print('=' * 60)
+    print('条款行分类器 一致性校验 / 性能基准')
+    print('=' * 60)
+
+    classifier = ClauseMatcherLogic.get_line_classifier()
+    excluded_titles = ClauseMatcherLogic._load_excluded_titles()
+    all_passed = True
+
+    def timed(fn, lines) -> float:
+        start = time.perf_counter()
+        for line in lines:
+            fn(line)
+        return time.perf_counter() - start
+
+    for doc_path in doc_paths:
+        name = os.path.basename(doc_path)
+        if not os.path.exists(doc_path):
+            print(f'{name}: ⚠️ 文件不存在 - {doc_path}')
+            continue
+        try:
+            lines = _collect_docx_lines(doc_path) * max(1, repeat)
+        except Exception as e:
+            print(f'{name}: ❌ 错误 - {e}')
+            all_passed = False
+            continue
+
+        mismatches = []
+        for line in dict.fromkeys(lines):
+            ref_excluded = bool(excluded_titles) and \
+                ClauseMatcherLogic._remove_leading_number(line).upper() in excluded_titles
+            expected = (ClauseMatcherLogic._is_likely_title_reference(line),
+                        ClauseMatcherLogic._is_valid_clause_line_reference(line), ref_excluded)
+            actual = (classifier.is_likely_title(line), classifier.is_valid_clause_line(line),
+                      classifier.is_excluded(line))
+            if expected != actual:
+                mismatches.append((line, expected, actual))
+
+        ref_title = timed(ClauseMatcherLogic._is_likely_title_reference, lines)
+        ref_line = timed(ClauseMatcherLogic._is_valid_clause_line_reference, lines)
+        classifier.title_features.cache_clear()
+        classifier.line_features.cache_clear()
+        new_title = timed(classifier.is_likely_title, lines)
+        new_line = timed(classifier.is_valid_clause_line, lines)
+
+        status = '✅ 一致' if not mismatches else f'❌ {len(mismatches)} 行不一致'
+        if mismatches:
+            all_passed = False
+        print(f'{name}: {len(lines)} 行 {status}')
+        print(f'  is_likely_title:       参考 {ref_title * 1000:8.1f} ms  分类器 {new_title * 1000:8.1f} ms  '
+              f'({ref_title / max(new_title, 1e-9):.2f}x)')
+        print(f'  _is_valid_clause_line: 参考 {ref_line * 1000:8.1f} ms  分类器 {new_line * 1000:8.1f} ms  '
+              f'({ref_line / max(new_line, 1e-9):.2f}x)')
+        for line, expected, actual in mismatches[:10]:
+            print(f'    {line[:60]!r}: 参考(标题,条款行,排除)={expected} 分类器={actual}')
+
+    print('=' * 60)
+    print('✅ 判定结果全部一致' if all_passed else '❌ 存在不一致，请检查')
+    print('=' * 60)
+    return all_passed
+
+
+def run_retrieval_benchmark(library_path: str = None, sizes: Tuple[int, ...] = (10000, 100000, 500000),
+                            n_queries: int = 200, top_k: int = None, recall_at: int = 10):
+    """
+    v19.1: 大库两阶段检索基准
+    按给定规模构建 n-gram 倒排索引，用扰动后的库内名称做查询，
+    统计第一阶段检索延迟，以及相对全量余弦检索（exhaustive_search）的召回率：
+    recall@k 为全量 top-k 落入候选集的比例，top1 为全量最佳结果落入候选集的比例
+    library_path: 条款库Excel；为空时使用合成条款名称。库规模不足时以编号变体扩充
+    """
+    import random
+    import time
+
+    if not HAS_RETRIEVAL:
+        print('❌ 未找到 clause_retrieval，无法运行检索基准')
+        return False
+    from clause_retrieval import NgramRetrievalIndex
+
+    top_k = top_k or ClauseMatcherLogic.RETRIEVAL_TOP_K
+    rng = random.Random(20261018)
+
+    if library_path:
+        base_names = [str(lib.get('条款名称', '')).strip() for lib in LibraryLoader.load_excel(library_path)]
+        base_names = [n for n in base_names if n]
+    else:
+        perils = ['火灾', '爆炸', '雷击', '暴雨', '洪水', '台风', '地震', '盗窃', '抢劫', '罢工', '暴乱',
+                  '恐怖主义', '机器损坏', '锅炉爆炸', '玻璃破碎', '冰雹', '地面突然下陷', '供电中断']
+        objects = ['财产', '露天财产', '存货', '在建工程', '施工机具', '临时建筑', '电子设备', '运输工具',
+                   '雇员财产', '艺术品', '清理残骸费用', '专业费用', '灭火费用', '营业中断', '租金损失']
+        kinds = ['扩展条款', '附加条款', '特别条款', '除外条款', '特约条款', '保障条款']
+        lines = ['企业财产保险', '财产一切险', '建筑工程一切险', '安装工程一切险', '机器损坏保险', '公众责任险']
+        regions = ['北京', '上海', '广东', '江苏', '浙江', '山东', '四川', '湖北', '福建', '河南',
+                   '天津', '重庆', '辽宁', '安徽', '陕西', '湖南', '河北', '江西', '云南', '广西']
+        # 合成名称去重，避免大量同分并列使召回率失真
+        base_names = list(dict.fromkeys(
+            f'{rng.choice(regions)}{rng.choice(lines)}{rng.choice(perils)}{rng.choice(objects)}'
+            f'{rng.choice(kinds)}（{rng.randint(2009, 2025)}版）'
+            for _ in range(max(sizes) * 2)))
+    if not base_names:
+        print('❌ 条款库为空')
+        return False
+
+    def perturb(name: str) -> str:
+        chars = list(name)
+        pos = rng.randrange(len(chars))
+        if rng.random() < 0.5 and len(chars) > 4:
+            del chars[pos]
+        else:
+            chars[pos] = rng.choice(name)
+        return ''.join(chars)
+
+    print('=' * 60)
+    print(f'大库两阶段检索基准 (top_k={top_k}, recall@{recall_at}, 查询数={n_queries})')
+    print('=' * 60)
+
+    for size in sizes:
+        names = [base_names[i % len(base_names)] if i < len(base_names)
+                 else f'{base_names[i % len(base_names)]}（{i // len(base_names)}）' for i in range(size)]
+
+        start = time.perf_counter()
+        index = NgramRetrievalIndex().build(names)
+        build_time = time.perf_counter() - start
+
+        queries = [perturb(names[rng.randrange(size)]) for _ in range(n_queries)]
+        approx_times, exact_times, recalls, top1_hits = [], [], [], []
+        for query in queries:
+            start = time.perf_counter()
+            approx = index.search(query, top_k=top_k)
+            approx_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            exact = index.exhaustive_search(query, top_k=recall_at)
+            exact_times.append(time.perf_counter() - start)
+
+            if exact:
+                approx_ids = {idx for idx, _ in approx}
+                recalls.append(sum(1 for idx, _ in exact if idx in approx_ids) / len(exact))
+                top1_hits.append(exact[0][0] in approx_ids)
+
+        approx_times.sort()
+        p50 = approx_times[len(approx_times) // 2] * 1000
+        p95 = approx_times[int(len(approx_times) * 0.95)] * 1000
+        exact_avg = sum(exact_times) / len(exact_times) * 1000
+        recall = sum(recalls) / len(recalls) if recalls else 0.0
+        recall_top1 = sum(top1_hits) / len(top1_hits) if top1_hits else 0.0
+        print(f'{size:>8} 条: 构建 {build_time:6.1f} s  检索 p50 {p50:6.2f} ms / p95 {p95:6.2f} ms  '
+              f'全量 {exact_avg:7.2f} ms  recall@{recall_at} {recall:.3f}  top1 {recall_top1:.3f}')
+
+    print('=' * 60)
+    return True
+
+
+def run_watch_daemon(input_dir: str, output_dir: str, library_path: str, sheet_name: str = None,
+                     match_mode: str = "auto", interval: float = 2.0, settle_seconds: float = 5.0,
+                     once: bool = False):
+    """
+    v19.1: 监控目录自动比对（无界面）
+    条款库只加载一次并常驻索引；条款库文件更新时自动重新加载
+    条款库暂时不可用（正在保存、共享断开）时文件保持待处理，退避后重试
+    once: 处理完目录中现有文件后退出（条款库不可用时每个文件最多重试3次）
+    """
+    if not HAS_WATCH:
+        print('❌ 未找到 clause_watch，无法启动监控模式')
+        return False
+    if not os.path.isdir(input_dir):
+        print(f'❌ 输入目录不存在: {input_dir}')
+        return False
+    if not os.path.exists(library_path):
+        print(f'❌ 条款库不存在: {library_path}')
+        return False
+
+    logic = ClauseMatcherLogic()
+    logic._current_category = logic.detect_category_from_sheet(sheet_name)
+    mapping_mgr = get_mapping_manager() if HAS_MAPPING_MANAGER else None
+    warm = {'mtime_ns': None, 'index': None}
+
+    def ensure_index() -> LibraryIndex:
+        try:
+            mtime_ns = os.stat(library_path).st_mtime_ns
+            if warm['mtime_ns'] != mtime_ns:
+                lib_data = LibraryLoader.load_excel(library_path, sheet_name=sheet_name)
+                warm['index'] = logic.build_index(lib_data)
+                warm['mtime_ns'] = mtime_ns
+                logger.info(f"监控模式: 条款库已加载 {len(lib_data)} 条")
+        except Exception as e:
+            # 条款库正在被保存等情况：沿用已加载的索引，下次再试；尚无索引时文件稍后重试
+            if warm['index'] is None:
+                raise RetryableError(f"条款库暂时无法加载: {e}") from e
+            logger.warning(f"监控模式: 条款库重新加载失败，沿用旧索引 - {e}")
+        return warm['index']
+
+    def process(doc_path: str, report_path: str) -> Dict:
+        index = ensure_index()
+        clauses, auto_detected_mode = logic.parse_document(doc_path)
+        if match_mode == "auto":
+            is_title_only = auto_detected_mode
+        else:
+            is_title_only = match_mode == "title"
+
+        results = []
+        stats = defaultdict(int)
+        for idx, clause in enumerate(clauses, 1):
+            row, primary_match, _ = logic.build_report_row(clause, index, idx, is_title_only, mapping_mgr)
+            results.append(row)
+            stats[primary_match.match_level.value] += 1
+        ExcelStyler.save_report(results, report_path)
+        return {'clauses': len(clauses), **stats}
+
+    try:
+        ensure_index()
+    except RetryableError as e:
+        print(f'⚠️ {e}，将在处理文件时重试')
+    watcher = FolderWatcher(input_dir, output_dir, process, interval=interval, settle_seconds=settle_seconds,
+                            max_retries=3 if once else None)
+    print(f'👀 监控目录: {watcher.input_dir}')
+    print(f'📁 报告输出: {watcher.output_dir}')
+    print(f'📊 状态文件: {watcher.status_path}')
+    if once:
+        watcher.run_until_idle()
+    else:
+        watcher.run_forever()
+    return True
+
+
+# 后台预热的重型模块（按首次使用的先后排列）
+WARMUP_MODULES = (
+    'pandas',
+    'numpy',
+    'docx',
+    'sklearn.feature_extraction.text',
+    'sklearn.metrics.pairwise',
+    'pdfplumber',
+    'jieba',
+)
+
+
+def _warmup_worker():
+    start = time.perf_counter()
+    for name in WARMUP_MODULES:
+        if name == 'jieba':
+            if not HAS_JIEBA:
+                continue
+            try:
+                jieba._load()
+                t0 = time.perf_counter()
+                jieba.initialize()
+                _IMPORT_TIMINGS['jieba.initialize'] = time.perf_counter() - t0
+            except Exception as e:
+                logger.warning(f"jieba预热失败: {e}")
+            continue
+        if not _has_module(name.split('.')[0]):
+            continue
+        try:
+            _timed_import(name)
+        except Exception as e:
+            logger.warning(f"预热模块失败 {name}: {e}")
+    logger.info(f"后台预热完成: {time.perf_counter() - start:.2f}s")
+
+
+def warmup_heavy_modules() -> threading.Thread:
+    """窗口显示后在后台线程导入重型依赖并初始化jieba词典，首次比对无需等待"""
+    thread = threading.Thread(target=_warmup_worker, name='module-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def build_jieba_cache(output_dir: str = None) -> Optional[Path]:
+    """
+    预编译jieba前缀词典缓存（jieba.cache），随程序分发后首次分词无需重建词典
+
+    默认写到本脚本所在目录，打包时与可执行文件放在同一目录即可
+    """
+    if not HAS_JIEBA:
+        print('❌ 未安装 jieba')
+        return None
+    out_dir = Path(output_dir) if output_dir else Path(__file__).parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = out_dir / JIEBA_CACHE_NAME
+    if cache_path.exists():
+        cache_path.unlink()
+
+    import jieba as jieba_module
+    jieba_module.setLogLevel(logging.WARNING)
+    tokenizer = jieba_module.Tokenizer()
+    tokenizer.tmp_dir = str(out_dir)
+    tokenizer.cache_file = JIEBA_CACHE_NAME
+    start = time.perf_counter()
+    tokenizer.initialize()
+    print(f'✅ jieba词典缓存已生成: {cache_path} ({cache_path.stat().st_size / 1024 / 1024:.1f} MB, {time.perf_counter() - start:.2f}s)')
+    return cache_path
+
+
+def run_import_report():
+    """启动耗时报告：模块加载、窗口创建、重型依赖首次导入与jieba初始化耗时"""
+    module_time = _MODULE_LOADED_AT - _MODULE_START
+    preloaded = [name for name in WARMUP_MODULES if name in sys.modules]
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    start = time.perf_counter()
+    window = ClauseComparisonAssistant()
+    window_time = time.perf_counter() - start
+
+    print('=' * 60)
+    print('启动耗时报告')
+    print('=' * 60)
+    print(f'主模块加载:     {module_time * 1000:8.1f} ms')
+    print(f'主窗口创建:     {window_time * 1000:8.1f} ms')
+    print(f'合计(至可交互): {(module_time + window_time) * 1000:8.1f} ms')
+    print(f'启动时已加载的重型模块: {", ".join(preloaded) or "无"}')
+
+    _warmup_worker()
+    print('-' * 60)
+    print('重型依赖首次导入耗时（后台预热）:')
+    for name, seconds in sorted(_IMPORT_TIMINGS.items(), key=lambda x: -x[1]):
+        print(f'  {name:<34} {seconds * 1000:8.1f} ms')
+    jieba_cache = Path(jieba.dt.tmp_dir or '') / (jieba.dt.cache_file or '') if HAS_JIEBA else None
+    if jieba_cache and jieba.dt.cache_file:
+        print(f'jieba词典缓存: {jieba_cache}')
+    elif HAS_JIEBA:
+        print(f'jieba词典缓存: 系统临时目录（可用 --build-jieba-cache 预生成随程序分发）')
+    window.close()
+    return True
+
+
 def main():
     if hasattr(Qt, 'AA_EnableHighDpiScaling'):
         QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
@@ -8099,10 +9848,22 @@ def main():
 
     window = ClauseComparisonAssistant()
     window.show()
+    logger.info(f"窗口已显示，启动耗时 {time.perf_counter() - _MODULE_START:.2f}s")
+    # v19.1: 窗口显示后再在后台预热 pandas/sklearn/jieba 等重型依赖
+    QTimer.singleShot(500, warmup_heavy_modules)
     sys.exit(app.exec_())
 
 
+_MODULE_LOADED_AT = time.perf_counter()
+
 if __name__ == '__main__':
+    # 打包版（PyInstaller）启动并行提取工作进程所需
+    import multiprocessing
+    multiprocessing.freeze_support()
+
+    # insurance_calculator 会 import 本模块；注册别名，避免延迟加载时整个模块再执行一遍
+    sys.modules.setdefault('Clause_Comparison_Assistant', sys.modules['__main__'])
+
     # 支持命令行测试模式
     if len(sys.argv) > 1 and sys.argv[1] == '--test':
         import glob as glob_module
@@ -8121,6 +9882,51 @@ if __name__ == '__main__':
             (find_file('/Volumes/4TB-Samsung/works/*梅花*Quotation*.docx'), None, '梅花'),
         ]
         run_clause_test(test_docs)
+    elif len(sys.argv) > 1 and sys.argv[1] == '--import-report':
+        # 启动耗时报告: --import-report
+        sys.exit(0 if run_import_report() else 1)
+    elif len(sys.argv) > 1 and sys.argv[1] == '--build-jieba-cache':
+        # 预编译jieba词典缓存: --build-jieba-cache [输出目录]
+        sys.exit(0 if build_jieba_cache(sys.argv[2] if len(sys.argv) > 2 else None) else 1)
+    elif len(sys.argv) > 1 and sys.argv[1] == '--bench-classifier':
+        # 行分类器一致性校验与性能基准: --bench-classifier [--repeat N] <文件或glob> ...
+        import glob as glob_module
+        args = sys.argv[2:]
+        repeat = 1
+        if len(args) >= 2 and args[0] == '--repeat':
+            repeat = int(args[1])
+            args = args[2:]
+        if not args:
+            print('用法: python Clause_Comparison_Assistant.py --bench-classifier [--repeat N] <文件路径> ...')
+            sys.exit(1)
+        doc_files = []
+        for pattern in args:
+            doc_files.extend(glob_module.glob(pattern) if '*' in pattern else [pattern])
+        sys.exit(0 if run_classifier_benchmark(doc_files, repeat=repeat) else 1)
+    elif len(sys.argv) > 1 and sys.argv[1] == '--bench-retrieval':
+        # 大库检索基准: --bench-retrieval [--sizes 10000,100000,500000] [条款库.xlsx]
+        args = sys.argv[2:]
+        sizes = (10000, 100000, 500000)
+        if len(args) >= 2 and args[0] == '--sizes':
+            sizes = tuple(int(x) for x in args[1].split(','))
+            args = args[2:]
+        sys.exit(0 if run_retrieval_benchmark(args[0] if args else None, sizes=sizes) else 1)
+    elif len(sys.argv) > 1 and sys.argv[1] == '--watch':
+        # 监控目录模式: --watch <输入目录> <输出目录> --library <条款库.xlsx> [选项]
+        import argparse
+        parser = argparse.ArgumentParser(prog='Clause_Comparison_Assistant.py --watch',
+                                         description='监控目录，自动比对新增/变更的 docx/pdf')
+        parser.add_argument('input_dir', help='监控的输入目录（含子目录）')
+        parser.add_argument('output_dir', help='报告输出目录')
+        parser.add_argument('--library', required=True, help='条款库Excel')
+        parser.add_argument('--sheet', default=None, help='条款库Sheet名称')
+        parser.add_argument('--mode', default='auto', choices=['auto', 'title', 'content'], help='匹配模式')
+        parser.add_argument('--interval', type=float, default=2.0, help='扫描间隔（秒）')
+        parser.add_argument('--settle', type=float, default=5.0, help='文件静置多久视为写入完成（秒）')
+        parser.add_argument('--once', action='store_true', help='处理完现有文件后退出')
+        opts = parser.parse_args(sys.argv[2:])
+        sys.exit(0 if run_watch_daemon(opts.input_dir, opts.output_dir, opts.library, opts.sheet, opts.mode,
+                                       opts.interval, opts.settle, opts.once) else 1)
     elif len(sys.argv) > 1 and sys.argv[1] == '--parse':
         # 解析指定文件
         import glob as glob_module
@@ -28,17 +28,24 @@ if not exist "%ICON_FILE%" (
 )
 
 echo.
-echo [1/2] Cleaning old build files...
+echo [1/3] Cleaning old build files...
 if exist build rmdir /s /q build
 if exist dist rmdir /s /q dist
 
+:: Pre-build jieba prefix dictionary cache (shipped with the exe, skips dictionary rebuild on first use)
+echo.
+echo [2/3] Building jieba dictionary cache...
+if exist jieba.cache del /q jieba.cache
+python Clause_Comparison_Assistant.py --build-jieba-cache
+if errorlevel 1 echo [WARN] jieba.cache not generated, jieba will build it on first use
+
 setlocal enabledelayedexpansion
 
 :: Build --add-data list dynamically (skip missing files)
 echo.
 echo Checking data files...
 set DATA_ARGS=
-for %%F in (Property.json Liability.json clause_mapping_manager.py clause_mapping_dialog.py insurance_calculator.py wx.jpg zfb.jpg) do (
+for %%F in (Property.json Liability.json clause_mapping_manager.py clause_mapping_dialog.py insurance_calculator.py wx.jpg zfb.jpg jieba.cache) do (
     if exist "%%F" (
         set "DATA_ARGS=!DATA_ARGS! --add-data %%F;."
         echo   [OK] %%F
@@ -48,7 +55,7 @@ for %%F in (Property.json Liability.json clause_mapping_manager.py clause_mappin
 )
 
 echo.
-echo [2/2] Building...
+echo [3/3] Building...
 echo.
 
 pyinstaller ^
@@ -60,6 +67,8 @@ pyinstaller ^
     %ICON_PARAM% ^
     !DATA_ARGS! ^
     --hidden-import=jieba ^
+    --hidden-import=pandas ^
+    --hidden-import=docx ^
     --hidden-import=sklearn ^
     --hidden-import=sklearn.feature_extraction.text ^
     --hidden-import=sklearn.metrics.pairwise ^
@@ -67,7 +76,7 @@ pyinstaller ^
     --hidden-import=PyPDF2 ^
     --hidden-import=numpy ^
     --collect-data=jieba ^
-    Clause_Comparison_Assistant_windows.py
+    Clause_Comparison_Assistant.py
 
 endlocal
 
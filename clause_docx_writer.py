@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+"""
+条款Word文档流式生成
+
+功能：
+- StreamingDocxWriter：段落XML直接写入 .docx 压缩包中的 word/document.xml，
+  不在内存中构建文档对象树，内存占用与条款数量无关
+- 字体/字号/颜色组合对应的 run 属性XML只生成一次并缓存
+- <b> 加粗标记一次扫描切分（与 ClauseOutputTab._add_formatted_text_to_paragraph 规则一致，
+  包括跨行被拆开的不完整标签）
+- 先写入同目录临时文件，完成后原子替换目标文件
+- write_clause_doc / write_category_doc / write_combined_doc：v18.15 条款输出格式
+  （宋体 + Times New Roman，5号字，两端对齐，单倍行距，段后0.5行）
+- export_documents：批量导出（逐条款/按分类），多进程生成到输出目录下的临时目录，
+  全部完成后移动到位或直接打包为 ZIP（clause_zip，.docx 直接存储）；取消或出错时不会留下半成品
+
+样式、页面设置等其余部件取自 python-docx 默认模板，与 Document() 生成的文档一致。
+
+Date: 2026-10-18
+"""
+
+import io
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from clause_zip import write_zip
+
+# v18.15 固定格式参数
+BODY_SIZE = 10.5              # 5号字
+TITLE_SIZE = 10.5
+SPACE_AFTER_HALF_LINE = 120   # 0.5行 (twips)
+ACCENT_COLOR = 'D97757'
+GRAY_COLOR = '808080'
+
+ALIGN_CENTER = 'center'
+ALIGN_JUSTIFY = 'both'
+
+FLUSH_BYTES = 1 << 16
+DOCUMENT_PART = 'word/document.xml'
+
+EXPORT_BATCH_SIZE = 20      # 每个进程任务生成的文档数（减少进程间通信次数）
+MIN_DOCS_FOR_POOL = 40      # 文档太少时进程启动开销大于收益
+
+_RE_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_RE_RUN_SPECIAL = re.compile(r'[\t\n\r]')     # python-docx 写成 <w:tab/> / <w:br/> 的字符
+_RE_UNSAFE_FILENAME = re.compile(r'[\\/*?:"<>|]')
+
+
+@lru_cache(maxsize=1)
+def _template_parts() -> Tuple[List[Tuple[zipfile.ZipInfo, bytes]], str, str]:
+    """默认模板的其余部件，以及 document.xml 中 <w:body> 前后的XML"""
+    from docx import Document
+
+    buffer = io.BytesIO()
+    Document().save(buffer)
+    parts = []
+    with zipfile.ZipFile(buffer) as zf:
+        for info in zf.infolist():
+            if info.filename == DOCUMENT_PART:
+                document_xml = zf.read(info).decode('utf-8')
+            else:
+                parts.append((info, zf.read(info)))
+    body_start = document_xml.index('<w:body>') + len('<w:body>')
+    sect_start = document_xml.index('<w:sectPr', body_start)
+    return parts, document_xml[:body_start], document_xml[sect_start:]
+
+
+@lru_cache(maxsize=64)
+def run_properties(size_pt: float, bold: bool = False, color: str = None) -> str:
+    """run 属性XML（与 _set_run_font 的输出一致）"""
+    color_xml = f'<w:color w:val="{color}"/>' if color else ''
+    bold_xml = '<w:b/>' if bold else '<w:b w:val="0"/>'
+    return ('<w:rPr><w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman" w:eastAsia="宋体"/>'
+            f'{bold_xml}{color_xml}<w:sz w:val="{round(size_pt * 2)}"/></w:rPr>')
+
+
+@lru_cache(maxsize=64)
+def paragraph_properties(align: str = None, space_after: int = None, single: bool = False) -> str:
+    spacing = ''
+    if space_after is not None or single:
+        after = f' w:after="{space_after}"' if space_after is not None else ''
+        line = ' w:line="240" w:lineRule="auto"' if single else ''
+        spacing = f'<w:spacing{after}{line}/>'
+    jc = f'<w:jc w:val="{align}"/>' if align else ''
+    if not (spacing or jc):
+        return ''
+    return f'<w:pPr>{spacing}{jc}</w:pPr>'
+
+
+def tokenize_bold(text: str, base_bold: bool = False) -> List[Tuple[str, bool]]:
+    """
+    按 <b> 标记切分为 (文本, 是否加粗)
+
+    不完整的标签（加粗文本跨行被拆开）：
+    - 以 </b> 开头（之前没有 <b>）：开头部分加粗
+    - 以 <b> 结尾且之后没有标签：结尾部分加粗
+    """
+    segments = []
+    close = text.find('</b>')
+    if close != -1 and '<b>' not in text[:close]:
+        if close:
+            segments.append((text[:close], True))
+        text = text[close + 4:]
+
+    tail = None
+    last_open = text.rfind('<b>')
+    if last_open != -1 and '<' not in text[last_open + 3:]:
+        tail = text[last_open + 3:]
+        text = text[:last_open]
+
+    pos = 0
+    while True:
+        start = text.find('<b>', pos)
+        if start == -1:
+            break
+        end = text.find('</b>', start + 3)
+        if end == -1:
+            break
+        if start > pos:
+            segments.append((text[pos:start], base_bold))
+        if end > start + 3:
+            segments.append((text[start + 3:end], True))
+        pos = end + 4
+    if pos < len(text):
+        segments.append((text[pos:], base_bold))
+
+    if tail:
+        segments.append((tail, True))
+    return segments
+
+
+def _text_xml(text: str) -> str:
+    """run 文本XML：与 python-docx run.text 相同，制表符转 <w:tab/>，\\n、\\r 转 <w:br/>，首尾空白保留"""
+    text = _RE_INVALID_XML.sub('', text)
+    pieces = []
+    pos = 0
+    for match in _RE_RUN_SPECIAL.finditer(text + '\n'):
+        chunk = text[pos:match.start()]
+        if chunk:
+            preserve = ' xml:space="preserve"' if chunk != chunk.strip() else ''
+            pieces.append(f'<w:t{preserve}>{escape(chunk)}</w:t>')
+        if match.start() < len(text):
+            pieces.append('<w:tab/>' if match.group() == '\t' else '<w:br/>')
+        pos = match.end()
+    return ''.join(pieces)
+
+
+class StreamingDocxWriter:
+    """
+    流式 .docx 写入器
+
+    with StreamingDocxWriter(path) as writer:
+        writer.paragraph("标题", size_pt=16, bold=True, align=ALIGN_CENTER)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._tmp_path = f"{path}.{os.getpid()}.tmp"
+        parts, self._head, self._tail = _template_parts()
+        self._zip = zipfile.ZipFile(self._tmp_path, 'w', zipfile.ZIP_DEFLATED)
+        try:
+            for info, data in parts:
+                self._zip.writestr(info, data)
+            self._stream = self._zip.open(DOCUMENT_PART, 'w', force_zip64=True)
+        except BaseException:
+            self._zip.close()
+            os.remove(self._tmp_path)
+            raise
+        self._buffer: List[str] = [self._head]
+        self._buffered = 0
+        self.paragraph_count = 0
+
+    def _write(self, xml: str):
+        self._buffer.append(xml)
+        self._buffered += len(xml)
+        if self._buffered >= FLUSH_BYTES:
+            self._flush()
+
+    def _flush(self):
+        self._stream.write(''.join(self._buffer).encode('utf-8'))
+        self._buffer = []
+        self._buffered = 0
+
+    def paragraph(self, text: str = '', size_pt: float = BODY_SIZE, bold: bool = False, color: str = None,
+                  align: str = None, space_after: int = None, single: bool = False, markup: bool = False):
+        """
+        写入一个段落
+
+        Args:
+            markup: 是否解析 <b> 加粗标记（bold 为标记外文本的基础粗细）
+        """
+        runs = tokenize_bold(text, bold) if markup else ([(text, bold)] if text else [])
+        xml = ['<w:p>', paragraph_properties(align, space_after, single)]
+        for run_text, run_bold in runs:
+            xml.append(f'<w:r>{run_properties(size_pt, run_bold, color)}{_text_xml(run_text)}</w:r>')
+        xml.append('</w:p>')
+        self._write(''.join(xml))
+        self.paragraph_count += 1
+
+    def blank(self, space_after: int = None):
+        self.paragraph(space_after=space_after)
+
+    def close(self):
+        """写完文档并原子替换目标文件"""
+        self._write(self._tail)
+        self._flush()
+        self._stream.close()
+        self._zip.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        """放弃写入，删除临时文件"""
+        try:
+            self._stream.close()
+            self._zip.close()
+        finally:
+            if os.path.exists(self._tmp_path):
+                os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+# ==========================================
+# v18.15 条款输出格式
+# ==========================================
+def _write_content(writer: StreamingDocxWriter, content: str):
+    """条款内容：逐行成段，支持<b>标记；最后一行段后0.5行"""
+    lines = content.split('\n')
+    last = len(lines) - 1
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if line:
+            writer.paragraph(line, BODY_SIZE, align=ALIGN_JUSTIFY, single=True, markup=True,
+                             space_after=SPACE_AFTER_HALF_LINE if i == last else 0)
+
+
+def _write_numbered_clause(writer: StreamingDocxWriter, number: int, clause: Dict, include_reg: bool):
+    # 条款前空行（除第一条外）
+    if number > 1:
+        writer.blank(SPACE_AFTER_HALF_LINE)
+    # 条款名称（加粗，无下划线）
+    writer.paragraph(f"{number}. {clause['name']}", TITLE_SIZE, bold=True, align=ALIGN_JUSTIFY,
+                     space_after=60, single=True)
+    # 注册号 - 直接输出，不添加额外前缀（数据已包含"注册号"或"产品注册号"）
+    if include_reg and clause.get('regNo'):
+        writer.paragraph(clause['regNo'], BODY_SIZE, align=ALIGN_JUSTIFY, space_after=60, single=True)
+    if clause.get('content'):
+        _write_content(writer, clause['content'])
+
+
+def write_clause_doc(path: str, clause: Dict, include_reg: bool = True):
+    """单个条款文档"""
+    with StreamingDocxWriter(path) as writer:
+        writer.paragraph(clause['name'], TITLE_SIZE, bold=True, align=ALIGN_CENTER, space_after=60, single=True)
+        if include_reg and clause.get('regNo'):
+            writer.paragraph(clause['regNo'], BODY_SIZE, align=ALIGN_CENTER,
+                             space_after=SPACE_AFTER_HALF_LINE, single=True)
+        if clause.get('content'):
+            _write_content(writer, clause['content'])
+
+
+def write_category_doc(path: str, category: str, clauses: List[Dict], include_reg: bool = True):
+    """分类条款汇总文档"""
+    with StreamingDocxWriter(path) as writer:
+        writer.paragraph(f"【{category}】条款汇总", 14, bold=True, align=ALIGN_CENTER, space_after=200)
+        writer.paragraph(f"共 {len(clauses)} 条 · {datetime.now():%Y-%m-%d}", 10, color=GRAY_COLOR,
+                         align=ALIGN_CENTER, space_after=200)
+        for i, clause in enumerate(clauses, 1):
+            _write_numbered_clause(writer, i, clause, include_reg)
+
+
+def write_combined_doc(path: str, clauses: List[Dict], include_reg: bool = True,
+                       on_progress: Callable[[int, int], None] = None) -> int:
+    """
+    全部条款合并文档（按分类分组，全局编号）
+
+    Returns:
+        分类数
+    """
+    categorized = defaultdict(list)
+    for clause in clauses:
+        categorized[clause.get('category', '其他') or '其他'].append(clause)
+
+    total = len(clauses)
+    with StreamingDocxWriter(path) as writer:
+        writer.paragraph('条款汇总清单', 16, bold=True, align=ALIGN_CENTER, space_after=400)  # 三号字
+        writer.paragraph(f"生成日期: {datetime.now():%Y年%m月%d日}", 10, color=GRAY_COLOR,
+                         align=ALIGN_CENTER, space_after=200)
+        clause_num = 1
+        for category, cat_clauses in categorized.items():
+            writer.paragraph(f"【{category}】", TITLE_SIZE, bold=True, color=ACCENT_COLOR,
+                             align=ALIGN_JUSTIFY, space_after=SPACE_AFTER_HALF_LINE)
+            for clause in cat_clauses:
+                _write_numbered_clause(writer, clause_num, clause, include_reg)
+                if on_progress and clause_num % 200 == 0:
+                    on_progress(clause_num, total)
+                clause_num += 1
+    return len(categorized)
+
+
+# ==========================================
+# 批量导出
+# ==========================================
+_WRITERS = {
+    'clause': write_clause_doc,
+    'category': write_category_doc,
+}
+
+
+def safe_filename(name: str, limit: int) -> str:
+    """清理文件名中的非法字符并截断"""
+    return _RE_UNSAFE_FILENAME.sub('_', name)[:limit]
+
+
+def unique_filenames(names: Sequence[str], suffix: str = '.docx') -> List[str]:
+    """生成不重名的文件名（不区分大小写，重名时追加 _2、_3 ...）"""
+    used = set()
+    result = []
+    for name in names:
+        candidate, n = f"{name}{suffix}", 1
+        while candidate.lower() in used:
+            n += 1
+            candidate = f"{name}_{n}{suffix}"
+        used.add(candidate.lower())
+        result.append(candidate)
+    return result
+
+
+def _write_batch(directory: str, jobs: List[Tuple[str, str, tuple]]) -> List[Tuple[str, Optional[str]]]:
+    """生成一批文档（模块级函数，供进程池调用），返回 [(文件名, 错误信息或 None)]"""
+    results = []
+    for filename, kind, args in jobs:
+        try:
+            _WRITERS[kind](os.path.join(directory, filename), *args)
+        except Exception as e:
+            results.append((filename, f"{type(e).__name__}: {e}"))
+        else:
+            results.append((filename, None))
+    return results
+
+
+def export_documents(jobs: Sequence[Tuple[str, str, tuple]], output_dir: str, max_workers: int = 1,
+                     zip_path: str = None,
+                     on_result: Callable[[str, Optional[str]], None] = None,
+                     on_progress: Callable[[int, int], None] = None,
+                     should_stop: Callable[[], bool] = None) -> Dict:
+    """
+    批量导出文档
+
+    Args:
+        jobs: [(文件名, 'clause' | 'category', 写入函数参数), ...]，文件名需互不相同（见 unique_filenames）
+        zip_path: 指定时打包为 ZIP，不在输出目录中保留单个文档
+        on_result(文件名, 错误信息或 None)、on_progress(已完成, 总数) 在调用线程中回调
+
+    Returns:
+        {'written': 成功数, 'failed': 失败数, 'cancelled': 是否取消, 'paths': 最终文件路径列表}
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # 临时目录与输出目录在同一文件系统，移动即原子替换
+    staging = tempfile.mkdtemp(prefix='.clause_export_', dir=output_dir)
+    total = len(jobs)
+    done = 0
+    written: List[str] = []
+    summary = {'written': 0, 'failed': 0, 'cancelled': False, 'paths': []}
+
+    def collect(results):
+        nonlocal done
+        for filename, error in results:
+            done += 1
+            if error is None:
+                written.append(filename)
+            else:
+                summary['failed'] += 1
+            if on_result:
+                on_result(filename, error)
+        if on_progress:
+            on_progress(done, total)
+
+    try:
+        batches = [list(jobs[i:i + EXPORT_BATCH_SIZE]) for i in range(0, total, EXPORT_BATCH_SIZE)]
+        if max_workers <= 1 or total < MIN_DOCS_FOR_POOL:
+            for batch in batches:
+                if should_stop and should_stop():
+                    summary['cancelled'] = True
+                    return summary
+                collect(_write_batch(staging, batch))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = [pool.submit(_write_batch, staging, batch) for batch in batches]
+                for future in as_completed(futures):
+                    if should_stop and should_stop():
+                        summary['cancelled'] = True
+                        pool.shutdown(wait=True, cancel_futures=True)
+                        return summary
+                    collect(future.result())
+
+        # 全部生成后再放到最终位置
+        if zip_path:
+            # .docx 本身已压缩，write_zip 直接存储，不再重复压缩
+            tmp_zip = os.path.join(staging, os.path.basename(zip_path))
+            packed = write_zip([(os.path.join(staging, filename), filename) for filename in written],
+                               tmp_zip, should_stop=should_stop)
+            if packed['cancelled']:
+                summary['cancelled'] = True
+                return summary
+            if packed['failed']:
+                src, error = packed['failed'][0]
+                raise OSError(f"打包失败: {os.path.basename(src)} - {error}")
+            os.replace(tmp_zip, zip_path)
+            summary['paths'] = [zip_path]
+        else:
+            for filename in written:
+                target = os.path.join(output_dir, filename)
+                os.replace(os.path.join(staging, filename), target)
+                summary['paths'].append(target)
+        summary['written'] = len(written)
+        return summary
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+条款Excel快速读取（只读、按列投影）
+
+功能：
+- 直接流式解析 xlsx 中的工作表 XML，只取识别出的条款名称/注册号/内容等列，
+  不为每个单元格创建 openpyxl 对象
+- 共享字符串只解析一次；含加粗的富文本只记录文本片段，<b> 标记在首次使用
+  （显示提示、生成文档）时才拼接（RichCell）
+- 结果与 openpyxl rich_text=True + ClauseOutputTab._extract_cell_text 一致：
+  加粗片段用 <b>...</b> 标记，首尾空白去除；公式单元格返回公式文本；
+  日期/时长格式的数字按 styles.xml 的数字格式转换为日期文本（与 ledger_reader 相同）
+
+Date: 2026-10-18
+"""
+
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, WINDOWS_EPOCH, from_excel, from_ISO8601
+
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+DEFAULT_BATCH_SIZE = 2000
+
+
+class XlsxReadError(Exception):
+    """文件结构无法识别（调用方可改用 openpyxl 完整读取）"""
+
+
+class RichCell:
+    """含加粗片段的富文本，str() 时生成带 <b> 标记的文本（结果缓存）"""
+
+    __slots__ = ('runs', '_markup')
+
+    def __init__(self, runs: Tuple[Tuple[str, bool], ...]):
+        self.runs = runs
+        self._markup = None
+
+    def __str__(self) -> str:
+        if self._markup is None:
+            self._markup = ''.join(f'<b>{text}</b>' if bold else text for text, bold in self.runs).strip()
+        return self._markup
+
+    def __bool__(self) -> bool:
+        return bool(self.runs)
+
+    @property
+    def plain(self) -> str:
+        return ''.join(text for text, _ in self.runs).strip()
+
+
+def cell_text(value) -> str:
+    """单元格值 -> 文本（RichCell 在此时生成标记）"""
+    return value if isinstance(value, str) else str(value)
+
+
+def _column_index(ref: str) -> int:
+    """'AB12' -> 27（从0开始）"""
+    idx = 0
+    for ch in ref:
+        if 'A' <= ch <= 'Z':
+            idx = idx * 26 + ord(ch) - 64
+        else:
+            break
+    return idx - 1
+
+
+def _cast_number(value: str) -> str:
+    """与 openpyxl 相同的数值转换后再转回文本（'1.50' -> '1.5'）"""
+    try:
+        number = float(value) if ('.' in value or 'E' in value or 'e' in value) else int(value)
+    except ValueError:
+        return value
+    return str(number) if number else ''
+
+
+class XlsxClauseReader:
+    """
+    xlsx 条款读取器
+
+    用法：
+        with XlsxClauseReader(path) as reader:
+            for sheet in reader.sheet_names():
+                for batch in reader.iter_records(sheet, detect_columns):
+                    ...
+    """
+
+    def __init__(self, path: str):
+        try:
+            self._zip = zipfile.ZipFile(path)
+        except (zipfile.BadZipFile, OSError) as e:
+            raise XlsxReadError(f"不是有效的 xlsx 文件: {e}") from e
+        self._sheets: List[Tuple[str, str]] = []
+        self._shared_path: Optional[str] = None
+        self._styles_path: Optional[str] = None
+        self._shared: Optional[List[object]] = None
+        self._epoch = WINDOWS_EPOCH
+        self._date_styles: Dict[int, bool] = {}    # 样式序号 -> 是否为时长格式
+        try:
+            self._read_workbook()
+            self._read_styles()
+        except (KeyError, ValueError, ET.ParseError) as e:
+            self._zip.close()
+            raise XlsxReadError(f"工作簿结构无法识别: {e}") from e
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- 工作簿结构 ----------
+    @staticmethod
+    def _rels(data: bytes, base_dir: str) -> Dict[str, Tuple[str, str]]:
+        """关系文件 -> {Id: (类型, 包内路径)}"""
+        rels = {}
+        for rel in ET.fromstring(data).iter(f'{{{_PKG_REL_NS}}}Relationship'):
+            target = rel.get('Target', '')
+            path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join(base_dir, target))
+            rels[rel.get('Id')] = (rel.get('Type', ''), path)
+        return rels
+
+    def _read_workbook(self):
+        workbook_path = 'xl/workbook.xml'
+        if '_rels/.rels' in self._zip.namelist():
+            for rel_type, path in self._rels(self._zip.read('_rels/.rels'), '').values():
+                if rel_type.endswith('/officeDocument'):
+                    workbook_path = path
+        base_dir = posixpath.dirname(workbook_path)
+        rels_path = posixpath.join(base_dir, '_rels', posixpath.basename(workbook_path) + '.rels')
+        rels = self._rels(self._zip.read(rels_path), base_dir)
+        for rel_type, path in rels.values():
+            if rel_type.endswith('/sharedStrings'):
+                self._shared_path = path
+            elif rel_type.endswith('/styles'):
+                self._styles_path = path
+
+        root = ET.fromstring(self._zip.read(workbook_path))
+        self._ns = root.tag[:root.tag.index('}') + 1] if root.tag.startswith('{') else ''
+        pr = root.find(f'{self._ns}workbookPr')
+        if pr is not None and pr.get('date1904', '').lower() in ('1', 'true'):
+            self._epoch = CALENDAR_MAC_1904
+        for sheet in root.iter(f'{self._ns}sheet'):
+            rel_type, path = rels.get(sheet.get(f'{{{_REL_NS}}}id'), ('', ''))
+            if rel_type.endswith('/worksheet'):    # 跳过图表页
+                self._sheets.append((sheet.get('name'), path))
+
+    def _read_styles(self):
+        """记录数字格式为日期/时长的单元格样式"""
+        if not self._styles_path or self._styles_path not in self._zip.namelist():
+            return
+        ns = self._ns
+        root = ET.fromstring(self._zip.read(self._styles_path))
+        custom = {int(fmt.get('numFmtId')): fmt.get('formatCode')
+                  for fmt in root.iterfind(f'{ns}numFmts/{ns}numFmt')}
+        for idx, xf in enumerate(root.iterfind(f'{ns}cellXfs/{ns}xf')):
+            fmt_id = int(xf.get('numFmtId', 0))
+            fmt = custom[fmt_id] if fmt_id in custom else BUILTIN_FORMATS.get(fmt_id)
+            if is_date_format(fmt):
+                self._date_styles[idx] = is_timedelta_format(fmt)
+
+    def sheet_names(self) -> List[str]:
+        return [name for name, _ in self._sheets]
+
+    # ---------- 文本 ----------
+    def _parse_text(self, node) -> object:
+        """<si>/<is> 节点 -> str 或 RichCell（与 openpyxl rich_text 读取规则一致）"""
+        ns = self._ns
+        t = node.find(f'{ns}t')
+        if t is not None:
+            return (t.text or '').replace('x005F_', '')
+        runs = []
+        has_bold = False
+        for r in node.iterfind(f'{ns}r'):
+            text = (r.findtext(f'{ns}t') or '').replace('x005F_', '')
+            rpr = r.find(f'{ns}rPr')
+            bold = False
+            if rpr is not None:
+                b = rpr.find(f'{ns}b')
+                bold = b is not None and b.get('val', 'true').lower() not in ('0', 'false')
+            has_bold = has_bold or bold
+            runs.append((text, bold))
+        if not has_bold:
+            return ''.join(text for text, _ in runs)
+        return RichCell(tuple(runs))
+
+    def _shared_strings(self) -> List[object]:
+        if self._shared is None:
+            self._shared = []
+            if self._shared_path and self._shared_path in self._zip.namelist():
+                with self._zip.open(self._shared_path) as f:
+                    for node in self._iter_elements(f, f'{self._ns}si'):
+                        self._shared.append(self._parse_text(node))
+        return self._shared
+
+    def _cell_value(self, c) -> object:
+        ns = self._ns
+        data_type = c.get('t', 'n')
+        value = inline = None
+        for child in c:
+            tag = child.tag[len(ns):]
+            if tag == 'f':
+                return '=' + (child.text or '')
+            if tag == 'v':
+                value = child.text
+            elif tag == 'is':
+                inline = child
+        if data_type == 'inlineStr':
+            value = self._parse_text(inline) if inline is not None else ''
+        else:
+            if value is None:
+                return ''
+            if data_type == 's':
+                value = self._shared_strings()[int(value)]
+            elif data_type == 'n':
+                style = c.get('s')
+                if style and int(style) in self._date_styles:
+                    return self._date_text(value, self._date_styles[int(style)])
+                return _cast_number(value)
+            elif data_type == 'd':
+                return str(from_ISO8601(value))
+            elif data_type == 'b':
+                return 'True' if int(value) else ''
+        if isinstance(value, str):
+            return value.strip()
+        return value
+
+    def _date_text(self, value: str, is_timedelta: bool) -> str:
+        """日期格式的数字 -> str(datetime/time/timedelta)，无法转换时与 openpyxl 相同记为 #VALUE!"""
+        try:
+            number = float(value) if ('.' in value or 'E' in value or 'e' in value) else int(value)
+            return str(from_excel(number, self._epoch, timedelta=is_timedelta))
+        except (OverflowError, ValueError):
+            return '#VALUE!'
+
+    # ---------- 行 ----------
+    @staticmethod
+    def _iter_elements(f, tag: str) -> Iterator[object]:
+        """流式产出指定标签的元素，处理完后释放（不保留已处理的兄弟节点）"""
+        # 记下目标元素的父节点（sheetData/sst），每处理完一个元素清空一次
+        parent = None
+        stack = []
+        for event, node in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                if parent is None and node.tag == tag and stack:
+                    parent = stack[-1]
+                stack.append(node)
+                continue
+            stack.pop()
+            if node.tag == tag:
+                yield node
+                node.clear()
+                if parent is not None:
+                    parent.clear()
+
+    def _iter_rows(self, path: str) -> Iterator[Tuple[int, object]]:
+        """逐行产出 (行号, row 元素)"""
+        row_counter = 0
+        with self._zip.open(path) as f:
+            for node in self._iter_elements(f, f'{self._ns}row'):
+                r = node.get('r')
+                row_counter = int(r) if r else row_counter + 1
+                yield row_counter, node
+
+    def _row_cells(self, row, wanted: Optional[Dict[int, str]]) -> Dict[int, object]:
+        """行内单元格 -> {列序号: 值}；wanted 为 None 时读取全部列"""
+        cells = {}
+        col = -1
+        for c in row.iterfind(f'{self._ns}c'):
+            ref = c.get('r')
+            col = _column_index(ref) if ref else col + 1
+            if wanted is None or col in wanted:
+                cells[col] = self._cell_value(c)
+        return cells
+
+    def iter_records(self, sheet: str, detect_columns: Callable[[List[str]], Dict[str, int]],
+                     lazy_fields: Sequence[str] = ('content',),
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict[str, object]]]:
+        """
+        按批产出条款记录 {字段: 值}
+
+        第1行作为表头交给 detect_columns 识别列（返回 {字段: 列序号}），
+        之后只读取识别出的列。lazy_fields 中的富文本保持 RichCell，其余字段为 str。
+        """
+        path = dict(self._sheets)[sheet]
+        wanted: Optional[Dict[int, str]] = None
+        batch: List[Dict[str, object]] = []
+        try:
+            for row_no, row in self._iter_rows(path):
+                if wanted is None:
+                    header = self._row_cells(row, None) if row_no == 1 else {}
+                    headers = [''] * (max(header) + 1 if header else 0)
+                    for col, value in header.items():
+                        headers[col] = value.plain if isinstance(value, RichCell) else value
+                    wanted = {col: field for field, col in detect_columns(headers).items() if col is not None}
+                    if row_no == 1:
+                        continue
+                cells = self._row_cells(row, wanted)
+                record = {}
+                for col, field in wanted.items():
+                    value = cells.get(col, '')
+                    record[field] = value if field in lazy_fields else cell_text(value)
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        except (KeyError, ET.ParseError) as e:
+            raise XlsxReadError(f"工作表 {sheet} 解析失败: {e}") from e
+        if batch:
+            yield batch
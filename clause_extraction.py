@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+条款文件并行提取引擎
+
+功能：
+- 将文件分发到多个工作进程解析（docx/pdf 解析是 CPU 密集型，多线程无法并行）
+- 结果按完成顺序回调，界面可以边提取边显示
+- 单个文件出错或超时只影响该文件：超时后终止进程池并重建，其余进行中的文件重新提交
+- 工作进程数可配置；只有 1 个进程或文件很少时直接在当前进程内顺序执行
+- 提取清单（ExtractionManifest）：记录每个文件的大小、修改时间、内容哈希和提取结果，
+  再次提取同一文件夹时只解析新增/修改的文件
+
+提取函数必须是模块级函数（可被 pickle），参数为文件路径，返回该文件的结果列表
+（见 Clause_Comparison_Assistant.extract_clause_file）。
+
+Date: 2026-10-18
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 180.0     # 单个文件解析超时（秒）
+MAX_TASKS_PER_CHILD = 50    # 工作进程处理若干文件后回收，避免解析大文件后内存累积
+MIN_FILES_FOR_POOL = 4      # 文件太少时进程启动开销大于收益
+
+MANIFEST_NAME = '.clause_extract_manifest.json'
+MANIFEST_VERSION = 1
+
+
+def available_cpus() -> int:
+    """当前进程可用的CPU核心数（容器/任务集限制下小于 os.cpu_count()）"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def default_workers() -> int:
+    """默认工作进程数：保留一个核心给界面，最多 8 个"""
+    return max(1, min(8, available_cpus() - 1))
+
+
+class ExtractionTimeout(Exception):
+    """单个文件解析超时"""
+
+
+class ParallelExtractor:
+    """
+    并行提取器
+
+    on_result(文件路径, 结果列表, 异常) 在调用 run() 的线程中按完成顺序回调；
+    成功时异常为 None，失败或超时时结果列表为 None
+    """
+
+    def __init__(self, extract_fn: Callable[[str], List[Dict]], max_workers: int = None,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.extract_fn = extract_fn
+        self.max_workers = max(1, max_workers or default_workers())
+        self.timeout = timeout
+
+    def run(self, files: Sequence[str],
+            on_result: Callable[[str, Optional[List[Dict]], Optional[Exception]], None],
+            should_stop: Callable[[], bool] = None) -> Dict[str, int]:
+        """
+        处理全部文件
+
+        Returns:
+            统计 {'done': 成功, 'failed': 出错, 'timeout': 超时, 'cancelled': 未处理}
+        """
+        stats = {'done': 0, 'failed': 0, 'timeout': 0, 'cancelled': 0}
+        if self.max_workers == 1 or len(files) < MIN_FILES_FOR_POOL:
+            self._run_inline(files, on_result, should_stop, stats)
+        else:
+            self._run_pool(files, on_result, should_stop, stats)
+        return stats
+
+    def _run_inline(self, files, on_result, should_stop, stats):
+        """当前进程内顺序执行（无法强制超时）"""
+        for i, path in enumerate(files):
+            if should_stop and should_stop():
+                stats['cancelled'] = len(files) - i
+                return
+            try:
+                results = self.extract_fn(path)
+            except Exception as e:
+                stats['failed'] += 1
+                on_result(path, None, e)
+            else:
+                stats['done'] += 1
+                on_result(path, results, None)
+
+    def _new_pool(self):
+        return multiprocessing.Pool(self.max_workers, maxtasksperchild=MAX_TASKS_PER_CHILD)
+
+    def _run_pool(self, files, on_result, should_stop, stats):
+        done_queue: queue.Queue = queue.Queue()
+        pending = deque(range(len(files)))
+        inflight: Dict[int, float] = {}  # 文件序号 -> 提交时间
+        generation = 0                   # 进程池代数，重建后丢弃旧进程池的迟到结果
+
+        def submit(pool, idx, gen):
+            pool.apply_async(
+                self.extract_fn, (files[idx],),
+                callback=lambda res, idx=idx, gen=gen: done_queue.put((gen, idx, res, None)),
+                error_callback=lambda err, idx=idx, gen=gen: done_queue.put((gen, idx, None, err)),
+            )
+
+        pool = self._new_pool()
+        try:
+            while pending or inflight:
+                if should_stop and should_stop():
+                    stats['cancelled'] = len(pending) + len(inflight)
+                    return
+
+                # 进行中的任务数不超过进程数，提交时间即近似开始时间
+                while pending and len(inflight) < self.max_workers:
+                    idx = pending.popleft()
+                    inflight[idx] = time.monotonic()
+                    submit(pool, idx, generation)
+
+                try:
+                    gen, idx, results, error = done_queue.get(timeout=0.2)
+                except queue.Empty:
+                    pass
+                else:
+                    if gen == generation and idx in inflight:
+                        del inflight[idx]
+                        if error is None:
+                            stats['done'] += 1
+                        else:
+                            stats['failed'] += 1
+                        on_result(files[idx], results, error)
+
+                # 每轮都检查超时：其他文件持续完成时，卡住的文件也能按时终止
+                now = time.monotonic()
+                overdue = [idx for idx, started in inflight.items() if now - started > self.timeout]
+                if not overdue:
+                    continue
+                # 无法单独终止某个任务：终止整个进程池，其余进行中的文件重新排队
+                logger.warning(f"解析超时，重建进程池: {[os.path.basename(files[i]) for i in overdue]}")
+                pool.terminate()
+                pool.join()
+                for idx in overdue:
+                    del inflight[idx]
+                    stats['timeout'] += 1
+                    on_result(files[idx], None, ExtractionTimeout(f"解析超时（>{self.timeout:.0f}s）"))
+                pending.extendleft(sorted(inflight, reverse=True))
+                inflight.clear()
+                generation += 1
+                pool = self._new_pool()
+        finally:
+            pool.terminate()
+            pool.join()
+
+
+def file_sha1(path: str, chunk_size: int = 1 << 20) -> str:
+    """文件内容哈希"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionManifest:
+    """
+    文件夹提取清单
+
+    - 默认保存在被提取的文件夹根目录（隐藏文件，文件夹遍历时自动跳过）；
+      文件夹不可写时保存到用户数据目录
+    - 以相对路径为键，文件夹整体移动后仍可复用
+    - 大小与修改时间均未变化视为未变更；修改时间变化但内容哈希相同（复制/另存）也视为未变更
+    - 提取出错的文件不记录，下次重新解析
+    """
+
+    def __init__(self, folder: str, manifest_path: str = None):
+        self.folder = Path(folder).resolve()
+        self.path = Path(manifest_path) if manifest_path else self._default_path(self.folder)
+        self.entries: Dict[str, Dict] = {}
+        self._load()
+
+    @staticmethod
+    def _default_path(folder: Path) -> Path:
+        if os.access(folder, os.W_OK):
+            return folder / MANIFEST_NAME
+        if sys.platform == 'darwin':
+            base = Path.home() / "Library" / "Application Support" / "ClauseNexus"
+        elif sys.platform == 'win32':
+            base = Path(os.environ.get('APPDATA', Path.home())) / "ClauseNexus"
+        else:
+            base = Path.home() / ".config" / "ClauseNexus"
+        key = hashlib.sha1(str(folder).encode('utf-8')).hexdigest()[:16]
+        return base / "extract_manifests" / f"{key}.json"
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取提取清单失败，将全部重新提取: {self.path} - {e}")
+            return
+        if data.get('version') == MANIFEST_VERSION:
+            self.entries = data.get('files', {})
+
+    def _key(self, path: str) -> str:
+        try:
+            return Path(path).resolve().relative_to(self.folder).as_posix()
+        except ValueError:
+            return str(Path(path).resolve())
+
+    def plan(self, files: Sequence[str]) -> Tuple[Dict[str, List[Dict]], List[str], Dict[str, int]]:
+        """
+        对比清单，决定哪些文件需要重新解析
+
+        Returns:
+            (reuse, to_parse, delta)
+            reuse: 文件路径 -> 上次的提取结果
+            to_parse: 需要解析的文件（新增或修改）
+            delta: {'added', 'changed', 'unchanged', 'removed'} 计数
+        """
+        reuse: Dict[str, List[Dict]] = {}
+        to_parse: List[str] = []
+        delta = {'added': 0, 'changed': 0, 'unchanged': 0, 'removed': 0}
+        seen = set()
+        for path in files:
+            key = self._key(path)
+            seen.add(key)
+            entry = self.entries.get(key)
+            if entry is None:
+                delta['added'] += 1
+                to_parse.append(path)
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                to_parse.append(path)
+                delta['changed'] += 1
+                continue
+            unchanged = entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+            if not unchanged and entry['size'] == stat.st_size:
+                try:
+                    unchanged = file_sha1(path) == entry['sha1']
+                except OSError:
+                    unchanged = False
+                if unchanged:
+                    entry['mtime_ns'] = stat.st_mtime_ns
+            if unchanged:
+                delta['unchanged'] += 1
+                reuse[path] = entry['results']
+            else:
+                delta['changed'] += 1
+                to_parse.append(path)
+
+        # 已删除（或不再属于提取范围）的文件
+        for key in [k for k in self.entries if k not in seen]:
+            del self.entries[key]
+            delta['removed'] += 1
+        return reuse, to_parse, delta
+
+    def record(self, path: str, results: List[Dict]):
+        """记录一个文件的提取结果（有出错结果时不记录，下次重新解析）"""
+        key = self._key(path)
+        if not results or any(r.get('Error') for r in results):
+            self.entries.pop(key, None)
+            return
+        try:
+            stat = os.stat(path)
+            digest = file_sha1(path)
+        except OSError:
+            self.entries.pop(key, None)
+            return
+        self.entries[key] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha1': digest,
+            'results': results,
+        }
+
+    def save(self):
+        """原子写入清单"""
+        data = {
+            'version': MANIFEST_VERSION,
+            'folder': str(self.folder),
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+            'files': self.entries,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"提取清单保存失败: {self.path} - {e}")
@@ -43,6 +43,21 @@ class ClauseMappingDialog(QDialog):
         self._setup_ui()
         self._load_mappings()
 
+    def _install_library_completer(self):
+        """条款库名称输入框的自动完成"""
+        if not self.library_clauses:
+            return
+        completer = QCompleter(self.library_clauses, self)
+        completer.setCaseSensitivity(Qt.CaseInsensitive)
+        completer.setFilterMode(Qt.MatchContains)
+        completer.setMaxVisibleItems(10)
+        self.library_input.setCompleter(completer)
+
+    def set_library_clauses(self, library_clauses: List[str]):
+        """条款库在后台加载完成后更新下拉提示"""
+        self.library_clauses = library_clauses or []
+        self._install_library_completer()
+
     def _setup_ui(self):
         self.setWindowTitle("条款映射管理 - 人工匹配设置")
         self.setMinimumSize(900, 600)
@@ -166,12 +181,7 @@ class ClauseMappingDialog(QDialog):
         self.library_input.setPlaceholderText("输入或选择条款库中的标准名称")
 
         # 设置自动完成
-        if self.library_clauses:
-            completer = QCompleter(self.library_clauses)
-            completer.setCaseSensitivity(Qt.CaseInsensitive)
-            completer.setFilterMode(Qt.MatchContains)
-            completer.setMaxVisibleItems(10)
-            self.library_input.setCompleter(completer)
+        self._install_library_completer()
 
         library_layout.addWidget(self.library_input)
         form_layout.addLayout(library_layout, 2)
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+条款列表 / 文件列表的数据模型（Qt Model/View）
+
+功能：
+- ClauseStore：按列存储条款（每个字段一个列表，勾选状态用 bytearray），不为每条条款创建界面对象；
+  字段值可以是延迟生成文本的对象（如 clause_excel_import.RichCell），取出时 str() 转换
+- ClauseTableModel：表格模型，只在视图绘制可见行时生成显示内容；
+  支持勾选、在模型内排序/筛选、分批追加（beginInsertRows，不重建整个列表）
+- FileListModel：条款提取页的文件列表，提取结果返回时更新对应文件的状态标记
+
+Date: 2026-10-18
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PyQt5.QtCore import QAbstractListModel, QAbstractTableModel, QModelIndex, Qt
+
+_RE_TAG = re.compile(r'</?b>')
+
+TOOLTIP_CHARS = 300
+
+
+class ClauseStore:
+    """按列存储的条款数据"""
+
+    FIELDS = ('name', 'regNo', 'content', 'category', 'filename')
+
+    def __init__(self):
+        self.columns: Dict[str, List[str]] = {f: [] for f in self.FIELDS}
+        self.checked = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.checked)
+
+    def clear(self):
+        for column in self.columns.values():
+            column.clear()
+        self.checked = bytearray()
+
+    def extend(self, records: Iterable[Dict], checked: bool = True):
+        for record in records:
+            for field, column in self.columns.items():
+                column.append(record.get(field) or '')
+            self.checked.append(1 if checked else 0)
+
+    def value(self, field: str, i: int) -> str:
+        value = self.columns[field][i]
+        return value if isinstance(value, str) else str(value)
+
+    def record(self, i: int) -> Dict[str, str]:
+        return {field: self.value(field, i) for field in self.FIELDS}
+
+
+class ClauseTableModel(QAbstractTableModel):
+    """
+    条款表格模型（第一列可勾选）
+
+    视图行 -> 存储序号的映射保存在 self._rows 中，排序和筛选只改变映射
+    """
+
+    COLUMNS = (('name', '条款名称'), ('category', '分类'), ('regNo', '注册号'))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = ClauseStore()
+        self._rows: List[int] = []
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        self._filter = ''
+
+    # ---------- Qt 接口 ----------
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        i = self._rows[index.row()]
+        field = self.COLUMNS[index.column()][0]
+        if role == Qt.DisplayRole:
+            return self.store.columns[field][i]
+        if role == Qt.CheckStateRole and index.column() == 0:
+            return Qt.Checked if self.store.checked[i] else Qt.Unchecked
+        if role == Qt.ToolTipRole:
+            if index.column() == 0:
+                content = _RE_TAG.sub('', self.store.value('content', i))
+                if len(content) > TOOLTIP_CHARS:
+                    content = content[:TOOLTIP_CHARS] + '...'
+                return f"{self.store.columns['name'][i]}\n\n{content}" if content else None
+            return self.store.columns[field][i] or None
+        if role == Qt.UserRole:
+            return self.store.record(i)
+        return None
+
+    def setData(self, index: QModelIndex, value, role=Qt.EditRole) -> bool:
+        if role != Qt.CheckStateRole or not index.isValid() or index.column() != 0:
+            return False
+        self.store.checked[self._rows[index.row()]] = 1 if value == Qt.Checked else 0
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return None
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        """column < 0 时恢复加载顺序"""
+        self._sort_column, self._sort_order = column, order
+        self.layoutAboutToBeChanged.emit()
+        old_rows = list(self._rows)
+        self._rows = self._ordered(self._rows)
+        # 保持选中项等持久索引指向同一条款
+        position = {store_index: row for row, store_index in enumerate(self._rows)}
+        for index in self.persistentIndexList():
+            if index.isValid():
+                new_row = position.get(old_rows[index.row()])
+                self.changePersistentIndex(
+                    index, self.index(new_row, index.column()) if new_row is not None else QModelIndex())
+        self.layoutChanged.emit()
+
+    # ---------- 数据操作 ----------
+    def _matches(self, i: int) -> bool:
+        if not self._filter:
+            return True
+        columns = self.store.columns
+        return any(self._filter in columns[field][i].lower() for field in ('name', 'category', 'regNo'))
+
+    def _ordered(self, rows: List[int]) -> List[int]:
+        if self._sort_column < 0:
+            return sorted(rows)
+        column = self.store.columns[self.COLUMNS[self._sort_column][0]]
+        return sorted(rows, key=column.__getitem__, reverse=self._sort_order == Qt.DescendingOrder)
+
+    def set_records(self, records: Sequence[Dict]):
+        """替换全部数据（默认全部勾选）"""
+        self.beginResetModel()
+        self.store.clear()
+        self.store.extend(records)
+        self._rows = self._ordered([i for i in range(len(self.store)) if self._matches(i)])
+        self.endResetModel()
+
+    def append_records(self, records: Sequence[Dict]):
+        """追加条款：未排序时只插入新行，已排序时重新排列"""
+        start = len(self.store)
+        self.store.extend(records)
+        new_rows = [i for i in range(start, len(self.store)) if self._matches(i)]
+        if not new_rows:
+            return
+        if self._sort_column >= 0:
+            self.beginResetModel()
+            self._rows = self._ordered(self._rows + new_rows)
+            self.endResetModel()
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+        self._rows.extend(new_rows)
+        self.endInsertRows()
+
+    def clear(self):
+        self.set_records([])
+
+    def set_filter(self, text: str):
+        """按条款名称/分类/注册号筛选（不区分大小写）"""
+        text = (text or '').strip().lower()
+        if text == self._filter:
+            return
+        self.beginResetModel()
+        self._filter = text
+        self._rows = self._ordered([i for i in range(len(self.store)) if self._matches(i)])
+        self.endResetModel()
+
+    def total_count(self) -> int:
+        return len(self.store)
+
+    def all_checked(self) -> bool:
+        """当前显示的条款是否全部勾选"""
+        checked = self.store.checked
+        return all(checked[i] for i in self._rows)
+
+    def set_all_checked(self, checked: bool):
+        """勾选/取消当前显示的全部条款"""
+        value = 1 if checked else 0
+        for i in self._rows:
+            self.store.checked[i] = value
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, 0), [Qt.CheckStateRole])
+
+    def checked_records(self) -> List[Dict[str, str]]:
+        """勾选的条款（按加载顺序）"""
+        return [self.store.record(i) for i, flag in enumerate(self.store.checked) if flag]
+
+
+class FileListModel(QAbstractListModel):
+    """文件列表模型：(路径, 图标)，可附加状态标记（如提取结果 ✓/✗）"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths: List[str] = []
+        self._labels: List[str] = []
+        self._status: List[str] = []
+        self._rows_by_name: Dict[str, List[int]] = {}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return f"{self._labels[row]}{self._status[row]}"
+        if role == Qt.ToolTipRole or role == Qt.UserRole:
+            return self._paths[row]
+        return None
+
+    def set_files(self, files: Sequence[Tuple[str, str]]):
+        """files: [(路径, 图标), ...]；.doc 文件附加 ⚠️ 标记"""
+        self.beginResetModel()
+        self._paths, self._labels, self._status = [], [], []
+        self._rows_by_name = {}
+        for row, (path, icon) in enumerate(files):
+            fname = os.path.basename(path)
+            suffix = " ⚠️" if fname.lower().endswith('.doc') else ""
+            self._paths.append(path)
+            self._labels.append(f"{icon} {fname}{suffix}")
+            self._status.append('')
+            self._rows_by_name.setdefault(fname, []).append(row)
+        self.endResetModel()
+
+    def clear(self):
+        self.set_files([])
+
+    def reset_status(self):
+        if self._paths:
+            self._status = [''] * len(self._paths)
+            self.dataChanged.emit(self.index(0), self.index(len(self._paths) - 1), [Qt.DisplayRole])
+
+    def set_status(self, file_name: str, status: str):
+        """按文件名更新状态标记"""
+        for row in self._rows_by_name.get(file_name, ()):
+            self._status[row] = status
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def paths(self) -> List[str]:
+        return list(self._paths)
+
+    def path_at(self, row: int) -> Optional[str]:
+        return self._paths[row] if 0 <= row < len(self._paths) else None
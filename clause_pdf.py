@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+PDF 文本提取（分页并行 + 内容哈希缓存）
+
+功能：
+- 默认引擎与旧版一致：pdfplumber，未安装时回退 PyPDF2
+- 快速路径（需显式开启：fast=True 或环境变量 CLAUSE_PDF_FAST=1）：pypdfium2（pdfplumber 0.11 起自带），
+  逐页 C 实现，比 pdfplumber 的逐字符版面分析快一个数量级；但分行方式不同，提取出的行可能与默认引擎不一致
+- 页数较多时按页区间拆分到多个进程并行提取（已在工作进程中时不再嵌套进程池）
+- 按文件内容哈希缓存每页文本到磁盘，同一 PDF（即使改名/移动）不会重复解析
+
+Date: 2026-10-18
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+CACHE_MAX_FILES = 5000        # 缓存文件数上限，超过后删除最久未使用的
+MIN_PAGES_PER_TASK = 8        # 每个并行任务至少处理的页数（每个任务都要重新打开PDF）
+MIN_PAGES_FOR_POOL = 24       # 页数少于此值时顺序提取（进程启动开销更大）
+
+ENGINE_PDFIUM = 'pdfium'
+ENGINE_PDFPLUMBER = 'pdfplumber'
+ENGINE_PYPDF2 = 'pypdf2'
+FAST_ENV = 'CLAUSE_PDF_FAST'  # 设为 1 时默认走 pypdfium2 快速路径（进程池工作进程同样继承）
+_ENGINE_MODULES = {
+    ENGINE_PDFIUM: 'pypdfium2',
+    ENGINE_PDFPLUMBER: 'pdfplumber',
+    ENGINE_PYPDF2: 'PyPDF2',
+}
+
+
+def _has_module(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def pick_engine(fast: bool = None) -> Optional[str]:
+    """选择可用的提取引擎，均未安装时返回 None；fast 为 None 时按环境变量 CLAUSE_PDF_FAST 决定"""
+    if fast is None:
+        fast = os.environ.get(FAST_ENV) == '1'
+    order = (ENGINE_PDFIUM, ENGINE_PDFPLUMBER, ENGINE_PYPDF2) if fast \
+        else (ENGINE_PDFPLUMBER, ENGINE_PYPDF2)
+    for engine in order:
+        if _has_module(_ENGINE_MODULES[engine]):
+            return engine
+    return None
+
+
+def file_sha1(path: str, chunk_size: int = 1 << 20) -> str:
+    """文件内容哈希"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_cache_dir() -> Path:
+    """用户缓存目录下的 ClauseNexus/pdf_text"""
+    if sys.platform == 'darwin':
+        base = Path.home() / "Library" / "Caches" / "ClauseNexus"
+    elif sys.platform == 'win32':
+        base = Path(os.environ.get('LOCALAPPDATA', os.environ.get('APPDATA', Path.home()))) / "ClauseNexus"
+    else:
+        base = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / ".cache")) / "ClauseNexus"
+    return base / "pdf_text"
+
+
+class PdfTextCache:
+    """按内容哈希 + 引擎缓存每页文本（JSON 文件，原子写入）"""
+
+    def __init__(self, cache_dir: str = None, max_files: int = CACHE_MAX_FILES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_files = max_files
+
+    def _path(self, digest: str, engine: str) -> Path:
+        return self.cache_dir / digest[:2] / f"{digest}.{engine}.v{CACHE_VERSION}.json"
+
+    def get(self, digest: str, engine: str) -> Optional[List[str]]:
+        path = self._path(digest, engine)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages = json.load(f)['pages']
+        except (OSError, ValueError, KeyError):
+            return None
+        try:
+            os.utime(path)  # 记录最近使用时间，供清理时参考
+        except OSError:
+            pass
+        return pages
+
+    def put(self, digest: str, engine: str, pages: List[str]):
+        path = self._path(digest, engine)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'pages': pages}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"PDF文本缓存写入失败: {e}")
+            return
+        self.prune()
+
+    def prune(self):
+        """超过上限时删除最久未使用的缓存"""
+        try:
+            files = list(self.cache_dir.glob('*/*.json'))
+            if len(files) <= self.max_files:
+                return
+            files.sort(key=lambda p: p.stat().st_mtime)
+            for path in files[:len(files) - self.max_files]:
+                path.unlink()
+        except OSError as e:
+            logger.debug(f"PDF文本缓存清理失败: {e}")
+
+
+def page_count(pdf_path: str, engine: str) -> int:
+    if engine == ENGINE_PDFIUM:
+        import pypdfium2
+        pdf = pypdfium2.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    if engine == ENGINE_PDFPLUMBER:
+        import pdfplumber
+        with pdfplumber.open(pdf_path) as pdf:
+            return len(pdf.pages)
+    import PyPDF2
+    with open(pdf_path, 'rb') as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
+
+def extract_page_range(pdf_path: str, engine: str, start: int, end: int) -> List[str]:
+    """提取 [start, end) 页的文本（模块级函数，供进程池调用）"""
+    texts = []
+    if engine == ENGINE_PDFIUM:
+        import pypdfium2
+        pdf = pypdfium2.PdfDocument(pdf_path)
+        try:
+            for i in range(start, end):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_range().replace('\r\n', '\n').replace('\r', '\n'))
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+    elif engine == ENGINE_PDFPLUMBER:
+        import pdfplumber
+        with pdfplumber.open(pdf_path, pages=list(range(start + 1, end + 1))) as pdf:
+            for page in pdf.pages:
+                texts.append(page.extract_text() or '')
+                page.flush_cache()
+    else:
+        import PyPDF2
+        with open(pdf_path, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            for i in range(start, end):
+                texts.append(reader.pages[i].extract_text() or '')
+    return texts
+
+
+def _available_cpus() -> int:
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def _page_ranges(n_pages: int, n_tasks: int) -> List[Tuple[int, int]]:
+    """把页拆成 n_tasks 个连续区间（尽量均匀）"""
+    size, extra = divmod(n_pages, n_tasks)
+    ranges, start = [], 0
+    for i in range(n_tasks):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _can_use_pool() -> bool:
+    # 并行提取条款时本函数已在进程池的工作进程（daemon）中执行，不能再创建子进程
+    return not multiprocessing.current_process().daemon
+
+
+def extract_pages(pdf_path: str, fast: bool = None, max_workers: int = None,
+                  cache: Optional[PdfTextCache] = None, use_cache: bool = True) -> List[str]:
+    """
+    提取每页文本
+
+    Args:
+        fast: 是否使用 pypdfium2 快速路径（分行可能与默认引擎不同），默认按环境变量 CLAUSE_PDF_FAST
+        max_workers: 分页并行的进程数，默认按CPU核心数；1 为顺序提取
+        cache: 文本缓存，默认使用用户缓存目录
+
+    Raises:
+        ImportError: 未安装任何PDF解析库
+    """
+    engine = pick_engine(fast)
+    if engine is None:
+        raise ImportError("未安装PDF解析库 (pdfplumber 或 PyPDF2)")
+
+    digest = None
+    if use_cache:
+        cache = cache or PdfTextCache()
+        digest = file_sha1(pdf_path)
+        pages = cache.get(digest, engine)
+        if pages is not None:
+            logger.debug(f"PDF文本缓存命中: {pdf_path}")
+            return pages
+
+    n_pages = page_count(pdf_path, engine)
+    if max_workers is None:
+        max_workers = min(8, _available_cpus())
+    workers = min(max_workers, n_pages // MIN_PAGES_PER_TASK)
+
+    if workers > 1 and n_pages >= MIN_PAGES_FOR_POOL and _can_use_pool():
+        ranges = _page_ranges(n_pages, workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = pool.map(extract_page_range, [pdf_path] * workers, [engine] * workers,
+                             [start for start, _ in ranges], [end for _, end in ranges])
+            pages = [text for part in parts for text in part]
+    else:
+        pages = extract_page_range(pdf_path, engine, 0, n_pages)
+
+    logger.info(f"PDF文本提取完成: {os.path.basename(pdf_path)} {n_pages} 页 ({engine})")
+    if use_cache:
+        cache.put(digest, engine, pages)
+    return pages
+
+
+def extract_pdf_lines(pdf_path: str, fast: bool = None, **kwargs) -> List[str]:
+    """提取PDF的非空文本行（已去除首尾空白）"""
+    lines = []
+    for text in extract_pages(pdf_path, fast=fast, **kwargs):
+        lines.extend(line.strip() for line in text.split('\n') if line.strip())
+    return lines
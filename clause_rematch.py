@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+修订版客户文档增量比对
+
+功能：
+- 每次比对后在报告旁写入状态文件（报告名.state.json），记录每条客户条款的
+  标准化标题、内容哈希和报告行
+- 收到修订版文档时，按标准化标题 + 内容哈希与上一版对齐：
+  - 未变更：直接复用上一版报告行
+  - 新增 / 修改：重新匹配
+  - 已删除：保留上一版报告行并标注
+- 条款库、Sheet 或匹配模式变化时状态失效，全部重新匹配
+
+Date: 2026-10-18
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+STATE_SUFFIX = '.state.json'
+
+# 变更状态
+STATUS_ADDED = '新增'
+STATUS_CHANGED = '修改'
+STATUS_UNCHANGED = '未变更'
+STATUS_REMOVED = '已删除'
+
+_RE_LEADING_NUMBER = re.compile(r'^(\d+(\.\d+)*|[一二三四五六七八九十]+|[\(（]\s*\w+\s*[\)）])[\.、．）\)\s]*')
+_RE_NON_WORD = re.compile(r'[^\w%]')
+_RE_WHITESPACE = re.compile(r'\s+')
+
+
+def state_path_for(report_path: str) -> Path:
+    """报告对应的状态文件路径"""
+    return Path(report_path).with_suffix(STATE_SUFFIX)
+
+
+def normalize_title(title: str) -> str:
+    """对齐用的标题键：去编号、全角转半角、小写、去标点空白"""
+    if not title:
+        return ""
+    text = []
+    for char in str(title).strip():
+        code = ord(char)
+        if 0xFF01 <= code <= 0xFF5E:
+            char = chr(code - 0xFEE0)
+        text.append(char)
+    text = _RE_LEADING_NUMBER.sub('', ''.join(text).lower())
+    return _RE_NON_WORD.sub('', text).replace('_', '')
+
+
+def content_hash(content: str) -> str:
+    """内容哈希（忽略空白差异），无内容时返回空串"""
+    text = _RE_WHITESPACE.sub(' ', str(content or '')).strip()
+    if not text:
+        return ""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def library_fingerprint(excel_path: str, sheet_name: Optional[str], is_title_only: bool) -> Dict:
+    """条款库与匹配设置指纹，任一变化都会使上一版结果失效"""
+    try:
+        stat = os.stat(excel_path)
+        size, mtime = stat.st_size, int(stat.st_mtime)
+    except OSError:
+        size, mtime = 0, 0
+    return {
+        'library': os.path.abspath(excel_path),
+        'size': size,
+        'mtime': mtime,
+        'sheet': sheet_name or '',
+        'title_only': bool(is_title_only),
+    }
+
+
+def load_state(report_path: str) -> Optional[Dict]:
+    """读取报告的状态文件，不存在或版本不符时返回 None"""
+    path = state_path_for(report_path)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"读取比对状态失败: {path} - {e}")
+        return None
+    if state.get('version') != STATE_VERSION:
+        logger.info(f"比对状态版本不符，忽略: {path}")
+        return None
+    return state
+
+
+def save_state(report_path: str, doc_path: str, fingerprint: Dict, entries: List[Dict]) -> Path:
+    """
+    写入状态文件
+
+    Args:
+        entries: [{'key', 'hash', 'mapped', 'row'}, ...]，顺序与报告一致
+    """
+    path = state_path_for(report_path)
+    state = {
+        'version': STATE_VERSION,
+        'doc': os.path.abspath(doc_path),
+        'updated_at': datetime.now().isoformat(timespec='seconds'),
+        'fingerprint': fingerprint,
+        'clauses': entries,
+    }
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def align_revision(prev_entries: List[Dict],
+                   new_keys: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, Optional[Dict]]], List[Dict]]:
+    """
+    将修订版条款与上一版对齐
+
+    Args:
+        prev_entries: 上一版状态中的条款列表
+        new_keys: 修订版每条条款的 (标题键, 内容哈希)
+
+    Returns:
+        (plan, removed)
+        plan: 与 new_keys 一一对应的 (变更状态, 对齐到的上一版条目或 None)
+        removed: 上一版中未被对齐的条目（已删除）
+    """
+    by_key: Dict[str, deque] = defaultdict(deque)
+    for pos, entry in enumerate(prev_entries):
+        by_key[entry.get('key', '')].append(pos)
+    used = set()
+
+    plan: List[Tuple[str, Optional[Dict]]] = []
+    unmatched = []
+    for i, (key, digest) in enumerate(new_keys):
+        queue = by_key.get(key)
+        while queue and queue[0] in used:
+            queue.popleft()
+        if not queue:
+            plan.append((STATUS_ADDED, None))
+            unmatched.append(i)
+            continue
+        # 同名条款优先对齐内容相同的那一条
+        pos = next((p for p in queue if p not in used and prev_entries[p].get('hash') == digest), queue[0])
+        used.add(pos)
+        entry = prev_entries[pos]
+        plan.append((STATUS_UNCHANGED if entry.get('hash') == digest else STATUS_CHANGED, entry))
+
+    # 标题改动但内容未变：按内容哈希补对齐，视为修改（标题变化需重新匹配）
+    if unmatched:
+        by_hash: Dict[str, deque] = defaultdict(deque)
+        for pos, entry in enumerate(prev_entries):
+            if pos not in used:
+                by_hash[entry.get('hash', '')].append(pos)
+        for i in unmatched:
+            queue = by_hash.get(new_keys[i][1]) if new_keys[i][1] else None
+            if queue:
+                pos = queue.popleft()
+                used.add(pos)
+                plan[i] = (STATUS_CHANGED, prev_entries[pos])
+
+    removed = [entry for pos, entry in enumerate(prev_entries) if pos not in used]
+    return plan, removed
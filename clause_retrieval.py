@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+大规模条款库两阶段检索引擎
+
+功能：
+- 第一阶段：字符 n-gram 倒排索引近似检索
+  - 按 IDF 从高到低（最稀有的 n-gram 优先）累加倒排表
+  - 文档频率过高的 n-gram（如"保险""条款"）直接跳过
+  - 每次查询访问的倒排项总数有上限，延迟与条款库规模基本无关
+- 第二阶段由调用方对候选做精确重打分（ClauseMatcherLogic._try_fuzzy_match）
+- exhaustive_search() 提供无剪枝的全量余弦检索，用于召回率评估
+
+适用于 10 万条以上的合并条款库；小库仍使用 TF-IDF / 全量扫描。
+
+Date: 2026-10-18
+"""
+
+import logging
+import math
+import re
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_RE_NON_WORD = re.compile(r'[^一-龥a-z0-9%]')
+
+
+def _fullwidth_to_halfwidth(text: str) -> str:
+    """全角字符转半角"""
+    result = []
+    for char in text:
+        code = ord(char)
+        if code == 0x3000:
+            result.append(' ')
+        elif 0xFF01 <= code <= 0xFF5E:
+            result.append(chr(code - 0xFEE0))
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def normalize_for_ngrams(text: str) -> str:
+    """n-gram 前的标准化：小写、全角转半角、仅保留中文/字母/数字/%"""
+    if not text:
+        return ""
+    return _RE_NON_WORD.sub('', _fullwidth_to_halfwidth(str(text).lower()))
+
+
+class NgramRetrievalIndex:
+    """
+    字符 n-gram 倒排索引（CSR 存储）
+
+    - 每条文本取 n-gram 集合（二值 TF），权重为平滑 IDF，相似度为余弦
+    - 倒排表按 n-gram 连续存放在一个 int32 数组中，indptr 给出每个 n-gram 的区间
+    """
+
+    def __init__(self, ngram_range: Tuple[int, int] = (2, 3),
+                 max_df_ratio: float = 0.2, posting_budget: int = 300000):
+        """
+        Args:
+            ngram_range: n-gram 长度范围（含两端）
+            max_df_ratio: 文档频率超过该比例的 n-gram 在近似检索中跳过
+            posting_budget: 单次查询最多访问的倒排项数（延迟上限）
+        """
+        self.ngram_range = ngram_range
+        self.max_df_ratio = max_df_ratio
+        self.posting_budget = posting_budget
+
+        self._vocab: Dict[str, int] = {}
+        self._ids = np.zeros(0, dtype=np.int64)        # 行号 -> 调用方的条目索引
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._postings = np.zeros(0, dtype=np.int32)
+        self._df = np.zeros(0, dtype=np.int32)
+        self._idf_sq = np.zeros(0, dtype=np.float32)
+        self._doc_norm = np.zeros(0, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _ngrams(self, text: str) -> set:
+        norm = normalize_for_ngrams(text)
+        if not norm:
+            return set()
+        lo, hi = self.ngram_range
+        if len(norm) < lo:
+            return {norm}
+        grams = set()
+        for n in range(lo, hi + 1):
+            for i in range(len(norm) - n + 1):
+                grams.add(norm[i:i + n])
+        return grams
+
+    def build(self, texts: Sequence[str], ids: Optional[Sequence[int]] = None) -> 'NgramRetrievalIndex':
+        """
+        构建倒排索引
+
+        Args:
+            texts: 待索引文本（条款名称）
+            ids: 每条文本对应的条目索引，默认 0..len(texts)-1
+        """
+        vocab = self._vocab = {}
+        rows = array('i')
+        cols = array('i')
+        for row, text in enumerate(texts):
+            gids = [vocab.setdefault(g, len(vocab)) for g in self._ngrams(text)]
+            cols.extend(gids)
+            rows.extend([row] * len(gids))
+
+        n_docs = len(texts)
+        n_terms = len(vocab)
+        rows_np = np.frombuffer(rows, dtype=np.int32) if rows else np.zeros(0, dtype=np.int32)
+        cols_np = np.frombuffer(cols, dtype=np.int32) if cols else np.zeros(0, dtype=np.int32)
+
+        self._ids = np.asarray(ids if ids is not None else range(n_docs), dtype=np.int64)
+        self._df = np.bincount(cols_np, minlength=n_terms).astype(np.int32)
+        self._indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(self._df, out=self._indptr[1:])
+        order = np.argsort(cols_np, kind='stable')
+        self._postings = rows_np[order]
+
+        idf = np.log((1.0 + n_docs) / (1.0 + self._df)) + 1.0
+        self._idf_sq = (idf * idf).astype(np.float32)
+        self._doc_norm = np.sqrt(
+            np.bincount(rows_np, weights=self._idf_sq[cols_np], minlength=n_docs)
+        ).astype(np.float32)
+
+        logger.info(f"n-gram倒排索引构建完成: {n_docs} 条, {n_terms} 个n-gram, {len(self._postings)} 个倒排项")
+        return self
+
+    def _query_terms(self, text: str) -> np.ndarray:
+        gids = [self._vocab[g] for g in self._ngrams(text) if g in self._vocab]
+        return np.asarray(gids, dtype=np.int64)
+
+    def _score(self, gids: np.ndarray, selected: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        """累加所选 n-gram 的倒排表，按余弦排序取 top_k（只处理访问到的行，开销与条款库规模无关）"""
+        if len(selected) == 0:
+            return []
+        starts, ends = self._indptr[selected], self._indptr[selected + 1]
+        rows = np.concatenate([self._postings[s:e] for s, e in zip(starts.tolist(), ends.tolist())])
+        if len(rows) == 0:
+            return []
+        weights = np.repeat(self._idf_sq[selected], ends - starts)
+        touched, inverse = np.unique(rows, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights).astype(np.float32)
+
+        q_norm = math.sqrt(float(self._idf_sq[gids].sum()))
+        cos = scores / (self._doc_norm[touched] * q_norm)
+        if len(touched) > top_k:
+            part = np.argpartition(-cos, top_k - 1)[:top_k]
+            touched, cos = touched[part], cos[part]
+        order = np.argsort(-cos, kind='stable')
+        return [(int(self._ids[touched[i]]), float(cos[i])) for i in order]
+
+    def search(self, text: str, top_k: int = 50) -> List[Tuple[int, float]]:
+        """
+        第一阶段近似检索
+
+        Returns:
+            [(条目索引, 近似余弦相似度), ...]，按相似度降序
+        """
+        if not len(self._ids):
+            return []
+        gids = self._query_terms(text)
+        if len(gids) == 0:
+            return []
+
+        df = self._df[gids]
+        max_df = max(1, int(len(self._ids) * self.max_df_ratio))
+        selected = []
+        visited = 0
+        for g, g_df in sorted(zip(gids.tolist(), df.tolist()), key=lambda x: x[1]):
+            # 始终保留最稀有的 n-gram，其余受文档频率与访问预算约束
+            if selected and (g_df > max_df or visited + g_df > self.posting_budget):
+                break
+            selected.append(g)
+            visited += g_df
+        return self._score(gids, np.asarray(selected, dtype=np.int64), top_k)
+
+    def exhaustive_search(self, text: str, top_k: int = 50) -> List[Tuple[int, float]]:
+        """无剪枝的全量余弦检索（召回率评估基准）"""
+        if not len(self._ids):
+            return []
+        gids = self._query_terms(text)
+        return self._score(gids, gids, top_k)
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+监控目录自动比对（无界面守护模式）
+
+功能：
+- 轮询监控输入目录树中的 .docx / .pdf 文件（不依赖额外的文件系统事件库）
+- 防抖：文件大小与修改时间在静置期内保持不变且可读，才视为写入完成；
+  长时间为空或无法读取的文件记为失败（文件再次变化时重试）
+- 条款库暂时不可用等可重试错误（RetryableError）：文件保持待处理，按指数退避重试
+- SQLite 状态库记录已处理文件（大小、修改时间、内容哈希），重启后跳过已完成的文件；
+  仅修改时间变化而内容未变的文件也不会重复比对
+- 状态文件（JSON）实时记录吞吐量、队列深度、最近处理结果
+
+比对本身由调用方传入的 process_fn 完成（见 Clause_Comparison_Assistant.run_watch_daemon）。
+
+Date: 2026-10-18
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATE_DB_NAME = '.clause_watch.db'
+STATUS_FILE_NAME = 'watch_status.json'
+DEFAULT_EXTENSIONS = ('.docx', '.pdf')
+# 可重试错误的最长退避间隔（秒）
+MAX_RETRY_DELAY = 300.0
+
+
+class RetryableError(Exception):
+    """暂时性错误（如条款库正在保存、网络共享断开）：文件不记为失败，退避后重试"""
+
+
+def file_sha1(path: str, chunk_size: int = 1 << 20) -> str:
+    """文件内容哈希"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WatchStateDB:
+    """已处理文件状态库（SQLite）"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS processed (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha1 TEXT NOT NULL,
+                status TEXT NOT NULL,
+                report TEXT,
+                error TEXT,
+                duration REAL,
+                processed_at TEXT
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, path: str) -> Optional[Dict]:
+        row = self._conn.execute(
+            "SELECT size, mtime_ns, sha1, status, report, error FROM processed WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('size', 'mtime_ns', 'sha1', 'status', 'report', 'error'), row))
+
+    def record(self, path: str, size: int, mtime_ns: int, sha1: str, status: str,
+               report: str = "", error: str = "", duration: float = 0.0):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO processed VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, size, mtime_ns, sha1, status, report, error, duration,
+             datetime.now().isoformat(timespec='seconds'))
+        )
+        self._conn.commit()
+
+    def touch(self, path: str, size: int, mtime_ns: int):
+        """内容未变、仅修改时间变化时更新记录"""
+        self._conn.execute("UPDATE processed SET size = ?, mtime_ns = ? WHERE path = ?", (size, mtime_ns, path))
+        self._conn.commit()
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._conn.execute("SELECT status, COUNT(*) FROM processed GROUP BY status").fetchall())
+
+    def close(self):
+        self._conn.close()
+
+
+class FolderWatcher:
+    """
+    目录监控器
+
+    process_fn(源文件路径, 报告路径) -> Dict，返回值（如条款数）写入状态文件；
+    抛出异常视为该文件处理失败，记录后继续处理其他文件（文件再次变化时会重试）；
+    抛出 RetryableError 时文件保持待处理，按 interval 起的指数退避重试，
+    max_retries 为重试次数上限（None 表示不限，超过后记为失败）。
+    静置后仍为空或无法读取的文件，stuck_seconds 后记为失败。
+    """
+
+    def __init__(self, input_dir: str, output_dir: str, process_fn: Callable[[str, str], Dict],
+                 extensions: Iterable[str] = DEFAULT_EXTENSIONS, interval: float = 2.0,
+                 settle_seconds: float = 5.0, status_path: str = None, stuck_seconds: float = 60.0,
+                 max_retries: Optional[int] = None):
+        self.input_dir = Path(input_dir).resolve()
+        self.output_dir = Path(output_dir).resolve()
+        self.process_fn = process_fn
+        self.extensions = tuple(e.lower() for e in extensions)
+        self.interval = interval
+        self.settle_seconds = settle_seconds
+        self.stuck_seconds = stuck_seconds
+        self.max_retries = max_retries
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.status_path = Path(status_path) if status_path else self.output_dir / STATUS_FILE_NAME
+        self.db = WatchStateDB(str(self.output_dir / STATE_DB_NAME))
+
+        # 防抖: 路径 -> (大小, 修改时间, 首次观察到该状态的时间)
+        self._pending: Dict[str, Tuple[int, int, float]] = {}
+        # 可重试错误: 路径 -> (已重试次数, 下次重试时间)
+        self._retry: Dict[str, Tuple[int, float]] = {}
+        self._started_at = time.time()
+        self._metrics = {
+            'processed': 0,
+            'failed': 0,
+            'unchanged': 0,
+            'total_seconds': 0.0,
+            'last_file': '',
+            'last_status': '',
+            'last_error': '',
+            'last_duration': 0.0,
+            'last_result': {},
+        }
+
+    def report_path_for(self, src: Path) -> Path:
+        """报告路径：输出目录下保持相对目录结构，文件名同批量比对"""
+        rel = src.relative_to(self.input_dir)
+        return self.output_dir / rel.parent / f"报告_{src.stem}.xlsx"
+
+    def _iter_candidates(self):
+        for root, dirs, files in os.walk(self.input_dir):
+            # 不监控输出目录本身（输出目录位于输入目录内时）
+            dirs[:] = [d for d in dirs if Path(root, d).resolve() != self.output_dir and not d.startswith('.')]
+            for name in files:
+                # 跳过 Office 锁文件 / 临时文件
+                if name.startswith(('~$', '.')) or not name.lower().endswith(self.extensions):
+                    continue
+                yield Path(root) / name
+
+    @staticmethod
+    def _is_readable(path: Path) -> bool:
+        try:
+            with open(path, 'rb') as f:
+                f.read(1)
+            return True
+        except OSError:
+            return False
+
+    def scan(self) -> list:
+        """扫描目录，返回已写入完成、需要处理的文件列表"""
+        now = time.time()
+        ready = []
+        seen = set()
+        for path in self._iter_candidates():
+            key = str(path)
+            seen.add(key)
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            size, mtime_ns = stat.st_size, stat.st_mtime_ns
+
+            record = self.db.get(key)
+            if record and record['size'] == size and record['mtime_ns'] == mtime_ns:
+                self._pending.pop(key, None)
+                continue
+
+            pending = self._pending.get(key)
+            if pending is None or pending[:2] != (size, mtime_ns):
+                # 新文件或仍在写入：重新计时
+                self._pending[key] = (size, mtime_ns, now)
+                continue
+            if now - pending[2] < self.settle_seconds or now < self._retry.get(key, (0, 0.0))[1]:
+                continue
+            if size > 0 and self._is_readable(path):
+                ready.append(path)
+            elif now - pending[2] >= self.stuck_seconds:
+                # 长时间为空/无法读取：记为失败，不再阻塞单次批处理（文件变化后重新处理）
+                self._fail(key, size, mtime_ns, '', '空文件' if size == 0 else '文件无法读取', 0.0)
+
+        # 已删除的文件不再跟踪
+        for key in list(self._pending):
+            if key not in seen:
+                self._forget(key)
+        return ready
+
+    def _forget(self, key: str):
+        self._pending.pop(key, None)
+        self._retry.pop(key, None)
+
+    def _fail(self, key: str, size: int, mtime_ns: int, sha1: str, error: str, duration: float):
+        self.db.record(key, size, mtime_ns, sha1, 'failed', error=error, duration=duration)
+        self._metrics.update(failed=self._metrics['failed'] + 1, last_file=key, last_status='failed',
+                             last_error=error, last_duration=round(duration, 3), last_result={})
+        self._metrics['total_seconds'] += duration
+        self._forget(key)
+
+    def process(self, path: Path):
+        key = str(path)
+        try:
+            stat = path.stat()
+            size, mtime_ns = stat.st_size, stat.st_mtime_ns
+            sha1 = file_sha1(key)
+        except OSError as e:
+            # 扫描后被删除/改名：不再跟踪（仍存在时下次扫描重新计时）
+            logger.warning(f"监控文件无法读取，跳过: {key} - {e}")
+            self._forget(key)
+            return
+
+        record = self.db.get(key)
+        if record and record['sha1'] == sha1 and record['status'] == 'done':
+            # 仅修改时间变化（如复制/另存为同内容）
+            self.db.touch(key, size, mtime_ns)
+            self._forget(key)
+            self._metrics['unchanged'] += 1
+            return
+
+        report = self.report_path_for(path)
+        start = time.perf_counter()
+        try:
+            report.parent.mkdir(parents=True, exist_ok=True)
+            result = self.process_fn(key, str(report)) or {}
+        except RetryableError as e:
+            attempts = self._retry.get(key, (0, 0.0))[0] + 1
+            if self.max_retries is not None and attempts > self.max_retries:
+                logger.error(f"监控比对重试 {self.max_retries} 次后仍失败: {key} - {e}")
+                self._fail(key, size, mtime_ns, sha1, str(e), time.perf_counter() - start)
+                return
+            delay = min(self.interval * 2 ** attempts, MAX_RETRY_DELAY)
+            self._retry[key] = (attempts, time.time() + delay)
+            self._metrics.update(last_file=key, last_status='retrying', last_error=str(e))
+            logger.warning(f"监控比对暂时失败，{delay:.0f}s 后重试（第{attempts}次）: {key} - {e}")
+        except Exception as e:
+            logger.exception(f"监控比对失败: {key}")
+            self._fail(key, size, mtime_ns, sha1, str(e), time.perf_counter() - start)
+        else:
+            duration = time.perf_counter() - start
+            self.db.record(key, size, mtime_ns, sha1, 'done', report=str(report), duration=duration)
+            self._metrics.update(processed=self._metrics['processed'] + 1, last_file=key, last_status='done',
+                                 last_error='', last_duration=round(duration, 3), last_result=result)
+            self._metrics['total_seconds'] += duration
+            self._forget(key)
+            logger.info(f"监控比对完成: {key} -> {report} ({duration:.1f}s)")
+
+    def write_status(self, queue_depth: int, state: str = 'running'):
+        """写出状态文件（原子替换）"""
+        elapsed = max(time.time() - self._started_at, 1e-9)
+        handled = self._metrics['processed'] + self._metrics['failed']
+        status = {
+            'state': state,
+            'input_dir': str(self.input_dir),
+            'output_dir': str(self.output_dir),
+            'started_at': datetime.fromtimestamp(self._started_at).isoformat(timespec='seconds'),
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+            'uptime_seconds': round(elapsed, 1),
+            'queue_depth': queue_depth,
+            'files_per_minute': round(handled / elapsed * 60, 2),
+            'avg_seconds_per_file': round(self._metrics['total_seconds'] / handled, 3) if handled else 0.0,
+            'db_counts': self.db.counts(),
+            **{k: v for k, v in self._metrics.items() if k != 'total_seconds'},
+        }
+        tmp_path = self.status_path.with_name(self.status_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(status, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.status_path)
+
+    def run_once(self) -> int:
+        """扫描并处理一轮，返回本轮处理的文件数"""
+        ready = self.scan()
+        for path in ready:
+            self.write_status(queue_depth=len(self._pending))
+            self.process(path)
+        self.write_status(queue_depth=len(self._pending))
+        return len(ready)
+
+    def run_until_idle(self):
+        """处理完当前目录中的全部文件后退出（单次批处理）"""
+        try:
+            self.run_once()
+            while self._pending:
+                time.sleep(self.interval)
+                self.run_once()
+        finally:
+            self.write_status(queue_depth=len(self._pending), state='stopped')
+            self.db.close()
+
+    def run_forever(self, should_stop: Callable[[], bool] = None):
+        """持续监控，直到 should_stop() 返回 True 或收到 Ctrl+C"""
+        logger.info(f"开始监控: {self.input_dir} -> {self.output_dir}（间隔 {self.interval}s，静置 {self.settle_seconds}s）")
+        try:
+            while not (should_stop and should_stop()):
+                self.run_once()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            logger.info("监控已停止")
+        finally:
+            self.write_status(queue_depth=len(self._pending), state='stopped')
+            self.db.close()
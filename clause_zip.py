@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+ZIP 打包（多线程压缩）
+
+功能：
+- 按文件类型选择压缩方式：.docx/.xlsx/.pdf 图片等本身已压缩的格式直接存储（不再重复压缩），
+  其余文件 deflate 压缩；压缩后反而变大的文件改为存储
+- 多个工作线程并行压缩（zlib 压缩时释放 GIL），压缩结果暂存在有上限的内存/临时文件中，
+  按提交顺序依次写入 ZIP，同时进行中的文件数有上限，内存占用与文件总大小无关
+- 写入同目录临时文件，完成后原子替换目标文件；文件名使用 UTF-8，超过 4GB 时自动使用 ZIP64
+
+zipfile 模块无法写入预先压缩好的数据，因此这里直接写 ZIP 结构（本地文件头 + 中央目录）。
+
+Date: 2026-10-18
+"""
+
+import logging
+import os
+import struct
+import tempfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+STORED = 0
+DEFLATED = 8
+COMPRESS_LEVEL = 6
+CHUNK_SIZE = 1 << 20
+SPOOL_MAX_MEMORY = 8 << 20    # 单个文件压缩结果超过此大小时转存临时文件
+
+# 本身已压缩的格式：直接存储
+STORE_EXTENSIONS = frozenset({
+    '.docx', '.docm', '.dotx', '.xlsx', '.xlsm', '.pptx', '.odt', '.ods', '.odp',
+    '.pdf', '.zip', '.gz', '.7z', '.rar', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.mp4',
+})
+
+ZIP64_LIMIT = 0xFFFFFFFF        # 大小/偏移达到此值时使用 ZIP64
+ZIP64_COUNT_LIMIT = 0xFFFF
+_ZIP64_MARKER = 0xFFFFFFFF
+_ZIP64_COUNT_MARKER = 0xFFFF
+_UTF8_FLAG = 0x800
+
+
+def compress_method_for(path: str) -> int:
+    return STORED if os.path.splitext(path)[1].lower() in STORE_EXTENSIONS else DEFLATED
+
+
+def _dos_datetime(timestamp: float) -> Tuple[int, int]:
+    t = time.localtime(timestamp)
+    if t.tm_year < 1980:
+        return 0, (0 << 9) | (1 << 5) | 1
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+@dataclass
+class _Entry:
+    src: str
+    arcname: str
+    method: int
+    crc: int
+    size: int
+    compressed_size: int
+    mtime: float
+    data: Optional[object] = None    # 压缩结果（SpooledTemporaryFile），存储的文件为 None
+    offset: int = 0
+
+
+def _prepare(src: str, arcname: str, level: int) -> _Entry:
+    """计算 CRC 并压缩（在工作线程中执行）"""
+    method = compress_method_for(src)
+    stat = os.stat(src)
+    crc = size = 0
+    spool = None
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15) if method == DEFLATED else None
+    if compressor is not None:
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    with open(src, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            if compressor is not None:
+                spool.write(compressor.compress(chunk))
+    compressed_size = size
+    if compressor is not None:
+        spool.write(compressor.flush())
+        compressed_size = spool.tell()
+        if compressed_size >= size:
+            # 压缩无收益：改为存储
+            spool.close()
+            spool = None
+            method, compressed_size = STORED, size
+        else:
+            spool.seek(0)
+    return _Entry(src, arcname, method, crc, size, compressed_size, stat.st_mtime, spool)
+
+
+class _ZipStreamWriter:
+    """顺序写入预先压缩好的条目"""
+
+    def __init__(self, fileobj):
+        self.fp = fileobj
+        self.entries: List[_Entry] = []
+
+    def add(self, entry: _Entry):
+        entry.offset = self.fp.tell()
+        name = entry.arcname.encode('utf-8')
+        dos_time, dos_date = _dos_datetime(entry.mtime)
+        zip64 = entry.size >= ZIP64_LIMIT or entry.compressed_size >= ZIP64_LIMIT
+        extra = struct.pack('<HHQQ', 0x0001, 16, entry.size, entry.compressed_size) if zip64 else b''
+        self.fp.write(struct.pack(
+            '<IHHHHHIIIHH', 0x04034b50, 45 if zip64 else 20, _UTF8_FLAG, entry.method, dos_time, dos_date,
+            entry.crc, _ZIP64_MARKER if zip64 else entry.compressed_size, _ZIP64_MARKER if zip64 else entry.size,
+            len(name), len(extra)))
+        self.fp.write(name)
+        self.fp.write(extra)
+
+        written = 0
+        if entry.data is not None:
+            with entry.data:
+                for chunk in iter(lambda: entry.data.read(CHUNK_SIZE), b''):
+                    self.fp.write(chunk)
+                    written += len(chunk)
+            entry.data = None
+        else:
+            with open(entry.src, 'rb') as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    self.fp.write(chunk)
+                    written += len(chunk)
+        if written != entry.compressed_size:
+            raise OSError(f"文件在打包过程中被修改: {entry.src}")
+        self.entries.append(entry)
+
+    def close(self):
+        """写中央目录"""
+        cd_offset = self.fp.tell()
+        for entry in self.entries:
+            name = entry.arcname.encode('utf-8')
+            dos_time, dos_date = _dos_datetime(entry.mtime)
+            fields = []
+            size, csize, offset = entry.size, entry.compressed_size, entry.offset
+            if size >= ZIP64_LIMIT:
+                fields.append(size)
+                size = _ZIP64_MARKER
+            if csize >= ZIP64_LIMIT:
+                fields.append(csize)
+                csize = _ZIP64_MARKER
+            if offset >= ZIP64_LIMIT:
+                fields.append(offset)
+                offset = _ZIP64_MARKER
+            extra = struct.pack(f'<HH{len(fields)}Q', 0x0001, 8 * len(fields), *fields) if fields else b''
+            version = 45 if fields else 20
+            self.fp.write(struct.pack(
+                '<IHHHHHHIIIHHHHHII', 0x02014b50, version, version, _UTF8_FLAG, entry.method, dos_time, dos_date,
+                entry.crc, csize, size, len(name), len(extra), 0, 0, 0, 0o100644 << 16, offset))
+            self.fp.write(name)
+            self.fp.write(extra)
+        cd_end = self.fp.tell()
+        cd_size = cd_end - cd_offset
+        count = len(self.entries)
+
+        if count >= ZIP64_COUNT_LIMIT or cd_offset >= ZIP64_LIMIT or cd_size >= ZIP64_LIMIT:
+            self.fp.write(struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, 45, 45, 0, 0,
+                                      count, count, cd_size, cd_offset))
+            self.fp.write(struct.pack('<IIQI', 0x07064b50, 0, cd_end, 1))
+            self.fp.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, _ZIP64_COUNT_MARKER, _ZIP64_COUNT_MARKER,
+                                      _ZIP64_MARKER, _ZIP64_MARKER, 0))
+        else:
+            self.fp.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, count, count, cd_size, cd_offset, 0))
+
+
+def default_threads() -> int:
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def write_zip(files: Sequence[Tuple[str, str]], zip_path: str, max_workers: int = None,
+              level: int = COMPRESS_LEVEL,
+              on_progress: Callable[[int, int], None] = None,
+              should_stop: Callable[[], bool] = None) -> Dict:
+    """
+    打包文件
+
+    Args:
+        files: [(源文件路径, ZIP内路径), ...]
+        on_progress(已完成, 总数) 在调用线程中回调
+
+    Returns:
+        {'written', 'stored', 'deflated', 'failed': [(源文件, 错误)], 'cancelled', 'bytes_in', 'bytes_out'}
+    """
+    max_workers = max_workers or default_threads()
+    summary = {'written': 0, 'stored': 0, 'deflated': 0, 'failed': [], 'cancelled': False,
+               'bytes_in': 0, 'bytes_out': 0}
+    tmp_path = f"{zip_path}.{os.getpid()}.tmp"
+    total = len(files)
+    done = 0
+    pending: deque = deque()
+    ok = False
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool, open(tmp_path, 'wb') as fp:
+            writer = _ZipStreamWriter(fp)
+            queue = iter(files)
+            try:
+                while True:
+                    # 进行中的文件数有上限，压缩结果按提交顺序写入
+                    while len(pending) < max_workers * 2:
+                        item = next(queue, None)
+                        if item is None:
+                            break
+                        pending.append((item, pool.submit(_prepare, item[0], item[1], level)))
+                    if not pending:
+                        break
+                    if should_stop and should_stop():
+                        summary['cancelled'] = True
+                        break
+
+                    (src, arcname), future = pending.popleft()
+                    try:
+                        entry = future.result()
+                        writer.add(entry)
+                    except OSError as e:
+                        summary['failed'].append((src, str(e)))
+                        logger.warning(f"打包失败: {src} - {e}")
+                    else:
+                        summary['written'] += 1
+                        summary['stored' if entry.method == STORED else 'deflated'] += 1
+                        summary['bytes_in'] += entry.size
+                        summary['bytes_out'] += entry.compressed_size
+                    done += 1
+                    if on_progress:
+                        on_progress(done, total)
+            finally:
+                # 取消/出错时释放尚未写入的压缩结果
+                for _, future in pending:
+                    future.cancel()
+                    if future.done() and not future.cancelled() and future.exception() is None:
+                        data = future.result().data
+                        if data is not None:
+                            data.close()
+
+            if summary['cancelled']:
+                return summary
+            writer.close()
+        os.replace(tmp_path, zip_path)
+        ok = True
+        return summary
+    finally:
+        if not ok and os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -12,7 +12,10 @@
 import sys
 import os
 import json
-from concurrent.futures import ThreadPoolExecutor
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import multiprocessing
+from contextlib import ExitStack
 import numpy as np
 
 # 修复 macOS Qt 平台插件问题
@@ -30,9 +33,19 @@ _fix_qt_plugin()
 from datetime import datetime, date
 from pathlib import Path
 import pandas as pd
-from openpyxl import Workbook, load_workbook
+from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
+# 【优化v4.2】台账快速读取：只读前几行探测表头，之后只读取需要的列
+from ledger_reader import CHUNK_ROWS, iter_ledger_chunks, read_ledger
+# 【优化v4.2】输出文件流式写入：数据、公式、格式一次写出
+from ledger_writer import CellFormat, Column, Formula, XlsxStreamWriter
+# 【优化v4.2】输出文件旁另存列式快照，下季度处理和年度对比优先读取快照
+from ledger_snapshot import HAS_PYARROW, iter_snapshot, read_snapshot, write_snapshot_chunks
+# 【优化v4.2】定稿季度写入本地台账库（SQLite），跨季度查询不再重读 Excel
+from ledger_store import DEFAULT_DB_PATH as LEDGER_DB_FILE, LedgerStore
+# 【优化v4.2】超大台账分块处理：数据块暂存临时文件，跨块只保留重复存量判断所需的贷款编号计数
+from ledger_chunks import ChunkSpool, DuplicateStockTracker, loan_key_series
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QFileDialog, QProgressBar, QTextEdit,
@@ -44,6 +57,12 @@ from PyQt5.QtGui import QFont, QDesktopServices
 
 # 配置文件路径
 CONFIG_FILE = os.path.expanduser("~/.insurance_processor_config.json")
+# 【优化v4.2】年度对比并行读取文件的最大进程数（4个季度文件 + 年初总表）
+MAX_READ_WORKERS = 5
+# 文件合计小于此大小时顺序读取（子进程启动开销大于并行收益）
+MIN_BYTES_FOR_POOL = 8 * 1024 * 1024
+# 【优化v4.2】当季度+上季度文件合计达到此大小时季度处理改为分块模式（每块 CHUNK_ROWS 行）
+CHUNKED_MIN_BYTES = 32 * 1024 * 1024
 
 # 样式表
 STYLE_SHEET = """
@@ -212,7 +231,10 @@ class ConfigManager:
             'year': 2025,
             'recent_files': [],
             'auto_save_log': True,
-            'use_fast_mode': True
+            'use_fast_mode': True,
+            'write_formulas': True,
+            'use_ledger_db': True,
+            'chunked_large_files': True
         }
 
     @staticmethod
@@ -235,14 +257,46 @@ class ConfigManager:
         config['recent_files'] = config['recent_files'][:10]  # 只保留10个
 
 
+# 【修复v2】按列名选择标准列,确保两个文件选择相同的列
+# 【优化v4.2】移到模块级，参数改为列名列表，读取文件时即可据此只读取标准列
+def find_standard_columns(columns, standard_cols):
+    """智能查找标准列,支持模糊匹配"""
+    columns = list(columns)
+    selected_cols = {}
+
+    for std_col in standard_cols:
+        # 精确匹配
+        if std_col in columns:
+            selected_cols[std_col] = std_col
+        else:
+            # 模糊匹配: 查找包含关键字的列
+            for col in columns:
+                if std_col in str(col):
+                    selected_cols[std_col] = col
+                    break
+
+    return selected_cols
+
+
 class QuarterProcessWorker(QThread):
     """季度处理后台线程 - 优化版"""
     progress = pyqtSignal(int, str)
     finished = pyqtSignal(bool, str, str)
     log = pyqtSignal(str)
 
+    # 读取的标准列
+    STANDARD_COLS = ['贷款编号', '经办机构', '被保险人', '被保险财产标的', '城市',
+                     '被保险财产地址', '币种', '保险金额', '保险起期', '保险止期', '贷款分类']
+    # 当季度剔除结清后文件的输出列
+    CURRENT_OUTPUT_COLS = ['贷款编号', '经办机构', '被保险人', '被保险财产标的', '城市', '被保险财产地址',
+                           '币种', '保险金额', '人民币保险金额', '保险起期', '保险止期', '贷款分类',
+                           '季度起期', '季度止期']
+    # 上季度文件的输出列
+    OUTPUT_COLS = CURRENT_OUTPUT_COLS + ['季度保费']
+
     def __init__(self, current_file, prev_file, output_file, quarter, year,
-                 current_usd_rate, current_hkd_rate, prev_usd_rate, prev_hkd_rate, fast_mode=True):
+                 current_usd_rate, current_hkd_rate, prev_usd_rate, prev_hkd_rate, fast_mode=True,
+                 write_formulas=True, ledger_db=None, chunk_rows=0):
         super().__init__()
         self.current_file = current_file
         self.prev_file = prev_file
@@ -256,6 +310,12 @@ class QuarterProcessWorker(QThread):
         self.prev_usd_rate = prev_usd_rate
         self.prev_hkd_rate = prev_hkd_rate
         self.fast_mode = fast_mode
+        # 输出文件中人民币金额/季度保费/汇总是否保留Excel公式（计算值总是写入）
+        self.write_formulas = write_formulas
+        # 本地台账库路径（None 表示不写入）
+        self.ledger_db = ledger_db
+        # 分块处理每块行数（0 表示整表读入内存处理）
+        self.chunk_rows = chunk_rows
 
         # 计算上季度
         if self.quarter == 1:
@@ -267,7 +327,10 @@ class QuarterProcessWorker(QThread):
 
     def run(self):
         try:
-            self.process_files()
+            if self.chunk_rows:
+                self.process_files_chunked()
+            else:
+                self.process_files()
         except Exception as e:
             import traceback
             self.finished.emit(False, str(e), traceback.format_exc())
@@ -276,55 +339,417 @@ class QuarterProcessWorker(QThread):
         """向量化日期解析 - 性能优化"""
         return pd.to_datetime(series, errors='coerce')
 
+    # 【优化v4.2】年份错误检测改为按列计算，不再逐行 replace/写回
+    @staticmethod
+    def detect_and_fix_year_errors(df, expected_year, quarter):
+        """检测并修正保险起期年份错误（向量化，按列计算）
+
+        检测条件（满足其一）:
+        1. 起期年份与预期年份相差超过2年，且止期年份在 expected_year-1 到 expected_year+1 之间
+        2. 起期晚于止期
+        修正: 起期年份改为止期年份（止期在6月及以后）或止期上一年，月、日、时间不变；
+        修正后日期不存在（如2月29日）或仍晚于止期时不修正
+
+        Args:
+            df: 数据框
+            expected_year: 预期年份
+            quarter: 当前季度(1-4)
+
+        Returns:
+            (修正后的数据框, 修正明细列表, 修正条数)
+        """
+        df_copy = df.copy()
+
+        # 解析保险起期和止期
+        start_dates = pd.to_datetime(df_copy['保险起期'], errors='coerce')
+        end_dates = pd.to_datetime(df_copy['保险止期'], errors='coerce')
+
+        start_year = start_dates.dt.year
+        end_year = end_dates.dt.year
+        year_diff_large = (start_year - expected_year).abs() > 2
+        end_year_reasonable = end_year.between(expected_year - 1, expected_year + 1)
+        start_after_end = start_dates > end_dates
+        suspect = (start_dates.notna() & end_dates.notna()
+                   & ((year_diff_large & end_year_reasonable) | start_after_end))
+
+        positions = np.flatnonzero(suspect.to_numpy())
+        if len(positions) == 0:
+            return df_copy, [], 0
+
+        # 使用止期的年份作为参考: 如果保险跨年，起期可能是上一年
+        starts = start_dates.iloc[positions]
+        ends = end_dates.iloc[positions]
+        corrected_year = np.where(ends.dt.month >= 6, ends.dt.year, ends.dt.year - 1)
+        # 按年月日重建日期（不存在的日期为 NaT），再加回原时间部分
+        rebuilt = pd.to_datetime(pd.DataFrame({
+            'year': corrected_year,
+            'month': starts.dt.month.to_numpy(),
+            'day': starts.dt.day.to_numpy(),
+        }), errors='coerce')
+        corrected = pd.Series(rebuilt.to_numpy(), index=starts.index) + (starts - starts.dt.normalize())
+
+        # 验证修正后的日期是否合理(起期应早于止期)
+        valid = (corrected.notna() & (corrected <= ends)).to_numpy()
+        positions = positions[valid]
+        if len(positions) == 0:
+            return df_copy, [], 0
+        originals, corrected, ends = starts[valid], corrected[valid], ends[valid]
+        loan_nos = df_copy['贷款编号'].iloc[positions]
+
+        # 修正日期（非日期列按 object 写入，保留其余单元格原值）
+        col = df_copy.columns.get_loc('保险起期')
+        if pd.api.types.is_datetime64_dtype(df_copy['保险起期']):
+            df_copy.iloc[positions, col] = corrected.to_numpy()
+        else:
+            df_copy['保险起期'] = df_copy['保险起期'].astype(object)
+            df_copy.iloc[positions, col] = pd.Series(list(corrected), dtype=object).to_numpy()
+
+        corrected_dates = [
+            {
+                'index': idx,
+                'loan_no': loan_no,
+                'original': original,
+                'corrected': fixed,
+                'original_str': original_str,
+                'corrected_str': corrected_str,
+                'end_date': end,
+            }
+            for idx, loan_no, original, fixed, original_str, corrected_str, end in zip(
+                positions.tolist(), loan_nos, originals, corrected,
+                originals.dt.strftime('%Y/%m/%d'), corrected.dt.strftime('%Y/%m/%d'), ends)
+        ]
+        return df_copy, corrected_dates, len(corrected_dates)
+
+    # 【优化v4.2】重复存量清理: 分组计算，不再逐个贷款编号过滤整表
+    @staticmethod
+    def remove_duplicate_stock(df, top=10, examples=5):
+        """删除贷款编号重复且贷款分类含"存量"的记录（贷款编号为空的不处理）
+
+        贷款编号按 loan_key_series 的文本键比较（123 与 '123' 为同一编号），与分块处理模式一致
+
+        Returns:
+            (清理后的数据框, 汇总信息):
+            dup_loans 重复贷款编号个数, affected_loans 含存量记录的个数, removed 删除条数,
+            per_loan_counts {每笔删除条数: 贷款个数}, by_agency 删除最多的经办机构,
+            examples 前几个贷款编号及删除条数
+        """
+        loan = df['贷款编号']
+        keys = loan_key_series(loan)
+        is_dup = keys.duplicated(keep=False)
+        is_stock = df['贷款分类'].astype(str).str.contains('存量', na=False)
+        remove = is_dup & is_stock & loan.notna()
+
+        removed = df[remove]
+        per_loan = keys[remove].groupby(keys[remove], sort=False).size()
+        summary = {
+            'dup_loans': len(pd.unique(keys[is_dup])),
+            'affected_loans': len(per_loan),
+            'removed': int(remove.sum()),
+            'per_loan_counts': per_loan.value_counts().sort_index().to_dict(),
+            'by_agency': (removed['经办机构'].value_counts().head(top).to_dict()
+                          if '经办机构' in removed.columns else {}),
+            'examples': per_loan.head(examples).to_dict(),
+        }
+        return df[~remove], summary
+
+    # 【优化v4.2】人民币金额/季度保费直接计算（与输出文件中的公式结果一致）
+    @staticmethod
+    def rmb_amounts(df, usd_rate, hkd_rate):
+        """人民币保险金额 = 保险金额 × 汇率（美元/港币按汇率，其他币种为1）
+
+        对应公式 =H*IF(G="美元",usd,IF(G="港币",hkd,1))：保险金额为空按0计，无法转为数值的为空值
+        """
+        amount = df['保险金额']
+        numbers = pd.to_numeric(amount, errors='coerce')
+        numbers = numbers.mask(amount.isna() | (amount == ''), 0.0)
+        rates = df['币种'].map({'美元': usd_rate, '港币': hkd_rate}).fillna(1).astype(float)
+        return numbers.astype(float) * rates
+
+    @staticmethod
+    def quarter_premiums(df):
+        """季度保费 = (季度止期-季度起期+1) × 人民币保险金额 / 365 × 0.0037 / 100，季度日期缺失时为0"""
+        start, end = df['季度起期'], df['季度止期']
+        days = (end - start) / pd.Timedelta(days=1)
+        premium = (days + 1) * df['人民币保险金额'] / 365 * 0.0037 / 100
+        return premium.where(start.notna() & end.notna(), 0.0)
+
+    @staticmethod
+    def _ledger_formats(book):
+        """季度台账输出的单元格格式（微软雅黑9号、浅灰细边框），每个工作簿登记一次"""
+        def add(**kwargs):
+            return book.add_format(CellFormat(font_name='Microsoft YaHei', font_size=9, border_color='CCCCCC',
+                                              **kwargs))
+        return {
+            'header': add(horizontal='center', vertical='center', wrap=True),
+            'header_center': add(horizontal='center', vertical='center'),
+            'left': add(horizontal='left', vertical='center'),
+            'left_wrap': add(horizontal='left', vertical='center', wrap=True),
+            'text': add(vertical='center'),
+            'money': add(vertical='center', number_format='#,##0.00'),
+            'date': add(vertical='center', number_format='YYYY/M/D'),
+            'sum': add(bold=True, color='000000', number_format='#,##0.00'),
+            'rate': add(bold=True, color='0066CC', number_format='0.0000'),
+            'stat': add(),
+            'stat_money': add(number_format='#,##0.00'),
+            'stat_count': add(number_format='0'),
+            'total': add(bold=True),
+            'total_money': add(bold=True, number_format='#,##0.00'),
+            'total_count': add(bold=True, number_format='0'),
+        }
+
+    @staticmethod
+    def _ledger_columns(df, cols, fmts, usd_rate, hkd_rate, formulas=True):
+        """
+        台账输出列（按列指定格式）
+
+        A-F列左对齐（F列自动换行）；保险金额/人民币保险金额/季度保费 '#,##0.00'；
+        日期列有值时 'YYYY/M/D'；I列人民币保险金额、O列季度保费写入计算值，formulas=True 时同时写公式
+        """
+        date_cols = ('保险起期', '保险止期', '季度起期', '季度止期')
+        columns = []
+        for col_idx, col in enumerate(cols, 1):
+            if col == '人民币保险金额':
+                # I列 (col=9): 人民币保险金额公式
+                columns.append(Column(df[col], fmts['money'], formula=(
+                    f'=H{{r}}*IF(G{{r}}="美元",{usd_rate},IF(G{{r}}="港币",{hkd_rate},1))' if formulas else None)))
+            elif col == '季度保费':
+                # O列 (col=15): 季度保费公式 =(N-M+1)*I/365*0.0037/100
+                columns.append(Column(df[col], fmts['money'], formula=(
+                    '=IF(AND(M{r}<>"",N{r}<>""),(N{r}-M{r}+1)*I{r}/365*0.0037/100,0)' if formulas else None)))
+            elif col in date_cols:
+                columns.append(Column(df[col], fmts['date'], blank_fmt=fmts['text']))
+            elif col == '保险金额':
+                columns.append(Column(df[col], fmts['money']))
+            elif col_idx <= 6:
+                columns.append(Column(df[col], fmts['left_wrap' if col_idx == 6 else 'left']))
+            else:
+                columns.append(Column(df[col], fmts['text']))
+        return columns
+
+    def _save_snapshot(self, xlsx_path, chunks, rows, **info):
+        """输出文件旁保存列式快照（chunks 为写入该文件的数据块，共 rows 行；未安装 pyarrow 时跳过）"""
+        path = write_snapshot_chunks(xlsx_path, chunks, rows, **info)
+        if path:
+            self.log.emit(f"   💾 已保存快照: {Path(path).name}")
+        elif HAS_PYARROW:
+            self.log.emit(f"   ⚠️ 快照保存失败（不影响Excel输出）: {Path(xlsx_path).name}")
+
+    def _save_to_store(self, chunks):
+        """定稿季度（上季度）写入本地台账库（chunks 依次为 (数据块, 是否为移入的结清记录)；失败不影响Excel输出）"""
+        try:
+            with LedgerStore(self.ledger_db) as store:
+                n = store.load_quarter_chunks(self.prev_year, self.prev_quarter, chunks, source_file=self.output_file,
+                                              usd_rate=self.prev_usd_rate, hkd_rate=self.prev_hkd_rate)
+            self.log.emit(f"   🗄️ 已写入台账库: {self.prev_year}Q{self.prev_quarter} {n} 行")
+        except (sqlite3.Error, OSError) as e:
+            self.log.emit(f"   ⚠️ 台账库写入失败（不影响Excel输出）: {e}")
+
+    @staticmethod
+    def quarter_bounds(year, quarter):
+        """季度第一天和最后一天"""
+        bounds = {1: (datetime(year,1,1), datetime(year,3,31)),
+                  2: (datetime(year,4,1), datetime(year,6,30)),
+                  3: (datetime(year,7,1), datetime(year,9,30)),
+                  4: (datetime(year,10,1), datetime(year,12,31))}
+        return bounds[quarter]
+
+    def quarter_dates(self, df, q_start, q_end, apply_settled_rule=False):
+        """计算季度起期和止期
+
+        Args:
+            df: 数据框
+            q_start: 季度开始日期
+            q_end: 季度结束日期
+            apply_settled_rule: 是否应用结清记录特殊规则
+
+        Returns:
+            (计算后的数据框, 应用了结清规则的行标记)
+        """
+        df_copy = df.copy()
+
+        # C. 向量化日期解析
+        start_dates = self.parse_date_vectorized(df_copy['保险起期'])
+        end_dates = self.parse_date_vectorized(df_copy['保险止期'])
+
+        # 标记是否为结清记录
+        is_settled = df_copy['贷款分类'].astype(str).str.contains('结清', na=False)
+
+        # 标记保险止期是否在当季度内
+        end_in_quarter = (end_dates >= q_start) & (end_dates <= q_end)
+
+        # C. 计算季度起期
+        df_copy['季度起期'] = start_dates
+        df_copy.loc[start_dates < q_start, '季度起期'] = q_start
+        df_copy.loc[start_dates > q_end, '季度起期'] = pd.NaT
+
+        # 【修正v4.1.6】不再强制结清记录的季度起期为季度第一天
+        # 结清记录遵循标准规则:
+        # - 如果保险起期 >= 季度开始, 季度起期 = 保险起期
+        # - 如果保险起期 < 季度开始, 季度起期 = 季度开始
+
+        # C. 计算季度止期
+        df_copy['季度止期'] = end_dates
+        df_copy.loc[end_dates > q_end, '季度止期'] = q_end
+        df_copy.loc[end_dates < q_start, '季度止期'] = pd.NaT
+
+        # 【修正v4.1.6】结清记录的季度止期使用实际保险止期(不截断到季度末)
+        # 这样可以准确计算当季度的保费天数
+        settled_in_q = is_settled & end_in_quarter if apply_settled_rule else pd.Series(False, index=df_copy.index)
+        if settled_in_q.any():
+            df_copy.loc[settled_in_q, '季度止期'] = end_dates[settled_in_q]
+
+        # 判断是否在季度内
+        df_copy['_in_q'] = (~start_dates.isna()) & (~end_dates.isna()) & \
+                             ~((end_dates < q_start) | (start_dates > q_end))
+
+        return df_copy, settled_in_q
+
+    def _log_settled_rule(self, count, examples):
+        """结清规则应用条数及示例（examples 为前几条记录）"""
+        self.log.emit(f"   ✓ 应用结清规则: {count} 条记录")
+        for idx, row in examples.iterrows():
+            q_start_actual = row['季度起期']
+            q_end_actual = row['季度止期']
+            self.log.emit(f"      结清[{row['贷款编号']}]: 季度起期={q_start_actual.strftime('%Y/%m/%d') if pd.notna(q_start_actual) else 'N/A'}, 季度止期={q_end_actual.strftime('%Y/%m/%d') if pd.notna(q_end_actual) else 'N/A'}")
+
+    def _log_year_corrections(self, label, corrections, errors):
+        """年份修正条数及前5条明细"""
+        if errors > 0:
+            self.log.emit(f"   🚨 {label}发现 {errors} 条保险起期年份错误,已自动修正:")
+            for correction in corrections[:5]:  # 显示前5条
+                self.log.emit(f"      ⚠️ 贷款[{correction['loan_no']}]: "
+                            f"{correction['original_str']} → {correction['corrected_str']} "
+                            f"(保险止期: {correction['end_date'].strftime('%Y/%m/%d')})")
+            if errors > 5:
+                self.log.emit(f"      ... 还有 {errors - 5} 条已修正")
+        else:
+            self.log.emit(f"   ✓ {label}未发现年份错误")
+
+    @staticmethod
+    def _branch_stats(df):
+        """按经办机构汇总：季度保费合计、人民币保险金额合计、笔数（分块处理时各块结果相加）"""
+        return df.groupby('经办机构', sort=False, dropna=False).agg(
+            premium=('季度保费', 'sum'), rmb=('人民币保险金额', 'sum'), count=('季度保费', 'size'))
+
+    def _remainder_file(self):
+        return str(Path(self.output_file).parent / f"{Path(self.current_file).stem}_剔除结清后.xlsx")
+
+    # 【优化v4.2】数据、公式和格式一次写出（不再 to_excel 后重新打开、逐格设置格式、多次保存）
+    # 人民币金额/季度保费及各项汇总均写入计算值；write_formulas=True 时同时保留公式
+    def _write_current_file(self, path, chunks, shared_strings=True):
+        """写出当季度剔除结清后文件（chunks 为数据块，逐块写入），返回行数"""
+        n = 0
+        with XlsxStreamWriter(path, shared_strings) as book:
+            fmts = self._ledger_formats(book)
+            sheet = book.add_sheet(f"{self.year}Q{self.quarter}", widths={
+                'A': 20, 'B': 10, 'C': 12, 'D': 14, 'E': 8, 'F': 56, 'G': 6, 'H': 14, 'I': 16,
+                'J': 12, 'K': 12, 'L': 8, 'M': 12, 'N': 12})
+            sheet.write_row(self.CURRENT_OUTPUT_COLS, [fmts['header']] * len(self.CURRENT_OUTPUT_COLS))
+            for df in chunks:
+                sheet.write_columns(self._ledger_columns(df, self.CURRENT_OUTPUT_COLS, fmts,
+                                                         self.current_usd_rate, self.current_hkd_rate,
+                                                         self.write_formulas),
+                                    len(df))
+                n += len(df)
+        return n
+
+    def _write_prev_file(self, chunks, rows, rmb_total, premium_total, stats, shared_strings=True):
+        """
+        写出上季度文件（台账 + 分行统计）
+
+        chunks 为数据块（逐块写入，共 rows 行）；汇总值和分行统计（_branch_stats 的结果）需预先算好，
+        因为它们写在第2行和数据表之后的工作表中
+        """
+        def cell(formula, value):
+            return Formula(formula, value) if self.write_formulas else value
+
+        output_cols = self.OUTPUT_COLS
+        # 汇总信息和汇率（P-S列，第2行）
+        summary_headers = ['人民币保险金额合计', '季度保费合计', '上季度美元汇率', '上季度港币汇率']
+        title = f"{self.prev_year}Q{self.prev_quarter}"
+        last = rows + 1
+
+        with XlsxStreamWriter(self.output_file, shared_strings) as book:
+            fmts = self._ledger_formats(book)
+            summary_cells = [(16, cell(f'=SUM(I2:I{last})', rmb_total), fmts['sum']),
+                             (17, cell(f'=SUM(O2:O{last})', premium_total), fmts['sum']),
+                             (18, self.prev_usd_rate, fmts['rate']), (19, self.prev_hkd_rate, fmts['rate'])]
+            # 设置列宽（F列被保险财产地址宽度调整为56）
+            sheet = book.add_sheet(title, freeze='A2', row_heights={1: 30}, widths={
+                'A': 20, 'B': 10, 'C': 12, 'D': 14, 'E': 8, 'F': 56, 'G': 6, 'H': 14, 'I': 16,
+                'J': 12, 'K': 12, 'L': 8, 'M': 12, 'N': 12, 'O': 12, 'P': 18, 'Q': 14, 'R': 10, 'S': 10})
+            sheet.write_row(output_cols + summary_headers,
+                            [fmts['header']] * len(output_cols) + [fmts['header_center']] * len(summary_headers))
+            for df in chunks:
+                sheet.write_columns(self._ledger_columns(df, output_cols, fmts,
+                                                         self.prev_usd_rate, self.prev_hkd_rate,
+                                                         self.write_formulas),
+                                    len(df), extra_cells={2: summary_cells})
+            if sheet.row < 2:
+                sheet.write_row([v for _, v, _ in summary_cells], [f for _, _, f in summary_cells], start_col=16)
+
+            self.progress.emit(90, "生成分行统计...")
+            self.log.emit("📈 生成分行统计...")
+
+            # 分行统计：按经办机构汇总上季度数据（计算值 + SUMIF/COUNTIF 公式）
+            agencies = sorted(stats.index.unique())
+            n = rows + 1
+            stats = stats.reindex(agencies)
+            formulas = self.write_formulas
+            ws2 = book.add_sheet('分行统计', freeze='A2', widths={'A': 12, 'B': 16, 'C': 20, 'D': 10})
+            ws2.write_row(['经办机构', '季度保费合计', '人民币保险金额合计', '贷款笔数'], [fmts['header_center']] * 4)
+            ws2.write_columns([
+                Column(agencies, fmts['stat']),
+                # 季度保费合计 - 使用SUMIF公式
+                Column(stats['premium'], fmts['stat_money'],
+                       formula=f'=SUMIF({title}!$B$2:$B${n},A{{r}},{title}!$O$2:$O${n})' if formulas else None),
+                # 人民币保险金额合计 - 使用SUMIF公式
+                Column(stats['rmb'], fmts['stat_money'],
+                       formula=f'=SUMIF({title}!$B$2:$B${n},A{{r}},{title}!$I$2:$I${n})' if formulas else None),
+                # 贷款笔数 - 使用COUNTIF公式
+                Column(stats['count'], fmts['stat_count'],
+                       formula=f'=COUNTIF({title}!$B$2:$B${n},A{{r}})' if formulas else None),
+            ], len(agencies))
+            # 合计行
+            tr = len(agencies) + 2
+            ws2.write_row(['合计', cell(f'=SUM(B2:B{tr - 1})', stats['premium'].sum()),
+                           cell(f'=SUM(C2:C{tr - 1})', stats['rmb'].sum()),
+                           cell(f'=SUM(D2:D{tr - 1})', int(stats['count'].sum()))],
+                          [fmts['total'], fmts['total_money'], fmts['total_money'], fmts['total_count']])
+
     def process_files(self):
         # ===== Step A: 读取文件并处理结清记录 =====
+        standard_cols = self.STANDARD_COLS
+
+        # 【优化v4.2】只读取标准列；上季度文件只读前10行探测表头（不再整表读两遍）
+        def select_standard(names):
+            return list(find_standard_columns(names, standard_cols).values())
+
         self.progress.emit(5, "读取当季度文件...")
         self.log.emit("📂 Step A: 读取当季度文件...")
-        df_current = pd.read_excel(self.current_file)
+        df_current = read_ledger(self.current_file, usecols=select_standard)
         self.log.emit(f"   当季度数据: {len(df_current)} 行")
 
         self.progress.emit(10, "读取上季度文件...")
         self.log.emit("📂 读取上季度文件...")
-        df_prev_raw = pd.read_excel(self.prev_file, header=None)
-        header_row = 0
-        for idx in range(min(10, len(df_prev_raw))):
-            if any('贷款编号' in str(val) for val in df_prev_raw.iloc[idx].astype(str).tolist()):
-                header_row = idx
-                break
-        df_prev = pd.read_excel(self.prev_file, header=header_row)
+        # 上季度文件是本工具上次输出的文件时，直接读取与之一致的快照
+        df_prev = read_snapshot(self.prev_file, usecols=select_standard)
+        if df_prev is not None:
+            self.log.emit("   使用快照（与Excel文件内容一致）")
+        else:
+            df_prev = read_ledger(self.prev_file, header_keywords=('贷款编号',), usecols=select_standard)
         self.log.emit(f"   上季度数据: {len(df_prev)} 行")
 
         # 统一列名
         self.progress.emit(15, "统一列名...")
         self.log.emit("🔧 统一列名...")
-        standard_cols = ['贷款编号', '经办机构', '被保险人', '被保险财产标的', '城市',
-                        '被保险财产地址', '币种', '保险金额', '保险起期', '保险止期', '贷款分类']
-
-        # 【修复v2】按列名选择标准列,确保两个文件选择相同的列
-        # 找出每个标准列在原文件中的位置
-        def find_standard_columns(df, standard_cols):
-            """智能查找标准列,支持模糊匹配"""
-            selected_cols = {}
-
-            for std_col in standard_cols:
-                # 精确匹配
-                if std_col in df.columns:
-                    selected_cols[std_col] = std_col
-                else:
-                    # 模糊匹配: 查找包含关键字的列
-                    for col in df.columns:
-                        if std_col in str(col):
-                            selected_cols[std_col] = col
-                            break
-
-            return selected_cols
 
         # 查找上季度文件的标准列
-        prev_col_map = find_standard_columns(df_prev, standard_cols)
+        prev_col_map = find_standard_columns(df_prev.columns, standard_cols)
         self.log.emit(f"   上季度列映射: {prev_col_map}")
 
         # 查找当季度文件的标准列
-        curr_col_map = find_standard_columns(df_current, standard_cols)
+        curr_col_map = find_standard_columns(df_current.columns, standard_cols)
         self.log.emit(f"   当季度列映射: {curr_col_map}")
 
         # 确保所有标准列都找到了
@@ -351,11 +776,7 @@ class QuarterProcessWorker(QThread):
         self.log.emit("🔍 Step A: 筛选'结清'记录并移动...")
 
         # 计算当季度范围
-        bounds = {1: (datetime(self.year,1,1), datetime(self.year,3,31)),
-                  2: (datetime(self.year,4,1), datetime(self.year,6,30)),
-                  3: (datetime(self.year,7,1), datetime(self.year,9,30)),
-                  4: (datetime(self.year,10,1), datetime(self.year,12,31))}
-        q_start, q_end = bounds[self.quarter]
+        q_start, q_end = self.quarter_bounds(self.year, self.quarter)
 
         loan_class_col = '贷款分类'
 
@@ -421,6 +842,8 @@ class QuarterProcessWorker(QThread):
         self.log.emit(f"   [诊断] 结清记录列: {list(settled.columns)}")
         self.log.emit(f"   [诊断] 上季度shape: {df_prev_clean.shape}, 结清shape: {settled.shape}")
         df_prev_merged = pd.concat([df_prev_clean, settled], ignore_index=True)
+        # 移入的结清记录行号从 n_prev_rows 开始（之后各步骤只筛选行、不重排行号）
+        n_prev_rows = len(df_prev_clean)
         self.log.emit(f"   合并到上季度后: {len(df_prev_merged)} 行")
         self.log.emit(f"   [诊断] 合并后列: {list(df_prev_merged.columns)}")
 
@@ -430,8 +853,8 @@ class QuarterProcessWorker(QThread):
         self.progress.emit(25, "删除重复存量...")
         self.log.emit("🔄 Step A2: 删除上季度重复存量行...")
 
-        # 标记重复贷款编号
-        df_prev_merged['_dup'] = df_prev_merged.duplicated(subset=['贷款编号'], keep=False)
+        # 标记重复贷款编号（【优化v4.2】按文本键比较，与分块处理模式一致）
+        df_prev_merged['_dup'] = loan_key_series(df_prev_merged['贷款编号']).duplicated(keep=False)
 
         # 标记是否为存量
         df_prev_merged['_is_stock'] = df_prev_merged['贷款分类'].astype(str).str.contains('存量', na=False)
@@ -451,195 +874,48 @@ class QuarterProcessWorker(QThread):
         self.log.emit(f"   上季度汇率: USD={self.prev_usd_rate}, HKD={self.prev_hkd_rate}")
         self.log.emit(f"   当季度汇率: USD={self.current_usd_rate}, HKD={self.current_hkd_rate}")
 
-        # B1. 处理当季度剩余数据（添加人民币金额、季度日期列 - 暂不填充，Excel公式处理）
-        df_remainder['人民币保险金额'] = 0.0
+        # 【优化v4.2】人民币金额直接计算写入输出文件（不依赖打开文件时Excel重算）
+        # B1. 处理当季度剩余数据（人民币金额按当季度汇率；季度日期列在 Step C 计算）
+        df_remainder['人民币保险金额'] = self.rmb_amounts(df_remainder, self.current_usd_rate, self.current_hkd_rate)
         df_remainder['季度起期'] = pd.NaT
         df_remainder['季度止期'] = pd.NaT
 
-        # B2. 处理上季度数据（添加人民币金额列 - 暂不填充，Excel公式处理）
-        df_prev_merged['人民币保险金额'] = 0.0
+        # B2. 处理上季度数据（人民币金额按上季度汇率）
+        df_prev_merged['人民币保险金额'] = self.rmb_amounts(df_prev_merged, self.prev_usd_rate, self.prev_hkd_rate)
 
         # ===== Step B3: 检测和修正保险起期年份错误 =====
         self.progress.emit(40, "检测日期年份错误...")
         self.log.emit("🔍 Step B3: 检测和修正保险起期年份错误...")
 
-        def detect_and_fix_year_errors(df, expected_year, quarter):
-            """检测并修正保险起期年份错误
-
-            Args:
-                df: 数据框
-                expected_year: 预期年份
-                quarter: 当前季度(1-4)
-            """
-            df_copy = df.copy()
-
-            # 解析保险起期和止期
-            start_dates = pd.to_datetime(df_copy['保险起期'], errors='coerce')
-            end_dates = pd.to_datetime(df_copy['保险止期'], errors='coerce')
-
-            # 检测年份错误的条件:
-            # 1. 保险起期年份与预期年份相差超过2年
-            # 2. 保险止期年份在合理范围内(expected_year-1 到 expected_year+1)
-            # 3. 保险起期晚于保险止期(明显错误)
-
-            errors_found = 0
-            corrected_dates = []
-
-            for idx, (start, end) in enumerate(zip(start_dates, end_dates)):
-                if pd.isna(start) or pd.isna(end):
-                    continue
-
-                start_year = start.year
-                end_year = end.year
-
-                # 条件1: 起期年份与预期相差过大(超过2年)
-                year_diff_large = abs(start_year - expected_year) > 2
-
-                # 条件2: 止期年份在合理范围
-                end_year_reasonable = (expected_year - 1) <= end_year <= (expected_year + 1)
-
-                # 条件3: 起期晚于止期
-                start_after_end = start > end
-
-                if (year_diff_large and end_year_reasonable) or start_after_end:
-                    # 尝试修正: 使用止期的年份作为参考
-                    # 如果保险跨年，起期可能是上一年
-                    corrected_year = end_year if end.month >= 6 else end_year - 1
-
-                    # 保持月份和日期不变
-                    try:
-                        corrected_start = start.replace(year=corrected_year)
-
-                        # 验证修正后的日期是否合理(起期应早于止期)
-                        if corrected_start <= end:
-                            loan_no = df_copy.iloc[idx]['贷款编号']
-                            original_str = start.strftime('%Y/%m/%d') if pd.notna(start) else 'N/A'
-                            corrected_str = corrected_start.strftime('%Y/%m/%d')
-
-                            corrected_dates.append({
-                                'index': idx,
-                                'loan_no': loan_no,
-                                'original': start,
-                                'corrected': corrected_start,
-                                'original_str': original_str,
-                                'corrected_str': corrected_str,
-                                'end_date': end
-                            })
-
-                            # 修正日期
-                            df_copy.at[df_copy.index[idx], '保险起期'] = corrected_start
-                            errors_found += 1
-                    except:
-                        pass
-
-            return df_copy, corrected_dates, errors_found
-
         # 检测并修正上季度数据
-        df_prev_merged, prev_corrections, prev_errors = detect_and_fix_year_errors(
+        df_prev_merged, prev_corrections, prev_errors = self.detect_and_fix_year_errors(
             df_prev_merged, self.year, self.quarter
         )
 
-        if prev_errors > 0:
-            self.log.emit(f"   🚨 上季度发现 {prev_errors} 条保险起期年份错误,已自动修正:")
-            for correction in prev_corrections[:5]:  # 显示前5条
-                self.log.emit(f"      ⚠️ 贷款[{correction['loan_no']}]: "
-                            f"{correction['original_str']} → {correction['corrected_str']} "
-                            f"(保险止期: {correction['end_date'].strftime('%Y/%m/%d')})")
-            if prev_errors > 5:
-                self.log.emit(f"      ... 还有 {prev_errors - 5} 条已修正")
-        else:
-            self.log.emit(f"   ✓ 上季度未发现年份错误")
+        self._log_year_corrections('上季度', prev_corrections, prev_errors)
 
         # 检测并修正当季度数据
-        df_remainder, curr_corrections, curr_errors = detect_and_fix_year_errors(
+        df_remainder, curr_corrections, curr_errors = self.detect_and_fix_year_errors(
             df_remainder, self.year, self.quarter
         )
 
-        if curr_errors > 0:
-            self.log.emit(f"   🚨 当季度发现 {curr_errors} 条保险起期年份错误,已自动修正:")
-            for correction in curr_corrections[:5]:  # 显示前5条
-                self.log.emit(f"      ⚠️ 贷款[{correction['loan_no']}]: "
-                            f"{correction['original_str']} → {correction['corrected_str']} "
-                            f"(保险止期: {correction['end_date'].strftime('%Y/%m/%d')})")
-            if curr_errors > 5:
-                self.log.emit(f"      ... 还有 {curr_errors - 5} 条已修正")
-        else:
-            self.log.emit(f"   ✓ 当季度未发现年份错误")
+        self._log_year_corrections('当季度', curr_corrections, curr_errors)
 
         # ===== Step C: 计算季度起期和季度止期 =====
         self.progress.emit(50, "计算季度日期...")
         self.log.emit(f"📅 Step C: 计算季度日期 (上季度: {self.prev_year}Q{self.prev_quarter}, 当季度: {self.year}Q{self.quarter})...")
 
         # 计算当季度范围(用于筛选结清记录)
-        bounds = {1: (datetime(self.year,1,1), datetime(self.year,3,31)),
-                  2: (datetime(self.year,4,1), datetime(self.year,6,30)),
-                  3: (datetime(self.year,7,1), datetime(self.year,9,30)),
-                  4: (datetime(self.year,10,1), datetime(self.year,12,31))}
-        q_start, q_end = bounds[self.quarter]
+        q_start, q_end = self.quarter_bounds(self.year, self.quarter)
 
         # 计算上季度范围(用于计算上季度文件的季度日期)
-        prev_bounds = {1: (datetime(self.prev_year,1,1), datetime(self.prev_year,3,31)),
-                       2: (datetime(self.prev_year,4,1), datetime(self.prev_year,6,30)),
-                       3: (datetime(self.prev_year,7,1), datetime(self.prev_year,9,30)),
-                       4: (datetime(self.prev_year,10,1), datetime(self.prev_year,12,31))}
-        prev_q_start, prev_q_end = prev_bounds[self.prev_quarter]
+        prev_q_start, prev_q_end = self.quarter_bounds(self.prev_year, self.prev_quarter)
 
         def calc_quarter_dates(df, q_start, q_end, apply_settled_rule=False):
-            """计算季度起期和止期
-
-            Args:
-                df: 数据框
-                q_start: 季度开始日期
-                q_end: 季度结束日期
-                apply_settled_rule: 是否应用结清记录特殊规则
-            """
-            df_copy = df.copy()
-
-            # C. 向量化日期解析
-            start_dates = self.parse_date_vectorized(df_copy['保险起期'])
-            end_dates = self.parse_date_vectorized(df_copy['保险止期'])
-
-            # 标记是否为结清记录
-            is_settled = df_copy['贷款分类'].astype(str).str.contains('结清', na=False)
-
-            # 标记保险止期是否在当季度内
-            end_in_quarter = (end_dates >= q_start) & (end_dates <= q_end)
-
-            # C. 计算季度起期
-            df_copy['季度起期'] = start_dates
-            df_copy.loc[start_dates < q_start, '季度起期'] = q_start
-            df_copy.loc[start_dates > q_end, '季度起期'] = pd.NaT
-
-            # 【修正v4.1.6】不再强制结清记录的季度起期为季度第一天
-            # 结清记录遵循标准规则:
-            # - 如果保险起期 >= 季度开始, 季度起期 = 保险起期
-            # - 如果保险起期 < 季度开始, 季度起期 = 季度开始
-
-            # C. 计算季度止期
-            df_copy['季度止期'] = end_dates
-            df_copy.loc[end_dates > q_end, '季度止期'] = q_end
-            df_copy.loc[end_dates < q_start, '季度止期'] = pd.NaT
-
-            # 【修正v4.1.6】结清记录的季度止期使用实际保险止期(不截断到季度末)
-            # 这样可以准确计算当季度的保费天数
-            if apply_settled_rule:
-                settled_in_q = is_settled & end_in_quarter
-                if settled_in_q.any():
-                    df_copy.loc[settled_in_q, '季度止期'] = end_dates[settled_in_q]
-                    # 输出示例
-                    count = settled_in_q.sum()
-                    self.log.emit(f"   ✓ 应用结清规则: {count} 条记录")
-                    examples = df_copy[settled_in_q].head(3)
-                    for idx, row in examples.iterrows():
-                        q_start_actual = row['季度起期']
-                        q_end_actual = row['季度止期']
-                        self.log.emit(f"      结清[{row['贷款编号']}]: 季度起期={q_start_actual.strftime('%Y/%m/%d') if pd.notna(q_start_actual) else 'N/A'}, 季度止期={q_end_actual.strftime('%Y/%m/%d') if pd.notna(q_end_actual) else 'N/A'}")
-
-            # 判断是否在季度内
-            df_copy['_in_q'] = (~start_dates.isna()) & (~end_dates.isna()) & \
-                                 ~((end_dates < q_start) | (start_dates > q_end))
-
-            return df_copy
+            df, settled_in_q = self.quarter_dates(df, q_start, q_end, apply_settled_rule)
+            if settled_in_q.any():
+                self._log_settled_rule(int(settled_in_q.sum()), df[settled_in_q].head(3))
+            return df
 
         # C1. 计算上季度的季度日期(使用上季度范围,应用结清规则)
         df_prev_merged = calc_quarter_dates(df_prev_merged, prev_q_start, prev_q_end, apply_settled_rule=True)
@@ -649,10 +925,10 @@ class QuarterProcessWorker(QThread):
         df_remainder = calc_quarter_dates(df_remainder, q_start, q_end, apply_settled_rule=True)
         self.log.emit(f"   当季度({self.year}Q{self.quarter})季度日期计算完成")
 
-        # ===== Step D: 添加季度保费列（暂不填充，Excel公式处理） =====
-        self.progress.emit(60, "准备季度保费列...")
-        self.log.emit("💵 Step D: 准备季度保费列...")
-        df_prev_merged['季度保费'] = 0.0
+        # ===== Step D: 计算季度保费列 =====
+        self.progress.emit(60, "计算季度保费...")
+        self.log.emit("💵 Step D: 计算季度保费...")
+        df_prev_merged['季度保费'] = self.quarter_premiums(df_prev_merged)
 
         # ===== Step D2: 最终清理 - 删除重复贷款编号中的存量记录 =====
         self.progress.emit(65, "最终清理重复记录...")
@@ -661,276 +937,342 @@ class QuarterProcessWorker(QThread):
         # 统计清理前的记录数
         before_cleanup = len(df_prev_merged)
 
-        # 标记重复的贷款编号
-        df_prev_merged['_is_dup'] = df_prev_merged.duplicated(subset=['贷款编号'], keep=False)
-
-        # 标记是否为存量
-        df_prev_merged['_is_stock'] = df_prev_merged['贷款分类'].astype(str).str.contains('存量', na=False)
-
-        # 找出所有重复的贷款编号
-        dup_loans = df_prev_merged[df_prev_merged['_is_dup']]['贷款编号'].unique()
-
-        # 删除规则: 贷款编号重复 且 贷款分类为存量
-        to_remove_final = []
-        for loan_no in dup_loans:
-            loan_records = df_prev_merged[df_prev_merged['贷款编号'] == loan_no]
-            stock_records = loan_records[loan_records['_is_stock']]
-
-            if len(stock_records) > 0:
-                # 记录要删除的存量记录
-                to_remove_final.extend(stock_records.index.tolist())
-                self.log.emit(f"   🗑️ 删除重复贷款[{loan_no}]的存量记录({len(stock_records)}条)")
-
-        # 执行删除
-        df_prev_merged = df_prev_merged.drop(index=to_remove_final)
-        df_prev_merged = df_prev_merged.drop(columns=['_is_dup', '_is_stock'])
-
-        removed_final = len(to_remove_final)
+        # 【优化v4.2】按贷款编号分组一次完成，输出汇总而不是逐笔日志
+        df_prev_merged, dup_summary = self.remove_duplicate_stock(df_prev_merged)
+        removed_final = dup_summary['removed']
         after_cleanup = len(df_prev_merged)
 
+        self.log.emit(f"   重复贷款编号: {dup_summary['dup_loans']} 个，"
+                      f"其中 {dup_summary['affected_loans']} 个含存量记录")
+        if removed_final:
+            self.log.emit("   每笔删除存量条数: " + ", ".join(
+                f"{n}条×{loans}个" for n, loans in dup_summary['per_loan_counts'].items()))
+            if dup_summary['by_agency']:
+                self.log.emit("   按经办机构: " + ", ".join(
+                    f"{agency} {n}条" for agency, n in dup_summary['by_agency'].items()))
+            self.log.emit("   示例: " + ", ".join(
+                f"贷款[{loan_no}]({n}条)" for loan_no, n in dup_summary['examples'].items()))
+
         self.log.emit(f"   最终清理完成:")
         self.log.emit(f"   - 清理前: {before_cleanup} 行")
         self.log.emit(f"   - 删除存量: {removed_final} 条")
         self.log.emit(f"   - 清理后: {after_cleanup} 行")
 
-        # ===== Step E: 生成Excel（使用公式计算人民币金额） =====
+        # ===== Step E: 生成Excel（写入计算值，可选保留公式） =====
         self.progress.emit(70, "生成Excel...")
         self.log.emit("📊 Step E: 生成Excel输出...")
 
-        # E1. 先保存当季度剔除结清后的文件（带公式）
+        # E1. 保存当季度剔除结清后的文件（带公式）
         self.log.emit("💾 保存当季度剔除结清后文件...")
-        remainder_file = str(Path(self.output_file).parent / f"{Path(self.current_file).stem}_剔除结清后.xlsx")
-
-        # 准备当季度输出列
-        current_output_cols = ['贷款编号', '经办机构', '被保险人', '被保险财产标的', '城市', '被保险财产地址',
-                              '币种', '保险金额', '人民币保险金额', '保险起期', '保险止期', '贷款分类',
-                              '季度起期', '季度止期']
-        df_current_output = df_remainder[current_output_cols].copy()
-
-        with pd.ExcelWriter(remainder_file, engine='openpyxl') as writer:
-            df_current_output.to_excel(writer, sheet_name=f"{self.year}Q{self.quarter}", index=False)
-
-        # E2. 准备上季度输出数据
-        output_cols = ['贷款编号', '经办机构', '被保险人', '被保险财产标的', '城市', '被保险财产地址',
-                       '币种', '保险金额', '人民币保险金额', '保险起期', '保险止期', '贷款分类',
-                       '季度起期', '季度止期', '季度保费']
-        df_output = df_prev_merged[output_cols].copy()
-
-        # 使用 ExcelWriter 批量写入 (使用上季度的年份和季度)
-        with pd.ExcelWriter(self.output_file, engine='openpyxl') as writer:
-            df_output.to_excel(writer, sheet_name=f"{self.prev_year}Q{self.prev_quarter}", index=False)
-
-            # 写入空的分行统计（稍后用公式计算）
-            stats_headers = ['经办机构', '季度保费合计', '人民币保险金额合计', '贷款笔数']
-            df_stats_empty = pd.DataFrame(columns=stats_headers)
-            df_stats_empty.to_excel(writer, sheet_name='分行统计', index=False)
-
-        # E3. 格式化当季度文件并添加公式
+        remainder_file = self._remainder_file()
         self.log.emit("🎨 格式化当季度文件...")
-        wb_current = load_workbook(remainder_file)
-        ws_current = wb_current[f"{self.year}Q{self.quarter}"]
-
-        cfont = Font(name='Microsoft YaHei', size=9)
-        border = Border(left=Side(style='thin', color='CCCCCC'), right=Side(style='thin', color='CCCCCC'),
-                       top=Side(style='thin', color='CCCCCC'), bottom=Side(style='thin', color='CCCCCC'))
-
-        # 添加人民币金额公式（当季度汇率）
-        self.log.emit(f"   添加当季度人民币金额公式 (USD={self.current_usd_rate}, HKD={self.current_hkd_rate})...")
-        for row_idx in range(2, len(df_remainder) + 2):
-            # I列 (col=9): 人民币保险金额公式
-            formula = f'=H{row_idx}*IF(G{row_idx}="美元",{self.current_usd_rate},IF(G{row_idx}="港币",{self.current_hkd_rate},1))'
-            ws_current.cell(row=row_idx, column=9, value=formula)
-
-        # 设置格式
-        for row_idx in range(1, len(df_remainder) + 2):
-            for col_idx in range(1, 15):
-                cell = ws_current.cell(row=row_idx, column=col_idx)
-                cell.font = cfont
-                cell.border = border
-                if row_idx >= 2 and col_idx <= 6:
-                    cell.alignment = Alignment(horizontal='left', vertical='center', wrap_text=(col_idx == 6))
-                elif row_idx == 1:
-                    cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                else:
-                    cell.alignment = Alignment(vertical='center', wrap_text=(col_idx == 6))
-
-        # 设置数字格式
-        for row in ws_current.iter_rows(min_row=2, max_row=len(df_remainder) + 1, min_col=8, max_col=9):
-            for cell in row:
-                cell.number_format = '#,##0.00'
-
-        # 设置日期格式
-        date_cols = [10, 11, 13, 14]
-        for row in ws_current.iter_rows(min_row=2, max_row=len(df_remainder) + 1):
-            for col_idx in date_cols:
-                cell = row[col_idx - 1]
-                if cell.value:
-                    cell.number_format = 'YYYY/M/D'
-
-        # 设置列宽
-        widths = {'A': 20, 'B': 10, 'C': 12, 'D': 14, 'E': 8, 'F': 56, 'G': 6, 'H': 14, 'I': 16,
-                  'J': 12, 'K': 12, 'L': 8, 'M': 12, 'N': 12}
-        for col, w in widths.items():
-            ws_current.column_dimensions[col].width = w
-
-        wb_current.save(remainder_file)
+        self.log.emit(f"   写入当季度人民币金额{'公式' if self.write_formulas else ''} "
+                      f"(USD={self.current_usd_rate}, HKD={self.current_hkd_rate})...")
+        self._write_current_file(remainder_file, [df_remainder])
         self.log.emit(f"   ✅ 当季度文件保存完成: {len(df_remainder)} 行")
+        self._save_snapshot(remainder_file, [df_remainder[self.CURRENT_OUTPUT_COLS]], len(df_remainder),
+                            sheet=f"{self.year}Q{self.quarter}",
+                            usd_rate=self.current_usd_rate, hkd_rate=self.current_hkd_rate)
 
-        # E4. 格式化上季度文件并添加公式
+        # E2. 上季度文件（使用上季度的年份和季度）
         self.progress.emit(80, "格式化上季度Excel...")
         self.log.emit("🎨 格式化上季度文件...")
-        wb = load_workbook(self.output_file)
-        ws = wb[f"{self.prev_year}Q{self.prev_quarter}"]
-
-        # 添加人民币金额公式（上季度汇率）
-        self.log.emit(f"   添加上季度人民币金额公式 (USD={self.prev_usd_rate}, HKD={self.prev_hkd_rate})...")
-        for row_idx in range(2, len(df_prev_merged) + 2):
-            # I列 (col=9): 人民币保险金额公式
-            formula = f'=H{row_idx}*IF(G{row_idx}="美元",{self.prev_usd_rate},IF(G{row_idx}="港币",{self.prev_hkd_rate},1))'
-            ws.cell(row=row_idx, column=9, value=formula)
-
-            # O列 (col=15): 季度保费公式
-            # =(N-M+1)*I/365*0.0037/100
-            formula_premium = f'=IF(AND(M{row_idx}<>"",N{row_idx}<>""),(N{row_idx}-M{row_idx}+1)*I{row_idx}/365*0.0037/100,0)'
-            ws.cell(row=row_idx, column=15, value=formula_premium)
-
-        # 【不改变填充色】只设置字体、边框和对齐方式
-        for row_idx in range(1, len(df_prev_merged) + 2):
-            for col_idx in range(1, 16):
-                cell = ws.cell(row=row_idx, column=col_idx)
-                cell.font = cfont
-                cell.border = border
-
-                # A-F列左对齐（从第2行开始）
-                if row_idx >= 2 and col_idx <= 6:
-                    cell.alignment = Alignment(horizontal='left', vertical='center', wrap_text=(col_idx == 6))
-                elif row_idx == 1:
-                    # 表头居中
-                    cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                else:
-                    cell.alignment = Alignment(vertical='center', wrap_text=(col_idx == 6))
-
-        # 设置数字格式（保险金额、人民币保险金额、季度保费）
-        for row in ws.iter_rows(min_row=2, max_row=len(df_prev_merged) + 1, min_col=8, max_col=9):
-            for cell in row:
-                cell.number_format = '#,##0.00'
-        for row in ws.iter_rows(min_row=2, max_row=len(df_prev_merged) + 1, min_col=15, max_col=15):
-            for cell in row:
-                cell.number_format = '#,##0.00'
-
-        # 【重要】设置日期格式为 '2025/1/1' 格式
-        # 保险起期 (J列=10)、保险止期 (K列=11)、季度起期 (M列=13)、季度止期 (N列=14)
-        date_cols = [10, 11, 13, 14]
-        for row in ws.iter_rows(min_row=2, max_row=len(df_prev_merged) + 1):
-            for col_idx in date_cols:
-                cell = row[col_idx - 1]  # 索引从0开始
-                if cell.value:
-                    cell.number_format = 'YYYY/M/D'
-
-        # 添加汇总信息和汇率
-        headers = ['贷款编号', '经办机构', '被保险人', '被保险财产标的', '城市', '被保险财产地址',
-                   '币种', '保险金额', '人民币保险金额', '保险起期', '保险止期', '贷款分类',
-                   '季度起期', '季度止期', '季度保费', '人民币保险金额合计', '季度保费合计', '上季度美元汇率', '上季度港币汇率']
-        for c, h in enumerate(headers[15:], 16):
-            ws.cell(row=1, column=c, value=h).font = cfont
-            ws.cell(row=1, column=c).border = border
-            ws.cell(row=1, column=c).alignment = Alignment(horizontal='center', vertical='center')
-
-        last = len(df_prev_merged) + 1
-        ws.cell(row=2, column=16, value=f'=SUM(I2:I{last})').number_format = '#,##0.00'
-        ws.cell(row=2, column=17, value=f'=SUM(O2:O{last})').number_format = '#,##0.00'
-        ws.cell(row=2, column=18, value=self.prev_usd_rate).number_format = '0.0000'
-        ws.cell(row=2, column=19, value=self.prev_hkd_rate).number_format = '0.0000'
-        for c in [16, 17, 18, 19]:
-            ws.cell(row=2, column=c).font = Font(name='Microsoft YaHei', size=9, bold=True, color='0066CC' if c >= 18 else '000000')
-            ws.cell(row=2, column=c).border = border
-
-        # 设置列宽（F列被保险财产地址宽度调整为56）
-        widths = {'A': 20, 'B': 10, 'C': 12, 'D': 14, 'E': 8, 'F': 56, 'G': 6, 'H': 14, 'I': 16,
-                  'J': 12, 'K': 12, 'L': 8, 'M': 12, 'N': 12, 'O': 12, 'P': 18, 'Q': 14, 'R': 10, 'S': 10}
-        for col, w in widths.items():
-            ws.column_dimensions[col].width = w
-        ws.row_dimensions[1].height = 30
-        ws.freeze_panes = 'A2'
+        self.log.emit(f"   写入上季度人民币金额{'公式' if self.write_formulas else ''} "
+                      f"(USD={self.prev_usd_rate}, HKD={self.prev_hkd_rate})...")
+        output_cols = self.OUTPUT_COLS
+        self._write_prev_file([df_prev_merged], len(df_prev_merged), df_prev_merged['人民币保险金额'].sum(),
+                              df_prev_merged['季度保费'].sum(), self._branch_stats(df_prev_merged))
+
+        self._save_snapshot(self.output_file, [df_prev_merged[output_cols]], len(df_prev_merged),
+                            sheet=f"{self.prev_year}Q{self.prev_quarter}",
+                            usd_rate=self.prev_usd_rate, hkd_rate=self.prev_hkd_rate)
+        if self.ledger_db:
+            self._save_to_store([(df_prev_merged[output_cols], df_prev_merged.index >= n_prev_rows)])
 
-        self.progress.emit(90, "生成分行统计...")
-        self.log.emit("📈 生成分行统计...")
-
-        # 生成分行统计数据（通过重新读取带公式的数据）
-        # 由于使用了公式，我们需要从源数据生成统计
-        wb.save(self.output_file)
-
-        # 重新加载以计算公式值
-        wb = load_workbook(self.output_file, data_only=False)
-        ws = wb[f"{self.prev_year}Q{self.prev_quarter}"]
-
-        # 获取不同的经办机构
-        agencies = df_prev_merged['经办机构'].unique()
+        self.log.emit(f"\n{'='*50}")
+        self.log.emit(f"✅ 完成! 上季度记录:{len(df_prev_merged)} 行")
+        self.log.emit(f"   当季度剔除结清后:{len(df_remainder)} 行")
+        self.log.emit(f"   输出文件: {Path(self.output_file).name}")
+        self.log.emit(f"   当季度文件: {Path(remainder_file).name}")
+        self.log.emit(f"{'='*50}")
+        self.progress.emit(100, "完成!")
+        self.finished.emit(True, self.output_file, "")
 
-        # 美化分行统计表
-        ws2 = wb['分行统计']
+    # 【优化v4.2】超大台账分块处理：两个季度文件都不整表读入内存
+    def process_files_chunked(self):
+        """分块处理（每块 chunk_rows 行），步骤和输出与 process_files 相同
+
+        1. 逐块读取上季度、当季度文件：上季度各块和当季度要移动的结清记录暂存到临时文件，
+           同时登记各贷款编号的出现次数/存量记录数（跨块只保留这一状态）；
+           当季度剩余记录逐块计算人民币金额、修正年份、计算季度日期后直接写入剔除结清后文件
+        2. 逐块读回上季度数据：删除重复存量，计算人民币金额、修正年份、计算季度日期和季度保费，
+           累计汇总值和分行统计后再次暂存
+        3. 逐块写出上季度文件（汇总值已知）、快照和台账库
+
+        输出文件中的字符串写为行内字符串（不在内存中累积字符串表）；合计值按块累加，
+        与整表计算可能有浮点末位差异。
+        """
+        chunk_rows = self.chunk_rows
+        standard_cols = self.STANDARD_COLS
+        title = f"{self.prev_year}Q{self.prev_quarter}"
+        q_start, q_end = self.quarter_bounds(self.year, self.quarter)
+        prev_q_start, prev_q_end = self.quarter_bounds(self.prev_year, self.prev_quarter)
+
+        def select_standard(names):
+            return list(find_standard_columns(names, standard_cols).values())
+
+        def standardize(chunks, label):
+            """按标准列选择并重命名（列映射按第一块确定）"""
+            col_map = None
+            for chunk in chunks:
+                if col_map is None:
+                    col_map = find_standard_columns(chunk.columns, standard_cols)
+                    self.log.emit(f"   {label}列映射: {col_map}")
+                    missing = [col for col in standard_cols if col not in col_map]
+                    if missing:
+                        self.log.emit(f"   ⚠️ {label}文件缺少列: {missing}")
+                yield chunk[[col_map[col] for col in standard_cols if col in col_map]].set_axis(
+                    [col for col in standard_cols if col in col_map], axis=1)
+
+        tracker = DuplicateStockTracker()
+        with ExitStack() as stack:
+            raw = stack.enter_context(ChunkSpool())
+            final = stack.enter_context(ChunkSpool())
+            # 剔除结清后文件的快照在文件写完后才能保存，需另存一份数据块
+            remainder = stack.enter_context(ChunkSpool()) if HAS_PYARROW else None
+
+            # ===== Step A: 分块读取上季度文件 =====
+            self.progress.emit(5, "分块读取上季度文件...")
+            self.log.emit(f"📂 分块处理模式: 每块 {chunk_rows} 行（数据块暂存到临时文件）")
+            self.log.emit("📂 Step A: 分块读取上季度文件...")
+            prev_chunks = iter_snapshot(self.prev_file, usecols=select_standard, batch_rows=chunk_rows)
+            if prev_chunks is not None:
+                self.log.emit("   使用快照（与Excel文件内容一致）")
+            else:
+                prev_chunks = iter_ledger_chunks(self.prev_file, header_keywords=('贷款编号',),
+                                                 usecols=select_standard, chunk_rows=chunk_rows)
+            for df in standardize(prev_chunks, '上季度'):
+                df = df.assign(_moved=False)
+                tracker.add(df)
+                raw.append(df)
+                self.progress.emit(10, f"读取上季度文件... {raw.rows} 行")
+            n_prev_rows = raw.rows
+            self.log.emit(f"   上季度数据: {n_prev_rows} 行")
+
+            # ===== Step A-C: 分块读取当季度文件，移动结清记录，剩余记录直接写出 =====
+            self.progress.emit(20, "分块读取当季度文件...")
+            self.log.emit("🔍 Step A: 分块读取当季度文件，筛选'结清'记录并移动...")
+            self.log.emit(f"   [诊断] 当季度范围: {q_start.strftime('%Y/%m/%d')} - {q_end.strftime('%Y/%m/%d')}")
+            current = {'rows': 0, 'settled': 0, 'kept_settled': 0, 'errors': 0, 'settled_rule': 0}
+            curr_corrections = []
+            rule_examples = []
+
+            def remainder_chunks():
+                chunks = iter_ledger_chunks(self.current_file, usecols=select_standard, chunk_rows=chunk_rows)
+                for df in standardize(chunks, '当季度'):
+                    # 【关键规则v4.1.4】只移动保险止期在当季度之前的结清记录
+                    end_dates = pd.to_datetime(df['保险止期'], errors='coerce')
+                    is_settled_class = df['贷款分类'].astype(str).str.contains('结清', na=False)
+                    is_settled_to_move = is_settled_class & (end_dates < q_start)
+                    settled = df[is_settled_to_move].assign(_moved=True)
+                    tracker.add(settled)
+                    raw.append(settled)
+                    current['rows'] += len(df)
+                    current['settled'] += int(is_settled_class.sum())
+                    current['kept_settled'] += int((is_settled_class & ~is_settled_to_move).sum())
+
+                    df_remainder = df[~is_settled_to_move].copy()
+                    df_remainder['人民币保险金额'] = self.rmb_amounts(df_remainder, self.current_usd_rate,
+                                                                self.current_hkd_rate)
+                    df_remainder, corrections, errors = self.detect_and_fix_year_errors(
+                        df_remainder, self.year, self.quarter)
+                    current['errors'] += errors
+                    curr_corrections.extend(corrections[:5 - len(curr_corrections)])
+                    df_remainder, settled_in_q = self.quarter_dates(df_remainder, q_start, q_end,
+                                                                    apply_settled_rule=True)
+                    current['settled_rule'] += int(settled_in_q.sum())
+                    if len(rule_examples) < 3 and settled_in_q.any():
+                        rule_examples.append(df_remainder[settled_in_q].head(3))
+                    if remainder is not None:
+                        remainder.append(df_remainder[self.CURRENT_OUTPUT_COLS])
+                    self.progress.emit(30, f"读取当季度文件... {current['rows']} 行")
+                    yield df_remainder
+
+            remainder_file = self._remainder_file()
+            n_remainder = self._write_current_file(remainder_file, remainder_chunks(), shared_strings=False)
+            moved = raw.rows - n_prev_rows
+            self.log.emit(f"   当季度数据: {current['rows']} 行")
+            self.log.emit(f"   当季度结清记录分析:")
+            self.log.emit(f"   - 总结清记录: {current['settled']} 条")
+            self.log.emit(f"   - 保险止期在当季度之前: {moved} 条 → 移动到上季度")
+            self.log.emit(f"   - 保险止期在当季度内: {current['kept_settled']} 条 → 保留在当季度")
+            self.log.emit(f"   合并到上季度后: {raw.rows} 行")
+            self._log_year_corrections('当季度', curr_corrections, current['errors'])
+            if current['settled_rule']:
+                self._log_settled_rule(current['settled_rule'], pd.concat(rule_examples).head(3))
+            self.log.emit(f"   当季度({self.year}Q{self.quarter})季度日期计算完成")
+            self.log.emit(f"   ✅ 当季度文件保存完成: {n_remainder} 行 (USD={self.current_usd_rate}, "
+                          f"HKD={self.current_hkd_rate})")
+            self._save_snapshot(remainder_file, remainder if remainder else [pd.DataFrame(
+                columns=self.CURRENT_OUTPUT_COLS)], n_remainder, sheet=f"{self.year}Q{self.quarter}",
+                usd_rate=self.current_usd_rate, hkd_rate=self.current_hkd_rate)
+
+            # ===== Step A2: 删除上季度重复存量行（按全部数据块的贷款编号计数判断） =====
+            self.progress.emit(45, "删除重复存量...")
+            self.log.emit("🔄 Step A2: 删除上季度重复存量行...")
+            self.log.emit(f"   删除重复存量: {tracker.removed} 条")
+            self.log.emit(f"   上季度最终: {tracker.rows - tracker.removed} 行")
+
+            # ===== Step B-D: 上季度逐块计算人民币金额、年份修正、季度日期和季度保费 =====
+            self.progress.emit(50, "处理上季度数据...")
+            self.log.emit(f"💰 Step B-D: 逐块计算上季度人民币保险金额、季度日期和季度保费...")
+            self.log.emit(f"   上季度汇率: USD={self.prev_usd_rate}, HKD={self.prev_hkd_rate}")
+            prev_errors, prev_corrections, settled_rule, rule_examples = 0, [], 0, []
+            rmb_total = premium_total = 0.0
+            stats = []
+            for df in raw.drain():
+                df = df[~tracker.remove_mask(df)].copy()
+                df['人民币保险金额'] = self.rmb_amounts(df, self.prev_usd_rate, self.prev_hkd_rate)
+                df, corrections, errors = self.detect_and_fix_year_errors(df, self.year, self.quarter)
+                prev_errors += errors
+                prev_corrections.extend(corrections[:5 - len(prev_corrections)])
+                df, settled_in_q = self.quarter_dates(df, prev_q_start, prev_q_end, apply_settled_rule=True)
+                settled_rule += int(settled_in_q.sum())
+                if len(rule_examples) < 3 and settled_in_q.any():
+                    rule_examples.append(df[settled_in_q].head(3))
+                df['季度保费'] = self.quarter_premiums(df)
+                rmb_total += df['人民币保险金额'].sum()
+                premium_total += df['季度保费'].sum()
+                stats.append(self._branch_stats(df))
+                final.append(df[self.OUTPUT_COLS + ['_moved']])
+                self.progress.emit(60, f"处理上季度数据... {final.rows} 行")
+            self._log_year_corrections('上季度', prev_corrections, prev_errors)
+            if settled_rule:
+                self._log_settled_rule(settled_rule, pd.concat(rule_examples).head(3))
+            self.log.emit(f"   上季度({self.prev_year}Q{self.prev_quarter})季度日期计算完成")
+
+            # ===== Step D2: 最终清理 =====
+            # A2 已删除重复贷款编号的全部存量记录，仍重复的贷款编号不含存量记录，不需要再遍历一次
+            self.log.emit("🧹 Step D2: 最终清理 - 删除重复贷款编号中的存量记录...")
+            self.log.emit(f"   重复贷款编号: {tracker.remaining_duplicates()} 个，其中 0 个含存量记录")
+            self.log.emit(f"   最终清理完成:")
+            self.log.emit(f"   - 清理前: {final.rows} 行")
+            self.log.emit(f"   - 删除存量: 0 条")
+            self.log.emit(f"   - 清理后: {final.rows} 行")
+
+            # ===== Step E: 逐块写出上季度文件 =====
+            self.progress.emit(70, "生成Excel...")
+            self.log.emit("📊 Step E: 生成Excel输出...")
+            self.log.emit(f"   写入上季度人民币金额{'公式' if self.write_formulas else ''} "
+                          f"(USD={self.prev_usd_rate}, HKD={self.prev_hkd_rate})...")
+            if stats:
+                stats = pd.concat(stats).groupby(level=0, sort=False, dropna=False).sum()
+            else:
+                stats = self._branch_stats(pd.DataFrame(columns=self.OUTPUT_COLS))
+            n_rows = final.rows
+            self._write_prev_file(final, n_rows, rmb_total, premium_total, stats, shared_strings=False)
+            self._save_snapshot(self.output_file, (df[self.OUTPUT_COLS] for df in final) if final else [
+                pd.DataFrame(columns=self.OUTPUT_COLS)], n_rows, sheet=title,
+                usd_rate=self.prev_usd_rate, hkd_rate=self.prev_hkd_rate)
+            if self.ledger_db:
+                self._save_to_store((df[self.OUTPUT_COLS], df['_moved']) for df in final)
 
-        # 填充分行统计数据
-        row_idx = 2
-        for agency in sorted(agencies):
-            ws2.cell(row=row_idx, column=1, value=agency)
+        self.log.emit(f"\n{'='*50}")
+        self.log.emit(f"✅ 完成! 上季度记录:{n_rows} 行")
+        self.log.emit(f"   当季度剔除结清后:{n_remainder} 行")
+        self.log.emit(f"   输出文件: {Path(self.output_file).name}")
+        self.log.emit(f"   当季度文件: {Path(remainder_file).name}")
+        self.log.emit(f"{'='*50}")
+        self.progress.emit(100, "完成!")
+        self.finished.emit(True, self.output_file, "")
 
-            # 季度保费合计 - 使用SUMIF公式
-            ws2.cell(row=row_idx, column=2, value=f'=SUMIF({ws.title}!$B$2:$B${len(df_prev_merged)+1},A{row_idx},{ws.title}!$O$2:$O${len(df_prev_merged)+1})')
 
-            # 人民币保险金额合计 - 使用SUMIF公式
-            ws2.cell(row=row_idx, column=3, value=f'=SUMIF({ws.title}!$B$2:$B${len(df_prev_merged)+1},A{row_idx},{ws.title}!$I$2:$I${len(df_prev_merged)+1})')
+# 【优化v4.2】年度对比的文件读取为模块级函数（不依赖线程对象，可在子进程中并行执行）
+def _available_cpus():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
 
-            # 贷款笔数 - 使用COUNTIF公式
-            ws2.cell(row=row_idx, column=4, value=f'=COUNTIF({ws.title}!$B$2:$B${len(df_prev_merged)+1},A{row_idx})')
 
-            row_idx += 1
+def round_cents(series):
+    """整列四舍五入保留两位小数，结果与逐个 round(x, 2) 相同
 
-        # 设置格式
-        for col_idx in range(1, 5):
-            cell = ws2.cell(row=1, column=col_idx)
-            cell.font = cfont
-            cell.border = border
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+    按 ×100 取整计算；×100 后接近 .5 或数值过大（浮点误差可能影响取整方向）的少数值改用 round(x, 2)
+    """
+    values = series.to_numpy(dtype=float)
+    scaled = values * 100
+    result = np.rint(scaled) / 100
+    with np.errstate(invalid='ignore'):
+        unsure = (np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6) | ~(np.abs(scaled) < 1e12)
+    for i in np.flatnonzero(unsure & ~np.isnan(values)):
+        result[i] = round(float(values[i]), 2)
+    return pd.Series(result, index=series.index)
 
-        # 格式化数据行
-        num_rows = len(agencies)
-        for r in range(2, num_rows + 2):
-            for col_idx in range(1, 5):
-                cell = ws2.cell(row=r, column=col_idx)
-                cell.border = border
-                cell.font = cfont
-                if col_idx >= 2:
-                    cell.number_format = '#,##0.00' if col_idx <= 3 else '0'
 
-        # 合计行
-        tr = num_rows + 2
-        tfont = Font(name='Microsoft YaHei', size=9, bold=True)
-        ws2.cell(row=tr, column=1, value='合计').font = tfont
-        ws2.cell(row=tr, column=2, value=f'=SUM(B2:B{tr - 1})').font = tfont
-        ws2.cell(row=tr, column=2).number_format = '#,##0.00'
-        ws2.cell(row=tr, column=3, value=f'=SUM(C2:C{tr - 1})').number_format = '#,##0.00'
-        ws2.cell(row=tr, column=4, value=f'=SUM(D2:D{tr - 1})').number_format = '0'
-        for c in range(1, 5):
-            ws2.cell(row=tr, column=c).border = border
-            ws2.cell(row=tr, column=c).font = tfont
-
-        ws2.column_dimensions['A'].width = 12
-        ws2.column_dimensions['B'].width = 16
-        ws2.column_dimensions['C'].width = 20
-        ws2.column_dimensions['D'].width = 10
-        ws2.freeze_panes = 'A2'
-
-        wb.save(self.output_file)
-
-        self.log.emit(f"\n{'='*50}")
-        self.log.emit(f"✅ 完成! 上季度记录:{len(df_prev_merged)} 行")
-        self.log.emit(f"   当季度剔除结清后:{len(df_remainder)} 行")
-        self.log.emit(f"   输出文件: {Path(self.output_file).name}")
-        self.log.emit(f"   当季度文件: {Path(remainder_file).name}")
-        self.log.emit(f"{'='*50}")
-        self.progress.emit(100, "完成!")
-        self.finished.emit(True, self.output_file, "")
+def read_branch_premiums(path, name):
+    """读取季度文件的分行季度保费 -> DataFrame[经办机构, name]"""
+    # 本工具输出的季度文件：按快照汇总（与分行统计表的 SUMIF 结果相同）
+    df = read_snapshot(path, usecols=lambda names: [c for c in names if c in ('经办机构', '季度保费')])
+    if df is not None and len(df.columns) == 2:
+        return df.groupby('经办机构')['季度保费'].sum().reset_index().rename(columns={'季度保费': name})
+    try:
+        df = read_ledger(path, sheet_name='分行统计')
+        prem_col = next((c for c in df.columns if '季度保费' in str(c)), df.columns[-1])
+        branch_col = df.columns[0]
+        df = df[~df[branch_col].astype(str).str.contains('合计', na=False)]
+        result = df[[branch_col, prem_col]].rename(columns={branch_col: '经办机构', prem_col: name})
+        # 检查数据是否为空（公式未计算的情况）
+        if result[name].notna().sum() > 0:
+            return result
+    except:
+        pass
+    # 回退：从原始数据表计算季度保费
+    # 【优化v4.2】只读取下面用到的列
+    df = read_ledger(path, sheet_name=0, usecols=lambda names: [
+        c for c in names if c in ('季度保费', '保险金额', '币种')
+        or any(k in str(c) for k in ('经办机构', '美元汇率', '港币汇率'))])
+    branch = next((c for c in df.columns if '经办机构' in str(c)), None)
+    prem_col = next((c for c in df.columns if c == '季度保费'), None)
+    # 如果季度保费列有数据，直接使用
+    if prem_col and df[prem_col].notna().sum() > 0:
+        return df.groupby(branch)[prem_col].sum().reset_index().rename(columns={branch: '经办机构', prem_col: name})
+    # 否则根据保险金额、币种、汇率计算
+    if not branch: raise ValueError("找不到经办机构列")
+    amt_col = next((c for c in df.columns if c == '保险金额'), None)
+    curr_col = next((c for c in df.columns if c == '币种'), None)
+    if not amt_col or not curr_col: raise ValueError("找不到保险金额或币种列")
+    # 获取汇率（从文件中读取或使用默认值）
+    usd_col = next((c for c in df.columns if '美元汇率' in str(c)), None)
+    hkd_col = next((c for c in df.columns if '港币汇率' in str(c)), None)
+    usd_rate = df[usd_col].dropna().iloc[0] if usd_col and df[usd_col].notna().any() else 7.2
+    hkd_rate = df[hkd_col].dropna().iloc[0] if hkd_col and df[hkd_col].notna().any() else 0.93
+    # 【优化v4.2】计算人民币保险金额：币种查表得到汇率（其他币种为1），整列相乘
+    rates = df[curr_col].map({'美元': usd_rate, '港币': hkd_rate}).fillna(1)
+    df['_rmb_amt'] = df[amt_col].fillna(0) * rates
+    # 季度保费 = 人民币保险金额 * 0.00025，四舍五入保留两位小数
+    df['_prem_raw'] = df['_rmb_amt'] * 0.00025
+    # 四舍五入后，如果原值>0但结果为0，则调整为0.01
+    prem = round_cents(df['_prem_raw'])
+    df['_prem'] = prem.mask((df['_prem_raw'] > 0) & (prem == 0), 0.01)
+    return df.groupby(branch)['_prem'].sum().reset_index().rename(columns={branch: '经办机构', '_prem': name})
+
+
+def read_annual_premiums(path):
+    """读取年初总表的分行保费 -> DataFrame[经办机构, 年初保费]"""
+    try:
+        df = read_ledger(path, sheet_name='分行统计')
+        prem_col = next((c for c in df.columns if '保费' in str(c)), df.columns[-1])
+        branch_col = df.columns[0]
+        df = df[~df[branch_col].astype(str).str.contains('合计', na=False)]
+        return df[[branch_col, prem_col]].rename(columns={branch_col: '经办机构', prem_col: '年初保费'})
+    except:
+        # 【优化v4.2】只读前10行探测表头，之后只读取经办机构/保费列
+        df = read_ledger(path, header_keywords=('贷款编号', '经办机构'), usecols=lambda names: [
+            c for c in names if '经办机构' in str(c) or '保费' in str(c)])
+        branch = next((c for c in df.columns if '经办机构' in str(c)), None)
+        prem = next((c for c in df.columns if '保费' in str(c)), None)
+        if not branch or not prem: raise ValueError("找不到必要列")
+        return df.groupby(branch)[prem].sum().reset_index().rename(columns={branch: '经办机构', prem: '年初保费'})
 
 
 class YearCompareWorker(QThread):
@@ -939,12 +1281,14 @@ class YearCompareWorker(QThread):
     finished = pyqtSignal(bool, str, str)
     log = pyqtSignal(str)
 
-    def __init__(self, q1, q2, q3, q4, annual, output, year):
+    def __init__(self, q1, q2, q3, q4, annual, output, year, ledger_db=None):
         super().__init__()
         self.q_files = {'Q1': q1, 'Q2': q2, 'Q3': q3, 'Q4': q4}
         self.annual_file = annual
         self.output_file = output
         self.year = year
+        # 本地台账库路径（None 表示不使用）
+        self.ledger_db = ledger_db
 
     def run(self):
         try:
@@ -956,90 +1300,92 @@ class YearCompareWorker(QThread):
     def read_branch(self, path, name):
         """读取分行统计"""
         self.log.emit(f"   {name}: {Path(path).name}")
-        try:
-            df = pd.read_excel(path, sheet_name='分行统计')
-            prem_col = next((c for c in df.columns if '季度保费' in str(c)), df.columns[-1])
-            branch_col = df.columns[0]
-            df = df[~df[branch_col].astype(str).str.contains('合计', na=False)]
-            result = df[[branch_col, prem_col]].rename(columns={branch_col: '经办机构', prem_col: name})
-            # 检查数据是否为空（公式未计算的情况）
-            if result[name].notna().sum() > 0:
-                return result
-        except:
-            pass
-        # 回退：从原始数据表计算季度保费
-        df = pd.read_excel(path, sheet_name=0)
-        branch = next((c for c in df.columns if '经办机构' in str(c)), None)
-        prem_col = next((c for c in df.columns if c == '季度保费'), None)
-        # 如果季度保费列有数据，直接使用
-        if prem_col and df[prem_col].notna().sum() > 0:
-            return df.groupby(branch)[prem_col].sum().reset_index().rename(columns={branch: '经办机构', prem_col: name})
-        # 否则根据保险金额、币种、汇率计算
-        if not branch: raise ValueError("找不到经办机构列")
-        amt_col = next((c for c in df.columns if c == '保险金额'), None)
-        curr_col = next((c for c in df.columns if c == '币种'), None)
-        if not amt_col or not curr_col: raise ValueError("找不到保险金额或币种列")
-        # 获取汇率（从文件中读取或使用默认值）
-        usd_col = next((c for c in df.columns if '美元汇率' in str(c)), None)
-        hkd_col = next((c for c in df.columns if '港币汇率' in str(c)), None)
-        usd_rate = df[usd_col].dropna().iloc[0] if usd_col and df[usd_col].notna().any() else 7.2
-        hkd_rate = df[hkd_col].dropna().iloc[0] if hkd_col and df[hkd_col].notna().any() else 0.93
-        # 计算人民币保险金额
-        def to_rmb(row):
-            amt = row[amt_col] if pd.notna(row[amt_col]) else 0
-            curr = row[curr_col] if pd.notna(row[curr_col]) else ''
-            if curr == '美元': return amt * usd_rate
-            if curr == '港币': return amt * hkd_rate
-            return amt
-        df['_rmb_amt'] = df.apply(to_rmb, axis=1)
-        # 季度保费 = 人民币保险金额 * 0.00025，四舍五入保留两位小数
-        df['_prem_raw'] = df['_rmb_amt'] * 0.00025
-        # 四舍五入后，如果原值>0但结果为0，则调整为0.01
-        df['_prem'] = df['_prem_raw'].apply(lambda x: 0.01 if x > 0 and round(x, 2) == 0 else round(x, 2))
-        return df.groupby(branch)['_prem'].sum().reset_index().rename(columns={branch: '经办机构', '_prem': name})
+        return read_branch_premiums(path, name)
 
     def read_annual(self, path):
         """读取年初总表"""
         self.log.emit(f"   年初总表: {Path(path).name}")
+        return read_annual_premiums(path)
+
+    def _read_from_store(self, q_paths):
+        """【优化v4.2】所选季度文件是本工具的输出且已写入台账库时，直接按季度查询分行保费
+
+        Returns:
+            {季度: 分行保费数据}（未入库或已被修改的文件不在其中）
+        """
+        results = {}
         try:
-            df = pd.read_excel(path, sheet_name='分行统计')
-            prem_col = next((c for c in df.columns if '保费' in str(c)), df.columns[-1])
-            branch_col = df.columns[0]
-            df = df[~df[branch_col].astype(str).str.contains('合计', na=False)]
-            return df[[branch_col, prem_col]].rename(columns={branch_col: '经办机构', prem_col: '年初保费'})
-        except:
-            raw = pd.read_excel(path, header=None)
-            hrow = next((i for i in range(min(10, len(raw))) 
-                        if any('贷款编号' in str(v) or '经办机构' in str(v) for v in raw.iloc[i].astype(str))), 0)
-            df = pd.read_excel(path, header=hrow)
-            branch = next((c for c in df.columns if '经办机构' in str(c)), None)
-            prem = next((c for c in df.columns if '保费' in str(c)), None)
-            if not branch or not prem: raise ValueError("找不到必要列")
-            return df.groupby(branch)[prem].sum().reset_index().rename(columns={branch: '经办机构', prem: '年初保费'})
+            with LedgerStore(self.ledger_db) as store:
+                for q, path in q_paths.items():
+                    period = store.find_quarter(path)
+                    if period:
+                        results[q] = (store.branch_premiums(*period), path, period)
+        except (sqlite3.Error, OSError) as e:
+            self.log.emit(f"\n⚠️ 台账库读取失败，改为读取文件: {e}")
+            return {}
+        if results:
+            self.log.emit("\n🗄️ 从台账库读取季度数据...")
+        for q, (df, path, (year, quarter)) in results.items():
+            self.log.emit(f"   {q}保费: {Path(path).name}（{year}Q{quarter}）  ✓ {len(df)} 分行")
+        return {q: df.rename(columns={'季度保费': f'{q}保费'}) for q, (df, _, _) in results.items()}
+
+    def _read_parallel(self, q_paths, workers, missing):
+        """【优化v4.2】季度文件和年初总表在子进程中同时读取，每读完一个报告一次进度
+
+        Returns:
+            ({季度: 分行保费数据}, 年初总表数据)
+        """
+        self.log.emit(f"\n📂 并行读取季度文件和年初总表（{workers} 个进程）...")
+        for q in missing:
+            self.log.emit(f"   ⚠️ {q}未选择")
+        results = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(read_branch_premiums, path, f'{q}保费'): (q, path) for q, path in q_paths.items()}
+            futures[pool.submit(read_annual_premiums, self.annual_file)] = ('年初总表', self.annual_file)
+            for done, future in enumerate(as_completed(futures), 1):
+                label, path = futures[future]
+                try:
+                    results[label] = future.result()
+                except Exception:
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    raise
+                self.progress.emit(10 + done * 70 // len(futures), f"已读取 {done}/{len(futures)}: {label}")
+                self.log.emit(f"   {label}: {Path(path).name}  ✓ {len(results[label])} 分行")
+        return {q: results[q] for q in q_paths}, results['年初总表']
 
     def compare(self):
         self.progress.emit(5, "开始对比...")
         self.log.emit("📊 年度对比分析\n" + "="*50)
         
-        self.log.emit("\n📂 读取季度文件...")
-        q_data = []
-        for i, (q, path) in enumerate(self.q_files.items()):
-            self.progress.emit(10 + i*15, f"读取{q}...")
-            if path and os.path.exists(path):
-                q_data.append(self.read_branch(path, f'{q}保费'))
-                self.log.emit(f"      ✓ {len(q_data[-1])} 分行")
-            else:
-                self.log.emit(f"      ⚠️ {q}未选择")
-        
-        self.progress.emit(70, "读取年初总表...")
-        self.log.emit("\n📂 读取年初总表...")
-        annual = self.read_annual(self.annual_file)
-        self.log.emit(f"      ✓ {len(annual)} 分行")
+        q_paths = {q: path for q, path in self.q_files.items() if path and os.path.exists(path)}
+        q_results = {}
+        if self.ledger_db and os.path.exists(self.ledger_db):
+            q_results = self._read_from_store(q_paths)
+        pending = {q: path for q, path in q_paths.items() if q not in q_results}
+        workers = min(len(pending) + 1, MAX_READ_WORKERS, _available_cpus())
+        if workers > 1 and self.annual_file and os.path.exists(self.annual_file) and \
+                sum(os.path.getsize(p) for p in [*pending.values(), self.annual_file]) >= MIN_BYTES_FOR_POOL:
+            results, annual = self._read_parallel(pending, workers, [q for q in self.q_files if q not in q_paths])
+            q_results.update(results)
+        else:
+            self.log.emit("\n📂 读取季度文件...")
+            for i, (q, path) in enumerate(self.q_files.items()):
+                self.progress.emit(10 + i*15, f"读取{q}...")
+                if q in pending:
+                    q_results[q] = self.read_branch(path, f'{q}保费')
+                    self.log.emit(f"      ✓ {len(q_results[q])} 分行")
+                elif q not in q_paths:
+                    self.log.emit(f"      ⚠️ {q}未选择")
+
+            self.progress.emit(70, "读取年初总表...")
+            self.log.emit("\n📂 读取年初总表...")
+            annual = self.read_annual(self.annual_file)
+            self.log.emit(f"      ✓ {len(annual)} 分行")
         
         self.progress.emit(80, "合并数据...")
         self.log.emit("\n🔄 合并对比...")
         merged = annual.copy()
-        for df in q_data:
+        for df in (q_results[q] for q in self.q_files if q in q_results):
             merged = merged.merge(df, on='经办机构', how='outer')
         merged = merged.fillna(0)
         
@@ -1423,6 +1769,21 @@ class InsuranceFeeProcessor(QMainWindow):
         self.fast_mode_cb.setChecked(self.config.get('use_fast_mode', True))
         other_layout.addWidget(self.fast_mode_cb)
 
+        self.write_formulas_cb = QCheckBox("输出文件保留Excel公式（不勾选则只写计算值）")
+        self.write_formulas_cb.setToolTip("人民币保险金额、季度保费及分行统计总是写入计算值，打开文件前即可读取")
+        self.write_formulas_cb.setChecked(self.config.get('write_formulas', True))
+        other_layout.addWidget(self.write_formulas_cb)
+
+        self.ledger_db_cb = QCheckBox("季度处理结果写入本地台账库（年度对比优先查询）")
+        self.ledger_db_cb.setToolTip(f"台账库位置: {LEDGER_DB_FILE}")
+        self.ledger_db_cb.setChecked(self.config.get('use_ledger_db', True))
+        other_layout.addWidget(self.ledger_db_cb)
+
+        self.chunked_cb = QCheckBox(f"超大台账分块处理（两个季度文件合计超过 {CHUNKED_MIN_BYTES // (1024 * 1024)}MB 时）")
+        self.chunked_cb.setToolTip(f"每次只处理 {CHUNK_ROWS} 行，中间数据暂存到临时文件，降低内存占用；输出结果不变")
+        self.chunked_cb.setChecked(self.config.get('chunked_large_files', True))
+        other_layout.addWidget(self.chunked_cb)
+
         layout.addWidget(other_group)
 
         # 最近文件
@@ -1482,6 +1843,9 @@ class InsuranceFeeProcessor(QMainWindow):
         self.config['current_hkd_rate'] = self.settings_current_hkd.value()
         self.config['auto_save_log'] = self.auto_save_log_cb.isChecked()
         self.config['use_fast_mode'] = self.fast_mode_cb.isChecked()
+        self.config['write_formulas'] = self.write_formulas_cb.isChecked()
+        self.config['use_ledger_db'] = self.ledger_db_cb.isChecked()
+        self.config['chunked_large_files'] = self.chunked_cb.isChecked()
 
         ConfigManager.save_config(self.config)
 
@@ -1501,6 +1865,9 @@ class InsuranceFeeProcessor(QMainWindow):
         self.settings_current_hkd.setValue(0.927)
         self.auto_save_log_cb.setChecked(True)
         self.fast_mode_cb.setChecked(True)
+        self.write_formulas_cb.setChecked(True)
+        self.ledger_db_cb.setChecked(True)
+        self.chunked_cb.setChecked(True)
 
     def _clear_recent_files(self):
         """清空最近文件"""
@@ -1540,11 +1907,17 @@ class InsuranceFeeProcessor(QMainWindow):
         ConfigManager.save_config(self.config)
 
         fast_mode = self.config.get('use_fast_mode', True)
+        # 【优化v4.2】超大台账改为分块处理
+        chunk_rows = 0
+        if self.config.get('chunked_large_files', True) and \
+                sum(os.path.getsize(p) for p in (self.q_current_file, self.q_prev_file)) >= CHUNKED_MIN_BYTES:
+            chunk_rows = CHUNK_ROWS
         self.qw = QuarterProcessWorker(
             self.q_current_file, self.q_prev_file, out, q, y,
             self.q_current_usd.value(), self.q_current_hkd.value(),
             self.q_prev_usd.value(), self.q_prev_hkd.value(),
-            fast_mode
+            fast_mode, self.config.get('write_formulas', True),
+            LEDGER_DB_FILE if self.config.get('use_ledger_db', True) else None, chunk_rows
         )
         self.qw.progress.connect(lambda v, m: (self.q_prog.setValue(v), self.q_status.setText(m)))
         self.qw.finished.connect(self._q_done)
@@ -1590,7 +1963,8 @@ class InsuranceFeeProcessor(QMainWindow):
         
         self.cw = YearCompareWorker(self.c_q_files.get('Q1'), self.c_q_files.get('Q2'), 
                                     self.c_q_files.get('Q3'), self.c_q_files.get('Q4'),
-                                    self.c_annual_file, out, y)
+                                    self.c_annual_file, out, y,
+                                    LEDGER_DB_FILE if self.config.get('use_ledger_db', True) else None)
         self.cw.progress.connect(lambda v, m: (self.c_prog.setValue(v), self.c_status.setText(m)))
         self.cw.finished.connect(self._c_done)
         self.cw.log.connect(self._clog)
@@ -1627,6 +2001,97 @@ class InsuranceFeeProcessor(QMainWindow):
         if f: QDesktopServices.openUrl(QUrl.fromLocalFile(f))
 
 
+# 【优化v4.2】年份错误修正一致性校验：向量化版本对照原逐行实现（python insurance_fee_processor.py --check-year-fix）
+def _year_fix_reference(df, expected_year):
+    """原逐行实现（对照用）"""
+    df_copy = df.copy()
+    # pandas 2 逐格写入时非日期列自动转为 object；pandas 3 的字符串列会直接报错，这里先转换以对照 pandas 2 的结果
+    if not pd.api.types.is_datetime64_dtype(df_copy['保险起期']):
+        df_copy['保险起期'] = df_copy['保险起期'].astype(object)
+    start_dates = pd.to_datetime(df_copy['保险起期'], errors='coerce')
+    end_dates = pd.to_datetime(df_copy['保险止期'], errors='coerce')
+
+    corrected_dates = []
+    for idx, (start, end) in enumerate(zip(start_dates, end_dates)):
+        if pd.isna(start) or pd.isna(end):
+            continue
+        year_diff_large = abs(start.year - expected_year) > 2
+        end_year_reasonable = (expected_year - 1) <= end.year <= (expected_year + 1)
+        if (year_diff_large and end_year_reasonable) or start > end:
+            corrected_year = end.year if end.month >= 6 else end.year - 1
+            try:
+                corrected_start = start.replace(year=corrected_year)
+            except ValueError:
+                continue
+            if corrected_start <= end:
+                corrected_dates.append({
+                    'index': idx,
+                    'loan_no': df_copy.iloc[idx]['贷款编号'],
+                    'original': start,
+                    'corrected': corrected_start,
+                    'original_str': start.strftime('%Y/%m/%d'),
+                    'corrected_str': corrected_start.strftime('%Y/%m/%d'),
+                    'end_date': end,
+                })
+                df_copy.at[df_copy.index[idx], '保险起期'] = corrected_start
+    return df_copy, corrected_dates, len(corrected_dates)
+
+
+def _synthetic_ledgers(rows, year, seed=0):
+    """测试台账：日期列/带时间/字符串/混合类型/闰日/空值/非默认索引"""
+    rng = np.random.default_rng(seed)
+    base = pd.Timestamp(year=year, month=1, day=1)
+    start = base + pd.to_timedelta(rng.integers(-200, 365, rows), unit='D')
+    # 约5%的起期年份录错（相差10年/起期晚于止期）
+    wrong = rng.random(rows) < 0.05
+    start = start.where(~wrong, start - pd.DateOffset(years=10))
+    end = start + pd.to_timedelta(rng.integers(-30, 730, rows), unit='D')
+    end = end.where(~wrong, start + pd.DateOffset(years=10) + pd.to_timedelta(rng.integers(1, 365, rows), unit='D'))
+    loans = pd.Series([f'L{i:07d}' for i in range(rows)])
+
+    dated = pd.DataFrame({'贷款编号': loans, '保险起期': start, '保险止期': end})
+    dated.loc[rng.random(rows) < 0.02, '保险起期'] = pd.NaT
+    dated.loc[rng.random(rows) < 0.02, '保险止期'] = pd.NaT
+    timed = dated.copy()
+    timed['保险起期'] = timed['保险起期'] + pd.to_timedelta(rng.integers(0, 86_400_000_000, rows), unit='us')
+    text = dated.copy()
+    text['保险起期'] = text['保险起期'].dt.strftime('%Y-%m-%d')
+    mixed = dated.copy()
+    mixed['保险起期'] = [v.strftime('%Y/%m/%d') if i % 3 == 0 and pd.notna(v) else (None if i % 7 == 0 else v)
+                     for i, v in enumerate(mixed['保险起期'])]
+    # 闰日：修正到非闰年后日期不存在，应保持不变（修正到闰年的则正常修正）
+    leap_years = [y for y in range(year - 20, year - 2) if y % 4 == 0 and (y % 100 or y % 400 == 0)][-2:]
+    leap = pd.DataFrame({'贷款编号': ['LEAP1', 'LEAP2', 'LEAP3'],
+                         '保险起期': [pd.Timestamp(y, 2, 29) for y in leap_years + leap_years[:1]],
+                         '保险止期': [pd.Timestamp(year + 1, 3, 1), pd.Timestamp(year, 12, 31),
+                                  pd.Timestamp(leap_years[-1] + 4, 7, 1)]})
+    indexed = dated.set_axis(pd.RangeIndex(1000, 1000 + 3 * rows, 3))
+    return {'日期列': dated, '带时间': timed, '字符串': text, '混合类型': mixed,
+            '闰日': pd.concat([dated.head(20), leap], ignore_index=True), '非默认索引': indexed}
+
+
+def check_year_fix_parity(rows=20000, year=2025):
+    """对照原逐行实现校验 detect_and_fix_year_errors，返回是否全部一致"""
+    import time
+    ok = True
+    for name, df in _synthetic_ledgers(rows, year).items():
+        t0 = time.perf_counter()
+        ref_df, ref_list, ref_n = _year_fix_reference(df, year)
+        t1 = time.perf_counter()
+        new_df, new_list, new_n = QuarterProcessWorker.detect_and_fix_year_errors(df, year, 1)
+        t2 = time.perf_counter()
+        try:
+            pd.testing.assert_frame_equal(new_df, ref_df)
+            same = new_n == ref_n and new_list == ref_list
+        except AssertionError:
+            same = False
+        ok = ok and same
+        print(f"{'✓' if same else '✗'} {name:<8} {len(df):>7} 行  修正 {new_n:>5} 条  "
+              f"逐行 {t1 - t0:.3f}s  向量化 {t2 - t1:.3f}s")
+    print('全部一致' if ok else '存在差异')
+    return ok
+
+
 def main():
     for pkg in ['pandas', 'openpyxl']:
         try: __import__(pkg)
@@ -1642,4 +2107,9 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    # 打包后（PyInstaller）年度对比的读取子进程需要
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] == '--check-year-fix':
+        # 年份错误修正一致性校验: --check-year-fix [行数]
+        sys.exit(0 if check_year_fix_parity(int(sys.argv[2]) if len(sys.argv) > 2 else 20000) else 1)
     main()
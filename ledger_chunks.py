@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+超大季度台账分块处理的辅助工具
+
+功能：
+- ChunkSpool：处理过程中的数据块依次存为临时文件，之后按原顺序逐块读回；
+  内存中只保留当前一块，临时目录在关闭时删除
+- DuplicateStockTracker：跨块的重复存量判断状态。只记录每个贷款编号的出现次数和其中的存量记录数，
+  全部数据块登记后即可逐块判断要删除的行
+- 贷款编号统一按 loan_keys 的文本键比较（123、123.0 与 '123' 视为同一编号）；整表处理的重复存量清理
+  同样使用 loan_key_series，分块与整表结果一致
+
+Date: 2026-10-18
+"""
+
+import os
+import tempfile
+from collections import Counter
+from typing import Iterator, List
+
+import numpy as np
+import pandas as pd
+
+# 贷款编号为空的记录（与 pandas duplicated 相同，所有空值视为同一个编号）
+_NA_KEY = ('<空贷款编号>',)
+
+
+def loan_keys(loans: pd.Series) -> List[object]:
+    """
+    贷款编号 -> 比较用的键
+
+    按文本比较：分块读取时同一列在不同块可能推断为数字或文本（如 123 与 '123'），整数值的浮点数去掉 '.0'
+    """
+    keys = []
+    for value, missing in zip(loans.tolist(), loans.isna().tolist()):
+        if missing:
+            keys.append(_NA_KEY)
+        elif isinstance(value, float) and value.is_integer():
+            keys.append(str(int(value)))
+        else:
+            keys.append(str(value))
+    return keys
+
+
+def loan_key_series(loans: pd.Series) -> pd.Series:
+    """贷款编号 -> 比较用的键（索引不变），供整表 duplicated/groupby 使用"""
+    return pd.Series(loan_keys(loans), index=loans.index, dtype=object)
+
+
+def stock_flags(df: pd.DataFrame) -> np.ndarray:
+    """贷款分类含"存量"的行"""
+    return df['贷款分类'].astype(str).str.contains('存量', na=False).to_numpy()
+
+
+class DuplicateStockTracker:
+    """
+    跨块重复存量判断
+
+    用法：
+        tracker = DuplicateStockTracker()
+        for df in chunks:
+            tracker.add(df)              # 第一遍：登记全部数据块
+        for df in chunks:
+            df = df[~tracker.remove_mask(df)]   # 第二遍：删除重复贷款编号中的存量记录
+    """
+
+    def __init__(self):
+        self._total = Counter()     # 贷款编号 -> 出现次数
+        self._stock = Counter()     # 贷款编号 -> 其中存量记录数
+
+    def add(self, df: pd.DataFrame):
+        keys = loan_keys(df['贷款编号'])
+        self._total.update(keys)
+        self._stock.update(key for key, stock in zip(keys, stock_flags(df)) if stock)
+
+    def remove_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """要删除的行：贷款编号出现两次及以上且为存量记录"""
+        total = self._total
+        keys = loan_keys(df['贷款编号'])
+        return np.fromiter((stock and total[key] >= 2 for key, stock in zip(keys, stock_flags(df))),
+                           dtype=bool, count=len(keys))
+
+    @property
+    def rows(self) -> int:
+        return sum(self._total.values())
+
+    @property
+    def removed(self) -> int:
+        """将删除的存量记录数"""
+        return sum(n for key, n in self._stock.items() if self._total[key] >= 2)
+
+    def remaining_duplicates(self) -> int:
+        """删除后仍重复的贷款编号个数（这些编号已没有存量记录，再次清理不会删除任何行）"""
+        return sum(1 for key, n in self._total.items() if n >= 2 and n - self._stock[key] >= 2)
+
+
+class ChunkSpool:
+    """
+    数据块临时存储
+
+    用法：
+        with ChunkSpool() as spool:
+            spool.append(df)
+            for df in spool:         # 按写入顺序读回（可多次遍历）
+                ...
+    """
+
+    def __init__(self, prefix: str = 'ledger_chunks_'):
+        self._dir = tempfile.TemporaryDirectory(prefix=prefix)
+        self._paths: List[str] = []
+        self.rows = 0
+
+    def append(self, df: pd.DataFrame):
+        """保存一块（空块不保存）"""
+        if df.empty:
+            return
+        path = os.path.join(self._dir.name, f'{len(self._paths):06d}.pkl')
+        df.to_pickle(path)
+        self._paths.append(path)
+        self.rows += len(df)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        for path in self._paths:
+            yield pd.read_pickle(path)
+
+    def drain(self) -> Iterator[pd.DataFrame]:
+        """逐块读回并删除临时文件（只遍历一次，读完即释放磁盘空间）"""
+        paths, self._paths, self.rows = self._paths, [], 0
+        for path in paths:
+            df = pd.read_pickle(path)
+            os.remove(path)
+            yield df
+
+    def close(self):
+        self._dir.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
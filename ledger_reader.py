@@ -0,0 +1,483 @@
+# -*- coding: utf-8 -*-
+"""
+贷款台账 Excel 快速读取（表头探测 + 按列读取）
+
+功能：
+- 只看前几行找到表头行（如包含“贷款编号”的行），不再先整表读一遍、再按表头重读一遍
+- 表头确定后由调用方选择需要的列，其余列的单元格不转换、不进入内存
+- 读取引擎：安装了 python-calamine 时交给 pandas 的 calamine 引擎；
+  否则直接流式解析 xlsx 工作表 XML（单元格取值规则与 openpyxl 只读模式相同）；
+  .xls 等其他格式或文件结构无法识别时回退到 pandas.read_excel
+- 结果与 pandas.read_excel(header=表头行)[所选列] 相同（同样的单元格转换、列名去重和类型推断）
+- 超大台账可用 iter_ledger_chunks 按固定行数分块读取，内存中只保留当前一块
+
+Date: 2026-10-18
+"""
+
+import importlib.util
+import logging
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, WINDOWS_EPOCH, from_excel, from_ISO8601
+
+logger = logging.getLogger(__name__)
+
+HAS_CALAMINE = importlib.util.find_spec('python_calamine') is not None
+
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+HEADER_SCAN_ROWS = 10
+# iter_ledger_chunks 默认每块行数
+CHUNK_ROWS = 50_000
+
+# 列选择：表头列名列表 -> 需要的列名（None 表示全部列）
+ColumnSelector = Callable[[List[object]], Optional[Sequence[object]]]
+
+
+class LedgerReadError(Exception):
+    """文件结构无法识别（调用方可改用 pandas.read_excel 完整读取）"""
+
+
+def _column_index(ref: str) -> int:
+    """'AB12' -> 27（从0开始）"""
+    idx = 0
+    for ch in ref:
+        if 'A' <= ch <= 'Z':
+            idx = idx * 26 + ord(ch) - 64
+        else:
+            break
+    return idx - 1
+
+
+def _is_blank(value) -> bool:
+    return value is None or value == ''
+
+
+def _trimmed(row: Sequence[object]) -> List[object]:
+    """去掉行尾的空单元格"""
+    row = list(row)
+    while row and _is_blank(row[-1]):
+        row.pop()
+    return row
+
+
+class XlsxLedgerReader:
+    """
+    xlsx 工作表流式读取（只读）
+
+    iter_rows(sheet) 逐行产出 (行序号, {列序号: 值}, 是否有内容)，行序号从0开始、缺失的行不产出；
+    wanted 指定列序号时只转换这些列。值与 pandas 的 openpyxl 引擎一致：
+    空单元格 ''，错误值 NaN，整数值的数字为 int，日期格式的数字为 datetime/time/timedelta。
+    """
+
+    def __init__(self, path: str):
+        try:
+            self._zip = zipfile.ZipFile(path)
+        except (zipfile.BadZipFile, OSError) as e:
+            raise LedgerReadError(f"不是有效的 xlsx 文件: {e}") from e
+        self._sheets: List[Tuple[str, str]] = []
+        self._shared_path: Optional[str] = None
+        self._styles_path: Optional[str] = None
+        self._shared: Optional[List[str]] = None
+        self._epoch = WINDOWS_EPOCH
+        self._date_styles: Dict[int, bool] = {}    # 样式序号 -> 是否为时长格式
+        try:
+            self._read_workbook()
+            self._read_styles()
+        except (KeyError, ValueError, ET.ParseError) as e:
+            self._zip.close()
+            raise LedgerReadError(f"工作簿结构无法识别: {e}") from e
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- 工作簿结构 ----------
+    @staticmethod
+    def _rels(data: bytes, base_dir: str) -> Dict[str, Tuple[str, str]]:
+        """关系文件 -> {Id: (类型, 包内路径)}"""
+        rels = {}
+        for rel in ET.fromstring(data).iter(f'{{{_PKG_REL_NS}}}Relationship'):
+            target = rel.get('Target', '')
+            path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join(base_dir, target))
+            rels[rel.get('Id')] = (rel.get('Type', ''), path)
+        return rels
+
+    def _read_workbook(self):
+        workbook_path = 'xl/workbook.xml'
+        if '_rels/.rels' in self._zip.namelist():
+            for rel_type, path in self._rels(self._zip.read('_rels/.rels'), '').values():
+                if rel_type.endswith('/officeDocument'):
+                    workbook_path = path
+        base_dir = posixpath.dirname(workbook_path)
+        rels_path = posixpath.join(base_dir, '_rels', posixpath.basename(workbook_path) + '.rels')
+        rels = self._rels(self._zip.read(rels_path), base_dir)
+        for rel_type, path in rels.values():
+            if rel_type.endswith('/sharedStrings'):
+                self._shared_path = path
+            elif rel_type.endswith('/styles'):
+                self._styles_path = path
+
+        root = ET.fromstring(self._zip.read(workbook_path))
+        self._ns = root.tag[:root.tag.index('}') + 1] if root.tag.startswith('{') else ''
+        pr = root.find(f'{self._ns}workbookPr')
+        if pr is not None and pr.get('date1904', '').lower() in ('1', 'true'):
+            self._epoch = CALENDAR_MAC_1904
+        for sheet in root.iter(f'{self._ns}sheet'):
+            rel_type, path = rels.get(sheet.get(f'{{{_REL_NS}}}id'), ('', ''))
+            if rel_type.endswith('/worksheet'):    # 跳过图表页
+                self._sheets.append((sheet.get('name'), path))
+
+    def _read_styles(self):
+        """记录数字格式为日期/时长的单元格样式"""
+        if not self._styles_path or self._styles_path not in self._zip.namelist():
+            return
+        ns = self._ns
+        root = ET.fromstring(self._zip.read(self._styles_path))
+        custom = {int(fmt.get('numFmtId')): fmt.get('formatCode')
+                  for fmt in root.iterfind(f'{ns}numFmts/{ns}numFmt')}
+        for idx, xf in enumerate(root.iterfind(f'{ns}cellXfs/{ns}xf')):
+            fmt_id = int(xf.get('numFmtId', 0))
+            fmt = custom[fmt_id] if fmt_id in custom else BUILTIN_FORMATS.get(fmt_id)
+            if is_date_format(fmt):
+                self._date_styles[idx] = is_timedelta_format(fmt)
+
+    def sheet_names(self) -> List[str]:
+        return [name for name, _ in self._sheets]
+
+    def _sheet_path(self, sheet) -> str:
+        if isinstance(sheet, int):
+            if not 0 <= sheet < len(self._sheets):
+                raise ValueError(f"Worksheet index {sheet} is invalid, {len(self._sheets)} worksheets found")
+            return self._sheets[sheet][1]
+        path = dict(self._sheets).get(sheet)
+        if path is None:
+            raise ValueError(f"Worksheet named '{sheet}' not found")    # 与 pandas.read_excel 相同
+        return path
+
+    # ---------- 单元格 ----------
+    def _text(self, node) -> str:
+        """<si>/<is> 节点 -> 纯文本（与 openpyxl Text.content 相同，不含注音）"""
+        ns = self._ns
+        parts = []
+        t = node.find(f'{ns}t')
+        if t is not None and t.text:
+            parts.append(t.text)
+        for r in node.iterfind(f'{ns}r'):
+            text = r.findtext(f'{ns}t')
+            if text:
+                parts.append(text)
+        return ''.join(parts)
+
+    def _shared_strings(self) -> List[str]:
+        if self._shared is None:
+            self._shared = []
+            if self._shared_path and self._shared_path in self._zip.namelist():
+                with self._zip.open(self._shared_path) as f:
+                    for node in self._iter_elements(f, f'{self._ns}si', f'{self._ns}sst'):
+                        self._shared.append(self._text(node).replace('x005F_', ''))
+        return self._shared
+
+    def _cell_value(self, c) -> object:
+        ns = self._ns
+        data_type = c.get('t', 'n')
+        if data_type == 'inlineStr':
+            node = c.find(f'{ns}is')
+            return self._text(node) if node is not None else ''
+        value = c.findtext(f'{ns}v')
+        if not value:
+            return ''
+        if data_type == 'n':
+            number = float(value) if ('.' in value or 'E' in value or 'e' in value) else int(value)
+            style = c.get('s')
+            if style and int(style) in self._date_styles:
+                try:
+                    return from_excel(number, self._epoch, timedelta=self._date_styles[int(style)])
+                except (OverflowError, ValueError):
+                    return np.nan
+            if isinstance(number, float) and number.is_integer():
+                return int(number)
+            return number
+        if data_type == 's':
+            return self._shared_strings()[int(value)]
+        if data_type == 'b':
+            return bool(int(value))
+        if data_type == 'e':
+            return np.nan
+        if data_type == 'd':
+            return from_ISO8601(value)
+        return value
+
+    def _has_data(self, c) -> bool:
+        """未选择的列只判断是否有内容（用于确定数据末行）"""
+        data_type = c.get('t', 'n')
+        if data_type == 'inlineStr':
+            return self._cell_value(c) != ''
+        value = c.findtext(f'{self._ns}v')
+        if not value:
+            return False
+        if data_type == 's':
+            return self._shared_strings()[int(value)] != ''
+        return True
+
+    # ---------- 行 ----------
+    @staticmethod
+    def _iter_elements(f, tag: str, parent_tag: str) -> Iterator[object]:
+        """流式产出指定标签的元素，处理完后从父节点（sheetData/sst）中移除，不保留已处理的元素"""
+        parent = None
+        for event, node in ET.iterparse(f, events=('start', 'end')):
+            if event == 'end':
+                if node.tag == tag:
+                    yield node
+                    if parent is not None:
+                        parent.clear()
+            elif parent is None and node.tag == parent_tag:
+                parent = node
+
+    def iter_rows(self, sheet=0, wanted: Optional[Sequence[int]] = None
+                  ) -> Iterator[Tuple[int, Dict[int, object], bool]]:
+        """
+        逐行产出 (行序号, {列序号: 值}, 该行是否有内容)
+
+        wanted 为 None 时转换全部列；否则只转换 wanted 中的列，其余列只用于判断该行是否有内容
+        """
+        path = self._sheet_path(sheet)
+        ns = self._ns
+        cell_tag = f'{ns}c'
+        wanted_set = None if wanted is None else set(wanted)
+        row_counter = -1
+        try:
+            with self._zip.open(path) as f:
+                for row in self._iter_elements(f, f'{ns}row', f'{ns}sheetData'):
+                    r = row.get('r')
+                    row_counter = int(r) - 1 if r else row_counter + 1
+                    cells = {}
+                    has_data = False
+                    col = -1
+                    for c in row.iterfind(cell_tag):
+                        ref = c.get('r')
+                        col = _column_index(ref) if ref else col + 1
+                        if wanted_set is None or col in wanted_set:
+                            value = self._cell_value(c)
+                            cells[col] = value
+                            if not has_data and not _is_blank(value):
+                                has_data = True
+                        elif not has_data:
+                            has_data = self._has_data(c)
+                    yield row_counter, cells, has_data
+        except (KeyError, ValueError, ET.ParseError) as e:
+            raise LedgerReadError(f"工作表 {sheet} 解析失败: {e}") from e
+
+
+def header_names(row: Sequence[object], width: int = 0) -> List[object]:
+    """表头行 -> 列名（与 pandas 相同：空白列为 'Unnamed: n'，重名列加 .1/.2；不足 width 列时补齐）"""
+    row = _trimmed(row)
+    row.extend([''] * (width - len(row)))
+    if not row:
+        return []
+    return TextParser([['' if v is None else v for v in row]], header=0).read().columns.tolist()
+
+
+def find_header_row(rows: Sequence[Sequence[object]], keywords: Sequence[str]) -> int:
+    """前几行中第一个包含任一关键字的行（找不到时为0）"""
+    for idx, row in enumerate(rows):
+        if any(kw in str(v) for v in row if not _is_blank(v) for kw in keywords):
+            return idx
+    return 0
+
+
+def _select(names: List[object], usecols: Optional[ColumnSelector]) -> Optional[List[int]]:
+    """选中列的序号（usecols 为 None 时返回 None，表示全部列）"""
+    if usecols is None:
+        return None
+    wanted = set(usecols(names) or ())
+    return [i for i, name in enumerate(names) if name in wanted]
+
+
+def _build_frame(rows: List[List[object]], names: List[object]) -> pd.DataFrame:
+    """按 pandas.read_excel 的方式推断类型（空行保留为 NaN 行）"""
+    if not rows:
+        return pd.DataFrame(columns=pd.Index(names, dtype=object))
+    return TextParser(rows, names=names, header=None, skip_blank_lines=False).read()
+
+
+def _xlsx_head(reader: XlsxLedgerReader, sheet, keywords: Sequence[str],
+               scan_rows: int) -> Tuple[List[List[object]], int]:
+    """表头探测：只读取前 scan_rows 行 -> (前几行, 表头行序号)"""
+    head: List[List[object]] = []
+    rows = reader.iter_rows(sheet)
+    for row_no, cells, _ in rows:
+        if row_no >= scan_rows:
+            break
+        head.extend([] for _ in range(row_no - len(head)))
+        head.append([cells.get(i, '') for i in range(max(cells) + 1)] if cells else [])
+    rows.close()
+    return head, (find_header_row(head, keywords) if keywords else 0)
+
+
+def _read_xlsx(path: str, sheet, keywords: Sequence[str], scan_rows: int,
+               usecols: Optional[ColumnSelector]) -> pd.DataFrame:
+    with XlsxLedgerReader(path) as reader:
+        # 1) 表头探测：只读取前 scan_rows 行
+        head, header = _xlsx_head(reader, sheet, keywords, scan_rows)
+        names = header_names(head[header]) if header < len(head) else []
+        selected = _select(names, usecols)
+
+        # 2) 表头以下的行：只转换选中的列
+        data: List[List[object]] = []
+        last_row = -1
+        width = max([len(_trimmed(row)) for row in head[:header + 1]] + [0])
+        for row_no, cells, has_data in reader.iter_rows(sheet, wanted=selected):
+            if row_no <= header:
+                continue
+            fill = len(selected) if selected is not None else 0
+            data.extend([''] * fill for _ in range(row_no - header - 1 - len(data)))
+            if selected is not None:
+                data.append([cells.get(i, '') for i in selected])
+            else:
+                row = _trimmed(cells.get(i, '') for i in range(max(cells) + 1)) if cells else []
+                width = max(width, len(row))
+                data.append(row)
+            if has_data:
+                last_row = len(data) - 1
+        # 与 pandas 相同：去掉末尾的空行
+        del data[last_row + 1:]
+
+    if selected is not None:
+        return _build_frame(data, [names[i] for i in selected])
+    # 全部列：与 pandas 相同，按最宽的行补齐
+    for row in data:
+        row.extend([''] * (width - len(row)))
+    return _build_frame(data, header_names(head[header], width) if header < len(head) else [])
+
+
+def _read_calamine(path: str, sheet, keywords: Sequence[str], scan_rows: int,
+                   usecols: Optional[ColumnSelector]) -> pd.DataFrame:
+    head = pd.read_excel(path, sheet_name=sheet, header=None, nrows=scan_rows, engine='calamine')
+    rows = [['' if pd.isna(v) else v for v in row] for row in head.itertuples(index=False)]
+    header = find_header_row(rows, keywords) if keywords else 0
+    names = header_names(rows[header]) if header < len(rows) else []
+    return pd.read_excel(path, sheet_name=sheet, header=header, usecols=_select(names, usecols),
+                         engine='calamine')
+
+
+def _read_pandas(path: str, sheet, keywords: Sequence[str], scan_rows: int,
+                 usecols: Optional[ColumnSelector]) -> pd.DataFrame:
+    """通用回退：整表读入一次，在内存中探测表头"""
+    raw = pd.read_excel(path, sheet_name=sheet, header=None)
+    rows = [['' if pd.isna(v) else v for v in row] for row in raw.head(scan_rows).itertuples(index=False)]
+    header = find_header_row(rows, keywords) if keywords else 0
+    if header >= len(rows):
+        return pd.DataFrame()
+    if usecols is None:
+        names = header_names(rows[header], raw.shape[1])
+        selected = list(range(len(names)))
+    else:
+        names = header_names(rows[header])
+        selected = _select(names, usecols)
+    body = raw.iloc[header + 1:, selected]
+    data = [['' if pd.isna(v) else v for v in row] for row in body.itertuples(index=False)]
+    return _build_frame(data, [names[i] for i in selected])
+
+
+def read_ledger(path: str, sheet_name=0, header_keywords: Sequence[str] = (),
+                usecols: Optional[ColumnSelector] = None, scan_rows: int = HEADER_SCAN_ROWS) -> pd.DataFrame:
+    """
+    读取台账工作表
+
+    Args:
+        sheet_name: 工作表名称或序号
+        header_keywords: 表头行关键字；在前 scan_rows 行中取第一个包含任一关键字的行作为表头，
+                         找不到或未指定时使用第1行
+        usecols: 列选择函数，参数为表头行的列名列表（到表头最后一个非空单元格为止），
+                 返回需要的列名；None 表示全部列
+
+    Returns:
+        与 pandas.read_excel(path, sheet_name, header=表头行)[所选列] 相同的 DataFrame
+    """
+    if HAS_CALAMINE:
+        try:
+            return _read_calamine(path, sheet_name, header_keywords, scan_rows, usecols)
+        except ImportError as e:
+            logger.warning(f"calamine 读取失败，改用其他方式: {path} - {e}")
+    if zipfile.is_zipfile(path):
+        try:
+            return _read_xlsx(path, sheet_name, header_keywords, scan_rows, usecols)
+        except LedgerReadError as e:
+            logger.warning(f"快速读取失败，改用 pandas 完整读取: {path} - {e}")
+    return _read_pandas(path, sheet_name, header_keywords, scan_rows, usecols)
+
+
+def _iter_xlsx_chunks(path: str, sheet, keywords: Sequence[str], scan_rows: int,
+                      usecols: Optional[ColumnSelector], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    with XlsxLedgerReader(path) as reader:
+        head, header = _xlsx_head(reader, sheet, keywords, scan_rows)
+        names = header_names(head[header]) if header < len(head) else []
+        selected = _select(names, usecols)
+        if selected is None:
+            selected = list(range(len(names)))
+        columns = [names[i] for i in selected]
+
+        batch: List[List[object]] = []
+        emitted = False
+        blank = 0              # 尚未写入的空行数：之后出现有内容的行才补上（与 pandas 相同，去掉末尾的空行）
+        next_row = header + 1
+        for row_no, cells, has_data in reader.iter_rows(sheet, wanted=selected):
+            if row_no <= header:
+                continue
+            blank += row_no - next_row
+            next_row = row_no + 1
+            if not has_data:
+                blank += 1
+                continue
+            batch.extend([''] * len(selected) for _ in range(blank))
+            blank = 0
+            batch.append([cells.get(i, '') for i in selected])
+            if len(batch) >= chunk_rows:
+                yield _build_frame(batch, columns)
+                batch, emitted = [], True
+        if batch or not emitted:
+            yield _build_frame(batch, columns)
+
+
+def iter_ledger_chunks(path: str, sheet_name=0, header_keywords: Sequence[str] = (),
+                       usecols: Optional[ColumnSelector] = None, chunk_rows: int = CHUNK_ROWS,
+                       scan_rows: int = HEADER_SCAN_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    分块读取台账工作表（xlsx 流式解析，同一时间只有一块数据在内存中）
+
+    参数与 read_ledger 相同；usecols 为 None 时读取表头范围内的全部列。
+    每块的类型单独推断（与 read_ledger 的区别：某列只在部分块中全为数字文本时，这些块按数字读入）；
+    各块行索引均从0开始。没有数据行时产出一个只有列名的空 DataFrame。
+    .xls 等非 xlsx 文件或结构无法识别时整表读取后再分块产出。
+    """
+    produced = False
+    if zipfile.is_zipfile(path):
+        try:
+            for chunk in _iter_xlsx_chunks(path, sheet_name, header_keywords, scan_rows, usecols, chunk_rows):
+                produced = True
+                yield chunk
+            return
+        except LedgerReadError as e:
+            if produced:
+                raise
+            logger.warning(f"分块读取失败，改用整表读取: {path} - {e}")
+    df = read_ledger(path, sheet_name, header_keywords, usecols, scan_rows)
+    if df.empty:
+        yield df
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].reset_index(drop=True)
+
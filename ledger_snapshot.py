@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+季度台账列式快照（Parquet）
+
+功能：
+- 季度处理输出 xlsx 的同时，把写入该文件的数据（含日期、人民币金额、季度保费）另存为 Parquet 快照，
+  放在 xlsx 旁边（xxx.xlsx -> xxx.snapshot.parquet）
+- 快照元数据记录对应 xlsx 的内容哈希；读取时哈希一致才使用快照，
+  xlsx 被修改、另存或快照缺失/损坏时返回 None，由调用方改为解析 Excel
+- 超大台账可分块写入/分块读取快照，不需要整表在内存中
+- 需要 pyarrow；未安装时不写快照，读取总是返回 None
+
+Date: 2026-10-18
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = '.snapshot.parquet'
+_META_KEY = b'ledger_snapshot'
+
+# 写入/读取失败时的异常（pyarrow 的异常均继承这些内置类型）
+_SNAPSHOT_ERRORS = (OSError, ValueError, TypeError, KeyError, NotImplementedError)
+
+
+def snapshot_path(xlsx_path: str) -> str:
+    """xlsx 对应的快照路径"""
+    path = Path(xlsx_path)
+    return str(path.with_name(path.stem + SNAPSHOT_SUFFIX))
+
+
+def file_sha1(path: str, chunk_size: int = 1 << 20) -> str:
+    """文件内容哈希"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_snapshot(xlsx_path: str, df: pd.DataFrame, **info) -> Optional[str]:
+    """
+    为已写好的 xlsx 保存快照（原子写入）
+
+    Args:
+        df: 写入 xlsx 的数据（列名即表头）
+        info: 附加信息（如工作表名、汇率），与哈希一起存入元数据
+
+    Returns:
+        快照路径；未安装 pyarrow 或写入失败时返回 None（同时删除旧快照）
+    """
+    return write_snapshot_chunks(xlsx_path, [df], len(df), **info)
+
+
+def write_snapshot_chunks(xlsx_path: str, chunks: Iterable[pd.DataFrame], rows: int, **info) -> Optional[str]:
+    """
+    分块保存快照（超大台账分块写出 xlsx 后使用，同一时间只有一块数据在内存中）
+
+    各块列相同；列类型以第一块为准，之后的块转换为相同类型（无法转换时按写入失败处理）。
+    rows 为总行数，与 info 一起存入元数据；返回值与 write_snapshot 相同。
+    """
+    path = snapshot_path(xlsx_path)
+    if not HAS_PYARROW:
+        _remove(path)
+        return None
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    writer = None
+    try:
+        meta = {'version': SNAPSHOT_VERSION, 'xlsx_sha1': file_sha1(xlsx_path), 'rows': rows, **info}
+        for df in chunks:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if writer is None:
+                schema = table.schema.with_metadata({**(table.schema.metadata or {}),
+                                                     _META_KEY: json.dumps(meta, ensure_ascii=False).encode('utf-8')})
+                writer = pq.ParquetWriter(tmp_path, schema)
+            writer.write_table(table.cast(schema))
+        if writer is None:
+            raise ValueError("没有数据块")
+        writer.close()
+        os.replace(tmp_path, path)
+    except _SNAPSHOT_ERRORS as e:
+        # 常见原因：某列同时含文本和数字等混合类型，Parquet 无法按列存储
+        logger.warning(f"快照写入失败，之后将解析 Excel: {xlsx_path} - {e}")
+        if writer is not None:
+            writer.close()
+        _remove(tmp_path)
+        _remove(path)
+        return None
+    return path
+
+
+def snapshot_info(xlsx_path: str) -> Optional[Dict]:
+    """与 xlsx 一致的快照的元数据；不可用时返回 None"""
+    path = snapshot_path(xlsx_path)
+    if not HAS_PYARROW or not os.path.exists(path):
+        return None
+    import pyarrow.parquet as pq
+
+    try:
+        meta = json.loads(pq.read_schema(path).metadata[_META_KEY])
+        if meta.get('version') != SNAPSHOT_VERSION or meta.get('xlsx_sha1') != file_sha1(xlsx_path):
+            return None
+    except _SNAPSHOT_ERRORS as e:
+        logger.debug(f"快照不可用: {path} - {e}")
+        return None
+    return meta
+
+
+def read_snapshot(xlsx_path: str,
+                  usecols: Optional[Callable[[List[object]], Optional[Sequence[object]]]] = None
+                  ) -> Optional[pd.DataFrame]:
+    """
+    读取与 xlsx 内容一致的快照
+
+    Args:
+        usecols: 列选择函数（与 ledger_reader.read_ledger 相同），参数为列名列表，返回需要的列名
+
+    Returns:
+        DataFrame；未安装 pyarrow、快照不存在、与 xlsx 不一致或读取失败时返回 None
+    """
+    if snapshot_info(xlsx_path) is None:
+        return None
+    import pyarrow.parquet as pq
+
+    path = snapshot_path(xlsx_path)
+    try:
+        columns = None
+        if usecols is not None:
+            names = pq.read_schema(path).names
+            wanted = set(usecols(list(names)) or ())
+            columns = [name for name in names if name in wanted]
+        return pq.read_table(path, columns=columns).to_pandas()
+    except _SNAPSHOT_ERRORS as e:
+        logger.warning(f"快照读取失败，改为解析 Excel: {path} - {e}")
+        return None
+
+
+def iter_snapshot(xlsx_path: str,
+                  usecols: Optional[Callable[[List[object]], Optional[Sequence[object]]]] = None,
+                  batch_rows: int = 50_000) -> Optional[Iterator[pd.DataFrame]]:
+    """
+    分块读取与 xlsx 内容一致的快照（参数同 read_snapshot，每块 batch_rows 行）
+
+    Returns:
+        数据块迭代器；快照不可用时返回 None（由调用方改为解析 Excel）
+    """
+    if snapshot_info(xlsx_path) is None:
+        return None
+    import pyarrow.parquet as pq
+
+    path = snapshot_path(xlsx_path)
+    try:
+        parquet = pq.ParquetFile(path)
+        columns = None
+        if usecols is not None:
+            names = parquet.schema_arrow.names
+            wanted = set(usecols(list(names)) or ())
+            columns = [name for name in names if name in wanted]
+    except _SNAPSHOT_ERRORS as e:
+        logger.warning(f"快照读取失败，改为解析 Excel: {path} - {e}")
+        return None
+    return (batch.to_pandas() for batch in parquet.iter_batches(batch_size=batch_rows, columns=columns))
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.debug(f"删除文件失败: {path} - {e}")
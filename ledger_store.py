@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+本地台账库（SQLite，多年度贷款保险历史）
+
+功能：
+- 季度处理完成后写入定稿季度（上季度）的全部台账记录：每条记录一行，日期统一为 'YYYY-MM-DD'，
+  含币种、保险金额、人民币保险金额、季度起止期、季度保费，以及是否为当季度移入的结清记录
+- 同一季度重新处理时整季替换；记录来源输出文件的内容哈希，年度对比可按所选文件找到对应季度
+- 按贷款编号、经办机构、季度建索引，跨季度查询（分行保费、贷款历史、结清移入次数）不再重读 Excel
+
+Date: 2026-10-18
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ledger_snapshot import file_sha1
+
+DEFAULT_DB_PATH = os.path.expanduser("~/.insurance_ledger.db")
+
+# 库字段 -> 台账列名
+FIELDS = {
+    'loan_no': '贷款编号',
+    'branch': '经办机构',
+    'insured': '被保险人',
+    'subject': '被保险财产标的',
+    'city': '城市',
+    'address': '被保险财产地址',
+    'currency': '币种',
+    'amount': '保险金额',
+    'rmb_amount': '人民币保险金额',
+    'start_date': '保险起期',
+    'end_date': '保险止期',
+    'loan_class': '贷款分类',
+    'q_start': '季度起期',
+    'q_end': '季度止期',
+    'premium': '季度保费',
+}
+_NUMBER_FIELDS = ('amount', 'rmb_amount', 'premium')
+_DATE_FIELDS = ('start_date', 'end_date', 'q_start', 'q_end')
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS quarters (
+        year INTEGER NOT NULL,
+        quarter INTEGER NOT NULL,
+        source_file TEXT,
+        source_sha1 TEXT,
+        usd_rate REAL,
+        hkd_rate REAL,
+        rows INTEGER NOT NULL,
+        loaded_at TEXT,
+        PRIMARY KEY (year, quarter)
+    );
+    CREATE INDEX IF NOT EXISTS idx_quarters_sha1 ON quarters (source_sha1);
+    CREATE TABLE IF NOT EXISTS ledger (
+        year INTEGER NOT NULL,
+        quarter INTEGER NOT NULL,
+        row_no INTEGER NOT NULL,
+        loan_no TEXT,
+        branch TEXT,
+        insured TEXT,
+        subject TEXT,
+        city TEXT,
+        address TEXT,
+        currency TEXT,
+        amount REAL,
+        rmb_amount REAL,
+        start_date TEXT,
+        end_date TEXT,
+        loan_class TEXT,
+        q_start TEXT,
+        q_end TEXT,
+        premium REAL,
+        settled_moved INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (year, quarter, row_no)
+    );
+    CREATE INDEX IF NOT EXISTS idx_ledger_loan ON ledger (loan_no, year, quarter);
+    CREATE INDEX IF NOT EXISTS idx_ledger_branch ON ledger (branch, year, quarter);
+"""
+
+
+def _text(value) -> Optional[str]:
+    """单元格值 -> 文本（空值为 None，整数值的浮点数去掉 '.0'）"""
+    if value is None or value is pd.NaT or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _dates(series: pd.Series) -> List[Optional[str]]:
+    parsed = pd.to_datetime(series, errors='coerce')
+    return parsed.dt.strftime('%Y-%m-%d').astype(object).where(parsed.notna(), None).tolist()
+
+
+def _numbers(series: pd.Series) -> List[Optional[float]]:
+    values = pd.to_numeric(series, errors='coerce').astype(float)
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def period_label(year: int, quarter: int) -> str:
+    return f"{year}Q{quarter}"
+
+
+class LedgerStore:
+    """
+    台账库
+
+    用法：
+        with LedgerStore() as store:
+            store.load_quarter(2025, 2, df, source_file=path)
+            store.premium_by_branch()
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- 写入 ----------
+    def load_quarter(self, year: int, quarter: int, df: pd.DataFrame, source_file: str = None,
+                     usd_rate: float = None, hkd_rate: float = None, settled_moved: Iterable[bool] = None) -> int:
+        """
+        写入一个季度的台账（替换该季度已有记录）
+
+        Args:
+            df: 台账数据，列名为台账列名（FIELDS 的值），缺少的列写入空值
+            source_file: 该季度的输出文件，记录其内容哈希（find_quarter 按文件查找季度）
+            settled_moved: 每行是否为从下一季度移入的结清记录
+
+        Returns:
+            写入行数
+        """
+        return self.load_quarter_chunks(year, quarter, [(df, settled_moved)], source_file, usd_rate, hkd_rate)
+
+    def load_quarter_chunks(self, year: int, quarter: int,
+                            chunks: Iterable[Tuple[pd.DataFrame, Optional[Iterable[bool]]]],
+                            source_file: str = None, usd_rate: float = None, hkd_rate: float = None) -> int:
+        """分块写入一个季度的台账（chunks 依次为 (df, settled_moved)，参数含义同 load_quarter；整季在一个事务中替换）"""
+        placeholders = ', '.join('?' * (len(FIELDS) + 4))
+        sha1 = file_sha1(source_file) if source_file and os.path.exists(source_file) else None
+        n = 0
+        with self._conn:
+            self._conn.execute("DELETE FROM ledger WHERE year = ? AND quarter = ?", (year, quarter))
+            for df, settled_moved in chunks:
+                self._conn.executemany(
+                    f"INSERT INTO ledger (year, quarter, row_no, {', '.join(FIELDS)}, settled_moved) "
+                    f"VALUES ({placeholders})", self._rows(year, quarter, n + 1, df, settled_moved))
+                n += len(df)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO quarters VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (year, quarter, os.path.abspath(source_file) if source_file else None, sha1,
+                 usd_rate, hkd_rate, n, datetime.now().isoformat(timespec='seconds')))
+        return n
+
+    @staticmethod
+    def _rows(year: int, quarter: int, first_row: int, df: pd.DataFrame, settled_moved: Optional[Iterable[bool]]):
+        n = len(df)
+        columns = []
+        for field, col in FIELDS.items():
+            if col not in df.columns:
+                columns.append([None] * n)
+            elif field in _DATE_FIELDS:
+                columns.append(_dates(df[col]))
+            elif field in _NUMBER_FIELDS:
+                columns.append(_numbers(df[col]))
+            else:
+                columns.append([_text(v) for v in df[col].tolist()])
+        moved = [0] * n if settled_moved is None else [int(bool(v)) for v in settled_moved]
+        return zip([year] * n, [quarter] * n, range(first_row, first_row + n), *columns, moved)
+
+    # ---------- 查询 ----------
+    def periods(self) -> pd.DataFrame:
+        """已入库的季度"""
+        return pd.read_sql_query(
+            "SELECT year, quarter, rows, source_file, loaded_at FROM quarters ORDER BY year, quarter", self._conn)
+
+    def find_quarter(self, path: str) -> Optional[Tuple[int, int]]:
+        """按文件内容查找入库季度（文件为该季度的输出文件且未被修改）"""
+        row = self._conn.execute(
+            "SELECT year, quarter FROM quarters WHERE source_sha1 = ? ORDER BY year DESC, quarter DESC",
+            (file_sha1(path),)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def quarter_records(self, year: int, quarter: int, fields: Iterable[str] = None) -> pd.DataFrame:
+        """某季度的台账记录（按原行序，列名为台账列名）"""
+        fields = list(fields or FIELDS)
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(fields)} FROM ledger WHERE year = ? AND quarter = ? ORDER BY row_no",
+            self._conn, params=(year, quarter))
+        return df.rename(columns=FIELDS)
+
+    def branch_premiums(self, year: int, quarter: int) -> pd.DataFrame:
+        """某季度按经办机构汇总的季度保费 -> DataFrame[经办机构, 季度保费]（与分行统计表相同）"""
+        df = self.quarter_records(year, quarter, ('branch', 'premium'))
+        return df.groupby('经办机构')['季度保费'].sum().reset_index()
+
+    def premium_by_branch(self, start: Tuple[int, int] = None, end: Tuple[int, int] = None) -> pd.DataFrame:
+        """各季度分行季度保费（行：经办机构，列：'2025Q1' 等），可限定起止季度"""
+        where, params = self._period_range(start, end)
+        df = pd.read_sql_query(
+            f"SELECT branch, year, quarter, SUM(premium) AS premium FROM ledger {where} "
+            f"GROUP BY branch, year, quarter", self._conn, params=params)
+        if df.empty:
+            return pd.DataFrame()
+        df['period'] = [period_label(y, q) for y, q in zip(df['year'], df['quarter'])]
+        table = df.pivot(index='branch', columns='period', values='premium').fillna(0)
+        table.index.name = '经办机构'
+        return table[sorted(table.columns)]
+
+    def loan_history(self, loan_no) -> pd.DataFrame:
+        """某笔贷款各季度的记录"""
+        df = pd.read_sql_query(
+            f"SELECT year, quarter, {', '.join(FIELDS)}, settled_moved FROM ledger "
+            f"WHERE loan_no = ? ORDER BY year, quarter, row_no", self._conn, params=(_text(loan_no),))
+        return df.rename(columns=FIELDS)
+
+    def settled_moves(self, min_times: int = 1, start: Tuple[int, int] = None,
+                      end: Tuple[int, int] = None) -> pd.DataFrame:
+        """各贷款作为结清记录移入上季度的次数（次数多的在前）"""
+        where, params = self._period_range(start, end, 'settled_moved = 1')
+        return pd.read_sql_query(
+            f"SELECT loan_no AS 贷款编号, COUNT(*) AS 移入次数, "
+            f"MIN(year || 'Q' || quarter) AS 首次, MAX(year || 'Q' || quarter) AS 最近 "
+            f"FROM ledger {where} GROUP BY loan_no HAVING COUNT(*) >= ? ORDER BY 移入次数 DESC, loan_no",
+            self._conn, params=(*params, min_times))
+
+    @staticmethod
+    def _period_range(start, end, condition: str = None) -> Tuple[str, List]:
+        conditions, params = [condition] if condition else [], []
+        if start:
+            conditions.append("year * 10 + quarter >= ?")
+            params.append(start[0] * 10 + start[1])
+        if end:
+            conditions.append("year * 10 + quarter <= ?")
+            params.append(end[0] * 10 + end[1])
+        return ("WHERE " + " AND ".join(conditions)) if conditions else "", params
@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+"""
+台账 Excel 流式写入（一次写出数据、公式和格式）
+
+功能：
+- 按行顺序直接生成工作表 XML 写入 xlsx（ZIP），不经过 DataFrame.to_excel + load_workbook 逐格设置样式 + 再次保存
+- 单元格格式（字体/边框/对齐/数字格式）在工作簿中只登记一次，按列指定格式序号，写入时不再创建样式对象
+- 公式按列给出模板（{r} 为行号），单个公式单元格用 Formula；均可附带计算值（打开文件前即可读到结果）
+- 字符串使用共享字符串表（重复的机构/币种/分类只存一份）；日期写为 Excel 序列值并使用日期格式
+- shared_strings=False 时字符串写为行内字符串，不在内存中累积字符串表（超大台账分块写出时使用）
+
+只写入本工具输出需要的部分（列宽、首行冻结、行高），不支持合并单元格、条件格式等。
+
+Date: 2026-10-18
+"""
+
+import datetime
+import math
+import os
+import re
+import zipfile
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pandas as pd
+from openpyxl.styles.numbers import BUILTIN_FORMATS_REVERSE
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import to_excel
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_XML_HEAD = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+ROWS_PER_WRITE = 2000
+_ILLEGAL_CHARS = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
+_EXCEL_EPOCH = np.datetime64('1899-12-30', 'us')
+
+
+@dataclass(frozen=True)
+class CellFormat:
+    """单元格格式（相同的格式在工作簿中只登记一次）"""
+    font_name: str = 'Calibri'
+    font_size: float = 11
+    bold: bool = False
+    color: Optional[str] = None            # 'RRGGBB'
+    border_color: Optional[str] = None     # 四边细线颜色 'RRGGBB'，None 表示无边框
+    horizontal: Optional[str] = None
+    vertical: Optional[str] = None
+    wrap: bool = False
+    number_format: str = 'General'
+
+
+@dataclass
+class Column:
+    """
+    一列数据
+
+    values 与 formula 至少给出一个：formula 为公式模板（如 '=H{r}*2'，{r} 替换为行号），
+    同时给出 values 时作为公式的计算值写入。值为空（None/NaN/NaT/''）的单元格使用 blank_fmt。
+    """
+    values: Optional[Sequence] = None
+    fmt: int = 0
+    formula: Optional[str] = None
+    blank_fmt: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class Formula:
+    """单个公式单元格（write_row / extra_cells 使用）：text 以 "=" 开头，value 为计算值（None 表示不写）"""
+    text: str
+    value: Optional[float] = None
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _excel_serials(series: pd.Series) -> List[Optional[float]]:
+    """datetime64 列 -> Excel 序列值（与 openpyxl.utils.datetime.to_excel 计算方式相同）"""
+    values = series.to_numpy(dtype='datetime64[us]')
+    valid = ~np.isnat(values)
+    delta = (values - _EXCEL_EPOCH).astype('int64')
+    days = delta // 86_400_000_000
+    micros = delta % 86_400_000_000
+    days = np.where((days > 0) & (days <= 60), days - 1, days)
+    serials = days + ((micros // 1_000_000) + (micros % 1_000_000) / 10 ** 6) / 86400
+    return [float(v) if ok else None for v, ok in zip(serials.tolist(), valid.tolist())]
+
+
+class XlsxStreamWriter:
+    """
+    xlsx 流式写入
+
+    用法：
+        with XlsxStreamWriter(path) as book:
+            fmt = book.add_format(CellFormat(...))
+            sheet = book.add_sheet('Sheet1', widths={'A': 20}, freeze='A2', row_heights={1: 30})
+            sheet.write_row(['表头', ...], [fmt, ...])
+            sheet.write_columns([Column(values, fmt), Column(formula='=A{r}*2', fmt=fmt)], nrows)
+            sheet.close()
+
+    工作表依次写入（同一时间只能有一个工作表在写）；关闭工作簿时写出共享字符串、样式和工作簿结构。
+    """
+
+    def __init__(self, path: str, shared_strings: bool = True):
+        self.path = path
+        self._shared_strings = shared_strings
+        self._tmp_path = f"{path}.tmp"
+        self._zip = zipfile.ZipFile(self._tmp_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=6)
+        self._sheets: List[str] = []
+        self._current: Optional['SheetStreamWriter'] = None
+        self._strings: Dict[str, int] = {}
+        self._formats: List[CellFormat] = [CellFormat()]
+        self._format_index: Dict[CellFormat, int] = {CellFormat(): 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add_format(self, fmt: CellFormat) -> int:
+        """登记格式，返回格式序号（相同格式返回同一序号）"""
+        if fmt not in self._format_index:
+            self._format_index[fmt] = len(self._formats)
+            self._formats.append(fmt)
+        return self._format_index[fmt]
+
+    def add_sheet(self, title: str, widths: Dict[str, float] = None, freeze: str = None,
+                  row_heights: Dict[int, float] = None) -> 'SheetStreamWriter':
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+        self._sheets.append(title)
+        stream = self._zip.open(f'xl/worksheets/sheet{len(self._sheets)}.xml', 'w', force_zip64=True)
+        self._current = SheetStreamWriter(self, stream, widths or {}, freeze, row_heights or {})
+        return self._current
+
+    def _string_index(self, text: str) -> int:
+        index = self._strings.get(text)
+        if index is None:
+            index = self._strings[text] = len(self._strings)
+        return index
+
+    def _string_cell(self, ref: str, fmt: int, text: str) -> str:
+        if self._shared_strings:
+            return f'<c r="{ref}" s="{fmt}" t="s"><v>{self._string_index(text)}</v></c>'
+        space = ' xml:space="preserve"' if text[:1].isspace() or text[-1:].isspace() else ''
+        return f'<c r="{ref}" s="{fmt}" t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+
+    # ---------- 工作簿结构 ----------
+    def _write_part(self, name: str, xml: str):
+        self._zip.writestr(name, _XML_HEAD + xml)
+
+    def _styles_xml(self) -> str:
+        fonts: Dict[Tuple, int] = {}
+        borders: Dict[Optional[str], int] = {None: 0}
+        num_fmts: Dict[str, int] = {}
+        xfs = []
+        for fmt in self._formats:
+            font_key = (fmt.font_name, fmt.font_size, fmt.bold, fmt.color)
+            font_id = fonts.setdefault(font_key, len(fonts))
+            border_id = borders.setdefault(fmt.border_color, len(borders))
+            num_fmt_id = BUILTIN_FORMATS_REVERSE.get(fmt.number_format)
+            if num_fmt_id is None:
+                num_fmt_id = num_fmts.setdefault(fmt.number_format, 164 + len(num_fmts))
+            alignment = ''
+            if fmt.horizontal or fmt.vertical or fmt.wrap:
+                attrs = ''.join(f' {k}="{v}"' for k, v in (
+                    ('horizontal', fmt.horizontal), ('vertical', fmt.vertical), ('wrapText', '1' if fmt.wrap else None)) if v)
+                alignment = f'<alignment{attrs}/>'
+            applied = ''.join(f' apply{name}="1"' for name, used in (
+                ('NumberFormat', num_fmt_id), ('Font', font_id), ('Border', border_id)) if used)
+            xfs.append(f'<xf numFmtId="{num_fmt_id}" fontId="{font_id}" fillId="0" borderId="{border_id}" xfId="0"'
+                       + applied + (f' applyAlignment="1">{alignment}</xf>' if alignment else '/>'))
+
+        parts = [f'<styleSheet xmlns="{_MAIN_NS}">']
+        if num_fmts:
+            parts.append(f'<numFmts count="{len(num_fmts)}">' + ''.join(
+                f'<numFmt numFmtId="{i}" formatCode={quoteattr(code)}/>' for code, i in num_fmts.items()) + '</numFmts>')
+        parts.append(f'<fonts count="{len(fonts)}">')
+        for name, size, bold, color in fonts:
+            parts.append('<font>' + ('<b/>' if bold else '') + f'<sz val="{size:g}"/>'
+                         + (f'<color rgb="00{color}"/>' if color else '') + f'<name val={quoteattr(name)}/></font>')
+        parts.append('</fonts><fills count="2"><fill><patternFill patternType="none"/></fill>'
+                     '<fill><patternFill patternType="gray125"/></fill></fills>')
+        parts.append(f'<borders count="{len(borders)}">')
+        for color in borders:
+            if color is None:
+                parts.append('<border><left/><right/><top/><bottom/><diagonal/></border>')
+            else:
+                side = f'style="thin"><color rgb="00{color}"/>'
+                parts.append(f'<border><left {side}</left><right {side}</right>'
+                             f'<top {side}</top><bottom {side}</bottom><diagonal/></border>')
+        parts.append('</borders><cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>'
+                     f'</cellStyleXfs><cellXfs count="{len(xfs)}">' + ''.join(xfs) + '</cellXfs>'
+                     '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+                     '</styleSheet>')
+        return ''.join(parts)
+
+    def _shared_strings_xml(self) -> Iterable[str]:
+        yield f'<sst xmlns="{_MAIN_NS}" count="{len(self._strings)}" uniqueCount="{len(self._strings)}">'
+        for text in self._strings:
+            space = ' xml:space="preserve"' if text[:1].isspace() or text[-1:].isspace() else ''
+            yield f'<si><t{space}>{escape(text)}</t></si>'
+        yield '</sst>'
+
+    def close(self):
+        if self._zip is None:
+            return
+        try:
+            if self._current is not None:
+                self._current.close()
+                self._current = None
+            n = len(self._sheets)
+            with self._zip.open('xl/sharedStrings.xml', 'w', force_zip64=True) as f:
+                f.write(_XML_HEAD.encode('utf-8'))
+                chunk = []
+                for part in self._shared_strings_xml():
+                    chunk.append(part)
+                    if len(chunk) >= ROWS_PER_WRITE:
+                        f.write(''.join(chunk).encode('utf-8'))
+                        chunk = []
+                f.write(''.join(chunk).encode('utf-8'))
+            self._write_part('xl/styles.xml', self._styles_xml())
+            self._write_part('xl/workbook.xml', (
+                f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><bookViews><workbookView activeTab="0"/></bookViews>'
+                '<sheets>' + ''.join(f'<sheet name={quoteattr(title)} sheetId="{i}" r:id="rId{i}"/>'
+                                     for i, title in enumerate(self._sheets, 1)) + '</sheets></workbook>'))
+            self._write_part('xl/_rels/workbook.xml.rels', (
+                f'<Relationships xmlns="{_PKG_REL_NS}">' + ''.join(
+                    f'<Relationship Id="rId{i}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                    for i in range(1, n + 1))
+                + f'<Relationship Id="rId{n + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+                + f'<Relationship Id="rId{n + 2}" Type="{_REL_NS}/sharedStrings" Target="sharedStrings.xml"/>'
+                + '</Relationships>'))
+            self._write_part('_rels/.rels', (
+                f'<Relationships xmlns="{_PKG_REL_NS}"><Relationship Id="rId1" '
+                f'Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/></Relationships>'))
+            sheet_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'
+            self._write_part('[Content_Types].xml', (
+                '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                '<Default Extension="xml" ContentType="application/xml"/>'
+                '<Override PartName="/xl/workbook.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                + ''.join(f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="{sheet_type}"/>'
+                          for i in range(1, n + 1))
+                + '<Override PartName="/xl/styles.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+                '<Override PartName="/xl/sharedStrings.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+                '</Types>'))
+            self._zip.close()
+            self._zip = None
+        except BaseException:
+            self.abort()
+            raise
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        """放弃写入（删除临时文件，不影响已有的目标文件）"""
+        if self._current is not None:
+            self._current.discard()
+            self._current = None
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+class SheetStreamWriter:
+    """工作表写入：按行顺序写出（write_row / write_columns 可交替调用）"""
+
+    def __init__(self, book: XlsxStreamWriter, stream, widths: Dict[str, float], freeze: Optional[str],
+                 row_heights: Dict[int, float]):
+        self._book = book
+        self._stream = stream
+        self._row_heights = row_heights
+        self.row = 0            # 已写入的最后一行（从1开始计）
+
+        parts = [_XML_HEAD, f'<worksheet xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">']
+        if freeze:
+            col, row = _split_ref(freeze)
+            pane = 'bottomRight' if col > 1 and row > 1 else ('bottomLeft' if row > 1 else 'topRight')
+            split = (f' xSplit="{col - 1}"' if col > 1 else '') + (f' ySplit="{row - 1}"' if row > 1 else '')
+            parts.append(f'<sheetViews><sheetView workbookViewId="0"><pane{split} topLeftCell="{freeze}" '
+                         f'activePane="{pane}" state="frozen"/><selection pane="{pane}" activeCell="{freeze}" '
+                         f'sqref="{freeze}"/></sheetView></sheetViews>')
+        parts.append('<sheetFormatPr defaultRowHeight="15"/>')
+        if widths:
+            cols = sorted((_split_ref(f'{letter}1')[0], width) for letter, width in widths.items())
+            parts.append('<cols>' + ''.join(f'<col min="{c}" max="{c}" width="{w:g}" customWidth="1"/>'
+                                            for c, w in cols) + '</cols>')
+        parts.append('<sheetData>')
+        self._write(parts)
+
+    def _write(self, parts: List[str]):
+        self._stream.write(''.join(parts).encode('utf-8'))
+
+    def _row_open(self, r: int) -> str:
+        height = self._row_heights.get(r)
+        return f'<row r="{r}" ht="{height:g}" customHeight="1">' if height else f'<row r="{r}">'
+
+    # ---------- 单元格 ----------
+    def _cell(self, ref: str, value, fmt: int, blank_fmt: Optional[int] = None) -> str:
+        """单个单元格的 XML（值为空时只写格式）"""
+        if isinstance(value, Formula):
+            cached = '' if _is_empty(value.value) else f'<v>{_number(value.value)}</v>'
+            return f'<c r="{ref}" s="{fmt}"><f>{escape(value.text[1:])}</f>{cached}</c>'
+        if _is_empty(value):
+            return f'<c r="{ref}" s="{blank_fmt if blank_fmt is not None else fmt}"/>'
+        if blank_fmt is not None and not value:
+            fmt = blank_fmt
+        if isinstance(value, str):
+            if len(value) > 1 and value[0] == '=':
+                return f'<c r="{ref}" s="{fmt}"><f>{escape(value[1:])}</f></c>'
+            return self._book._string_cell(ref, fmt, _clean(value))
+        if isinstance(value, (bool, np.bool_)):
+            return f'<c r="{ref}" s="{fmt}" t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float, np.integer, np.floating)):
+            if isinstance(value, (float, np.floating)) and not math.isfinite(value):
+                # 与 pandas.to_excel 相同：无穷大写为文本
+                text = 'inf' if value > 0 else '-inf'
+                return self._book._string_cell(ref, fmt, text)
+            return f'<c r="{ref}" s="{fmt}"><v>{_number(value.item() if isinstance(value, np.generic) else value)}</v></c>'
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time, datetime.timedelta)):
+            return f'<c r="{ref}" s="{fmt}"><v>{_number(to_excel(value))}</v></c>'
+        return self._book._string_cell(ref, fmt, _clean(str(value)))
+
+    def write_row(self, values: Sequence, fmts: Sequence[int], start_col: int = 1):
+        """写入下一行（fmts 与 values 一一对应）"""
+        self.row += 1
+        r = self.row
+        cells = [self._cell(f'{get_column_letter(c)}{r}', v, f)
+                 for c, (v, f) in enumerate(zip(values, fmts), start_col)]
+        self._write([self._row_open(r)] + cells + ['</row>'])
+
+    def write_columns(self, columns: Sequence[Column], nrows: int,
+                      extra_cells: Dict[int, List[Tuple[int, object, int]]] = None):
+        """
+        按列写入 nrows 行（从下一行开始）
+
+        extra_cells: {行号: [(列号, 值, 格式序号), ...]}，附加在该行数据列之后（列号从1开始，需大于数据列）
+        """
+        extra_cells = extra_cells or {}
+        letters = [get_column_letter(c) for c in range(1, len(columns) + 1)]
+        prepared = []
+        for column in columns:
+            values = column.values
+            if isinstance(values, pd.Series) and pd.api.types.is_datetime64_any_dtype(values.dtype) \
+                    and values.dt.tz is None:
+                values = _excel_serials(values)
+            elif isinstance(values, (pd.Series, pd.Index, np.ndarray)):
+                values = values.tolist()
+            formula = escape(column.formula[1:]) if column.formula else None
+            prepared.append((values, formula, column.fmt, column.blank_fmt))
+
+        first = self.row + 1
+        chunk: List[str] = []
+        for i in range(nrows):
+            r = first + i
+            chunk.append(self._row_open(r))
+            for letter, (values, formula, fmt, blank_fmt) in zip(letters, prepared):
+                ref = f'{letter}{r}'
+                if formula is None:
+                    chunk.append(self._cell(ref, values[i], fmt, blank_fmt))
+                    continue
+                value = values[i] if values is not None else None
+                cached = '' if _is_empty(value) else f'<v>{_number(value)}</v>'
+                chunk.append(f'<c r="{ref}" s="{fmt}"><f>{formula.format(r=r)}</f>{cached}</c>')
+            for c, value, fmt in extra_cells.get(r, ()):
+                chunk.append(self._cell(f'{get_column_letter(c)}{r}', value, fmt))
+            chunk.append('</row>')
+            if len(chunk) >= ROWS_PER_WRITE * (len(columns) + 2):
+                self._write(chunk)
+                chunk = []
+        self._write(chunk)
+        self.row += nrows
+
+    def close(self):
+        if self._stream is None:
+            return
+        self._write(['</sheetData><pageMargins left="0.75" right="0.75" top="1" bottom="1" header="0.5" footer="0.5"/>'
+                     '</worksheet>'])
+        self._stream.close()
+        self._stream = None
+
+    def discard(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+def _split_ref(ref: str) -> Tuple[int, int]:
+    """'B3' -> (2, 3)"""
+    letters = ''.join(ch for ch in ref if ch.isalpha())
+    col = 0
+    for ch in letters.upper():
+        col = col * 26 + ord(ch) - 64
+    return col, int(ref[len(letters):])
+
+
+def _is_empty(value) -> bool:
+    if value is None or value is pd.NaT:
+        return True
+    if isinstance(value, float):
+        return value != value
+    if isinstance(value, str):
+        return value == ''
+    return bool(pd.isna(value)) if isinstance(value, (np.floating, np.datetime64, np.timedelta64)) else False
+
+
+def _clean(text: str) -> str:
+    """去掉 XML 不允许的控制字符"""
+    return _ILLEGAL_CHARS.sub('', text)
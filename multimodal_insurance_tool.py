@@ -29,6 +29,13 @@ from PyQt6.QtGui import QFont, QPainter, QPen, QColor
 # 导入配置管理器
 from customer_config import get_config_manager
 
+# 常驻 LibreOffice 转换服务（逐个启动 soffice 时启动开销远大于转换本身）
+try:
+    from office_convert import shared_converter
+    HAS_OFFICE_CONVERT = True
+except ImportError:
+    HAS_OFFICE_CONVERT = False
+
 # 抑制 Qt 相关的系统日志消息
 os.environ['QT_LOGGING_RULES'] = '*.debug=false;qt.qpa.*=false'
 
@@ -908,10 +915,23 @@ def remove_images_from_doc(doc):
                         for pict in picts:
                             pict.getparent().remove(pict)
 
+def _convert_with_office_service(src_path, pdf_path):
+    """通过常驻 soffice 实例转换，服务不可用时返回 None（由调用方回退逐个启动 soffice）"""
+    if not HAS_OFFICE_CONVERT:
+        return None
+    converter = shared_converter('multimodal')
+    if not converter.available:
+        return None
+    return converter.convert_file(src_path, pdf_path, 'pdf')
+
+
 def convert_to_pdf(docx_path, pdf_path):
     try:
         import platform
         if platform.system() == 'Darwin':
+            converted = _convert_with_office_service(docx_path, pdf_path)
+            if converted is not None:
+                return converted
             libreoffice_paths = [
                 '/Applications/LibreOffice.app/Contents/MacOS/soffice',
                 '/usr/local/bin/soffice',
@@ -953,6 +973,9 @@ def convert_excel_to_pdf(excel_path, pdf_path):
         import platform
         output_dir = os.path.dirname(pdf_path)
         if platform.system() == 'Darwin':
+            converted = _convert_with_office_service(excel_path, pdf_path)
+            if converted is not None:
+                return converted
             libreoffice_paths = [
                 '/Applications/LibreOffice.app/Contents/MacOS/soffice',
                 '/usr/local/bin/soffice',
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""
+LibreOffice 常驻转换服务
+
+功能：
+- 启动一个常驻的 headless soffice 实例（独立用户配置目录，不受用户已打开的 LibreOffice 影响）
+- 转换请求以同一配置目录调用 soffice --convert-to，交给常驻实例处理，省去每个文件的启动开销；
+  同一输出目录的多个文件一次调用提交
+- 看门狗：按输出文件出现的进度判断，单个文件超时或 soffice 崩溃时结束进程、
+  重启常驻实例，其余文件继续转换
+- 线程安全，可在任意工作线程中调用（不要在界面线程中调用）
+
+Date: 2026-10-18
+"""
+
+import atexit
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 120.0     # 单个文件转换超时（秒）
+STARTUP_TIMEOUT = 60.0      # 常驻实例启动等待时间（秒）
+POLL_INTERVAL = 0.2
+
+_SOFFICE_CANDIDATES = {
+    'darwin': ['/Applications/LibreOffice.app/Contents/MacOS/soffice', '/usr/local/bin/soffice',
+               '/opt/homebrew/bin/soffice'],
+    'win32': [r'C:\Program Files\LibreOffice\program\soffice.exe',
+              r'C:\Program Files (x86)\LibreOffice\program\soffice.exe'],
+}
+
+
+def find_soffice() -> Optional[str]:
+    """查找 soffice 可执行文件，未安装时返回 None"""
+    for path in _SOFFICE_CANDIDATES.get(sys.platform, []):
+        if os.path.exists(path):
+            return path
+    for name in ('soffice', 'libreoffice'):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def default_profile_dir(name: str) -> Path:
+    """转换服务专用的 LibreOffice 用户配置目录（首次初始化较慢，之后复用）"""
+    if sys.platform == 'darwin':
+        base = Path.home() / "Library" / "Caches" / "ClauseNexus"
+    elif sys.platform == 'win32':
+        base = Path(os.environ.get('LOCALAPPDATA', os.environ.get('APPDATA', Path.home()))) / "ClauseNexus"
+    else:
+        base = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / ".cache")) / "ClauseNexus"
+    return base / f"lo_profile_{name}"
+
+
+class ConversionError(Exception):
+    """转换失败或超时"""
+
+
+class OfficeConverter:
+    """
+    常驻 soffice 转换服务
+
+    convert(文件列表, 目标格式, 输出目录) 返回 {源文件: 输出文件或 None}；
+    on_result(源文件, 输出文件, 异常) 在调用线程中按完成顺序回调
+    """
+
+    def __init__(self, soffice: str = None, timeout: float = DEFAULT_TIMEOUT,
+                 profile_name: str = 'default', profile_dir: str = None):
+        self.soffice = soffice or find_soffice()
+        self.timeout = timeout
+        self.profile_dir = Path(profile_dir) if profile_dir else default_profile_dir(profile_name)
+        self._resident: Optional[subprocess.Popen] = None
+        self._restarts = 0
+        self._lock = threading.RLock()
+
+    @property
+    def available(self) -> bool:
+        return self.soffice is not None
+
+    def _base_cmd(self) -> List[str]:
+        return [self.soffice, f"-env:UserInstallation={self.profile_dir.resolve().as_uri()}",
+                '--headless', '--invisible', '--nologo', '--norestore', '--nolockcheck']
+
+    @staticmethod
+    def _popen(cmd: List[str]) -> subprocess.Popen:
+        kwargs = {'stdout': subprocess.DEVNULL, 'stderr': subprocess.DEVNULL, 'stdin': subprocess.DEVNULL}
+        if sys.platform == 'win32':
+            kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+        return subprocess.Popen(cmd, **kwargs)
+
+    def start(self):
+        """启动常驻实例（已在运行时不做任何事）"""
+        with self._lock:
+            if self._resident is not None and self._resident.poll() is None:
+                return
+            if not self.available:
+                raise ConversionError("未找到 LibreOffice (soffice)")
+            if self._resident is not None:
+                self._restarts += 1
+                logger.warning(f"soffice 常驻实例已退出，重新启动（第 {self._restarts} 次）")
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            lock_file = self.profile_dir / '.lock'
+            try:
+                lock_file.unlink()  # 上次被强制结束时遗留的锁
+            except OSError:
+                pass
+            self._resident = self._popen(self._base_cmd() + ['--nodefault'])
+            # 配置目录出现 .lock 即表示实例已就绪，可以接收转换请求
+            deadline = time.monotonic() + STARTUP_TIMEOUT
+            while time.monotonic() < deadline and self._resident.poll() is None:
+                if lock_file.exists():
+                    return
+                time.sleep(POLL_INTERVAL)
+            logger.warning("soffice 常驻实例未在预期时间内就绪，转换请求将自行启动 soffice")
+
+    def _stop_resident(self):
+        if self._resident is None:
+            return
+        if self._resident.poll() is None:
+            self._resident.terminate()
+            try:
+                self._resident.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._resident.kill()
+                self._resident.wait()
+
+    def close(self):
+        """结束常驻实例"""
+        with self._lock:
+            self._stop_resident()
+            self._resident = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def output_path(src: str, fmt: str, outdir: str) -> str:
+        return os.path.join(outdir, f"{os.path.splitext(os.path.basename(src))[0]}.{fmt.split(':')[0]}")
+
+    def convert(self, files: Sequence[str], fmt: str, outdir: str = None,
+                on_result: Callable[[str, Optional[str], Optional[Exception]], None] = None,
+                should_stop: Callable[[], bool] = None) -> Dict[str, Optional[str]]:
+        """
+        批量转换
+
+        Args:
+            fmt: soffice 目标格式，如 'docx'、'pdf'
+            outdir: 输出目录，默认与源文件相同
+        """
+        results: Dict[str, Optional[str]] = {}
+
+        def report(src, out, error):
+            results[src] = out
+            if error is not None:
+                logger.warning(f"转换失败: {src} - {error}")
+            if on_result:
+                on_result(src, out, error)
+
+        groups: Dict[str, List[str]] = {}
+        for src in files:
+            groups.setdefault(outdir or os.path.dirname(os.path.abspath(src)), []).append(src)
+
+        with self._lock:
+            for target_dir, group in groups.items():
+                if should_stop and should_stop():
+                    break
+                self._convert_group(group, fmt, target_dir, report, should_stop)
+        return results
+
+    def _convert_group(self, files, fmt, outdir, report, should_stop):
+        pending = list(files)
+        while pending:
+            self.start()
+            outputs = [self.output_path(src, fmt, outdir) for src in pending]
+            before = {}
+            for out in outputs:
+                try:
+                    before[out] = os.stat(out).st_mtime_ns
+                except OSError:
+                    before[out] = None
+
+            def produced(i):
+                try:
+                    mtime = os.stat(outputs[i]).st_mtime_ns
+                except OSError:
+                    return False
+                return before[outputs[i]] is None or mtime != before[outputs[i]]
+
+            proc = self._popen(self._base_cmd() + ['--convert-to', fmt, '--outdir', outdir] + pending)
+            done = 0                          # 已确认完成的文件数（按提交顺序）
+            last_progress = time.monotonic()
+            timed_out = stopped = False
+            while True:
+                if proc.poll() is not None:
+                    break
+                # soffice 按提交顺序转换：后面的文件出现输出，说明之前的文件都已处理完
+                latest = next((i for i in range(len(pending) - 1, done, -1) if produced(i)), done)
+                while done < latest:
+                    if produced(done):
+                        report(pending[done], outputs[done], None)
+                    else:
+                        report(pending[done], None, ConversionError("soffice 未生成输出文件"))
+                    done += 1
+                    last_progress = time.monotonic()
+                if should_stop and should_stop():
+                    stopped = True
+                    break
+                if time.monotonic() - last_progress > self.timeout:
+                    timed_out = True
+                    break
+                time.sleep(POLL_INTERVAL)
+
+            if timed_out or stopped:
+                proc.kill()
+                proc.wait()
+                # 常驻实例可能卡在该文件上，结束后下一轮自动重启
+                self._stop_resident()
+            if stopped:
+                return
+
+            rest = [i for i in range(done, len(pending)) if not produced(i)]
+            for i in range(done, len(pending)):
+                if i not in rest:
+                    report(pending[i], outputs[i], None)
+            if not rest:
+                return
+            if timed_out or proc.returncode != 0:
+                # 卡住/崩溃在第一个未完成的文件上，其余文件重新提交
+                first = rest.pop(0)
+                reason = f"转换超时（>{self.timeout:.0f}s）" if timed_out else f"soffice 异常退出 ({proc.returncode})"
+                report(pending[first], None, ConversionError(reason))
+                if not timed_out:
+                    self._stop_resident()
+                pending = [pending[i] for i in rest]
+            else:
+                # 正常退出但没有输出：文件本身无法转换
+                for i in rest:
+                    report(pending[i], None, ConversionError("soffice 未生成输出文件"))
+                return
+
+    def convert_file(self, src: str, dst: str, fmt: str = None) -> bool:
+        """转换单个文件到指定路径（输出目录为目标文件所在目录）"""
+        fmt = fmt or os.path.splitext(dst)[1].lstrip('.')
+        outdir = os.path.dirname(os.path.abspath(dst))
+        out = self.convert([src], fmt, outdir).get(src)
+        if not out:
+            return False
+        if os.path.abspath(out) != os.path.abspath(dst):
+            os.replace(out, dst)
+        return True
+
+
+_shared: Dict[str, OfficeConverter] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_converter(profile_name: str = 'default') -> OfficeConverter:
+    """进程内共享的转换服务（首次使用时创建，退出时自动关闭常驻实例）"""
+    with _shared_lock:
+        converter = _shared.get(profile_name)
+        if converter is None:
+            converter = OfficeConverter(profile_name=profile_name)
+            _shared[profile_name] = converter
+        return converter
+
+
+@atexit.register
+def _close_shared():
+    for converter in _shared.values():
+        converter.close()